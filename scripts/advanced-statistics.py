@@ -1,88 +1,93 @@
 #!/usr/bin/env python3
 """
 Script pour calculer des statistiques avancées sur les résultats de performance
-Usage: python scripts/advanced-statistics.py results/performance/
+Usage: python scripts/advanced-statistics.py results/performance/ [--workers N] [--output stats.json|stats.csv]
+       [--robust [--resamples 2000] [--seed S] [--correction holm|bh] [--comparison-output comparison.csv]]
+       python scripts/advanced-statistics.py results/performance/ --sketch [--output tails.json|tails.csv]
+       python scripts/advanced-statistics.py nouvelles_executions/ --gate --baseline baseline.json [--platform P]
+       [--branch B] [--last N] [--min-effect 0.10] [--min-seconds 5] [--alpha 0.05] [--update-baseline [--window 20]]
+       [--seed-baseline] [--output gate.json|gate.csv]
+       python scripts/advanced-statistics.py results/performance/ --plan [--min-effect 0.10] [--power 0.8] [--alpha 0.05]
+       [--precision 0.05] [--output plan.json|plan.csv]
+
+Les statistiques de toutes les cellules plateforme × stage (et de la durée
+totale) sont calculées en une passe vectorisée (cimetrics/stats.py);
+--output écrit la table complète en JSON ou CSV.
+
+--robust ajoute une comparaison par bootstrap et tests de permutation
+(médiane et p95) de toutes les paires de plateformes sur tous les stages,
+avec correction pour comparaisons multiples (cimetrics/resampling.py).
+
+--sketch affiche les percentiles de queue (p50/p90/p95/p99) de chaque
+plateforme × stage depuis les sketches de quantiles fusionnables
+(cimetrics/sketch.py, erreur relative <= 1 %), sans charger les durées:
+adapté aux historiques de millions d'exécutions.
+
+--gate contrôle les dernières exécutions (un fichier ou un répertoire de
+nouveaux résultats) contre une référence de résumés fusionnables
+(cimetrics/gate.py): test de Mann-Whitney contre les sketches de la
+référence et effet minimal sur la médiane, pour la durée totale et chaque
+stage. Le script sort en erreur (code 1) si une régression est détectée,
+et avec le code 2 si aucune cellule n'a pu être contrôlée (trop peu de
+nouvelles exécutions ou de valeurs dans la référence). --update-baseline
+ajoute les exécutions contrôlées à la fenêtre glissante de la référence
+quand le contrôle réussit (celles qu'elle contient déjà sont ignorées);
+--seed-baseline crée ou complète une référence trop peu fournie sans
+contrôle.
+
+--plan estime, depuis le coefficient de variation observé de chaque
+cellule (cimetrics/power.py), le nombre d'exécutions par plateforme pour
+détecter un écart relatif --min-effect avec la puissance --power, et pour
+que l'IC 95 % de la moyenne ait une demi-largeur relative d'au plus
+--precision.
 """
 
-import json
+import os
 import sys
-from pathlib import Path
-from statistics import mean, median, stdev
-from scipy import stats
 import numpy as np
 
-def load_results(results_dir):
-    """Charge tous les fichiers de résultats JSON"""
-    results = {}
-    for file in Path(results_dir).glob("*.json"):
-        platform = file.stem.split("_")[0]
-        with open(file) as f:
-            data = json.load(f)
-            if platform not in results:
-                results[platform] = []
-            
-            # Support pour ancien format (liste) et nouveau format (objet)
-            if isinstance(data, list):
-                results[platform].extend(data)
-            elif isinstance(data, dict):
-                if "executions" in data:
-                    results[platform].extend(data["executions"])
-                else:
-                    results[platform].append(data)
-    
-    return results
-
-def calculate_advanced_statistics(executions):
-    """Calcule des statistiques avancées"""
-    durations = [e.get("duration", {}).get("total", 0) if isinstance(e, dict) else e.get("duration", 0) for e in executions]
-    
-    if len(durations) < 2:
-        return None
-    
-    durations = [d for d in durations if d > 0]  # Filtrer les valeurs invalides
-    
+from cimetrics.aggregates import Summary
+from cimetrics.consolidation import load_summary
+from cimetrics.gate import (
+    DEFAULT_ALPHA,
+    DEFAULT_MIN_EFFECT,
+    DEFAULT_MIN_SECONDS,
+    DEFAULT_WINDOW,
+    GATE_FIELDS,
+    MIN_BASELINE,
+    MIN_NEW,
+    Baseline,
+    execution_keys,
+    gate_table,
+    select_newest,
+)
+from cimetrics.loader import list_result_files, load_files
+from cimetrics.options import exit_with_usage, pop_flag, pop_option, reject_unknown_options, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.power import DEFAULT_POWER, DEFAULT_PRECISION, PLAN_FIELDS, plan_table
+from cimetrics.snapshot import load_columns
+from cimetrics.resampling import COMPARISON_FIELDS, CORRECTIONS, compare_all
+from cimetrics.stats import TAIL_FIELDS, TOTAL, describe, statistics_table, tail_table, write_table
+
+# Codes de sortie de --gate
+EXIT_REGRESSION = 1
+EXIT_UNCHECKED = 2
+
+def load_results(results_dir, workers=1):
+    """Charge les exécutions en colonnes"""
+    return load_columns(results_dir, workers)
+
+def calculate_advanced_statistics(durations):
+    """Calcule des statistiques avancées sur les durées valides (> 0)"""
     if len(durations) < 2:
         return None
     
-    # Statistiques de base
-    mean_val = mean(durations)
-    median_val = median(durations)
-    std_val = stdev(durations) if len(durations) > 1 else 0
-    min_val = min(durations)
-    max_val = max(durations)
-    
-    # Intervalle de confiance 95%
-    n = len(durations)
-    se = std_val / (n ** 0.5)
-    t_critical = stats.t.ppf(0.975, n - 1)  # 95% confidence
-    ci_lower = mean_val - t_critical * se
-    ci_upper = mean_val + t_critical * se
-    
-    # Quartiles
-    q1 = np.percentile(durations, 25)
-    q3 = np.percentile(durations, 75)
-    iqr = q3 - q1
-    
-    # Coefficient de variation
-    cv = (std_val / mean_val) * 100 if mean_val > 0 else 0
-    
-    return {
-        "count": n,
-        "mean": mean_val,
-        "median": median_val,
-        "std": std_val,
-        "min": min_val,
-        "max": max_val,
-        "q1": q1,
-        "q3": q3,
-        "iqr": iqr,
-        "cv": cv,
-        "ci_95_lower": ci_lower,
-        "ci_95_upper": ci_upper
-    }
+    return describe(durations)
 
 def compare_platforms(results):
     """Compare les plateformes avec tests statistiques"""
+    from scipy import stats
+    
     platforms = list(results.keys())
     
     if len(platforms) < 2:
@@ -93,13 +98,10 @@ def compare_platforms(results):
     print("COMPARAISON STATISTIQUE DES PLATFORMES")
     print("="*80)
     
-    # Extraire les durées pour chaque plateforme
-    platform_durations = {}
-    for platform, executions in results.items():
-        durations = [e.get("duration", {}).get("total", 0) if isinstance(e, dict) else e.get("duration", 0) for e in executions]
-        durations = [d for d in durations if d > 0]
-        if len(durations) >= 2:
-            platform_durations[platform] = durations
+    # Plateformes avec assez de durées valides
+    platform_durations = {
+        platform: durations for platform, durations in results.items() if len(durations) >= 2
+    }
     
     # Tests t de Student (comparaison deux à deux)
     if len(platform_durations) >= 2:
@@ -119,52 +121,274 @@ def compare_platforms(results):
                     print(f"{p1} vs {p2}:")
                     print(f"  t-statistic: {t_stat:.4f}")
                     print(f"  p-value: {p_value:.4f} {significant}")
-                    print(f"  Différence moyenne: {mean(durations1) - mean(durations2):.2f}s")
+                    print(f"  Différence moyenne: {np.mean(durations1) - np.mean(durations2):.2f}s")
                     print()
 
-def generate_detailed_report(results):
+def robust_comparison(columns, n_resamples=2000, seed=None, correction="holm", workers=1):
+    """Compare les plateformes par bootstrap et tests de permutation (médiane, p95)"""
+    print("\n" + "="*80)
+    print(f"COMPARAISON ROBUSTE ({n_resamples} rééchantillonnages, correction {correction})")
+    print("="*80)
+    
+    rows = compare_all(columns, n_resamples=n_resamples, seed=seed, correction=correction, workers=workers)
+    if not rows:
+        print("⚠️  Pas assez de données pour comparaison")
+        return rows
+    
+    print(f"{'Paire':<18} {'Stage':<16} {'Stat':<6} {'Différence':>10} {'IC 95%':>22} {'p corr.':>8}")
+    print("-"*80)
+    for row in rows:
+        pair = f"{row['platform_a']} vs {row['platform_b']}"
+        ci = f"[{row['ci_lower']:.1f}, {row['ci_upper']:.1f}]"
+        marker = "✅" if row["significant"] else "  "
+        print(f"{pair:<18} {row['stage']:<16} {row['statistic']:<6} {row['difference']:>10.2f} "
+              f"{ci:>22} {row['p_adjusted']:>8.4f} {marker}")
+    return rows
+
+def print_platform_statistics(platform, stats_data):
+    """Affiche les statistiques de la durée totale d'une plateforme"""
+    print(f"\n📊 {platform.upper()}:")
+    print("-"*80)
+    print(f"  Nombre d'exécutions: {stats_data['count']}")
+    print(f"  Temps moyen: {stats_data['mean']:.2f}s")
+    print(f"  Médiane: {stats_data['median']:.2f}s")
+    print(f"  Écart-type: {stats_data['std']:.2f}s")
+    print(f"  Min: {stats_data['min']:.2f}s")
+    print(f"  Max: {stats_data['max']:.2f}s")
+    print(f"  Q1 (25%): {stats_data['q1']:.2f}s")
+    print(f"  Q3 (75%): {stats_data['q3']:.2f}s")
+    print(f"  IQR: {stats_data['iqr']:.2f}s")
+    print(f"  Coefficient de variation: {stats_data['cv']:.2f}%")
+    print(f"  Intervalle de confiance 95%: [{stats_data['ci_95_lower']:.2f}s, {stats_data['ci_95_upper']:.2f}s]")
+
+def print_stage_table(table):
+    """Affiche les statistiques par stage de toutes les plateformes"""
+    print("\n" + "="*80)
+    print("STATISTIQUES PAR STAGE")
+    print("="*80)
+    print(f"{'Plateforme':<10} {'Stage':<16} {'N':>5} {'Moyenne':>9} {'Médiane':>9} "
+          f"{'Écart-type':>10} {'IQR':>8} {'CV %':>7}")
+    print("-"*80)
+    for row in table:
+        if row["stage"] == TOTAL:
+            continue
+        print(f"{row['platform']:<10} {row['stage']:<16} {row['count']:>5} {row['mean']:>9.2f} "
+              f"{row['median']:>9.2f} {row['std']:>10.2f} {row['iqr']:>8.2f} {row['cv']:>7.2f}")
+
+def print_tail_table(table):
+    """Affiche les percentiles de queue estimés par les sketches"""
+    print("\n" + "="*80)
+    print("PERCENTILES DE QUEUE (sketches, erreur relative <= 1%)")
+    print("="*80)
+    print(f"{'Plateforme':<10} {'Stage':<16} {'N':>8} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'Max':>9}")
+    print("-"*80)
+    for row in table:
+        print(f"{row['platform']:<10} {row['stage']:<16} {row['count']:>8} {row['p50']:>9.2f} "
+              f"{row['p90']:>9.2f} {row['p95']:>9.2f} {row['p99']:>9.2f} {row['max']:>9.2f}")
+
+def sketch_report(results_dir, output_file=None, workers=1):
+    """Rapport des percentiles de queue depuis les agrégats fusionnables"""
+    table = tail_table(load_summary(results_dir, workers))
+    if not table:
+        print(f"❌ Aucun résultat trouvé dans {results_dir}")
+        sys.exit(1)
+    print_tail_table(table)
+    if output_file:
+        write_table(table, output_file, TAIL_FIELDS)
+        print(f"✅ Table des percentiles écrite: {output_file}")
+
+def load_new_executions(path, workers=1):
+    """Charge les nouvelles exécutions d'un fichier ou d'un répertoire de résultats"""
+    paths = list_result_files(path) if os.path.isdir(path) else [path]
+    return load_files(paths, workers)
+
+def print_gate_table(rows):
+    """Affiche la comparaison aux médianes de référence (régressions en tête)"""
+    print("\n" + "="*80)
+    print("CONTRÔLE DE NON-RÉGRESSION (médianes, Mann-Whitney, correction Holm)")
+    print("="*80)
+    print(f"{'Plateforme':<10} {'Stage':<16} {'N':>4} {'Réf.':>9} {'Nouveau':>9} {'Écart':>9} {'%':>7} {'p corr.':>8}")
+    print("-"*80)
+    for row in sorted(rows, key=lambda row: not row["regression"]):
+        marker = "❌" if row["regression"] else "✅"
+        print(f"{row['platform']:<10} {row['stage']:<16} {row['n_new']:>4} {row['baseline_median']:>8.1f}s "
+              f"{row['new_median']:>8.1f}s {row['difference']:>+8.1f}s {row['relative'] * 100:>+6.1f}% "
+              f"{row['p_adjusted']:>8.4f} {marker}")
+
+def gate(new_path, baseline_file, platform=None, branch=None, last=None, alpha=DEFAULT_ALPHA,
+         min_effect=DEFAULT_MIN_EFFECT, min_seconds=DEFAULT_MIN_SECONDS, update_baseline=False,
+         window=None, output_file=None, workers=1, seed_baseline=False):
+    """Contrôle les nouvelles exécutions contre la référence; retourne le code de sortie
+
+    0 si aucune régression, 1 si régression, 2 si aucune cellule n'a pu être
+    contrôlée (sauf --seed-baseline, qui initialise alors la référence).
+    """
+    if seed_baseline and not os.path.exists(baseline_file):
+        baseline = Baseline(window=window or DEFAULT_WINDOW)
+    else:
+        try:
+            baseline = Baseline.load(baseline_file, window)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Référence illisible: {baseline_file} ({e})")
+            sys.exit(1)
+    columns = select_newest(load_new_executions(new_path, workers), platform, branch, last)
+    if not len(columns):
+        print(f"❌ Aucune nouvelle exécution trouvée dans {new_path}")
+        sys.exit(1)
+    
+    rows = gate_table(columns, baseline.summary(), alpha, min_effect, min_seconds)
+    if rows:
+        print_gate_table(rows)
+    if output_file:
+        write_table(rows, output_file, GATE_FIELDS)
+        print(f"✅ Table du contrôle écrite: {output_file}")
+    
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s): "
+              + ", ".join(f"{row['platform']}/{row['stage']}" for row in regressions))
+        return EXIT_REGRESSION
+    if rows:
+        print(f"\n✅ Aucune régression ({len(columns)} exécutions contrôlées)")
+    elif seed_baseline:
+        print(f"🌱 Aucune cellule contrôlable: initialisation de la référence avec {len(columns)} exécutions")
+    else:
+        print(f"\n❌ Aucune cellule contrôlée: pas assez de nouvelles exécutions (au moins {MIN_NEW}) "
+              f"ou de valeurs dans la référence (au moins {MIN_BASELINE}); --seed-baseline pour l'initialiser")
+        return EXIT_UNCHECKED
+    if update_baseline or seed_baseline:
+        update_baseline_file(baseline, baseline_file, columns)
+    return 0
+
+def update_baseline_file(baseline, baseline_file, columns):
+    """Ajoute à la référence les exécutions qu'elle ne contient pas encore"""
+    columns = columns.select(baseline.unseen(columns))
+    if not len(columns):
+        print(f"ℹ️  Exécutions déjà présentes dans la référence: {baseline_file} inchangée")
+        return
+    baseline.push(Summary().update_columns(columns), execution_keys(columns))
+    baseline.save(baseline_file)
+    print(f"✅ Référence mise à jour: {baseline_file} (+{len(columns)} exécutions, {len(baseline.batches)} lots)")
+
+def print_plan_table(rows, effect, power, precision):
+    """Affiche le nombre d'exécutions recommandé par cellule et par plateforme"""
+    print("\n" + "="*80)
+    print(f"PLANIFICATION (écart {effect * 100:.0f}%, puissance {power * 100:.0f}%, précision ±{precision * 100:.0f}%)")
+    print("="*80)
+    print(f"{'Plateforme':<10} {'Stage':<16} {'N':>5} {'CV %':>7} {'Préc. %':>8} {'Écart dét.':>10} "
+          f"{'N écart':>8} {'N préc.':>8}")
+    print("-"*80)
+    for row in rows:
+        print(f"{row['platform']:<10} {row['stage']:<16} {row['count']:>5} {row['cv']:>7.2f} "
+              f"{row['precision'] * 100:>7.1f}% {row['detectable_effect'] * 100:>9.1f}% "
+              f"{row['runs_for_effect']:>8} {row['runs_for_precision']:>8}")
+    print()
+    for row in rows:
+        if row["stage"] != TOTAL:
+            continue
+        needed = max(row["runs_for_effect"], row["runs_for_precision"])
+        remaining = max(needed - row["count"], 0)
+        print(f"🎯 {row['platform'].upper()}: {needed} exécutions recommandées pour la durée totale "
+              f"({row['count']} mesurées, {remaining} de plus)")
+
+def plan_runs(columns, effect, alpha, power, precision, output_file=None):
+    """Planifie le nombre d'exécutions depuis la variabilité observée"""
+    rows = plan_table(columns, effect, alpha, power, precision)
+    if not rows:
+        print("⚠️  Pas assez de données pour estimer la variabilité (au moins 2 exécutions)")
+        return
+    print_plan_table(rows, effect, power, precision)
+    if output_file:
+        write_table(rows, output_file, PLAN_FIELDS)
+        print(f"✅ Table de planification écrite: {output_file}")
+
+def generate_detailed_report(columns, table):
     """Génère un rapport détaillé"""
     print("\n" + "="*80)
     print("RAPPORT STATISTIQUE DÉTAILLÉ")
     print("="*80)
     
-    for platform, executions in results.items():
-        stats_data = calculate_advanced_statistics(executions)
-        
-        if stats_data is None:
+    totals = {row["platform"]: row for row in table if row["stage"] == TOTAL}
+    for platform in columns.platforms():
+        if platform not in totals:
             print(f"\n⚠️  {platform.upper()}: Pas assez de données")
             continue
-        
-        print(f"\n📊 {platform.upper()}:")
-        print("-"*80)
-        print(f"  Nombre d'exécutions: {stats_data['count']}")
-        print(f"  Temps moyen: {stats_data['mean']:.2f}s")
-        print(f"  Médiane: {stats_data['median']:.2f}s")
-        print(f"  Écart-type: {stats_data['std']:.2f}s")
-        print(f"  Min: {stats_data['min']:.2f}s")
-        print(f"  Max: {stats_data['max']:.2f}s")
-        print(f"  Q1 (25%): {stats_data['q1']:.2f}s")
-        print(f"  Q3 (75%): {stats_data['q3']:.2f}s")
-        print(f"  IQR: {stats_data['iqr']:.2f}s")
-        print(f"  Coefficient de variation: {stats_data['cv']:.2f}%")
-        print(f"  Intervalle de confiance 95%: [{stats_data['ci_95_lower']:.2f}s, {stats_data['ci_95_upper']:.2f}s]")
+        print_platform_statistics(platform, totals[platform])
+    
+    print_stage_table(table)
     
     # Comparaison
-    compare_platforms(results)
+    compare_platforms({platform: columns.durations(platform) for platform in columns.platforms()})
+
+def print_usage():
+    print("Usage: python scripts/advanced-statistics.py <results_dir> [--workers N] [--output stats.json|stats.csv]")
+    print("       [--robust [--resamples N] [--seed S] [--correction holm|bh] [--comparison-output file]]")
+    print("       [--sketch]")
+    print("       [--gate --baseline baseline.json [--platform P] [--branch B] [--last N] [--min-effect 0.10]")
+    print("        [--min-seconds 5] [--alpha 0.05] [--update-baseline [--window 20]] [--seed-baseline]]")
+    print("       [--plan [--min-effect 0.10] [--power 0.8] [--precision 0.05]]")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/advanced-statistics.py <results_dir>")
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        output_file, args = pop_option(args, "output")
+        robust, args = pop_flag(args, "robust")
+        n_resamples, args = pop_option(args, "resamples", 2000, int)
+        seed, args = pop_option(args, "seed", None, int)
+        correction, args = pop_option(args, "correction", "holm")
+        comparison_output, args = pop_option(args, "comparison-output")
+        sketch, args = pop_flag(args, "sketch")
+        gate_mode, args = pop_flag(args, "gate")
+        baseline_file, args = pop_option(args, "baseline")
+        platform, args = pop_option(args, "platform")
+        branch, args = pop_option(args, "branch")
+        last, args = pop_option(args, "last", None, int)
+        alpha, args = pop_option(args, "alpha", DEFAULT_ALPHA, float)
+        min_effect, args = pop_option(args, "min-effect", DEFAULT_MIN_EFFECT, float)
+        min_seconds, args = pop_option(args, "min-seconds", DEFAULT_MIN_SECONDS, float)
+        update_baseline, args = pop_flag(args, "update-baseline")
+        seed_baseline, args = pop_flag(args, "seed-baseline")
+        window, args = pop_option(args, "window", None, int)
+        plan, args = pop_flag(args, "plan")
+        power, args = pop_option(args, "power", DEFAULT_POWER, float)
+        precision, args = pop_option(args, "precision", DEFAULT_PRECISION, float)
+    reject_unknown_options(args, print_usage)
+    if correction not in CORRECTIONS:
+        exit_with_usage(f"--correction: {correction} (choix: {'|'.join(CORRECTIONS)})", print_usage)
+    if len(args) < 1 or (gate_mode and not baseline_file):
+        print_usage()
         sys.exit(1)
     
-    results_dir = sys.argv[1]
-    results = load_results(results_dir)
+    results_dir = args[0]
+    if gate_mode:
+        sys.exit(gate(results_dir, baseline_file, platform, branch, last, alpha, min_effect, min_seconds,
+                      update_baseline, window, output_file, workers, seed_baseline))
+    if sketch:
+        sketch_report(results_dir, output_file, workers)
+        return
+    
+    columns = load_results(results_dir, workers)
     
-    if not results:
+    if not len(columns):
         print(f"❌ Aucun résultat trouvé dans {results_dir}")
         sys.exit(1)
     
-    generate_detailed_report(results)
+    if plan:
+        plan_runs(columns, min_effect, alpha, power, precision, output_file)
+        return
+    
+    table = statistics_table(columns)
+    generate_detailed_report(columns, table)
+    
+    if robust:
+        comparison = robust_comparison(columns, n_resamples, seed, correction, workers)
+        if comparison_output:
+            write_table(comparison, comparison_output, COMPARISON_FIELDS)
+            print(f"✅ Table des comparaisons écrite: {comparison_output}")
+    
+    if output_file:
+        write_table(table, output_file)
+        print(f"✅ Table des statistiques écrite: {output_file}")
 
 if __name__ == "__main__":
     try:
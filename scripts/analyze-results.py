@@ -1,41 +1,68 @@
 #!/usr/bin/env python3
 """
 Script pour analyser les résultats de performance des pipelines CI/CD
-Usage: python scripts/analyze-results.py results/performance/
+Usage: python scripts/analyze-results.py results/performance/ [--workers N] [--sketch]
+
+--sketch lit les statistiques dans les agrégats fusionnables (summary du
+manifeste ou lecture en flux): médiane et percentiles viennent des sketches
+de quantiles, sans charger les durées en mémoire.
 """
 
-import json
 import os
 import sys
-from pathlib import Path
-from statistics import mean, median, stdev
-import matplotlib.pyplot as plt
+import numpy as np
+
+from cimetrics.consolidation import load_summary
+from cimetrics.options import pop_flag, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
 
-def load_results(results_dir):
-    """Charge tous les fichiers de résultats JSON"""
+def load_results(results_dir, workers=1):
+    """Charge les durées totales valides par plateforme"""
+    columns = load_columns(results_dir, workers)
     results = {}
-    for file in Path(results_dir).glob("*.json"):
-        platform = file.stem.split("_")[0]
-        with open(file) as f:
-            data = json.load(f)
-            if platform not in results:
-                results[platform] = []
-            results[platform].extend(data.get("executions", []))
+    for platform in columns.platforms():
+        durations = columns.durations(platform)
+        if len(durations):
+            results[platform] = durations
     return results
 
-def calculate_statistics(executions):
-    """Calcule les statistiques pour une série d'exécutions"""
-    durations = [e["duration"] for e in executions]
+def load_summary_statistics(results_dir, workers=1):
+    """Statistiques des durées totales par plateforme, depuis les agrégats fusionnables"""
+    summary = load_summary(results_dir, workers)
+    statistics = {}
+    for platform, platform_summary in summary.platforms.items():
+        duration = platform_summary.duration
+        if not duration.count:
+            continue
+        percentiles = duration.percentiles()
+        statistics[platform] = {
+            "mean": duration.mean,
+            "median": percentiles["p50"],
+            "p95": percentiles["p95"],
+            "p99": percentiles["p99"],
+            "min": duration.min,
+            "max": duration.max,
+            "stdev": duration.std,
+            "count": duration.count
+        }
+    return statistics
+
+def calculate_statistics(durations):
+    """Calcule les statistiques pour une série de durées"""
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99])
     return {
-        "mean": mean(durations),
-        "median": median(durations),
-        "min": min(durations),
-        "max": max(durations),
-        "stdev": stdev(durations) if len(durations) > 1 else 0,
+        "mean": float(np.mean(durations)),
+        "median": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "min": float(np.min(durations)),
+        "max": float(np.max(durations)),
+        "stdev": float(np.std(durations, ddof=1)) if len(durations) > 1 else 0,
         "count": len(durations)
     }
 
-def generate_comparison_table(results):
+def generate_comparison_table(statistics):
     """Génère un tableau de comparaison"""
     print("\n" + "="*80)
     print("COMPARAISON DES PERFORMANCES")
@@ -43,21 +70,21 @@ def generate_comparison_table(results):
     print(f"{'Plateforme':<20} {'Moyenne':<15} {'Médiane':<15} {'Min':<15} {'Max':<15} {'Écart-type':<15}")
     print("-"*80)
     
-    for platform, executions in results.items():
-        stats = calculate_statistics(executions)
+    for platform, stats in statistics.items():
         print(f"{platform:<20} {stats['mean']:<15.2f} {stats['median']:<15.2f} "
               f"{stats['min']:<15.2f} {stats['max']:<15.2f} {stats['stdev']:<15.2f}")
     
     print("="*80)
 
-def plot_comparison(results, output_file="results/comparison.png"):
+def plot_comparison(statistics, output_file="results/comparison.png"):
     """Génère un graphique de comparaison"""
+    import matplotlib.pyplot as plt
+    
     platforms = []
     means = []
     stds = []
     
-    for platform, executions in results.items():
-        stats = calculate_statistics(executions)
+    for platform, stats in statistics.items():
         platforms.append(platform)
         means.append(stats["mean"])
         stds.append(stats["stdev"])
@@ -73,34 +100,44 @@ def plot_comparison(results, output_file="results/comparison.png"):
     plt.savefig(output_file)
     print(f"\nGraphique sauvegarde: {output_file}")
 
+def print_usage():
+    print("Usage: python scripts/analyze-results.py <results_dir> [--workers N] [--sketch]")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/analyze-results.py <results_dir>")
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        sketch, args = pop_flag(args, "sketch")
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
     
-    results_dir = sys.argv[1]
-    results = load_results(results_dir)
+    results_dir = args[0]
+    if sketch:
+        statistics = load_summary_statistics(results_dir, workers)
+    else:
+        results = load_results(results_dir, workers)
+        statistics = {platform: calculate_statistics(durations) for platform, durations in results.items()}
     
-    if not results:
+    if not statistics:
         print(f"Aucun résultat trouvé dans {results_dir}")
         sys.exit(1)
     
     # Afficher les statistiques
-    for platform, executions in results.items():
+    for platform, stats in statistics.items():
         print(f"\n{platform.upper()}:")
-        stats = calculate_statistics(executions)
         print(f"  Nombre d'exécutions: {stats['count']}")
         print(f"  Temps moyen: {stats['mean']:.2f}s")
         print(f"  Temps médian: {stats['median']:.2f}s")
+        print(f"  p95 / p99: {stats['p95']:.2f}s / {stats['p99']:.2f}s")
         print(f"  Min: {stats['min']:.2f}s")
         print(f"  Max: {stats['max']:.2f}s")
         print(f"  Écart-type: {stats['stdev']:.2f}s")
     
     # Tableau de comparaison
-    generate_comparison_table(results)
+    generate_comparison_table(statistics)
     
     # Graphique
-    plot_comparison(results)
+    plot_comparison(statistics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script pour identifier les stages qui déterminent la durée des pipelines
+Usage: python scripts/bottleneck-report.py results/performance/ [--tail-percentile 90] [--top N]
+       [--output bottlenecks.json|bottlenecks.csv] [--workers N]
+
+Pour chaque plateforme, la durée totale est décomposée en contributions des
+stages du chemin critique (les stages parallèles attendus ne comptent pas)
+et du reste « overhead » (attente, checkout, démarrage) selon trois points
+de vue (cimetrics/attribution.py):
+  - Moy. %  part de la durée moyenne
+  - Var. %  contribution à la variance de la durée totale (covariance)
+  - Queue % part de l'excès des exécutions lentes (au-delà du p90)
+Les stages sont classés par score (moyenne des trois parts): les premiers
+sont les cibles d'optimisation prioritaires; l'overhead est affiché sans rang. Une plateforme avec moins de
+MIN_RELIABLE_RUNS exécutions est signalée (colonne low_n de la table).
+--output écrit la table complète en JSON ou CSV.
+"""
+
+import sys
+
+from cimetrics.attribution import ATTRIBUTION_FIELDS, MIN_RELIABLE_RUNS, TAIL_PERCENTILE, attribution_table
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
+from cimetrics.stats import write_table
+
+def format_share(value):
+    return f"{'-':>8}" if value is None else f"{value * 100:>7.1f}%"
+
+def print_attribution(table, tail_percentile, top=None):
+    """Affiche le classement des stages de chaque plateforme"""
+    platforms = list(dict.fromkeys(row["platform"] for row in table))
+    for platform in platforms:
+        rows = [row for row in table if row["platform"] == platform]
+        first = rows[0]
+        print("\n" + "="*80)
+        print(f"{platform.upper()}: {first['runs']} exécutions, {first['tail_runs']} au-delà du "
+              f"p{tail_percentile} ({first['tail_threshold']:.1f}s)")
+        print("="*80)
+        if first["low_n"]:
+            print(f"⚠️  Moins de {MIN_RELIABLE_RUNS} exécutions: parts et classement peu significatifs")
+        print(f"{'Rang':>4} {'Stage':<16} {'Moyenne':>9} {'Moy. %':>8} {'Var. %':>8} {'Queue %':>8} {'Score':>7}")
+        print("-"*80)
+        for row in rows[:top]:
+            score = "-" if row["score"] is None else f"{row['score']:.2f}"
+            rank = "-" if row["rank"] is None else row["rank"]
+            print(f"{rank:>4} {row['stage']:<16} {row['mean']:>8.1f}s {format_share(row['mean_share'])} "
+                  f"{format_share(row['variance_share'])} {format_share(row['tail_share'])} {score:>7}")
+        ranked = [row for row in rows if row["rank"] is not None]
+        if ranked:
+            print(f"\n🎯 Cible prioritaire: {ranked[0]['stage']}")
+
+def print_usage():
+    print("Usage: python scripts/bottleneck-report.py <results_dir> [--tail-percentile 90] [--top N]")
+    print("       [--output bottlenecks.json|bottlenecks.csv] [--workers N]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        tail_percentile, args = pop_option(args, "tail-percentile", TAIL_PERCENTILE, float)
+        top, args = pop_option(args, "top", None, int)
+        output_file, args = pop_option(args, "output")
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+
+    results_dir = args[0]
+    columns = load_columns(results_dir, workers)
+    table = attribution_table(columns, tail_percentile)
+
+    if not table:
+        print(f"❌ Aucune exécution avec des durées de stages dans {results_dir}")
+        sys.exit(1)
+
+    print_attribution(table, f"{tail_percentile:g}", top)
+
+    if output_file:
+        write_table(table, output_file, ATTRIBUTION_FIELDS)
+        print(f"\n✅ Table des contributions écrite: {output_file}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ImportError:
+        print("❌ Erreur: numpy est requis")
+        print("   Installer avec: pip install numpy")
+        sys.exit(1)
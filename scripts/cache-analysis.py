@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Script pour mesurer ce que rapportent les caches de dépendances
+Usage: python scripts/cache-analysis.py results/performance/ [--throughput 50] [--builds-per-month 100]
+       [--resamples 2000] [--seed S] [--pricing tarifs.json] [--output cache.json|cache.csv]
+       [--summary-output cache_resume.json|cache_resume.csv] [--workers N]
+
+Les exécutions sont séparées selon cache.hit (cimetrics/cache.py): pour la
+durée totale et chaque stage, durées moyennes et médianes des hits et des
+misses, et gain par hit (miss - hit) avec son IC 95 % bootstrap.
+
+Par plateforme, le modèle de coût du cache (débit de transfert
+--throughput Mo/s, taille médiane cache.size_mb) donne le gain net par
+build face à un pipeline sans cache, la taille au-delà de laquelle le
+cache ne se rentabilise plus et les minutes économisées par mois pour
+--builds-per-month builds, valorisées avec les tarifs de calculate-costs.py.
+"""
+
+import sys
+
+from cimetrics.cache import (
+    CACHE_FIELDS,
+    CACHE_SUMMARY_FIELDS,
+    DEFAULT_BUILDS_PER_MONTH,
+    DEFAULT_RESAMPLES,
+    DEFAULT_THROUGHPUT,
+    cache_summary,
+    cache_table,
+)
+from cimetrics.costs import load_pricing
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
+from cimetrics.stats import write_table
+
+def format_seconds(value):
+    return f"{'-':>8}" if value is None else f"{value:>7.1f}s"
+
+def format_interval(lower, upper, unit="s", digits=1):
+    return "-" if lower is None else f"[{lower:.{digits}f}{unit}, {upper:.{digits}f}{unit}]"
+
+def print_cache_table(table):
+    """Affiche les durées hit/miss et le gain par hit de chaque cellule"""
+    for platform in dict.fromkeys(row["platform"] for row in table):
+        rows = [row for row in table if row["platform"] == platform]
+        print("\n" + "="*80)
+        print(f"{platform.upper()}: {rows[0]['hits']} hits, {rows[0]['misses']} misses")
+        print("="*80)
+        print(f"{'Stage':<16} {'Hit moy.':>9} {'Miss moy.':>9} {'Gain/hit':>9}  IC 95%")
+        print("-"*80)
+        for row in rows:
+            print(f"{row['stage']:<16} {format_seconds(row['hit_mean']):>9} {format_seconds(row['miss_mean']):>9} "
+                  f"{format_seconds(row['saving']):>9}  {format_interval(row['saving_lower'], row['saving_upper'])}")
+
+def print_cache_summary(summary, throughput, builds_per_month):
+    """Affiche le gain net, la taille de rentabilité et les économies mensuelles"""
+    print("\n" + "="*80)
+    print(f"RENTABILITÉ DES CACHES (transfert {throughput:g} Mo/s, {builds_per_month} builds/mois)")
+    print("="*80)
+    for row in summary:
+        verdict = "✅" if row["net_saving"] > 0 else "❌"
+        print(f"\n{verdict} {row['platform'].upper()} ({row['runs']} exécutions, taux de hit {row['hit_rate'] * 100:.0f}%)")
+        print(f"  Cache: {row['cache_size_mb']:.0f} Mo ({row['transfer_seconds']:.1f}s de transfert)", end="")
+        if row["artifact_size_mb"] is not None:
+            print(f", artefacts: {row['artifact_size_mb']:.0f} Mo")
+        else:
+            print()
+        print(f"  Gain par hit: {row['saving_per_hit']:.1f}s")
+        print(f"  Gain net par build: {row['net_saving']:.1f}s {format_interval(row['net_lower'], row['net_upper'])}")
+        print(f"  Rentable jusqu'à: {row['break_even_mb']:.0f} Mo "
+              f"{format_interval(row['break_even_lower'], row['break_even_upper'], ' Mo', 0)}")
+        print(f"  Minutes économisées/mois: {row['minutes_per_month']:.0f} "
+              f"{format_interval(row['minutes_lower'], row['minutes_upper'], '', 0)}")
+        if row["cost_saved"] is not None:
+            print(f"  Économie/mois: ${row['cost_saved']:.2f}")
+
+def print_usage():
+    print("Usage: python scripts/cache-analysis.py <results_dir> [--throughput 50] [--builds-per-month 100]")
+    print("       [--resamples 2000] [--seed S] [--pricing tarifs.json] [--output cache.json|cache.csv]")
+    print("       [--summary-output cache_resume.json|cache_resume.csv] [--workers N]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        throughput, args = pop_option(args, "throughput", DEFAULT_THROUGHPUT, float)
+        builds_per_month, args = pop_option(args, "builds-per-month", DEFAULT_BUILDS_PER_MONTH, int)
+        n_resamples, args = pop_option(args, "resamples", DEFAULT_RESAMPLES, int)
+        seed, args = pop_option(args, "seed", None, int)
+        pricing_file, args = pop_option(args, "pricing")
+        output_file, args = pop_option(args, "output")
+        summary_file, args = pop_option(args, "summary-output")
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+
+    results_dir = args[0]
+    columns = load_columns(results_dir, workers)
+    table, draws = cache_table(columns, n_resamples, seed)
+    if not table:
+        print(f"❌ Aucune exécution avec cache.hit renseigné dans {results_dir}")
+        sys.exit(1)
+
+    print_cache_table(table)
+    summary = cache_summary(columns, table, draws, throughput, builds_per_month, load_pricing(pricing_file))
+    if summary:
+        print_cache_summary(summary, throughput, builds_per_month)
+    else:
+        print("\n⚠️  Il faut au moins 2 hits et 2 misses par plateforme pour estimer le gain du cache")
+
+    if output_file:
+        write_table(table, output_file, CACHE_FIELDS)
+        print(f"\n✅ Table hit/miss écrite: {output_file}")
+    if summary_file:
+        write_table(summary, summary_file, CACHE_SUMMARY_FIELDS)
+        print(f"✅ Résumé écrit: {summary_file}")
+
+if __name__ == "__main__":
+    main()
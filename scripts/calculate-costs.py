@@ -1,123 +1,60 @@
 #!/usr/bin/env python3
 """
 Script pour calculer les coûts des différentes plateformes CI/CD
-Usage: python scripts/calculate-costs.py results/performance/
+Usage: python scripts/calculate-costs.py results/performance/ [builds_per_month] [--pricing tarifs.json]
+       [--samples 2000] [--seed S] [--workers N]
+       python scripts/calculate-costs.py results/performance/ --sweep [--min-builds 1] [--max-builds 100000]
+       [--points 121] [--output couts.json|couts.csv] [--no-plots] [--pricing tarifs.json] [--samples 2000] [--seed S]
+
+Les coûts sont calculés par cimetrics/costs.py à partir de la table PRICING
+(--pricing la complète plateforme par plateforme depuis un fichier JSON):
+chaque job est arrondi à la minute supérieure comme sur GitHub Actions et
+GitLab CI. Le coût mensuel rapporté est celui des minutes facturées
+moyennes (déterministe, comme les minutes payantes affichées); sa bande de
+confiance 5 %-95 % est tirée de la distribution des durées mesurées
+(--seed pour la reproduire).
+
+--sweep calcule les courbes de coût sur toute la grille de builds/mois
+(logarithmique de --min-builds à --max-builds), les seuils de rentabilité
+face au coût fixe de Jenkins et un graphique
+(results_dir/visualizations/cost_curves.png). --output écrit les courbes
+en JSON ou CSV.
 """
 
-import json
 import sys
 from pathlib import Path
-from statistics import mean
 
-# Pricing (à mettre à jour selon les tarifs actuels)
-PRICING = {
-    "github": {
-        "free_minutes": 2000,  # Minutes gratuites par mois
-        "price_per_minute": 0.008,  # $0.008 par minute après le quota
-        "runner_type": "ubuntu-latest"
-    },
-    "gitlab": {
-        "free_minutes": 400,  # Minutes gratuites par mois (Shared Runner)
-        "price_per_minute": 0.01,  # $0.01 par minute après le quota
-        "runner_type": "shared"
-    },
-    "jenkins": {
-        "self_hosted": True,
-        "infrastructure_cost_per_month": 20,  # Coût estimé infrastructure
-        "maintenance_hours_per_month": 4,
-        "hourly_rate": 50  # Taux horaire pour maintenance
-    }
-}
+import numpy as np
 
-def load_results(results_dir):
-    """Charge tous les fichiers de résultats JSON"""
-    results = {}
-    for file in Path(results_dir).glob("*.json"):
-        platform = file.stem.split("_")[0]
-        with open(file) as f:
-            data = json.load(f)
-            if platform not in results:
-                results[platform] = []
-            
-            if isinstance(data, list):
-                results[platform].extend(data)
-            elif isinstance(data, dict):
-                if "executions" in data:
-                    results[platform].extend(data["executions"])
-                else:
-                    results[platform].append(data)
-    
-    return results
+from cimetrics.costs import (
+    BAND,
+    COST_FIELDS,
+    DEFAULT_MAX_BUILDS,
+    DEFAULT_MIN_BUILDS,
+    DEFAULT_POINTS,
+    DEFAULT_SAMPLES,
+    builds_grid,
+    cost_sweep,
+    load_pricing,
+    sweep_rows,
+)
+from cimetrics.options import exit_with_usage, pop_flag, pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
+from cimetrics.stats import write_table
 
-def calculate_github_costs(executions, builds_per_month=100):
-    """Calcule les coûts pour GitHub Actions"""
-    durations = []
-    for e in executions:
-        if isinstance(e, dict):
-            duration = e.get("duration", {}).get("total", 0)
-        else:
-            duration = e.get("duration", 0)
-        if duration > 0:
-            durations.append(duration / 60)  # Convertir en minutes
-    
-    if not durations:
-        return None
-    
-    avg_duration_minutes = mean(durations)
-    total_minutes_per_month = avg_duration_minutes * builds_per_month
-    
-    free_minutes = PRICING["github"]["free_minutes"]
-    paid_minutes = max(0, total_minutes_per_month - free_minutes)
-    cost_per_month = paid_minutes * PRICING["github"]["price_per_minute"]
-    
-    return {
-        "avg_duration_minutes": avg_duration_minutes,
-        "total_minutes_per_month": total_minutes_per_month,
-        "free_minutes": free_minutes,
-        "paid_minutes": paid_minutes,
-        "cost_per_month": cost_per_month,
-        "cost_per_build": cost_per_month / builds_per_month if builds_per_month > 0 else 0
-    }
+DPI = 150
 
-def calculate_gitlab_costs(executions, builds_per_month=100):
-    """Calcule les coûts pour GitLab CI"""
-    durations = []
-    for e in executions:
-        if isinstance(e, dict):
-            duration = e.get("duration", {}).get("total", 0)
-        else:
-            duration = e.get("duration", 0)
-        if duration > 0:
-            durations.append(duration / 60)  # Convertir en minutes
-    
-    if not durations:
-        return None
-    
-    avg_duration_minutes = mean(durations)
-    total_minutes_per_month = avg_duration_minutes * builds_per_month
-    
-    free_minutes = PRICING["gitlab"]["free_minutes"]
-    paid_minutes = max(0, total_minutes_per_month - free_minutes)
-    cost_per_month = paid_minutes * PRICING["gitlab"]["price_per_minute"]
-    
-    return {
-        "avg_duration_minutes": avg_duration_minutes,
-        "total_minutes_per_month": total_minutes_per_month,
-        "free_minutes": free_minutes,
-        "paid_minutes": paid_minutes,
-        "cost_per_month": cost_per_month,
-        "cost_per_build": cost_per_month / builds_per_month if builds_per_month > 0 else 0
-    }
+def format_builds(value):
+    return "jamais (sur la grille)" if value is None else f"{value:,.0f} builds/mois"
 
-def calculate_jenkins_costs(executions, builds_per_month=100):
+def calculate_jenkins_costs(pricing, builds_per_month=100):
     """Calcule les coûts pour Jenkins (self-hosted)"""
     # Coût fixe d'infrastructure
-    infrastructure_cost = PRICING["jenkins"]["infrastructure_cost_per_month"]
+    infrastructure_cost = pricing["infrastructure_cost_per_month"]
     
     # Coût de maintenance
-    maintenance_hours = PRICING["jenkins"]["maintenance_hours_per_month"]
-    hourly_rate = PRICING["jenkins"]["hourly_rate"]
-    maintenance_cost = maintenance_hours * hourly_rate
+    maintenance_cost = pricing["maintenance_hours_per_month"] * pricing["hourly_rate"]
     
     total_cost_per_month = infrastructure_cost + maintenance_cost
     
@@ -129,85 +66,171 @@ def calculate_jenkins_costs(executions, builds_per_month=100):
         "note": "Coût fixe indépendant du nombre de builds"
     }
 
-def generate_cost_report(results, builds_per_month=100):
+def generate_cost_report(columns, pricing, builds_per_month=100, n_samples=DEFAULT_SAMPLES, seed=None):
     """Génère un rapport de coûts"""
     print("\n" + "="*80)
     print(f"ANALYSE DES COÛTS (pour {builds_per_month} builds/mois)")
     print("="*80)
     
-    costs = {}
-    
-    # GitHub Actions
-    if "github" in results:
-        costs["github"] = calculate_github_costs(results["github"], builds_per_month)
-    
-    # GitLab CI
-    if "gitlab" in results:
-        costs["gitlab"] = calculate_gitlab_costs(results["gitlab"], builds_per_month)
+    sweep = cost_sweep(columns, [builds_per_month], n_samples, seed, pricing)
+    monthly_costs = {}
     
-    # Jenkins
-    if "jenkins" in results:
-        costs["jenkins"] = calculate_jenkins_costs(results["jenkins"], builds_per_month)
-    
-    # Afficher les résultats
-    for platform, cost_data in costs.items():
-        if cost_data is None:
-            print(f"\n⚠️  {platform.upper()}: Pas assez de données")
+    for platform in columns.platforms():
+        values = pricing.get(platform)
+        if values is None:
             continue
-        
-        print(f"\n💰 {platform.upper()}:")
-        print("-"*80)
-        
-        if platform in ["github", "gitlab"]:
-            print(f"  Durée moyenne: {cost_data['avg_duration_minutes']:.2f} minutes")
-            print(f"  Total minutes/mois: {cost_data['total_minutes_per_month']:.2f}")
-            print(f"  Minutes gratuites: {cost_data['free_minutes']}")
-            print(f"  Minutes payantes: {cost_data['paid_minutes']:.2f}")
-            print(f"  Coût/mois: ${cost_data['cost_per_month']:.2f}")
-            print(f"  Coût/build: ${cost_data['cost_per_build']:.4f}")
-        else:  # Jenkins
+        if values.get("model") == "fixed":
+            cost_data = calculate_jenkins_costs(values, builds_per_month)
+            print(f"\n💰 {platform.upper()}:")
+            print("-"*80)
             print(f"  Coût infrastructure: ${cost_data['infrastructure_cost']:.2f}/mois")
             print(f"  Coût maintenance: ${cost_data['maintenance_cost']:.2f}/mois")
             print(f"  Coût total/mois: ${cost_data['total_cost_per_month']:.2f}")
             print(f"  Coût/build: ${cost_data['cost_per_build']:.4f}")
             print(f"  Note: {cost_data['note']}")
+            monthly_costs[platform] = cost_data["total_cost_per_month"]
+            continue
+    
+        result = sweep["platforms"].get(platform)
+        if result is None:
+            print(f"\n⚠️  {platform.upper()}: Pas assez de données")
+            continue
+    
+        total_minutes = result["billed_minutes"] * builds_per_month
+        print(f"\n💰 {platform.upper()} ({result['runs']} exécutions):")
+        print("-"*80)
+        print(f"  Durée moyenne: {result['actual_minutes']:.2f} minutes")
+        print(f"  Minutes facturées/build: {result['billed_minutes']:.2f} "
+              f"(arrondi {values.get('rounding', 'job')}: "
+              f"+{(result['billed_minutes'] / result['actual_minutes'] - 1) * 100:.1f}%)")
+        print(f"  Total minutes facturées/mois: {total_minutes:.2f}")
+        print(f"  Minutes gratuites: {values['free_minutes']}")
+        print(f"  Minutes payantes: {max(0, total_minutes - values['free_minutes']):.2f}")
+        print(f"  Coût/mois: ${result['estimate'][0]:.2f} "
+              f"(IC {BAND[0]}-{BAND[1]}%: ${result['low'][0]:.2f} - ${result['high'][0]:.2f})")
+        print(f"  Coût/build: ${result['estimate'][0] / builds_per_month:.4f}")
+        monthly_costs[platform] = float(result["estimate"][0])
     
     # Comparaison
-    if len(costs) >= 2:
+    if len(monthly_costs) >= 2:
         print("\n" + "="*80)
         print("COMPARAISON DES COÛTS")
         print("="*80)
-        
-        monthly_costs = {}
-        for platform, cost_data in costs.items():
-            if cost_data:
-                if platform in ["github", "gitlab"]:
-                    monthly_costs[platform] = cost_data['cost_per_month']
-                else:
-                    monthly_costs[platform] = cost_data['total_cost_per_month']
-        
-        if monthly_costs:
-            sorted_costs = sorted(monthly_costs.items(), key=lambda x: x[1])
-            print("\n📊 Classement par coût (du moins cher au plus cher):")
-            for i, (platform, cost) in enumerate(sorted_costs, 1):
-                print(f"  {i}. {platform.upper()}: ${cost:.2f}/mois")
+    
+        sorted_costs = sorted(monthly_costs.items(), key=lambda x: x[1])
+        print("\n📊 Classement par coût (du moins cher au plus cher):")
+        for i, (platform, cost) in enumerate(sorted_costs, 1):
+            print(f"  {i}. {platform.upper()}: ${cost:.2f}/mois")
+
+def print_sweep(sweep):
+    """Affiche les courbes de coût aux puissances de 10 et les seuils de rentabilité"""
+    print("\n" + "="*80)
+    print(f"COURBES DE COÛT ({sweep['builds'][0]:,} à {sweep['builds'][-1]:,} builds/mois)")
+    print("="*80)
+    builds = sweep["builds"]
+    shown = np.flatnonzero(np.isin(builds, 10 ** np.arange(10)) | (np.arange(len(builds)) == len(builds) - 1))
+    header = f"{'Builds/mois':>12}" + "".join(f"{platform.upper():>28}" for platform in sweep["platforms"])
+    header += "".join(f"{platform.upper():>12}" for platform in sweep["fixed"])
+    print(header)
+    print("-"*len(header))
+    for k in shown:
+        line = f"{builds[k]:>12,}"
+        for result in sweep["platforms"].values():
+            cell = f"${result['median'][k]:,.2f} [{result['low'][k]:,.0f}-{result['high'][k]:,.0f}]"
+            line += f"{cell:>28}"
+        line += "".join(f"{'$' + format(cost, ',.2f'):>12}" for cost in sweep["fixed"].values())
+        print(line)
+    
+    if not sweep["fixed"]:
+        return
+    reference = next(iter(sweep["fixed"]))
+    print(f"\n⚖️  Seuils de rentabilité face à {reference.upper()} (${sweep['fixed'][reference]:.2f}/mois):")
+    for platform, result in sweep["platforms"].items():
+        threshold = result["break_even"]
+        print(f"  {platform.upper()}: plus cher au-delà de {format_builds(threshold['median'])}", end="")
+        if threshold["median"] is not None:
+            print(f" (IC {BAND[0]}-{BAND[1]}%: {format_builds(threshold['earliest'])} - {format_builds(threshold['latest'])})")
+        else:
+            print()
+
+def plot_cost_curves(sweep, output_file, dpi=DPI):
+    """Courbes de coût mensuel (échelle log) avec bandes de confiance et seuils"""
+    import matplotlib.pyplot as plt
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    builds = sweep["builds"]
+    for platform, result in sweep["platforms"].items():
+        line, = ax.plot(builds, result["median"], label=f"{platform.upper()} (médiane)")
+        ax.fill_between(builds, result["low"], result["high"], color=line.get_color(), alpha=0.2)
+        threshold = result["break_even"] and result["break_even"]["median"]
+        if threshold:
+            ax.axvline(threshold, color=line.get_color(), linestyle=":", linewidth=1)
+    for platform, cost in sweep["fixed"].items():
+        ax.axhline(cost, color="#d33833", linestyle="--", label=f"{platform.upper()} (coût fixe)")
+    ax.set_xscale("log")
+    ax.set_xlabel("Builds par mois")
+    ax.set_ylabel("Coût mensuel ($)")
+    ax.set_title(f"Coût mensuel selon le volume de builds (bande {BAND[0]}-{BAND[1]}%)")
+    ax.legend()
+    ax.grid(True, alpha=0.3, which="both")
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Courbes de coût générées: {output_file}")
+
+def print_usage():
+    print("Usage: python scripts/calculate-costs.py <results_dir> [builds_per_month] [--pricing tarifs.json]")
+    print("       [--samples 2000] [--seed S] [--workers N]")
+    print("       python scripts/calculate-costs.py <results_dir> --sweep [--min-builds 1] [--max-builds 100000]")
+    print("       [--points 121] [--output couts.json|couts.csv] [--no-plots]")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/calculate-costs.py <results_dir> [builds_per_month]")
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        pricing_file, args = pop_option(args, "pricing")
+        n_samples, args = pop_option(args, "samples", DEFAULT_SAMPLES, int)
+        seed, args = pop_option(args, "seed", None, int)
+        sweep_mode, args = pop_flag(args, "sweep")
+        min_builds, args = pop_option(args, "min-builds", DEFAULT_MIN_BUILDS, int)
+        max_builds, args = pop_option(args, "max-builds", DEFAULT_MAX_BUILDS, int)
+        points, args = pop_option(args, "points", DEFAULT_POINTS, int)
+        output_file, args = pop_option(args, "output")
+        no_plots, args = pop_flag(args, "no-plots")
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
     
-    results_dir = sys.argv[1]
-    builds_per_month = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    results_dir = Path(args[0])
+    try:
+        builds_per_month = int(args[1]) if len(args) > 1 else 100
+    except ValueError:
+        exit_with_usage(f"builds_per_month: valeur invalide: {args[1]}", print_usage)
+    if min(builds_per_month, min_builds, points, n_samples) < 1 or max_builds < min_builds:
+        exit_with_usage("builds_per_month, --min-builds, --points et --samples doivent être ≥ 1, "
+                        "--max-builds ≥ --min-builds", print_usage)
+    pricing = load_pricing(pricing_file)
     
-    results = load_results(results_dir)
+    columns = load_columns(results_dir, workers)
     
-    if not results:
+    if not len(columns.durations()):
         print(f"❌ Aucun résultat trouvé dans {results_dir}")
         sys.exit(1)
     
-    generate_cost_report(results, builds_per_month)
+    if not sweep_mode:
+        generate_cost_report(columns, pricing, builds_per_month, n_samples, seed)
+        return
+    
+    sweep = cost_sweep(columns, builds_grid(min_builds, max_builds, points), n_samples, seed, pricing)
+    print_sweep(sweep)
+    if output_file:
+        write_table(sweep_rows(sweep), output_file, COST_FIELDS)
+        print(f"\n✅ Courbes de coût écrites: {output_file}")
+    if not no_plots:
+        output_dir = results_dir / "visualizations"
+        output_dir.mkdir(exist_ok=True)
+        print()
+        plot_cost_curves(sweep, output_dir / "cost_curves.png")
 
 if __name__ == "__main__":
     main()
-
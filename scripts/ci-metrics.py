@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée unique des scripts de métriques CI/CD
+Usage: python scripts/ci-metrics.py <commande> [arguments...]
+
+Liste des commandes: python scripts/ci-metrics.py --help (voir cimetrics/cli.py).
+"""
+
+from cimetrics.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Outils partagés pour l'analyse des métriques CI/CD (scripts/*.py)
+
+Les sous-modules sont importés explicitement (ex: ``from cimetrics.loader
+import load_executions``) pour que chaque script ne charge que ce dont il a
+besoin.
+"""
@@ -0,0 +1,293 @@
+"""
+Agrégats fusionnables pour summary.json
+
+Chaque plateforme conserve, pour la durée totale et pour chaque stage, des
+statistiques suffisantes (count, sum, m2, min, max) et un sketch de
+quantiles. m2, somme des carrés des écarts à la moyenne, est mis à jour par
+Welford (une valeur) et combiné par Chan et al. (lot, fusion): la variance
+reste précise même quand l'écart-type est petit devant la moyenne, là où
+sum_sq - sum²/n s'annule. Ajouter une exécution coûte O(1) et deux résumés
+(shards, machines différentes) se combinent avec merge(). La moyenne,
+l'écart-type et p50/p90/p95/p99 se lisent sans recharger les exécutions
+brutes.
+
+summarize_files() construit un résumé en lisant les fichiers bloc par bloc:
+la mémoire reste bornée par la taille d'un bloc, quelle que soit la
+longueur de l'historique.
+"""
+
+import math
+
+import numpy as np
+
+from .loader import PLATFORMS, STAGES, deduplicate, iter_file_columns
+from .parallel import map_chunks
+from .sketch import REPORTED_PERCENTILES, QuantileSketch
+
+SUMMARY_VERSION = 4
+
+
+class RunningStats:
+    """Statistiques suffisantes d'une série de durées (> 0)"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        """Ajoute une durée en O(1); les valeurs <= 0 ou NaN sont ignorées"""
+        if not value > 0:
+            return
+        delta = value - self.mean
+        self.count += 1
+        self.sum += value
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def update(self, values):
+        """Ajoute un tableau de durées en une passe vectorisée"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[values > 0]
+        if not len(values):
+            return
+        deviations = values - values.mean()
+        self._combine(len(values), float(values.sum()), float(np.dot(deviations, deviations)))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+
+    def _combine(self, count, total, m2):
+        """Ajoute un groupe (count, somme, m2) à la Chan et al."""
+        if self.count and count:
+            delta = total / count - self.mean
+            m2 += delta * delta * self.count * count / (self.count + count)
+        self.count += count
+        self.sum += total
+        self.m2 += m2
+
+    def merge(self, other):
+        self._combine(other.count, other.sum, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0
+
+    @property
+    def variance(self):
+        """Variance d'échantillon (ddof=1)"""
+        if self.count < 2:
+            return 0
+        return max(0.0, self.m2 / (self.count - 1))
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def _clamp(self, value):
+        """Borne une estimation du sketch (à alpha près) par le min et le max exacts"""
+        return value if value is None else min(max(value, self.min), self.max)
+
+    def quantile(self, q):
+        return self._clamp(self.sketch.quantile(q))
+
+    def percentiles(self, percentiles=REPORTED_PERCENTILES):
+        return {name: self._clamp(value) for name, value in self.sketch.percentiles(percentiles).items()}
+
+    def box_stats(self, label=None, whis=1.5):
+        """Statistiques de box plot (Axes.bxp): quantiles du sketch, moyenne, min et max exacts"""
+        stats = self.sketch.box_stats(whis, self.min, self.max)
+        if stats is None:
+            return None
+        stats["mean"] = self.mean
+        if label is not None:
+            stats["label"] = label
+        return stats
+
+    def violin_stats(self):
+        """Statistiques de violon (Axes.violin) depuis la densité du sketch"""
+        stats = self.sketch.density(self.min, self.max)
+        if stats is None:
+            return None
+        stats.update({
+            "mean": self.mean,
+            "median": self.quantile(0.5),
+            "min": self.min,
+            "max": self.max,
+        })
+        return stats
+
+    def to_dict(self):
+        data = {
+            "count": self.count,
+            "sum": self.sum,
+            "m2": self.m2,
+            "min": self.min if self.count else 0,
+            "max": self.max if self.count else 0,
+            "mean": self.mean,
+            "std": self.std,
+        }
+        data.update(self.percentiles())
+        data["sketch"] = self.sketch.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.sum = data["sum"]
+        stats.m2 = data["m2"]
+        if stats.count:
+            stats.min = data["min"]
+            stats.max = data["max"]
+        stats.sketch = QuantileSketch.from_dict(data["sketch"])
+        return stats
+
+
+class PlatformSummary:
+    """Agrégats d'une plateforme: durée totale, stages et compteurs de succès"""
+
+    def __init__(self):
+        self.executions = 0
+        self.successful = 0
+        self.failed = 0
+        self.duration = RunningStats()
+        self.stages = {stage: RunningStats() for stage in STAGES}
+
+    def add_execution(self, total, stage_durations, success):
+        """Ajoute une exécution en O(1) (stage_durations: dict stage → durée)"""
+        self.executions += 1
+        if success is True:
+            self.successful += 1
+        elif success is False:
+            self.failed += 1
+        self.duration.add(total)
+        for stage, value in stage_durations.items():
+            if stage in self.stages:
+                self.stages[stage].add(value)
+
+    def update_columns(self, columns):
+        """Ajoute toutes les exécutions d'un bloc de colonnes (une seule plateforme)"""
+        successful, failed = columns.success_counts()
+        self.executions += len(columns)
+        self.successful += successful
+        self.failed += failed
+        self.duration.update(columns.total)
+        for index, stage in enumerate(STAGES):
+            self.stages[stage].update(columns.stages[:, index])
+
+    def merge(self, other):
+        self.executions += other.executions
+        self.successful += other.successful
+        self.failed += other.failed
+        self.duration.merge(other.duration)
+        for stage in STAGES:
+            self.stages[stage].merge(other.stages[stage])
+        return self
+
+    def to_dict(self):
+        return {
+            # Champs historiques de summary.json
+            "total_executions": self.executions,
+            "successful_executions": self.successful,
+            "failed_executions": self.failed,
+            "avg_duration": self.duration.mean,
+            "min_duration": self.duration.min if self.duration.count else 0,
+            "max_duration": self.duration.max if self.duration.count else 0,
+            # Statistiques fusionnables
+            "duration": self.duration.to_dict(),
+            "stages": {
+                stage: stats.to_dict() for stage, stats in self.stages.items() if stats.count
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls()
+        summary.executions = data["total_executions"]
+        summary.successful = data["successful_executions"]
+        summary.failed = data["failed_executions"]
+        summary.duration = RunningStats.from_dict(data["duration"])
+        for stage, stats in data.get("stages", {}).items():
+            if stage in summary.stages:
+                summary.stages[stage] = RunningStats.from_dict(stats)
+        return summary
+
+
+class Summary:
+    """Résumé fusionnable de toutes les plateformes (contenu de summary.json)"""
+
+    def __init__(self):
+        self.platforms = {}
+
+    def platform(self, platform):
+        if platform not in self.platforms:
+            self.platforms[platform] = PlatformSummary()
+        return self.platforms[platform]
+
+    def update_columns(self, columns):
+        """Ajoute un bloc d'exécutions (toutes plateformes) en une passe par plateforme"""
+        for platform in columns.platforms():
+            self.platform(platform).update_columns(columns.for_platform(platform))
+        return self
+
+    def merge(self, other):
+        for platform, platform_summary in other.platforms.items():
+            self.platform(platform).merge(platform_summary)
+        return self
+
+    def to_dict(self):
+        ordered = [platform for platform in PLATFORMS if platform in self.platforms]
+        return {
+            "version": SUMMARY_VERSION,
+            "total_platforms": len(ordered),
+            "platforms": {platform: self.platforms[platform].to_dict() for platform in ordered},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != SUMMARY_VERSION:
+            raise ValueError(f"Version de résumé non supportée: {data.get('version')}")
+        summary = cls()
+        for platform, platform_data in data.get("platforms", {}).items():
+            summary.platforms[platform] = PlatformSummary.from_dict(platform_data)
+        return summary
+
+
+def _summarize_chunk(paths):
+    """Résumé d'un lot de fichiers lus bloc par bloc (exécuté dans un worker)"""
+    summary = Summary()
+    for path in paths:
+        for columns in iter_file_columns(path):
+            summary.update_columns(columns)
+    return summary
+
+
+def summarize_files(paths, workers=1, unique=False):
+    """Résumé fusionnable de fichiers de résultats, sans charger toutes les durées
+
+    Sans unique, les exécutions ne sont pas dédupliquées: à utiliser sur les
+    magasins consolidés ou sur des fichiers bruts sans doublons. Avec
+    unique, chaque platform:execution_id n'est compté qu'une fois; les
+    fichiers sont alors lus à la suite (les doublons peuvent être dans des
+    fichiers différents) et seules les clés restent en mémoire.
+    """
+    summary = Summary()
+    if unique:
+        seen = set()
+        for path in paths:
+            for columns in iter_file_columns(path):
+                summary.update_columns(deduplicate(columns, seen))
+        return summary
+    for chunk_summary in map_chunks(_summarize_chunk, list(paths), workers):
+        summary.merge(chunk_summary)
+    return summary
@@ -0,0 +1,174 @@
+"""
+Client HTTP/1.1 asyncio avec pool de connexions (bibliothèque standard)
+
+Les connexions sont gardées ouvertes (keep-alive) et réutilisées par hôte:
+au plus max_per_host connexions simultanées vers un même hôte, les
+requêtes suivantes attendent qu'une connexion se libère. Une connexion
+réutilisée que le serveur a fermée entre deux requêtes est remplacée et la
+requête renvoyée une fois. Corps Content-Length, chunked ou jusqu'à la
+fermeture; réponses gzip décompressées.
+
+Utilisation:
+    pool = ConnectionPool(max_per_host=8)
+    response = await pool.request("GET", "https://api.github.com/...", {"Accept": "application/json"})
+    data = response.json()
+    await pool.close()
+"""
+
+import asyncio
+import gzip
+import json
+import ssl
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30.0
+MAX_HEADER_LINE = 65536
+
+
+class Response:
+    """Réponse HTTP: status, en-têtes (noms en minuscules) et corps"""
+
+    def __init__(self, status, headers, body, url):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self):
+        self.writer.close()
+
+
+class _HostPool:
+    def __init__(self, size):
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+
+
+class ConnectionPool:
+    """Pool de connexions HTTP/1.1 keep-alive par hôte"""
+
+    def __init__(self, max_per_host=8, timeout=DEFAULT_TIMEOUT, ssl_context=None):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._hosts = {}
+        # Compteurs: requêtes envoyées et connexions ouvertes
+        self.requests = 0
+        self.connections = 0
+
+    def _host(self, key):
+        if key not in self._hosts:
+            self._hosts[key] = _HostPool(self.max_per_host)
+        return self._hosts[key]
+
+    async def _connect(self, scheme, host, port):
+        context = None
+        if scheme == "https":
+            context = self.ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=context, limit=MAX_HEADER_LINE)
+        self.connections += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method, url, headers=None, body=None):
+        """Envoie une requête; retourne une Response (toute réponse HTTP, y compris 4xx/5xx)"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        head = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", "Accept-Encoding: gzip"]
+        for name, value in (headers or {}).items():
+            head.append(f"{name}: {value}")
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            body = body or b""
+            head.append(f"Content-Length: {len(body)}")
+        data = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        pool = self._host(key)
+        async with pool.slots:
+            while True:
+                connection = pool.idle.pop() if pool.idle else await asyncio.wait_for(
+                    self._connect(*key), self.timeout)
+                try:
+                    self.requests += 1
+                    response, keep_alive = await asyncio.wait_for(
+                        self._exchange(connection, data, method, url), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    connection.close()
+                    # Connexion keep-alive fermée par le serveur entre deux requêtes
+                    if connection.reused and not getattr(e, "partial", b""):
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                if keep_alive:
+                    connection.reused = True
+                    pool.idle.append(connection)
+                else:
+                    connection.close()
+                return response
+
+    async def _exchange(self, connection, data, method, url):
+        connection.writer.write(data)
+        await connection.writer.drain()
+        reader = connection.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connexion fermée par le serveur")
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n"):
+                break
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        status = int(status)
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Fin du corps (en-têtes de fin ignorés)
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return Response(status, headers, body, url), keep_alive
+
+    async def close(self):
+        connections = [connection for pool in self._hosts.values() for connection in pool.idle]
+        for pool in self._hosts.values():
+            pool.idle.clear()
+        for connection in connections:
+            connection.close()
+        await asyncio.gather(*(connection.writer.wait_closed() for connection in connections),
+                             return_exceptions=True)
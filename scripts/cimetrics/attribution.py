@@ -0,0 +1,187 @@
+"""
+Attribution de la durée des pipelines aux stages (goulots d'étranglement)
+
+Les stages d'un pipeline s'exécutent en partie en parallèle: la somme des
+stages dépasse la durée totale. Pour chaque exécution valide, les durées
+mesurées sont ordonnancées sur le graphe de dépendances de la plateforme
+(simulation.PIPELINES, runners illimités) et seul le chemin critique compte:
+un stage du chemin contribue sa durée, un stage hors du chemin (attendu
+par un stage parallèle plus long) contribue 0. Le reste OVERHEAD est
+total - durée du chemin critique (attente, checkout, démarrage des
+runners), ramené à 0 quand le chemin est plus long que le total mesuré
+(horloges des runners); la durée décomposée est alors la somme des
+composantes. Un stage absent d'une exécution compte pour 0. Trois
+attributions en découlent, chacune sommant à 1 sur les composantes d'une
+plateforme:
+  - mean_share: part de la durée moyenne, E[stage] / E[total]
+  - variance_share: contribution à la variance, Cov(stage, total) / Var(total)
+  - tail_share: part de l'excès des exécutions lentes (total >= p90),
+    (E[stage | queue] - E[stage]) / (E[total | queue] - E[total])
+score est la moyenne des trois parts: il classe les stages, cibles
+d'optimisation (rank 1 = stage qui pèse le plus à la fois sur la durée
+typique, sur sa variabilité et sur les exécutions lentes); OVERHEAD est
+rapporté sans rang. count est le nombre d'exécutions où le stage est sur
+le chemin critique. Avec moins de MIN_RELIABLE_RUNS
+exécutions, les parts (surtout variance et queue) ne sont pas
+significatives: les lignes de la plateforme sont marquées low_n.
+
+Toutes les exécutions d'une plateforme sont ordonnancées ensemble
+(simulation.schedule) et les parts calculées sur le cube (plateformes,
+exécutions, composantes) de stats.platform_cube, sans boucle Python par
+exécution.
+"""
+
+import warnings
+
+import numpy as np
+
+from .loader import STAGE_INDEX, STAGES
+from .simulation import PIPELINES, critical_paths, schedule, topological_order
+from .stats import _scalar, platform_cube
+
+OVERHEAD = "overhead"
+COMPONENTS = STAGES + (OVERHEAD,)
+
+# Seuil des exécutions lentes (percentile de la durée totale)
+TAIL_PERCENTILE = 90
+
+# En dessous, les parts sont rapportées mais marquées low_n
+MIN_RELIABLE_RUNS = 10
+
+ATTRIBUTION_FIELDS = (
+    "platform",
+    "stage",
+    "rank",
+    "count",
+    "runs",
+    "tail_runs",
+    "tail_threshold",
+    "mean",
+    "mean_share",
+    "variance_share",
+    "tail_mean",
+    "tail_excess",
+    "tail_share",
+    "score",
+    "low_n",
+)
+
+
+def pipeline_dag(platform):
+    """Graphe des stages d'une plateforme; stages séquentiels si elle n'est pas dans PIPELINES"""
+    if platform in PIPELINES:
+        return PIPELINES[platform]
+    return {stage: list(STAGES[index - 1:index]) for index, stage in enumerate(STAGES)}
+
+
+def critical_stages(dag, durations):
+    """Stages du chemin critique de chaque exécution: (masque (N, len(STAGES)), durée du chemin (N,))"""
+    finish, binding = schedule(dag, durations)
+    masks = critical_paths(finish, binding)
+    on_path = np.zeros(durations.shape, dtype=bool)
+    for k, stage in enumerate(topological_order(dag)):
+        on_path[:, STAGE_INDEX[stage]] = masks >> k & 1
+    return on_path, finish.max(axis=1) if finish.size else np.zeros(len(durations))
+
+
+def component_cube(columns):
+    """Décompose les durées totales: retourne (plateformes, total (P, N), composantes (P, N, C))
+
+    Les composantes sont les stages du chemin critique et OVERHEAD (voir le
+    docstring du module); total est leur somme. Les exécutions sans durée
+    totale ou sans aucun stage mesuré (et le remplissage du cube) valent NaN.
+    """
+    platforms, cube = platform_cube(columns)
+    total = cube[:, :, 0]
+    stages = cube[:, :, 1:]
+    valid = ~np.isnan(total) & ~np.isnan(stages).all(axis=2)
+    durations = np.nan_to_num(stages)
+    overhead = np.empty(total.shape)
+    for p, platform in enumerate(platforms):
+        on_path, length = critical_stages(pipeline_dag(platform), durations[p])
+        durations[p] = np.where(on_path, durations[p], 0.0)
+        overhead[p] = np.maximum(np.nan_to_num(total[p]) - length, 0.0)
+    components = np.concatenate([durations, overhead[:, :, None]], axis=2)
+    components = np.where(valid[:, :, None], components, np.nan)
+    return platforms, components.sum(axis=2), components
+
+
+def attribute(total, components, tail_percentile=TAIL_PERCENTILE):
+    """Parts de chaque composante pour chaque plateforme
+
+    total: (P, N), components: (P, N, C), NaN pour les exécutions ignorées.
+    Retourne un dict nom → tableau (P, C), ou (P,) pour les grandeurs de la
+    plateforme: runs, tail_runs, tail_threshold.
+    """
+    with warnings.catch_warnings():
+        # Plateformes sans exécution valide ou de variance nulle: NaN attendus
+        warnings.simplefilter("ignore", RuntimeWarning)
+        valid = ~np.isnan(total)
+        runs = valid.sum(axis=1)
+        mean_total = np.nanmean(total, axis=1)
+        mean = np.nanmean(components, axis=1)
+        centered_total = total - mean_total[:, None]
+        variance = np.nansum(centered_total ** 2, axis=1) / (runs - 1)
+        covariance = np.nansum((components - mean[:, None, :]) * centered_total[:, :, None], axis=1) / (runs - 1)[:, None]
+
+        threshold = np.nanpercentile(total, tail_percentile, axis=1)
+        tail = valid & (total >= threshold[:, None])
+        tail_runs = tail.sum(axis=1)
+        tail_mean = np.nanmean(np.where(tail[:, :, None], components, np.nan), axis=1)
+        tail_total = np.nanmean(np.where(tail, total, np.nan), axis=1)
+        tail_excess = tail_mean - mean
+
+        mean_share = mean / mean_total[:, None]
+        variance_share = np.where(variance[:, None] > 0, covariance / variance[:, None], np.nan)
+        excess_total = (tail_total - mean_total)[:, None]
+        tail_share = np.where(excess_total > 0, tail_excess / excess_total, np.nan)
+        # Parts indisponibles (variance nulle, pas de queue) ignorées dans le score
+        score = np.nanmean(np.stack([mean_share, variance_share, tail_share]), axis=0)
+
+    # Exécutions où la composante est non nulle (stage sur le chemin critique)
+    count = np.sum(np.nan_to_num(components) != 0, axis=1)
+    return {
+        "runs": runs,
+        "tail_runs": tail_runs,
+        "tail_threshold": threshold,
+        "count": count,
+        "mean": mean,
+        "mean_share": mean_share,
+        "variance_share": variance_share,
+        "tail_mean": tail_mean,
+        "tail_excess": tail_excess,
+        "tail_share": tail_share,
+        "score": score,
+    }
+
+
+def attribution_table(columns, tail_percentile=TAIL_PERCENTILE, min_runs=2):
+    """Table tidy des attributions, une ligne par plateforme × composante
+
+    Les lignes d'une plateforme sont triées par rang (score décroissant des
+    stages), puis OVERHEAD sans rang (None); les plateformes avec moins de
+    min_runs exécutions valides sont omises, comme les stages jamais sur le
+    chemin critique, et celles avec moins de MIN_RELIABLE_RUNS sont
+    marquées low_n.
+    """
+    platforms, total, components = component_cube(columns)
+    result = attribute(total, components, tail_percentile)
+    rows = []
+    for p, platform in enumerate(platforms):
+        if result["runs"][p] < min_runs:
+            continue
+        score = np.nan_to_num(result["score"][p], nan=-np.inf)
+        overhead = COMPONENTS.index(OVERHEAD)
+        ranked = [c for c in np.argsort(-score, kind="stable") if result["count"][p, c] and c != overhead]
+        ranks = list(range(1, len(ranked) + 1))
+        if result["count"][p, overhead]:
+            ranked.append(overhead)
+            ranks.append(None)
+        for rank, c in zip(ranks, ranked):
+            row = {"platform": platform, "stage": COMPONENTS[c], "rank": rank}
+            for name in ATTRIBUTION_FIELDS[3:-1]:
+                values = result[name]
+                row[name] = _scalar(values[p] if values.ndim == 1 else values[p, c])
+            row["low_n"] = bool(result["runs"][p] < MIN_RELIABLE_RUNS)
+            rows.append(row)
+    return rows
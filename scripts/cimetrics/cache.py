@@ -0,0 +1,208 @@
+"""
+Efficacité des caches de dépendances (cache.hit, cache.size_mb)
+
+Pour chaque plateforme et chaque cellule (durée totale et stages), les
+exécutions dont le champ cache.hit est connu sont séparées en hits et
+misses; le gain par hit est la différence des durées moyennes
+(miss - hit). Les intervalles de confiance viennent d'un bootstrap des
+exécutions de la plateforme (hits et misses rééchantillonnés ensemble, ce
+qui inclut l'incertitude sur le taux de hit), tiré par lots de matrices
+NumPy comme dans resampling.py.
+
+Modèle du coût du cache, avec un débit de restauration/sauvegarde
+throughput (Mo/s): un hit paie la restauration, un miss la sauvegarde,
+toutes deux size_mb / throughput secondes. Les exécutions mesurées
+incluant déjà ces transferts, le gain net moyen par build face à un
+pipeline sans cache vaut:
+    net = taux_hit × gain_par_hit - size_mb / throughput
+et le cache est rentable tant que sa taille reste sous
+    break_even_mb = taux_hit × gain_par_hit × throughput
+Les minutes économisées par mois sont valorisées avec PRICING (costs.py).
+"""
+
+import numpy as np
+
+from .costs import PRICING, billed_minutes, minutes_cost
+from .loader import UNKNOWN
+from .resampling import MAX_BATCH_ELEMENTS
+from .stats import CELLS, TOTAL
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_THROUGHPUT = 50.0
+DEFAULT_BUILDS_PER_MONTH = 100
+CONFIDENCE = 0.95
+
+CACHE_FIELDS = (
+    "platform",
+    "stage",
+    "hits",
+    "misses",
+    "hit_mean",
+    "miss_mean",
+    "hit_median",
+    "miss_median",
+    "saving",
+    "saving_lower",
+    "saving_upper",
+)
+
+CACHE_SUMMARY_FIELDS = (
+    "platform",
+    "runs",
+    "hit_rate",
+    "cache_size_mb",
+    "artifact_size_mb",
+    "transfer_seconds",
+    "saving_per_hit",
+    "net_saving",
+    "net_lower",
+    "net_upper",
+    "break_even_mb",
+    "break_even_lower",
+    "break_even_upper",
+    "minutes_per_month",
+    "minutes_lower",
+    "minutes_upper",
+    "cost_saved",
+)
+
+
+def cell_values(columns, cell):
+    return columns.total if cell == TOTAL else columns.stage(cell)
+
+
+def bootstrap_cache_effect(values, hit, n_resamples, rng):
+    """Tirages bootstrap du taux de hit et du gain par hit (miss - hit)
+
+    Retourne (taux, gain), deux tableaux de n_resamples valeurs; NaN pour
+    les tirages sans hit ou sans miss.
+    """
+    rates = []
+    savings = []
+    batch = max(1, MAX_BATCH_ELEMENTS // len(values))
+    for start in range(0, n_resamples, batch):
+        indices = rng.integers(0, len(values), (min(batch, n_resamples - start), len(values)))
+        sample_hit = hit[indices]
+        sample_values = values[indices]
+        hits = sample_hit.sum(axis=1)
+        misses = len(values) - hits
+        hit_sum = np.where(sample_hit, sample_values, 0).sum(axis=1)
+        miss_sum = sample_values.sum(axis=1) - hit_sum
+        with np.errstate(invalid="ignore", divide="ignore"):
+            savings.append(miss_sum / misses - hit_sum / hits)
+        rates.append(hits / len(values))
+    return np.concatenate(rates), np.concatenate(savings)
+
+
+def interval(samples, confidence=CONFIDENCE):
+    """IC percentile (None, None) si aucun tirage n'est défini"""
+    samples = samples[~np.isnan(samples)]
+    if not len(samples):
+        return None, None
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(samples, [alpha, 1 - alpha])
+    return float(lower), float(upper)
+
+
+def cache_table(columns, n_resamples=DEFAULT_RESAMPLES, seed=None, min_runs=2):
+    """Durées hit/miss et gain par hit, pour chaque cellule plateforme × stage
+
+    Retourne (lignes, tirages) où tirages[plateforme] = (taux, gain) pour
+    la durée totale, réutilisés par cache_summary.
+    """
+    rows = []
+    draws = {}
+    platforms = columns.platforms()
+    seeds = np.random.SeedSequence(seed).spawn(len(platforms))
+    for platform, platform_seed in zip(platforms, seeds):
+        rng = np.random.default_rng(platform_seed)
+        known = columns.platform_mask(platform) & (columns.cache_hit != UNKNOWN)
+        for cell in CELLS:
+            values = cell_values(columns, cell)
+            mask = known & (values > 0)
+            values = values[mask]
+            hit = columns.cache_hit[mask] == 1
+            hits = int(np.count_nonzero(hit))
+            misses = len(values) - hits
+            if hits < min_runs and misses < min_runs:
+                continue
+            row = {
+                "platform": platform,
+                "stage": cell,
+                "hits": hits,
+                "misses": misses,
+                "hit_mean": float(values[hit].mean()) if hits else None,
+                "miss_mean": float(values[~hit].mean()) if misses else None,
+                "hit_median": float(np.median(values[hit])) if hits else None,
+                "miss_median": float(np.median(values[~hit])) if misses else None,
+                "saving": None,
+                "saving_lower": None,
+                "saving_upper": None,
+            }
+            if hits >= min_runs and misses >= min_runs:
+                rates, savings = bootstrap_cache_effect(values, hit, n_resamples, rng)
+                row["saving"] = row["miss_mean"] - row["hit_mean"]
+                row["saving_lower"], row["saving_upper"] = interval(savings)
+                if cell == TOTAL:
+                    draws[platform] = (rates, savings)
+            rows.append(row)
+    return rows, draws
+
+
+def cache_model(hit_rate, saving, cache_size_mb, throughput=DEFAULT_THROUGHPUT):
+    """Temps de transfert, gain net par build et taille de rentabilité (scalaires ou tableaux)"""
+    transfer = cache_size_mb / throughput
+    return transfer, hit_rate * saving - transfer, hit_rate * saving * throughput
+
+
+def cache_summary(columns, table, draws, throughput=DEFAULT_THROUGHPUT,
+                  builds_per_month=DEFAULT_BUILDS_PER_MONTH, pricing=None):
+    """Gain net, taille de rentabilité et économies mensuelles par plateforme"""
+    pricing = pricing or PRICING
+    rows = []
+    for row in table:
+        platform = row["platform"]
+        if row["stage"] != TOTAL or platform not in draws:
+            continue
+        mask = columns.platform_mask(platform) & (columns.cache_hit != UNKNOWN) & (columns.total > 0)
+        runs = row["hits"] + row["misses"]
+        hit_rate = row["hits"] / runs
+        sizes = columns.cache_size_mb[mask]
+        sizes = sizes[sizes >= 0]
+        size = float(np.median(sizes)) if len(sizes) else 0.0
+        artifacts = columns.artifact_size_mb[columns.platform_mask(platform)]
+        artifacts = artifacts[artifacts >= 0]
+        transfer, net, break_even = cache_model(hit_rate, row["saving"], size, throughput)
+        rates, savings = draws[platform]
+        _, net_draws, break_even_draws = cache_model(rates, savings, size, throughput)
+        net_lower, net_upper = interval(net_draws)
+        break_even_lower, break_even_upper = interval(break_even_draws)
+        minutes = builds_per_month / 60
+        summary = {
+            "platform": platform,
+            "runs": runs,
+            "hit_rate": hit_rate,
+            "cache_size_mb": size,
+            "artifact_size_mb": float(np.median(artifacts)) if len(artifacts) else None,
+            "transfer_seconds": transfer,
+            "saving_per_hit": row["saving"],
+            "net_saving": net,
+            "net_lower": net_lower,
+            "net_upper": net_upper,
+            "break_even_mb": break_even,
+            "break_even_lower": break_even_lower,
+            "break_even_upper": break_even_upper,
+            "minutes_per_month": net * minutes,
+            "minutes_lower": None if net_lower is None else net_lower * minutes,
+            "minutes_upper": None if net_upper is None else net_upper * minutes,
+            "cost_saved": None,
+        }
+        values = pricing.get(platform, {})
+        if values.get("model") == "per_minute":
+            # Même volume de builds sans cache: minutes actuelles + gain net
+            current = billed_minutes(columns, platform, values.get("rounding", "job")).mean() * builds_per_month
+            summary["cost_saved"] = float(
+                minutes_cost(current + summary["minutes_per_month"], values) - minutes_cost(current, values)
+            )
+        rows.append(summary)
+    return rows
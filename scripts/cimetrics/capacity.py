@@ -0,0 +1,175 @@
+"""
+Dimensionnement des executors Jenkins (simulation à événements discrets)
+
+Le Jenkinsfile déclare `agent any` au niveau du pipeline: un build occupe
+un executor du début à la fin, stages parallèles compris. Le temps de
+service d'un build est donc la durée totale d'une exécution mesurée, tirée
+avec remise.
+
+Arrivées des builds:
+  - synthétiques: processus de Poisson de rate_per_hour builds/heure en
+    moyenne, modulé par le profil horaire observé (part des exécutions
+    mesurées à chaque heure UTC de la journée), généré par amincissement
+  - rejouées: horodatages des exécutions mesurées, éventuellement
+    compressés d'un facteur scale pour simuler plus de builds
+
+File FIFO servie par executors executors identiques: les fins de build
+sont des événements rangés dans un tas (heapq); chaque arrivée prend
+l'executor qui se libère le premier. Les mêmes arrivées et durées servent
+pour tous les nombres d'executors comparés. Bibliothèque standard
+uniquement: un mois de builds se simule en quelques millisecondes par
+configuration.
+"""
+
+import heapq
+import math
+import random
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+DAYS_PER_MONTH = 30
+
+DEFAULT_DAYS = DAYS_PER_MONTH
+DEFAULT_MAX_EXECUTORS = 8
+DEFAULT_TARGET_WAIT = 60.0
+
+# En dessous, le profil horaire observé n'est pas fiable (arrivées
+# uniformes), ni le rythme observé (--rate requis) ou les arrivées rejouées
+MIN_PROFILE_RUNS = 48
+
+# Percentile de l'attente utilisé pour la recommandation
+TARGET_PERCENTILE = 95
+
+CAPACITY_FIELDS = (
+    "executors",
+    "agents",
+    "builds",
+    "wait_mean",
+    "wait_p50",
+    "wait_p90",
+    "wait_p95",
+    "wait_p99",
+    "waiting_share",
+    "utilization",
+    "cost_per_month",
+    "cost_per_build",
+)
+
+
+def percentile(sorted_values, q):
+    """Percentile q (0-100) d'une liste triée, interpolation linéaire"""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def hourly_profile(timestamps, min_runs=MIN_PROFILE_RUNS):
+    """Poids des 24 heures UTC (moyenne 1) d'après les horodatages observés
+
+    Profil uniforme avec moins de min_runs exécutions ou moins d'un jour
+    d'historique.
+    """
+    if len(timestamps) < min_runs or max(timestamps) - min(timestamps) < SECONDS_PER_DAY:
+        return [1.0] * 24
+    counts = [0] * 24
+    for timestamp in timestamps:
+        counts[int(timestamp // SECONDS_PER_HOUR) % 24] += 1
+    return [24 * count / len(timestamps) for count in counts]
+
+
+def synthesize_arrivals(rate_per_hour, days=DEFAULT_DAYS, profile=None, rng=None):
+    """Instants d'arrivée (secondes depuis minuit UTC du premier jour), triés"""
+    rng = rng or random.Random()
+    profile = profile or [1.0] * 24
+    peak = max(profile)
+    if rate_per_hour <= 0 or peak <= 0:
+        return []
+    peak_rate = rate_per_hour * peak / SECONDS_PER_HOUR
+    horizon = days * SECONDS_PER_DAY
+    arrivals = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(peak_rate)
+        if t >= horizon:
+            return arrivals
+        if rng.random() * peak < profile[int(t // SECONDS_PER_HOUR) % 24]:
+            arrivals.append(t)
+
+
+def replay_arrivals(timestamps, scale=1.0):
+    """Horodatages observés → instants relatifs au premier, compressés d'un facteur scale"""
+    ordered = sorted(timestamps)
+    if not ordered:
+        return []
+    return [(timestamp - ordered[0]) / scale for timestamp in ordered]
+
+
+def sample_services(durations, n, rng=None):
+    """n durées de build tirées avec remise parmi les durées mesurées"""
+    rng = rng or random.Random()
+    return rng.choices(durations, k=n)
+
+
+def simulate_queue(arrivals, services, executors):
+    """Simule la file FIFO; retourne (attentes, temps occupé total, fin du dernier build)"""
+    free_at = [0.0] * executors
+    waits = []
+    busy = 0.0
+    end = 0.0
+    for arrival, service in zip(arrivals, services):
+        available = heapq.heappop(free_at)
+        start = max(arrival, available)
+        finish = start + service
+        heapq.heappush(free_at, finish)
+        waits.append(start - arrival)
+        busy += service
+        end = max(end, finish)
+    return waits, busy, end
+
+
+def monthly_cost(executors, pricing):
+    """Coût mensuel Jenkins: un agent par executors_per_agent executors, plus la maintenance"""
+    agents = math.ceil(executors / pricing.get("executors_per_agent", 1))
+    cost = agents * pricing["infrastructure_cost_per_month"]
+    return agents, cost + pricing["maintenance_hours_per_month"] * pricing["hourly_rate"]
+
+
+def capacity_table(arrivals, services, executor_counts, pricing, period):
+    """Attentes, utilisation et coût pour chaque nombre d'executors
+
+    period: durée couverte par les arrivées (secondes), pour ramener le
+    nombre de builds et le coût à un mois.
+    """
+    rows = []
+    builds_per_month = len(arrivals) * DAYS_PER_MONTH * SECONDS_PER_DAY / period if period > 0 else 0
+    for executors in executor_counts:
+        waits, busy, end = simulate_queue(arrivals, services, executors)
+        waits.sort()
+        agents, cost = monthly_cost(executors, pricing)
+        horizon = max(period, end)
+        rows.append({
+            "executors": executors,
+            "agents": agents,
+            "builds": len(waits),
+            "wait_mean": sum(waits) / len(waits) if waits else math.nan,
+            "wait_p50": percentile(waits, 50),
+            "wait_p90": percentile(waits, 90),
+            "wait_p95": percentile(waits, 95),
+            "wait_p99": percentile(waits, 99),
+            "waiting_share": sum(1 for wait in waits if wait > 0) / len(waits) if waits else math.nan,
+            "utilization": busy / (executors * horizon) if horizon > 0 else math.nan,
+            "cost_per_month": cost,
+            "cost_per_build": cost / builds_per_month if builds_per_month else math.nan,
+        })
+    return rows
+
+
+def recommend(rows, target_wait=DEFAULT_TARGET_WAIT, q=TARGET_PERCENTILE):
+    """Plus petite configuration dont l'attente au percentile q est au plus target_wait"""
+    for row in rows:
+        if row[f"wait_p{q}"] <= target_wait:
+            return row
+    return None
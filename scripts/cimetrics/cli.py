@@ -0,0 +1,92 @@
+"""
+Point d'entrée unique des scripts de métriques CI/CD
+
+Usage: python scripts/ci-metrics.py <commande> [arguments...]
+       python -m cimetrics <commande> [arguments...]   (depuis scripts/)
+
+Chaque commande exécute le script correspondant de scripts/ avec les mêmes
+arguments. Seul le script de la commande est chargé: numpy, scipy,
+matplotlib et seaborn ne sont importés que par les commandes qui en ont
+besoin (collect, validate et import n'importent aucune bibliothèque
+scientifique, costs seulement numpy). L'aide (--help, <commande> --help)
+est lue dans la docstring du script sans l'importer. Le backend matplotlib
+non interactif Agg est choisi avant tout import de matplotlib.
+"""
+
+import ast
+import os
+import runpy
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# Commande → (script, description)
+COMMANDS = {
+    "collect": ("collect-runs.py", "Collecter les exécutions depuis les API des plateformes"),
+    "import": ("import-ci.py", "Importer les exports d'API GitHub, GitLab et Jenkins"),
+    "validate": ("validate-data.py", "Valider les fichiers de résultats"),
+    "consolidate": ("consolidate-data.py", "Consolider les exécutions et le résumé"),
+    "analyze": ("analyze-results.py", "Comparer les durées totales des plateformes"),
+    "stats": ("advanced-statistics.py", "Statistiques avancées par plateforme et stage"),
+    "costs": ("calculate-costs.py", "Estimer les coûts mensuels"),
+    "viz": ("generate-visualizations.py", "Générer les graphiques"),
+    "simulate": ("simulate-pipeline.py", "Simuler la durée des pipelines par scénario"),
+    "bottlenecks": ("bottleneck-report.py", "Attribuer la durée et sa variance aux stages"),
+    "trends": ("trend-analysis.py", "Détecter les tendances et ruptures dans le temps"),
+    "capacity": ("jenkins-capacity.py", "Dimensionner les executors Jenkins (attente en file)"),
+    "cache": ("cache-analysis.py", "Mesurer le gain et la rentabilité des caches"),
+    "tests": ("test-timings.py", "Historique des durées par test (rapports JUnit)"),
+    "shards": ("shard-planner.py", "Répartir les fichiers de test en shards équilibrés"),
+    "mock-ci": ("mock-ci-server.py", "Serveur CI simulé et débit du collecteur"),
+}
+
+HELP_FLAGS = ("-h", "--help")
+
+
+def script_path(command):
+    return SCRIPTS_DIR / COMMANDS[command][0]
+
+
+def script_help(command):
+    """Docstring du script d'une commande, lue sans exécuter le script"""
+    source = script_path(command).read_text(encoding="utf-8")
+    return (ast.get_docstring(ast.parse(source)) or COMMANDS[command][1]).strip()
+
+
+def usage():
+    lines = ["Usage: python scripts/ci-metrics.py <commande> [arguments...]", "", "Commandes:"]
+    for command, (_, description) in COMMANDS.items():
+        lines.append(f"  {command:<12} {description}")
+    lines.append("")
+    lines.append("Aide d'une commande: python scripts/ci-metrics.py <commande> --help")
+    return "\n".join(lines)
+
+
+def run(command, args):
+    """Exécute le script d'une commande comme s'il était lancé directement"""
+    path = script_path(command)
+    # Backend non interactif: les scripts ne font que sauvegarder des figures
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    sys.argv = [str(path)] + list(args)
+    runpy.run_path(str(path), run_name="__main__")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in HELP_FLAGS:
+        print(usage())
+        sys.exit(0 if argv else 1)
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"❌ Commande inconnue: {command}")
+        print()
+        print(usage())
+        sys.exit(1)
+    if any(arg in HELP_FLAGS for arg in args):
+        print(script_help(command))
+        sys.exit(0)
+    run(command, args)
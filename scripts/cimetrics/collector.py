@@ -0,0 +1,444 @@
+"""
+Collecte asynchrone des exécutions depuis les API GitHub, GitLab et Jenkins
+
+Remplace la mesure au chronomètre de measure-performance.sh: les durées
+viennent exclusivement des horodatages rapportés par la plateforme (runs,
+jobs, stages), normalisés par importers.py. Un run qui n'est pas terminé
+est interrogé jusqu'à sa fin (wait) ou ignoré, jamais enregistré avec une
+durée estimée.
+
+APIClient partage entre toutes les tâches:
+  - un pool de connexions keep-alive (asynchttp.py) et un sémaphore qui
+    borne le nombre de requêtes en vol (concurrency)
+  - les requêtes conditionnelles: l'ETag de chaque URL est conservé et
+    renvoyé (If-None-Match); une réponse 304 réutilise le corps en cache
+    (chez GitHub, elle ne compte pas dans le quota)
+  - la limite de débit: sur 429, ou 403 avec X-RateLimit-Remaining à 0,
+    toutes les tâches attendent Retry-After ou X-RateLimit-Reset
+  - les erreurs transitoires (5xx, connexion): nouvelles tentatives avec
+    un délai exponentiel et une part aléatoire (backoff * 2^n)
+
+Sources (une par plateforme): liste des derniers runs, détail d'un run,
+documents à normaliser (run et pages de jobs) et déclenchement d'un run.
+"""
+
+import asyncio
+import base64
+import json
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote, urlencode, urljoin
+
+from .asynchttp import ConnectionPool
+from .importers import GITLAB_FINISHED, JENKINS_UNFINISHED, CIImporter
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_LIMIT = 100
+DEFAULT_POLL = 15.0
+DEFAULT_TIMEOUT = 7200.0
+MAX_RETRIES = 5
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+PER_PAGE = 100
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+DEFAULT_API_URLS = {
+    "github": "https://api.github.com",
+    "gitlab": "https://gitlab.com/api/v4",
+}
+
+
+class APIError(Exception):
+    """Réponse d'erreur définitive (ou tentatives épuisées)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def rate_limit_delay(response, now=None):
+    """Attente demandée par une réponse de limite de débit, None si ce n'en est pas une"""
+    headers = response.headers
+    limited = response.status == 429 or (
+        response.status == 403 and (headers.get("x-ratelimit-remaining") == "0" or "retry-after" in headers))
+    if not limited:
+        return None
+    now = time.time() if now is None else now
+    if "retry-after" in headers:
+        value = headers["retry-after"]
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - now, 0.0)
+            except (TypeError, ValueError):
+                pass
+    if "x-ratelimit-reset" in headers:
+        try:
+            return max(float(headers["x-ratelimit-reset"]) - now, 0.0)
+        except ValueError:
+            pass
+    return 0.0
+
+
+class APIClient:
+    """Requêtes JSON avec pool de connexions, ETag, limite de débit et reprises"""
+
+    def __init__(self, headers=None, concurrency=DEFAULT_CONCURRENCY, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF, max_backoff=MAX_BACKOFF, etags=True, pool=None, seed=None):
+        self.headers = dict(headers or {})
+        self.pool = pool or ConnectionPool(max_per_host=concurrency)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.etags = {} if etags else None
+        self.random = random.Random(seed)
+        self._resume_at = 0.0
+        # Compteurs pour le rapport de collecte
+        self.not_modified = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+    async def close(self):
+        await self.pool.close()
+
+    async def _wait_rate_limit(self):
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt):
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * self.random.uniform(0.5, 1.0)
+
+    async def request(self, method, url, body=None, headers=None):
+        """Requête avec reprises; retourne la Response (2xx ou 304)"""
+        headers = {**self.headers, **(headers or {})}
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            await self._wait_rate_limit()
+            try:
+                async with self.semaphore:
+                    response = await self.pool.request(method, url, headers, body)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                delay = self._backoff_delay(attempt)
+            else:
+                if 200 <= response.status < 300 or response.status == 304:
+                    return response
+                last_error = f"HTTP {response.status}"
+                delay = rate_limit_delay(response)
+                if delay is not None:
+                    # Limite de débit: toutes les tâches attendent
+                    self.rate_limited += 1
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                    delay = 0.0
+                elif response.status in RETRY_STATUSES:
+                    delay = self._backoff_delay(attempt)
+                else:
+                    raise APIError(f"{method} {url}: HTTP {response.status} {response.body[:200]!r}",
+                                   response.status)
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(delay)
+        raise APIError(f"{method} {url}: échec après {self.max_retries + 1} tentatives ({last_error})")
+
+    async def get_json(self, url):
+        """GET JSON conditionnel: If-None-Match avec l'ETag connu, corps en cache sur 304"""
+        headers = {} if "Accept" in self.headers else {"Accept": "application/json"}
+        cached = self.etags.get(url) if self.etags is not None else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        response = await self.request("GET", url, headers=headers)
+        if response.status == 304 and cached:
+            self.not_modified += 1
+            return json.loads(cached[1])
+        if self.etags is not None and "etag" in response.headers:
+            self.etags[url] = (response.headers["etag"], response.body)
+        return response.json()
+
+    async def post(self, url, data=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        return await self.request("POST", url, body, {"Content-Type": "application/json"})
+
+
+def _url(base, path, **params):
+    params = {name: value for name, value in params.items() if value is not None}
+    return base.rstrip("/") + path + (f"?{urlencode(params)}" if params else "")
+
+
+def _iso_timestamp(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class GitHubSource:
+    """GitHub Actions: GET/POST /repos/:owner/:repo/actions/..."""
+
+    platform = "github"
+
+    def __init__(self, client, repo, api_url=None, workflow=None, ref="main"):
+        self.client = client
+        self.base = _url(api_url or DEFAULT_API_URLS["github"], f"/repos/{repo}/actions")
+        self.workflow = workflow
+        self.ref = ref
+        self._claimed = set()
+        self._claim_lock = asyncio.Lock()
+
+    def _runs_path(self):
+        return f"/workflows/{quote(self.workflow, safe='')}/runs" if self.workflow else "/runs"
+
+    async def list_runs(self, limit):
+        runs = []
+        page = 1
+        while len(runs) < limit:
+            data = await self.client.get_json(_url(self.base, self._runs_path(), per_page=PER_PAGE, page=page))
+            batch = data.get("workflow_runs") or []
+            runs.extend(batch)
+            if len(batch) < PER_PAGE:
+                break
+            page += 1
+        return [run["id"] for run in runs[:limit]]
+
+    async def fetch_run(self, run_id):
+        return await self.client.get_json(_url(self.base, f"/runs/{run_id}"))
+
+    def finished(self, run):
+        return run.get("status") == "completed"
+
+    async def documents(self, run):
+        documents = [run]
+        page = 1
+        while True:
+            data = await self.client.get_json(
+                _url(self.base, f"/runs/{run['id']}/jobs", filter="latest", per_page=PER_PAGE, page=page))
+            documents.append(data)
+            if len(data.get("jobs") or []) < PER_PAGE:
+                return documents
+            page += 1
+
+    async def trigger(self, poll, timeout=DEFAULT_TIMEOUT):
+        """workflow_dispatch, puis le premier run de ce type créé après le déclenchement
+
+        APIError si aucun run n'apparaît en timeout secondes.
+        """
+        if not self.workflow:
+            raise APIError("--workflow est nécessaire pour déclencher un run GitHub")
+        dispatched = time.time()
+        deadline = time.monotonic() + timeout
+        await self.client.post(_url(self.base, f"/workflows/{quote(self.workflow, safe='')}/dispatches"),
+                               {"ref": self.ref})
+        while True:
+            data = await self.client.get_json(
+                _url(self.base, self._runs_path(), event="workflow_dispatch", per_page=20))
+            async with self._claim_lock:
+                candidates = sorted(
+                    (run for run in data.get("workflow_runs") or []
+                     if run["id"] not in self._claimed
+                     # Marge pour l'écart d'horloge avec GitHub
+                     and (_iso_timestamp(run.get("created_at")) or 0) >= dispatched - 5),
+                    key=lambda run: (run.get("created_at", ""), run["id"]))
+                if candidates:
+                    self._claimed.add(candidates[0]["id"])
+                    return candidates[0]["id"]
+            if time.monotonic() + poll > deadline:
+                raise APIError(f"{self.workflow}: aucun run workflow_dispatch après {timeout:g} s")
+            await asyncio.sleep(poll)
+
+
+class GitLabSource:
+    """GitLab CI: GET/POST /projects/:id/pipelines..."""
+
+    platform = "gitlab"
+
+    def __init__(self, client, project, api_url=None, ref="main"):
+        self.client = client
+        self.base = _url(api_url or DEFAULT_API_URLS["gitlab"], f"/projects/{quote(str(project), safe='')}")
+        self.ref = ref
+
+    async def list_runs(self, limit):
+        ids = []
+        page = 1
+        while len(ids) < limit:
+            batch = await self.client.get_json(_url(self.base, "/pipelines", per_page=PER_PAGE, page=page)) or []
+            ids.extend(pipeline["id"] for pipeline in batch)
+            if len(batch) < PER_PAGE:
+                break
+            page += 1
+        return ids[:limit]
+
+    async def fetch_run(self, run_id):
+        return await self.client.get_json(_url(self.base, f"/pipelines/{run_id}"))
+
+    def finished(self, run):
+        return run.get("status") in GITLAB_FINISHED
+
+    async def documents(self, run):
+        documents = [run]
+        page = 1
+        while True:
+            jobs = await self.client.get_json(
+                _url(self.base, f"/pipelines/{run['id']}/jobs", per_page=PER_PAGE, page=page)) or []
+            documents.append(jobs)
+            if len(jobs) < PER_PAGE:
+                return documents
+            page += 1
+
+    async def trigger(self, poll, timeout=DEFAULT_TIMEOUT):
+        response = await self.client.post(_url(self.base, "/pipeline", ref=self.ref))
+        return response.json()["id"]
+
+
+class JenkinsSource:
+    """Jenkins: api/json du job, wfapi/describe des builds, POST build"""
+
+    platform = "jenkins"
+
+    def __init__(self, client, job, api_url):
+        self.client = client
+        self.root = api_url.rstrip("/")
+        # Dossiers: a/b → /job/a/job/b
+        self.base = self.root + "".join(f"/job/{quote(part)}" for part in job.strip("/").split("/"))
+
+    async def list_runs(self, limit):
+        data = await self.client.get_json(_url(self.base, "/api/json", tree=f"builds[number]{{0,{limit}}}"))
+        return [build["number"] for build in (data.get("builds") or [])[:limit]]
+
+    async def fetch_run(self, run_id):
+        return await self.client.get_json(f"{self.base}/{run_id}/wfapi/describe")
+
+    def finished(self, run):
+        return run.get("status") not in JENKINS_UNFINISHED
+
+    async def documents(self, run):
+        return [run]
+
+    async def trigger(self, poll, timeout=DEFAULT_TIMEOUT):
+        """POST build, puis l'élément de file jusqu'à ce qu'il devienne un build
+
+        APIError si l'élément est encore en file après timeout secondes.
+        """
+        deadline = time.monotonic() + timeout
+        response = await self.client.post(self.base + "/build")
+        location = response.headers.get("location")
+        if not location:
+            raise APIError(f"{self.base}/build: en-tête Location absent")
+        item_url = urljoin(self.base + "/", location).rstrip("/") + "/api/json"
+        while True:
+            item = await self.client.get_json(item_url)
+            if item.get("cancelled"):
+                raise APIError(f"Build annulé dans la file Jenkins: {location}")
+            if item.get("executable"):
+                return item["executable"]["number"]
+            if time.monotonic() + poll > deadline:
+                raise APIError(f"Build encore dans la file Jenkins après {timeout:g} s: {location}")
+            await asyncio.sleep(poll)
+
+
+def auth_headers(platform, environ):
+    """En-têtes d'authentification lus dans l'environnement"""
+    if platform == "github" and environ.get("GITHUB_TOKEN"):
+        return {"Authorization": f"Bearer {environ['GITHUB_TOKEN']}", "Accept": "application/vnd.github+json"}
+    if platform == "gitlab" and environ.get("GITLAB_TOKEN"):
+        return {"PRIVATE-TOKEN": environ["GITLAB_TOKEN"]}
+    if platform == "jenkins" and environ.get("JENKINS_TOKEN"):
+        credentials = f"{environ.get('JENKINS_USER', '')}:{environ['JENKINS_TOKEN']}"
+        return {"Authorization": "Basic " + base64.b64encode(credentials.encode()).decode()}
+    return {}
+
+
+def make_source(platform, client, target, api_url=None, workflow=None, ref="main"):
+    if platform == "github":
+        return GitHubSource(client, target, api_url, workflow, ref)
+    if platform == "gitlab":
+        return GitLabSource(client, target, api_url, ref)
+    if platform == "jenkins":
+        if not api_url:
+            raise ValueError("L'URL de Jenkins est nécessaire (--api-url ou JENKINS_URL)")
+        return JenkinsSource(client, target, api_url)
+    raise ValueError(f"Plateforme inconnue: {platform}")
+
+
+class Collector:
+    """Collecte des exécutions terminées d'une source, plusieurs runs à la fois
+
+    Chaque run est interrogé jusqu'à sa fin (wait) puis normalisé; les runs
+    non terminés (sans wait ou au-delà de timeout) sont comptés dans
+    unfinished et ne produisent aucune exécution. Un run déclenché qui n'a
+    pas démarré après timeout secondes est compté dans failed.
+    """
+
+    def __init__(self, source, aliases=None, wait=False, poll=DEFAULT_POLL, timeout=DEFAULT_TIMEOUT):
+        self.source = source
+        self.aliases = aliases
+        self.wait = wait
+        self.poll = poll
+        self.timeout = timeout
+        self.unfinished = 0
+        self.failed = []
+
+    async def collect_run(self, run_id):
+        """Exécution normalisée d'un run, None s'il n'est pas terminé"""
+        deadline = time.monotonic() + self.timeout
+        run = await self.source.fetch_run(run_id)
+        while not self.source.finished(run):
+            if not self.wait or time.monotonic() + self.poll > deadline:
+                self.unfinished += 1
+                return None
+            await asyncio.sleep(self.poll)
+            run = await self.source.fetch_run(run_id)
+        importer = CIImporter(self.source.platform, self.aliases)
+        for document in await self.source.documents(run):
+            importer.add_document(document)
+        executions = importer.executions()
+        if not executions:
+            self.unfinished += 1
+            return None
+        return executions[0]
+
+    async def _safe_collect(self, run_id):
+        try:
+            return await self.collect_run(run_id)
+        except APIError as e:
+            self.failed.append((run_id, str(e)))
+            return None
+
+    async def collect_recent(self, limit=DEFAULT_LIMIT):
+        """Les limit derniers runs, collectés en parallèle"""
+        run_ids = await self.source.list_runs(limit)
+        results = await asyncio.gather(*(self._safe_collect(run_id) for run_id in run_ids))
+        return [execution for execution in results if execution is not None]
+
+    async def collect_triggered(self, runs, parallel_runs=1, stop=None):
+        """Déclenche runs exécutions (au plus parallel_runs en cours) et attend leur fin
+
+        stop(exécutions) est appelé après chaque run terminé; s'il retourne
+        vrai, aucun nouveau run n'est déclenché (ceux en cours sont attendus).
+        """
+        executions = []
+        slots = asyncio.Semaphore(parallel_runs)
+        stopped = False
+
+        async def one():
+            nonlocal stopped
+            async with slots:
+                if stopped:
+                    return
+                try:
+                    run_id = await self.source.trigger(self.poll, self.timeout)
+                except APIError as e:
+                    self.failed.append((None, str(e)))
+                    return
+                execution = await self._safe_collect(run_id)
+                if execution is not None:
+                    executions.append(execution)
+                    if stop is not None and stop(executions):
+                        stopped = True
+
+        await asyncio.gather(*(one() for _ in range(runs)))
+        return executions
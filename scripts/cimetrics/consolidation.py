@@ -0,0 +1,239 @@
+"""
+Consolidation incrémentale des exécutions
+
+Le manifeste (.consolidation-manifest.json) mémorise pour chaque fichier
+brut sa taille, son mtime et le SHA-256 de son contenu. Les clés
+(platform, execution_id) déjà consolidées sont dans un journal en ajout
+seul (.consolidation-keys.tsv, une clé et l'empreinte du contenu de
+l'exécution par ligne) dont le manifeste retient la taille validée: chaque
+consolidation n'écrit que ses nouvelles clés. Seuls les fichiers nouveaux
+ou modifiés sont relus, et les nouvelles exécutions sont ajoutées à la fin
+du journal {platform}_all.jsonl[.gz|.zst] (voir execlog.py) au lieu de
+réécrire tout l'historique.
+
+Une exécution déjà consolidée dont le contenu a changé dans un fichier
+modifié n'est pas remplacée (les magasins et les agrégats sont en ajout
+seul): elle est signalée, et --rebuild la relit.
+
+Le manifeste contient aussi les agrégats fusionnables (voir aggregates.py)
+dont summary.json est le rendu: il est écrit en dernier et sert de point de
+validation, de sorte qu'une consolidation interrompue ne compte jamais une
+exécution deux fois.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from . import execlog
+from .aggregates import Summary, summarize_files
+from .loader import MANIFEST_FILE, PLATFORMS, list_result_files
+from .records import KEYS_FILE
+
+MANIFEST_VERSION = 5
+
+
+def store_path(output_dir, platform, compression=None):
+    """Chemin du magasin consolidé d'une plateforme"""
+    return Path(output_dir) / f"{platform}_all.jsonl{execlog.COMPRESSIONS[compression]}"
+
+
+def existing_stores(output_dir):
+    """Magasins consolidés présents, tous formats confondus, dans l'ordre de PLATFORMS"""
+    paths = []
+    for platform in PLATFORMS:
+        for compression in execlog.COMPRESSIONS:
+            path = store_path(output_dir, platform, compression)
+            if path.exists():
+                paths.append(path)
+    return paths
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def execution_digest(execution):
+    """Empreinte SHA-1 du contenu d'une exécution (JSON canonique)"""
+    canonical = json.dumps(execution, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def execution_key(platform, execution):
+    """Clé de déduplication: platform:execution_id, ou hash du contenu si l'id manque"""
+    execution_id = execution.get("execution_id")
+    if execution_id is None:
+        execution_id = "sha1:" + execution_digest(execution)
+    return f"{platform}:{execution_id}"
+
+
+def read_keys(output_dir, size):
+    """Clés consolidées {clé: empreinte} des size premiers octets du journal des clés
+
+    Les octets au-delà de size (consolidation interrompue avant le manifeste)
+    sont ignorés; append_keys les écrase.
+    """
+    path = Path(output_dir) / KEYS_FILE
+    if not size:
+        return {}
+    with open(path, "rb") as f:
+        data = f.read(size)
+    if len(data) < size:
+        raise ValueError(f"{path}: journal des clés tronqué (relancer avec --rebuild)")
+    keys = {}
+    for line in data.decode().splitlines():
+        key, _, digest = line.rpartition("\t")
+        keys[key] = digest
+    return keys
+
+
+def append_keys(output_dir, size, keys):
+    """Ajoute [(clé, empreinte)] au journal des clés après ses size octets validés; retourne sa taille"""
+    path = Path(output_dir) / KEYS_FILE
+    with open(path, "ab") as f:
+        f.truncate(size)
+        f.write("".join(f"{key}\t{digest}\n" for key, digest in keys).encode())
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def write_json_atomic(path, data, indent=None):
+    """Écrit un fichier JSON via un fichier temporaire puis os.replace"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Manifest:
+    """État de la consolidation: fichiers traités, clés vues, magasins, agrégats et instantané"""
+
+    def __init__(self, files=None, keys=None, store_sizes=None, summary=None, store_format="jsonl",
+                 snapshot=None, keys_size=0):
+        self.files = files or {}
+        # {clé: empreinte du contenu}, dont keys_size octets déjà dans le journal des clés
+        self.keys = dict(keys or {})
+        self.keys_size = keys_size
+        self.new_keys = []
+        self.store_sizes = store_sizes or {}
+        self.summary = summary or Summary()
+        self.store_format = store_format
+        # meta.json validé de l'instantané binaire (voir snapshot.py)
+        self.snapshot = snapshot
+
+    @property
+    def compression(self):
+        return execlog.FORMATS[self.store_format]
+
+    @classmethod
+    def load(cls, output_dir):
+        path = Path(output_dir) / MANIFEST_FILE
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"Version de manifeste non supportée: {data.get('version')} (relancer avec --rebuild)"
+            )
+        keys_size = data.get("keys_size", 0)
+        return cls(
+            data.get("files"),
+            read_keys(output_dir, keys_size),
+            data.get("store_sizes"),
+            Summary.from_dict(data["summary"]),
+            data.get("store_format", "jsonl"),
+            data.get("snapshot"),
+            keys_size,
+        )
+
+    def add_key(self, key, digest):
+        self.keys[key] = digest
+        self.new_keys.append((key, digest))
+
+    def save(self, output_dir):
+        """Ajoute les nouvelles clés à leur journal puis écrit le manifeste qui les valide"""
+        self.keys_size = append_keys(output_dir, self.keys_size, self.new_keys)
+        self.new_keys = []
+        write_json_atomic(Path(output_dir) / MANIFEST_FILE, {
+            "version": MANIFEST_VERSION,
+            "store_format": self.store_format,
+            "files": dict(sorted(self.files.items())),
+            "keys_size": self.keys_size,
+            "store_sizes": dict(sorted(self.store_sizes.items())),
+            "summary": self.summary.to_dict(),
+            "snapshot": self.snapshot,
+        })
+
+    def changed_files(self, paths):
+        """Retourne [(path, entry)] des fichiers nouveaux ou modifiés
+
+        Le hash n'est calculé que si la taille ou le mtime a changé; un fichier
+        simplement « touché » met à jour son entrée sans être relu.
+        """
+        changed = []
+        for path in paths:
+            stat = path.stat()
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            known = self.files.get(path.name)
+            if known and known["size"] == entry["size"] and known["mtime_ns"] == entry["mtime_ns"]:
+                continue
+            entry["sha256"] = file_digest(path)
+            if known and known.get("sha256") == entry["sha256"]:
+                self.files[path.name] = entry
+                continue
+            changed.append((path, entry))
+        return changed
+
+    def rollback_stores(self, output_dir):
+        """Tronque les magasins à la taille connue (ajout interrompu avant le manifeste)"""
+        for platform in PLATFORMS:
+            path = store_path(output_dir, platform, self.compression)
+            execlog.truncate_log(path, self.store_sizes.get(platform, 0))
+
+
+def append_executions(output_dir, executions_by_platform, compression=None):
+    """Ajoute les exécutions aux journaux; retourne la nouvelle taille par plateforme"""
+    sizes = {}
+    for platform, executions in executions_by_platform.items():
+        path = store_path(output_dir, platform, compression)
+        with execlog.ExecutionLogWriter(path) as log:
+            for execution in executions:
+                log.append(execution)
+        sizes[platform] = path.stat().st_size
+    return sizes
+
+
+def reset(output_dir):
+    """Supprime le manifeste et les magasins pour une reconstruction complète"""
+    output_dir = Path(output_dir)
+    for path in existing_stores(output_dir):
+        path.unlink()
+        execlog.index_path(path).unlink(missing_ok=True)
+    (output_dir / MANIFEST_FILE).unlink(missing_ok=True)
+    (output_dir / KEYS_FILE).unlink(missing_ok=True)
+
+
+def load_summary(results_dir, workers=1):
+    """Résumé fusionnable des exécutions, sans charger les durées
+
+    Le résumé du manifeste est utilisé si aucun fichier brut n'a changé
+    depuis la dernière consolidation; sinon les fichiers bruts sont relus en
+    flux (aggregates.summarize_files), les doublons n'étant comptés qu'une
+    fois comme dans la consolidation.
+    """
+    manifest = Manifest.load(results_dir)
+    result_files = list_result_files(results_dir)
+    if manifest.files and not manifest.changed_files(result_files):
+        return manifest.summary
+    return summarize_files(result_files, workers, unique=True)
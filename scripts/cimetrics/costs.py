@@ -0,0 +1,242 @@
+"""
+Modèle de coût des plateformes CI/CD
+
+PRICING décrit la tarification de chaque plateforme:
+  - "per_minute": minutes facturées au-delà d'un quota gratuit mensuel.
+    rounding précise l'arrondi à la minute supérieure: "job" (chaque job,
+    c'est-à-dire chaque stage mesuré, est arrondi séparément, comme GitHub
+    Actions et GitLab CI), "build" (durée totale arrondie) ou "none".
+  - "fixed": coût mensuel indépendant du nombre de builds (Jenkins
+    auto-hébergé: infrastructure + heures de maintenance).
+Une exécution sans durée de stage est facturée sur sa durée totale.
+
+Le coût d'un mois de B builds dépend de toute la distribution des minutes
+facturées (le quota gratuit rend le coût non linéaire). Pour chaque tirage:
+  - incertitude sur la distribution: rééchantillonnage avec remise des
+    exécutions observées (bootstrap) → moyenne et écart-type des minutes
+    (approximation normale de la moyenne bootstrap quand les exécutions
+    sont trop nombreuses)
+  - variabilité d'un mois à l'autre: somme de B tirages, exacte jusqu'à
+    EXACT_BUILDS builds, loi normale au-delà (théorème central limite)
+Toute la grille de builds/mois × tirages est calculée en une matrice
+NumPy; les bandes de confiance sont les quantiles des tirages. L'estimation
+ponctuelle ("estimate") ne dépend pas des tirages: coût de B fois les
+minutes facturées moyennes, reproductible sans --seed. Le seuil
+de rentabilité est le nombre de builds/mois où le coût dépasse celui de
+Jenkins.
+"""
+
+import copy
+import json
+
+import numpy as np
+
+PRICING = {
+    "github": {
+        "model": "per_minute",
+        "free_minutes": 2000,  # Minutes gratuites par mois
+        "price_per_minute": 0.008,  # $0.008 par minute après le quota
+        "rounding": "job",  # Chaque job arrondi à la minute supérieure
+        "runner_type": "ubuntu-latest",
+    },
+    "gitlab": {
+        "model": "per_minute",
+        "free_minutes": 400,  # Minutes gratuites par mois (Shared Runner)
+        "price_per_minute": 0.01,  # $0.01 par minute après le quota
+        "rounding": "job",
+        "runner_type": "shared",
+    },
+    "jenkins": {
+        "model": "fixed",
+        "self_hosted": True,
+        "infrastructure_cost_per_month": 20,  # Coût estimé infrastructure
+        "maintenance_hours_per_month": 4,
+        "hourly_rate": 50,  # Taux horaire pour maintenance
+        "executors_per_agent": 2,  # Executors par agent (capacity.py)
+    },
+}
+
+ROUNDING_MODES = ("job", "build", "none")
+
+DEFAULT_SAMPLES = 2000
+DEFAULT_MIN_BUILDS = 1
+DEFAULT_MAX_BUILDS = 100_000
+DEFAULT_POINTS = 121
+
+# Bande de confiance (percentiles des tirages)
+BAND = (5, 95)
+
+# Jusqu'à ce nombre de builds/mois, la somme des minutes est tirée exactement
+EXACT_BUILDS = 64
+
+# Taille maximale de la matrice de rééchantillonnage (tirages × exécutions)
+MAX_BOOTSTRAP_ELEMENTS = 4_000_000
+
+COST_FIELDS = (
+    "platform",
+    "builds_per_month",
+    "estimate",
+    "mean",
+    "low",
+    "median",
+    "high",
+    "cost_per_build",
+)
+
+
+def load_pricing(path=None):
+    """PRICING, complété ou remplacé plateforme par plateforme par un fichier JSON"""
+    pricing = copy.deepcopy(PRICING)
+    if path is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            for platform, values in json.load(f).items():
+                pricing.setdefault(platform, {}).update(values)
+    for platform, values in pricing.items():
+        if values.get("model") == "per_minute" and values.get("rounding", "job") not in ROUNDING_MODES:
+            raise ValueError(f"Arrondi inconnu pour {platform}: {values['rounding']}")
+    return pricing
+
+
+def fixed_cost(pricing):
+    """Coût mensuel d'une plateforme auto-hébergée"""
+    return pricing["infrastructure_cost_per_month"] + pricing["maintenance_hours_per_month"] * pricing["hourly_rate"]
+
+
+def billed_minutes(columns, platform, rounding="job"):
+    """Minutes facturées de chaque exécution valide (durée totale > 0)"""
+    mask = columns.platform_mask(platform) & (columns.total > 0)
+    total = columns.total[mask]
+    if rounding == "none":
+        return total / 60
+    if rounding == "build":
+        return np.ceil(total / 60)
+    stages = columns.stages[mask]
+    measured = stages > 0
+    jobs = np.ceil(np.where(measured, stages, 0) / 60).sum(axis=1)
+    return np.where(measured.any(axis=1), jobs, np.ceil(total / 60))
+
+
+def builds_grid(min_builds=DEFAULT_MIN_BUILDS, max_builds=DEFAULT_MAX_BUILDS, points=DEFAULT_POINTS):
+    """Grille logarithmique d'entiers de builds/mois"""
+    return np.unique(np.geomspace(min_builds, max_builds, points).round().astype(np.int64))
+
+
+def monthly_minutes(minutes, builds, n_samples=DEFAULT_SAMPLES, rng=None):
+    """Minutes facturées sur un mois, matrice (len(builds), n_samples)"""
+    rng = rng or np.random.default_rng()
+    minutes = np.asarray(minutes, dtype=np.float64)
+    builds = np.asarray(builds, dtype=np.int64)
+    if n_samples * len(minutes) <= MAX_BOOTSTRAP_ELEMENTS:
+        resampled = minutes[rng.integers(len(minutes), size=(n_samples, len(minutes)))]
+        mean = resampled.mean(axis=1)
+        std = resampled.std(axis=1)
+    else:
+        # Beaucoup d'exécutions: moyenne bootstrap ~ loi normale, écart-type stable
+        std = np.full(n_samples, minutes.std())
+        mean = minutes.mean() + std / np.sqrt(len(minutes)) * rng.standard_normal(n_samples)
+    # Mêmes nombres aléatoires pour toute la grille: courbes lisses
+    noise = rng.standard_normal(n_samples)
+    totals = builds[:, None] * mean + np.sqrt(builds)[:, None] * std * noise
+    totals = np.maximum(totals, 0)
+    small = np.flatnonzero(builds <= EXACT_BUILDS)
+    if len(small):
+        draws = minutes[rng.integers(len(minutes), size=(n_samples, int(builds[small].max())))]
+        cumulative = np.cumsum(draws, axis=1)
+        totals[small] = cumulative[:, builds[small] - 1].T
+    return totals
+
+
+def minutes_cost(minutes, pricing):
+    """Coût mensuel de minutes facturées selon le quota gratuit et le prix"""
+    return np.maximum(minutes - pricing["free_minutes"], 0) * pricing["price_per_minute"]
+
+
+def break_even(builds, cost, threshold):
+    """Builds/mois à partir desquels cost atteint threshold (interpolé), None si jamais"""
+    above = np.flatnonzero(cost >= threshold)
+    if not len(above):
+        return None
+    k = int(above[0])
+    if k == 0:
+        return float(builds[0])
+    fraction = (threshold - cost[k - 1]) / (cost[k] - cost[k - 1])
+    return float(builds[k - 1] + fraction * (builds[k] - builds[k - 1]))
+
+
+def cost_sweep(columns, builds=None, n_samples=DEFAULT_SAMPLES, seed=None, pricing=None):
+    """Courbes de coût mensuel de chaque plateforme sur une grille de builds/mois
+
+    Retourne {"builds": grille, "fixed": {plateforme: coût},
+    "platforms": {plateforme: estimation déterministe "estimate", courbes
+    tirées mean/low/median/high, minutes
+    moyennes facturées et réelles, seuils de rentabilité}}. Les seuils
+    sont calculés contre la première plateforme à coût fixe (Jenkins):
+    "median" sur la courbe médiane, "earliest"/"latest" sur les bornes
+    haute et basse de la bande.
+    """
+    pricing = pricing or PRICING
+    builds = builds_grid() if builds is None else np.asarray(builds, dtype=np.int64)
+    fixed = {platform: fixed_cost(values) for platform, values in pricing.items() if values.get("model") == "fixed"}
+    reference = next(iter(fixed.values()), None)
+    present = columns.platforms()
+    hosted = [platform for platform in pricing if pricing[platform].get("model") == "per_minute" and platform in present]
+    seeds = np.random.SeedSequence(seed).spawn(len(hosted))
+    results = {}
+    for platform, platform_seed in zip(hosted, seeds):
+        values = pricing[platform]
+        minutes = billed_minutes(columns, platform, values.get("rounding", "job"))
+        if not len(minutes):
+            continue
+        actual = billed_minutes(columns, platform, "none")
+        costs = minutes_cost(monthly_minutes(minutes, builds, n_samples, np.random.default_rng(platform_seed)), values)
+        low, median, high = np.percentile(costs, [BAND[0], 50, BAND[1]], axis=1)
+        result = {
+            "runs": len(minutes),
+            "billed_minutes": float(minutes.mean()),
+            "actual_minutes": float(actual.mean()),
+            "estimate": minutes_cost(builds * minutes.mean(), values),
+            "mean": costs.mean(axis=1),
+            "low": low,
+            "median": median,
+            "high": high,
+            "break_even": None,
+        }
+        if reference is not None:
+            result["break_even"] = {
+                "median": break_even(builds, median, reference),
+                "earliest": break_even(builds, high, reference),
+                "latest": break_even(builds, low, reference),
+            }
+        results[platform] = result
+    return {"builds": builds, "fixed": fixed, "platforms": results}
+
+
+def sweep_rows(sweep):
+    """Table longue (plateforme × builds/mois) pour write_table"""
+    rows = []
+    builds = sweep["builds"]
+    for platform, result in sweep["platforms"].items():
+        for k, count in enumerate(builds):
+            rows.append({
+                "platform": platform,
+                "builds_per_month": int(count),
+                "estimate": float(result["estimate"][k]),
+                "mean": float(result["mean"][k]),
+                "low": float(result["low"][k]),
+                "median": float(result["median"][k]),
+                "high": float(result["high"][k]),
+                "cost_per_build": float(result["estimate"][k] / count),
+            })
+    for platform, cost in sweep["fixed"].items():
+        for count in builds:
+            rows.append({
+                "platform": platform,
+                "builds_per_month": int(count),
+                "estimate": cost,
+                "mean": cost,
+                "low": cost,
+                "median": cost,
+                "high": cost,
+                "cost_per_build": cost / count,
+            })
+    return rows
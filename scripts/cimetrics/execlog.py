@@ -0,0 +1,347 @@
+"""
+Journal d'exécutions JSON Lines en ajout seul
+
+Une exécution par ligne, écrite par blocs de block_size exécutions. Chaque
+bloc peut être compressé séparément (gzip ou zstd): le fichier reste un
+flux gzip/zstd valide (membres/frames concaténés, lisible par zcat/zstdcat)
+et chaque bloc se décompresse indépendamment. Un index à côté du journal
+(<journal>.idx, une ligne JSON par bloc: offset, size, records) permet de
+reprendre la lecture à n'importe quel bloc sans relire le début. Les
+lignes ajoutées au journal sans passer par ExecutionLogWriter (ex: >>)
+sont lues en flux après le dernier bloc indexé, puis indexées au prochain
+ajout.
+
+Les lecteurs sont des générateurs: la mémoire utilisée est bornée par la
+taille d'un bloc, quelle que soit la taille de l'historique.
+
+Extensions: .jsonl (texte), .jsonl.gz (gzip), .jsonl.zst (zstd, nécessite
+le paquet zstandard).
+"""
+
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+
+DEFAULT_BLOCK_SIZE = 1000
+
+# Compression → suffixe ajouté après .jsonl
+COMPRESSIONS = {
+    None: "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# Formats acceptés en ligne de commande (--format)
+FORMATS = {
+    "jsonl": None,
+    "jsonl.gz": "gzip",
+    "jsonl.zst": "zstd",
+}
+
+LOG_SUFFIXES = tuple(".jsonl" + suffix for suffix in COMPRESSIONS.values())
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard est requis pour les journaux .jsonl.zst (pip install zstandard)"
+        ) from None
+    return zstandard
+
+
+def is_execution_log(path):
+    return os.path.basename(path).endswith(LOG_SUFFIXES)
+
+
+def log_compression(path):
+    """Compression d'un journal d'après son extension"""
+    name = Path(path).name
+    if name.endswith(".jsonl.gz"):
+        return "gzip"
+    if name.endswith(".jsonl.zst"):
+        return "zstd"
+    return None
+
+
+def index_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def _compress(data, compression):
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor().compress(data)
+    return data
+
+
+def _decompress(data, compression):
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def _stream_lines(path, compression, offset=0):
+    """Lignes du journal décompressé à partir de l'octet offset (lecture sans index)"""
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw)
+        elif compression == "zstd":
+            stream = _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = raw
+        yield from io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def _parse_lines(lines, name, on_error=None, first_line=1):
+    """Décode les lignes JSON; les lignes invalides sont signalées à on_error(numéro, erreur)
+
+    Sans on_error, un avertissement est affiché et la ligne est ignorée.
+    """
+    for line_number, line in enumerate(lines, first_line):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            if on_error is None:
+                print(f"⚠️  Ligne {line_number} invalide dans {name}: {e}")
+            else:
+                on_error(line_number, e)
+
+
+def read_index(path):
+    """Entrées de l'index ({offset, size, records}); [] si le journal n'est pas indexé"""
+    idx = index_path(path)
+    if not idx.exists():
+        return []
+    with open(idx) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def indexed_size(index):
+    """Octets couverts par l'index (fin du dernier bloc)"""
+    return index[-1]["offset"] + index[-1]["size"] if index else 0
+
+
+def _valid_index(path, index):
+    """Entrées de l'index contenues dans le fichier (index plus long qu'un journal tronqué)"""
+    size = path.stat().st_size
+    valid = [entry for entry in index if entry["offset"] + entry["size"] <= size]
+    if len(valid) < len(index):
+        print(f"⚠️  Index de {path.name} plus long que le journal: {len(index) - len(valid)} bloc(s) ignoré(s)")
+    return valid
+
+
+def _stream_blocks(lines, name, on_error=None, first_line=1):
+    """Découpe un flux de lignes en blocs de DEFAULT_BLOCK_SIZE exécutions"""
+    block = []
+    for record in _parse_lines(lines, name, on_error, first_line):
+        block.append(record)
+        if len(block) == DEFAULT_BLOCK_SIZE:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def iter_blocks(path, start_block=0, on_error=None):
+    """Itère sur les blocs du journal (listes d'exécutions) à partir de start_block
+
+    Les blocs indexés sont lus directement; ce qui suit le dernier bloc
+    indexé (tout le journal s'il n'a pas d'index) est lu en flux et découpé
+    en blocs de DEFAULT_BLOCK_SIZE exécutions, comptés à la suite des blocs
+    indexés. Les lignes invalides sont ignorées et signalées à on_error
+    (voir _parse_lines).
+    """
+    path = Path(path)
+    compression = log_compression(path)
+    index = _valid_index(path, read_index(path))
+    line_number = 1
+    with open(path, "rb") as f:
+        for number, entry in enumerate(index):
+            if number < start_block:
+                line_number += entry["records"]
+                continue
+            f.seek(entry["offset"])
+            lines = _decompress(f.read(entry["size"]), compression).decode().splitlines()
+            yield list(_parse_lines(lines, path.name, on_error, line_number))
+            line_number += len(lines)
+
+    tail = indexed_size(index)
+    if path.stat().st_size <= tail:
+        return
+    if index:
+        print(f"⚠️  {path.stat().st_size - tail} octet(s) non indexé(s) à la fin de {path.name}: lus en flux")
+    blocks = _stream_blocks(_stream_lines(path, compression, tail), path.name, on_error, line_number)
+    for number, block in enumerate(blocks, len(index)):
+        if number >= start_block:
+            yield block
+
+
+def iter_records(path, start_block=0, on_error=None):
+    """Itère sur les exécutions du journal en mémoire constante"""
+    for block in iter_blocks(path, start_block, on_error):
+        yield from block
+
+
+def count_records(path):
+    """Nombre d'exécutions du journal (lu depuis l'index, sauf pour la fin non indexée)"""
+    path = Path(path)
+    index = _valid_index(path, read_index(path))
+    tail = indexed_size(index)
+    count = sum(entry["records"] for entry in index)
+    if path.stat().st_size > tail:
+        count += sum(len(block) for block in
+                     _stream_blocks(_stream_lines(path, log_compression(path), tail), path.name, lambda *_: None))
+    return count
+
+
+def truncate_log(path, size):
+    """Ramène le journal à size octets et supprime les blocs d'index au-delà"""
+    path = Path(path)
+    if not path.exists() or path.stat().st_size <= size:
+        return
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    _write_index(path, [entry for entry in read_index(path) if entry["offset"] + entry["size"] <= size])
+
+
+def _write_index(path, entries):
+    tmp = index_path(path).with_name(index_path(path).name + ".tmp")
+    with open(tmp, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    os.replace(tmp, index_path(path))
+
+
+def _text_blocks(path, offset):
+    """Entrées d'index des blocs de DEFAULT_BLOCK_SIZE lignes d'un journal texte à partir d'offset
+
+    Une dernière ligne sans fin de ligne est complétée pour que le bloc
+    suivant commence sur une nouvelle ligne.
+    """
+    entries = []
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        start = position = offset
+        records = 0
+        line = b""
+        for line in f:
+            position += len(line)
+            records += bool(line.strip())
+            if records == DEFAULT_BLOCK_SIZE:
+                entries.append({"offset": start, "size": position - start, "records": records})
+                start, records = position, 0
+        if line and not line.endswith(b"\n"):
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+            position += 1
+        if position > start:
+            entries.append({"offset": start, "size": position - start, "records": records})
+    return entries
+
+
+class ExecutionLogWriter:
+    """Ajoute des exécutions à un journal, bloc par bloc
+
+    Utilisation:
+        with ExecutionLogWriter(path) as log:
+            for execution in executions:
+                log.append(execution)
+    """
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE):
+        self.path = Path(path)
+        self.compression = log_compression(self.path)
+        self.block_size = block_size
+        self._lines = []
+        self._file = None
+        self._index = None
+
+    def __enter__(self):
+        self._index_existing()
+        self._file = open(self.path, "ab")
+        self._index = open(index_path(self.path), "a")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _index_existing(self):
+        """Indexe, en blocs de DEFAULT_BLOCK_SIZE exécutions, la fin du journal sans index
+
+        Journal créé sans index ou lignes ajoutées sans ExecutionLogWriter: en
+        texte, les blocs sont délimités sur place; compressée, la fin est
+        recompressée bloc par bloc dans une copie qui remplace le journal.
+        """
+        if not self.path.exists():
+            return
+        index = _valid_index(self.path, read_index(self.path))
+        tail = indexed_size(index)
+        if self.path.stat().st_size <= tail:
+            if len(index) < len(read_index(self.path)):
+                _write_index(self.path, index)
+            return
+        if self.compression is None:
+            entries = _text_blocks(self.path, tail)
+        else:
+            entries = self._recompress_tail(tail)
+        _write_index(self.path, index + entries)
+
+    def _recompress_tail(self, tail):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        entries = []
+        with open(self.path, "rb") as source, open(tmp, "wb") as target:
+            remaining = tail
+            while remaining:
+                chunk = source.read(min(remaining, 1 << 20))
+                target.write(chunk)
+                remaining -= len(chunk)
+            for block in _stream_blocks(_stream_lines(self.path, self.compression, tail), self.path.name):
+                data = _compress(("\n".join(json.dumps(record, separators=(",", ":")) for record in block)
+                                  + "\n").encode(), self.compression)
+                entries.append({"offset": target.tell(), "size": len(data), "records": len(block)})
+                target.write(data)
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(tmp, self.path)
+        return entries
+
+    def append(self, execution):
+        self._lines.append(json.dumps(execution, separators=(",", ":")))
+        if len(self._lines) >= self.block_size:
+            self.flush_block()
+
+    def flush_block(self):
+        """Écrit le bloc courant (compressé si besoin) et son entrée d'index"""
+        if not self._lines:
+            return
+        data = _compress(("\n".join(self._lines) + "\n").encode(), self.compression)
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._index.write(json.dumps({
+            "offset": offset,
+            "size": len(data),
+            "records": len(self._lines),
+        }) + "\n")
+        self._lines = []
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush_block()
+        for f in (self._file, self._index):
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        self._file = self._index = None
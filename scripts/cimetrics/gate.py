@@ -0,0 +1,207 @@
+"""
+Contrôle de non-régression des nouvelles exécutions (étape de pipeline)
+
+Les dernières exécutions d'une plateforme (et d'une branche) sont comparées,
+pour la durée totale et chaque stage, à une référence qui ne contient que
+des agrégats fusionnables (aggregates.Summary): l'historique complet n'est
+jamais relu, le contrôle ne dure que quelques secondes.
+
+Référence: fichier {"version", "window", "batches": [résumés], "keys":
+[clés de chaque lot]} dont les lots sont fusionnés à la lecture. Après un
+contrôle réussi, le résumé des nouvelles exécutions est ajouté comme lot
+et les lots au-delà de window sont retirés: la référence est une fenêtre
+glissante des derniers lots. Les clés plateforme:execution_id de chaque
+lot évitent d'ajouter deux fois les mêmes exécutions. Un summary.json de
+consolidate-data.py est accepté comme référence initiale (un seul lot,
+sans clés).
+
+Test: Mann-Whitney unilatéral (les nouvelles durées sont-elles plus
+grandes ?) entre les nouvelles valeurs et le sketch de quantiles de la
+référence, deux valeurs du même intervalle du sketch comptant comme
+ex-aequo (approximation normale avec correction de continuité). Les
+p-values des cellules sont corrigées par Holm. Une cellule est en
+régression si la p-value corrigée est sous alpha et si la médiane a
+augmenté d'au moins min_effect (relatif) et min_seconds (absolu): une
+différence significative mais négligeable ne bloque pas le pipeline.
+"""
+
+import json
+import math
+
+import numpy as np
+
+from .aggregates import Summary
+from .consolidation import write_json_atomic
+from .records import PLATFORMS
+from .resampling import adjust_p_values
+from .stats import CELLS, TOTAL
+
+BASELINE_VERSION = 1
+
+# Nombre de lots conservés dans la fenêtre glissante de la référence
+DEFAULT_WINDOW = 20
+
+DEFAULT_ALPHA = 0.05
+DEFAULT_MIN_EFFECT = 0.10
+DEFAULT_MIN_SECONDS = 5.0
+
+# Effectifs minimaux pour tester une cellule
+MIN_NEW = 3
+MIN_BASELINE = 10
+
+GATE_FIELDS = (
+    "platform",
+    "stage",
+    "n_new",
+    "n_baseline",
+    "baseline_median",
+    "new_median",
+    "difference",
+    "relative",
+    "p_value",
+    "p_adjusted",
+    "regression",
+)
+
+
+class Baseline:
+    """Fenêtre glissante de résumés servant de référence au contrôle"""
+
+    def __init__(self, batches=None, window=DEFAULT_WINDOW, keys=None):
+        self.batches = list(batches or [])
+        self.window = window
+        # Clés plateforme:execution_id de chaque lot (liste vide si inconnues)
+        self.keys = [list(batch_keys) for batch_keys in keys] if keys else [[] for _ in self.batches]
+
+    def summary(self):
+        """Résumé fusionné de tous les lots de la fenêtre"""
+        merged = Summary()
+        for batch in self.batches:
+            merged.merge(batch)
+        return merged
+
+    def push(self, summary, keys=()):
+        """Ajoute un lot et retire les plus anciens au-delà de la fenêtre"""
+        self.batches.append(summary)
+        self.keys.append(list(keys))
+        del self.batches[:-self.window]
+        del self.keys[:-self.window]
+
+    def unseen(self, columns):
+        """Masque des exécutions absentes des lots de la fenêtre (sans execution_id: toujours absentes)"""
+        known = {key for batch_keys in self.keys for key in batch_keys}
+        return np.array([
+            execution_id is None or f"{PLATFORMS[code]}:{execution_id}" not in known
+            for code, execution_id in zip(columns.platform, columns.execution_id)
+        ], dtype=bool)
+
+    def to_dict(self):
+        return {
+            "version": BASELINE_VERSION,
+            "window": self.window,
+            "batches": [batch.to_dict() for batch in self.batches],
+            "keys": self.keys,
+        }
+
+    @classmethod
+    def from_dict(cls, data, window=None):
+        if "batches" in data:
+            if data.get("version") != BASELINE_VERSION:
+                raise ValueError(f"Version de référence non supportée: {data.get('version')}")
+            batches = [Summary.from_dict(batch) for batch in data["batches"]]
+            return cls(batches, window or data.get("window", DEFAULT_WINDOW), data.get("keys"))
+        # summary.json de la consolidation: un seul lot
+        return cls([Summary.from_dict(data)], window or DEFAULT_WINDOW)
+
+    @classmethod
+    def load(cls, path, window=None):
+        with open(path) as f:
+            return cls.from_dict(json.load(f), window)
+
+    def save(self, path):
+        write_json_atomic(path, self.to_dict())
+
+
+def execution_keys(columns):
+    """Clés plateforme:execution_id des exécutions qui ont un execution_id"""
+    return [f"{PLATFORMS[code]}:{execution_id}"
+            for code, execution_id in zip(columns.platform, columns.execution_id) if execution_id is not None]
+
+
+def select_newest(columns, platform=None, branch=None, last=None):
+    """Exécutions à contrôler: filtrées par plateforme et branche, les last plus récentes
+
+    L'ordre est celui des horodatages (les exécutions sans horodatage sont
+    considérées comme les plus anciennes), sinon celui des fichiers.
+    """
+    mask = np.ones(len(columns), dtype=bool)
+    if platform is not None:
+        mask &= columns.platform_mask(platform)
+    if branch is not None:
+        mask &= columns.branch == branch
+    columns = columns.select(mask)
+    if last is not None and len(columns) > last:
+        timestamps = np.nan_to_num(columns.timestamp, nan=-np.inf)
+        newest = np.sort(np.argsort(timestamps, kind="stable")[-last:])
+        columns = columns.select(newest)
+    return columns
+
+
+def mann_whitney_greater(values, sketch):
+    """p-value unilatérale de Mann-Whitney: values tend-elle à dépasser la référence ?"""
+    m, n = len(values), sketch.count
+    below, equal = sketch.rank_counts(values)
+    u = float(np.sum(below + 0.5 * equal))
+    sigma = math.sqrt(m * n * (m + n + 1) / 12)
+    if sigma == 0:
+        return 1.0
+    z = (u - m * n / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _cell_values(columns, cell):
+    values = columns.total if cell == TOTAL else columns.stage(cell)
+    return values[values > 0]
+
+
+def gate_table(columns, baseline_summary, alpha=DEFAULT_ALPHA, min_effect=DEFAULT_MIN_EFFECT,
+               min_seconds=DEFAULT_MIN_SECONDS, min_new=MIN_NEW, min_baseline=MIN_BASELINE):
+    """Compare les nouvelles exécutions à la référence, une ligne par plateforme × cellule
+
+    Les cellules sans assez de valeurs (min_new nouvelles, min_baseline dans
+    la référence) sont omises; les p-values sont corrigées (Holm) sur
+    l'ensemble des cellules testées.
+    """
+    rows = []
+    for platform in columns.platforms():
+        if platform not in baseline_summary.platforms:
+            continue
+        platform_columns = columns.for_platform(platform)
+        reference = baseline_summary.platforms[platform]
+        for cell in CELLS:
+            stats = reference.duration if cell == TOTAL else reference.stages[cell]
+            values = _cell_values(platform_columns, cell)
+            if len(values) < min_new or stats.count < min_baseline:
+                continue
+            baseline_median = stats.quantile(0.5)
+            new_median = float(np.median(values))
+            difference = new_median - baseline_median
+            rows.append({
+                "platform": platform,
+                "stage": cell,
+                "n_new": len(values),
+                "n_baseline": stats.count,
+                "baseline_median": baseline_median,
+                "new_median": new_median,
+                "difference": difference,
+                "relative": difference / baseline_median,
+                "p_value": mann_whitney_greater(values, stats.sketch),
+            })
+
+    adjusted = adjust_p_values([row["p_value"] for row in rows], "holm")
+    for row, p_adjusted in zip(rows, adjusted):
+        row["p_adjusted"] = float(p_adjusted)
+        row["regression"] = bool(
+            p_adjusted < alpha and row["relative"] >= min_effect and row["difference"] >= min_seconds
+        )
+    return rows
@@ -0,0 +1,543 @@
+"""
+Import des exports d'API des plateformes CI au format des exécutions
+
+Exports acceptés (fichiers JSON, .json.gz, JSON Lines, ou pages
+concaténées comme celles de gh api --paginate):
+  - GitHub Actions: workflow runs (GET /repos/:o/:r/actions/runs, clé
+    workflow_runs) et jobs avec leurs steps (GET .../runs/:id/jobs, clé
+    jobs); un run peut aussi contenir directement sa liste "jobs"
+  - GitLab CI: pipelines (GET /projects/:id/pipelines/:pid) et jobs
+    (GET .../pipelines/:pid/jobs); un pipeline peut contenir sa liste "jobs"
+  - Jenkins: wfapi/describe d'un build, ou liste wfapi/runs
+
+Les fichiers sont lus en flux: un tableau JSON de premier niveau est
+décodé élément par élément, la mémoire reste bornée par la taille d'un
+run (ou d'une page d'API) quel que soit le nombre de runs exportés. Seul un
+état réduit par exécution est gardé (dates, durées par stage), les runs et
+leurs jobs pouvant venir de fichiers différents.
+
+Les noms de jobs et de stages sont ramenés aux stages canoniques
+(records.STAGES) par STAGE_ALIASES, complétable par un fichier JSON
+{"nom du job": "stage"}. Les suffixes de matrice ("Backend Tests (18.x)")
+et de parallélisation ("e2e-tests 1/3") sont ignorés; les jobs d'un même
+stage sont additionnés. Un job GitHub sans correspondance est décomposé
+en ses steps; pour GitLab, le nom du stage du job est essayé ensuite.
+
+Exécution produite: platform, execution_id (run_<id>, pipeline_<id>,
+build_<id> comme les exemples de results/performance), timestamp
+(création), branch, trigger, duration.total (début du run → fin du
+dernier job, pauses Jenkins exclues), duration.stages, queue_time
+(début du run → début du premier job), success, runner_type. Les runs non
+terminés sont ignorés.
+"""
+
+import gzip
+import json
+import math
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import execlog
+from .records import PLATFORMS, STAGES, parse_timestamp
+from .schema import FileReport, Validator
+
+READ_SIZE = 1 << 20
+
+WHITESPACE = " \t\n\r"
+
+# Nom normalisé (minuscules, séparateurs → _) → stage canonique
+STAGE_ALIASES = {
+    "lint_backend": "lint_backend",
+    "backend_lint": "lint_backend",
+    "lint_frontend": "lint_frontend",
+    "frontend_lint": "lint_frontend",
+    "test_backend": "test_backend",
+    "backend_test": "test_backend",
+    "backend_tests": "test_backend",
+    "test_frontend": "test_frontend",
+    "frontend_test": "test_frontend",
+    "frontend_tests": "test_frontend",
+    "build_frontend": "build_frontend",
+    "frontend_build": "build_frontend",
+    "build": "build_frontend",
+    "e2e_tests": "e2e_tests",
+    "e2e_test": "e2e_tests",
+    "e2e": "e2e_tests",
+    "end_to_end_tests": "e2e_tests",
+    "docker_build": "docker_build",
+    "docker_build_backend": "docker_build",
+    "docker_build_frontend": "docker_build",
+    "build_docker": "docker_build",
+    "docker": "docker_build",
+    "deploy": "deploy",
+    "deploy_staging": "deploy",
+    "deploy_production": "deploy",
+    "deploy_to_staging": "deploy",
+    "deploy_to_production": "deploy",
+}
+
+# Suffixes de matrice "(18.x)" et de parallélisation "1/3"
+JOB_SUFFIX = re.compile(r"\s*(\([^)]*\)|\d+/\d+)\s*$")
+
+GITHUB_FAILURES = ("failure", "cancelled", "timed_out", "startup_failure")
+GITLAB_FINISHED = ("success", "failed", "canceled", "skipped")
+JENKINS_UNFINISHED = ("IN_PROGRESS", "QUEUED", "PAUSED_PENDING_INPUT", "NOT_EXECUTED")
+
+
+def alias_key(name):
+    """Nom de job ou de stage normalisé pour STAGE_ALIASES"""
+    name = JOB_SUFFIX.sub("", str(name))
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def load_aliases(path=None):
+    """STAGE_ALIASES complété par un fichier JSON {"nom": "stage"}"""
+    aliases = dict(STAGE_ALIASES)
+    if path:
+        with open(path) as f:
+            extra = json.load(f)
+        for name, stage in extra.items():
+            if stage not in STAGES:
+                raise ValueError(f"Stage inconnu pour l'alias {name}: {stage} (choix: {', '.join(STAGES)})")
+            aliases[alias_key(name)] = stage
+    return aliases
+
+
+def _open_export(path):
+    path = Path(path)
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+class _JSONStream:
+    """Décodage incrémental de valeurs JSON depuis un fichier texte"""
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        chunk = self.f.read(size or READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Prochain caractère non blanc, None en fin de fichier"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return None
+
+    def value(self):
+        self.peek()
+        size = READ_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self._fill(size):
+                    raise
+                # Valeur plus grande que le tampon: lectures de plus en plus grandes
+                size *= 2
+                continue
+            # Un nombre en fin de tampon peut être tronqué
+            if end == len(self.buffer) and not self.eof and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_documents(path):
+    """Itère en flux sur les valeurs JSON d'un fichier d'export
+
+    Un tableau de premier niveau produit ses éléments un par un; les
+    valeurs successives (JSON Lines, pages concaténées) sont produites
+    dans l'ordre.
+    """
+    with _open_export(path) as f:
+        stream = _JSONStream(f)
+        while (char := stream.peek()) is not None:
+            if char != "[":
+                yield stream.value()
+                continue
+            stream.pos += 1
+            if stream.peek() == "]":
+                stream.pos += 1
+                continue
+            while True:
+                yield stream.value()
+                char = stream.peek()
+                if char not in (",", "]"):
+                    raise ValueError(f"{path}: ',' ou ']' attendu dans le tableau JSON")
+                stream.pos += 1
+                if char == "]":
+                    break
+
+
+def _millis(value):
+    return value / 1000 if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def _iso(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _known(value):
+    return value is not None and not math.isnan(value)
+
+
+def _min(current, value):
+    return value if current is None or value < current else current
+
+
+def _max(current, value):
+    return value if current is None or value > current else current
+
+
+class CIImporter:
+    """Normalise les exports d'API d'une plateforme en exécutions
+
+    Utilisation:
+        importer = CIImporter("github")
+        importer.add_file("runs.json")
+        importer.add_file("jobs.json")
+        for execution in importer.executions():
+            ...
+    """
+
+    def __init__(self, platform, aliases=None):
+        if platform not in PLATFORMS:
+            raise ValueError(f"Plateforme inconnue: {platform} (choix: {', '.join(PLATFORMS)})")
+        self.platform = platform
+        self.aliases = aliases or STAGE_ALIASES
+        self.pipelines = {}
+        self._stages = {}
+        self.jobs = 0
+        # Noms de jobs/stages sans stage canonique → nombre d'occurrences
+        self.unmapped = {}
+        self._add = {
+            "github": self._add_github,
+            "gitlab": self._add_gitlab,
+            "jenkins": self._add_jenkins,
+        }[platform]
+
+    def stage(self, *names):
+        """Stage canonique du premier nom reconnu (None si aucun)"""
+        for name in names:
+            if name:
+                # Les mêmes noms reviennent à chaque run
+                if name not in self._stages:
+                    self._stages[name] = self.aliases.get(alias_key(name))
+                if self._stages[name]:
+                    return self._stages[name]
+        return None
+
+    def _pipeline(self, key):
+        key = str(key)
+        if key not in self.pipelines:
+            self.pipelines[key] = {
+                "id": key,
+                "created": None,
+                "start": None,
+                "end": None,
+                "end_fallback": None,
+                "total": None,
+                "queue_time": None,
+                "branch": None,
+                "trigger": None,
+                "runner_type": None,
+                "finished": None,
+                "success": None,
+                "job_failed": False,
+                "job_start": None,
+                "job_end": None,
+                "stages": {},
+            }
+        return self.pipelines[key]
+
+    def _unmapped(self, name):
+        name = str(name)
+        self.unmapped[name] = self.unmapped.get(name, 0) + 1
+
+    def _add_stage(self, pipeline, stage, seconds):
+        if _known(seconds) and seconds > 0:
+            pipeline["stages"][stage] = pipeline["stages"].get(stage, 0.0) + seconds
+
+    def _add_job_span(self, pipeline, start, end):
+        if _known(start) and _known(end):
+            pipeline["job_start"] = _min(pipeline["job_start"], start)
+            pipeline["job_end"] = _max(pipeline["job_end"], end)
+
+    def add_file(self, path):
+        for data in iter_json_documents(path):
+            self.add_document(data)
+
+    def add_document(self, data):
+        """Ajoute un document d'export: objet, page d'API ou liste"""
+        if isinstance(data, list):
+            for item in data:
+                self.add_document(item)
+        elif isinstance(data, dict):
+            self._add(data)
+
+    # GitHub Actions
+
+    def _add_github(self, data):
+        if "workflow_runs" in data:
+            for run in data["workflow_runs"]:
+                self._github_run(run)
+        elif "jobs" in data and "workflow_id" not in data:
+            for job in data["jobs"]:
+                self._github_job(job)
+        elif "run_id" in data:
+            self._github_job(data)
+        elif "id" in data:
+            self._github_run(data)
+
+    def _github_run(self, run):
+        pipeline = self._pipeline(run["id"])
+        pipeline["attempt"] = run.get("run_attempt", 1)
+        pipeline["created"] = parse_timestamp(run.get("created_at"))
+        pipeline["start"] = parse_timestamp(run.get("run_started_at") or run.get("created_at"))
+        pipeline["end_fallback"] = parse_timestamp(run.get("updated_at"))
+        pipeline["branch"] = run.get("head_branch")
+        pipeline["trigger"] = run.get("event")
+        pipeline["finished"] = run.get("status") == "completed"
+        if run.get("conclusion"):
+            pipeline["success"] = run["conclusion"] == "success"
+        jobs = run.get("jobs")
+        if isinstance(jobs, dict):
+            jobs = jobs.get("jobs")
+        for job in jobs or ():
+            self._github_job(job, pipeline)
+
+    def _github_job(self, job, pipeline=None):
+        if pipeline is None:
+            pipeline = self._pipeline(job["run_id"])
+            pipeline.setdefault("attempt", job.get("run_attempt", 1))
+        self.jobs += 1
+        created = parse_timestamp(job.get("created_at"))
+        start = parse_timestamp(job.get("started_at"))
+        end = parse_timestamp(job.get("completed_at"))
+        if _known(created):
+            pipeline["job_created"] = _min(pipeline.get("job_created"), created)
+        if job.get("conclusion") in GITHUB_FAILURES:
+            pipeline["job_failed"] = True
+        if job.get("status") not in (None, "completed"):
+            pipeline["job_running"] = True
+        if job.get("conclusion") == "skipped":
+            return
+        self._add_job_span(pipeline, start, end)
+        if pipeline["runner_type"] is None and job.get("labels"):
+            pipeline["runner_type"] = job["labels"][0]
+        stage = self.stage(job.get("name"))
+        if stage:
+            self._add_stage(pipeline, stage, end - start)
+            return
+        # Job monolithique: ses steps portent les stages
+        mapped = False
+        for step in job.get("steps") or ():
+            step_stage = self.stage(step.get("name"))
+            if step_stage:
+                mapped = True
+                self._add_stage(pipeline, step_stage,
+                                parse_timestamp(step.get("completed_at")) - parse_timestamp(step.get("started_at")))
+        if not mapped:
+            self._unmapped(job.get("name"))
+
+    # GitLab CI
+
+    def _add_gitlab(self, data):
+        if isinstance(data.get("pipeline"), dict) and "stage" in data:
+            self._gitlab_job(data)
+        elif "id" in data:
+            self._gitlab_pipeline(data)
+
+    def _gitlab_pipeline(self, data):
+        pipeline = self._pipeline(data["id"])
+        pipeline["created"] = parse_timestamp(data.get("created_at"))
+        pipeline["start"] = parse_timestamp(data.get("started_at"))
+        pipeline["end"] = parse_timestamp(data.get("finished_at"))
+        pipeline["end_fallback"] = parse_timestamp(data.get("updated_at"))
+        if isinstance(data.get("duration"), (int, float)):
+            pipeline["total"] = float(data["duration"])
+        if isinstance(data.get("queued_duration"), (int, float)):
+            pipeline["queue_time"] = float(data["queued_duration"])
+        pipeline["branch"] = data.get("ref")
+        pipeline["trigger"] = data.get("source")
+        pipeline["finished"] = data.get("status") in GITLAB_FINISHED
+        if pipeline["finished"]:
+            pipeline["success"] = data["status"] == "success"
+        for job in data.get("jobs") or ():
+            self._gitlab_job(job, pipeline)
+
+    def _gitlab_job(self, job, pipeline=None):
+        if pipeline is None:
+            pipeline = self._pipeline(job["pipeline"]["id"])
+            if pipeline["branch"] is None:
+                pipeline["branch"] = job["pipeline"].get("ref")
+        if job.get("retried"):
+            return
+        self.jobs += 1
+        created = parse_timestamp(job.get("created_at"))
+        start = parse_timestamp(job.get("started_at"))
+        end = parse_timestamp(job.get("finished_at"))
+        if _known(created):
+            pipeline["job_created"] = _min(pipeline.get("job_created"), created)
+        if job.get("status") == "failed" and not job.get("allow_failure"):
+            pipeline["job_failed"] = True
+        if job.get("status") in ("created", "pending", "running", "waiting_for_resource", "preparing"):
+            pipeline["job_running"] = True
+        self._add_job_span(pipeline, start, end)
+        if pipeline["runner_type"] is None and isinstance(job.get("runner"), dict):
+            pipeline["runner_type"] = job["runner"].get("description")
+        stage = self.stage(job.get("name"), job.get("stage"))
+        if not stage:
+            self._unmapped(job.get("name"))
+            return
+        duration = job.get("duration")
+        seconds = float(duration) if isinstance(duration, (int, float)) else end - start
+        self._add_stage(pipeline, stage, seconds)
+
+    # Jenkins (wfapi)
+
+    def _add_jenkins(self, data):
+        if "stages" in data or "startTimeMillis" in data:
+            self._jenkins_run(data)
+
+    def _jenkins_run(self, data):
+        pipeline = self._pipeline(data["id"])
+        self.jobs += len(data.get("stages") or ())
+        start = _millis(data.get("startTimeMillis"))
+        queue = _millis(data.get("queueDurationMillis"))
+        pipeline["start"] = start
+        pipeline["created"] = start - queue if _known(queue) else start
+        pipeline["queue_time"] = queue if _known(queue) else None
+        duration = _millis(data.get("durationMillis"))
+        pause = _millis(data.get("pauseDurationMillis"))
+        if _known(duration):
+            pipeline["total"] = duration - (pause if _known(pause) else 0.0)
+        status = data.get("status")
+        pipeline["finished"] = status not in JENKINS_UNFINISHED
+        pipeline["success"] = status == "SUCCESS"
+        for stage_data in data.get("stages") or ():
+            if stage_data.get("status") == "NOT_EXECUTED":
+                continue
+            stage = self.stage(stage_data.get("name"))
+            if not stage:
+                self._unmapped(stage_data.get("name"))
+                continue
+            seconds = _millis(stage_data.get("durationMillis"))
+            stage_pause = _millis(stage_data.get("pauseDurationMillis"))
+            self._add_stage(pipeline, stage, seconds - (stage_pause if _known(stage_pause) else 0.0))
+
+    # Exécutions
+
+    def execution_id(self, pipeline):
+        if self.platform == "github":
+            attempt = pipeline.get("attempt") or 1
+            return f"run_{pipeline['id']}" + (f"_{attempt}" if attempt > 1 else "")
+        prefix = "pipeline" if self.platform == "gitlab" else "build"
+        return f"{prefix}_{pipeline['id']}"
+
+    def normalize(self, pipeline):
+        """Exécution au format des résultats, None si le run n'est pas terminé ou n'est pas daté"""
+        if pipeline["finished"] is False or pipeline.get("job_running"):
+            return None
+        created = pipeline["created"]
+        if not _known(created):
+            created = pipeline.get("job_created")
+        start = pipeline["start"] if _known(pipeline["start"]) else pipeline["job_start"]
+        if not _known(created):
+            created = start
+        end = pipeline["end"] if _known(pipeline["end"]) else pipeline["job_end"]
+        if not _known(end):
+            end = pipeline["end_fallback"]
+        if _known(start) and _known(end):
+            total = end - start
+        elif pipeline["total"] is not None:
+            total = pipeline["total"]
+        else:
+            return None
+        if not _known(created) or total <= 0:
+            return None
+        queue_time = pipeline["queue_time"]
+        if queue_time is None and _known(pipeline["job_start"]):
+            # Début du run (relance comprise) → premier job démarré
+            reference = pipeline["start"] if _known(pipeline["start"]) else created
+            queue_time = max(pipeline["job_start"] - reference, 0.0)
+        success = pipeline["success"]
+        if success is None:
+            success = not pipeline["job_failed"]
+        execution = {
+            "platform": self.platform,
+            "execution_id": self.execution_id(pipeline),
+            "timestamp": _iso(created),
+            "branch": pipeline["branch"],
+            "trigger": pipeline["trigger"],
+            "duration": {
+                "total": round(total, 3),
+                "stages": {stage: round(seconds, 3) for stage, seconds in pipeline["stages"].items()},
+            },
+            "success": success,
+            "queue_time": round(queue_time, 3) if queue_time is not None else 0,
+            "runner_type": pipeline["runner_type"],
+            "source": f"{self.platform}-api",
+        }
+        return {key: value for key, value in execution.items() if value is not None}
+
+    def executions(self):
+        """Exécutions terminées, par date de création"""
+        executions = (self.normalize(pipeline) for pipeline in self.pipelines.values())
+        return sorted((e for e in executions if e is not None), key=lambda e: (e["timestamp"], e["execution_id"]))
+
+
+def existing_ids(path):
+    """execution_id déjà présents dans un journal d'exécutions"""
+    if not Path(path).exists():
+        return set()
+    return {record.get("execution_id") for record in execlog.iter_records(path)}
+
+
+def write_executions(path, executions):
+    """Ajoute à un journal les exécutions valides qui n'y sont pas encore
+
+    Les exécutions sont validées avec le schéma de validate-data.py et
+    écrites en un seul bloc (données puis entrée d'index, voir execlog.py).
+    Retourne (ajoutées, déjà présentes, invalides, FileReport).
+    """
+    known = existing_ids(path)
+    validator = Validator()
+    report = FileReport(path)
+    accepted = []
+    duplicates = invalid = 0
+    for execution in executions:
+        if execution["execution_id"] in known:
+            duplicates += 1
+            continue
+        errors = report.error_count
+        validator.validate_execution(execution, report, execution["execution_id"])
+        if report.error_count > errors:
+            invalid += 1
+            continue
+        accepted.append(execution)
+        known.add(execution["execution_id"])
+    if accepted:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with execlog.ExecutionLogWriter(path, block_size=len(accepted)) as log:
+            for execution in accepted:
+                log.append(execution)
+    return len(accepted), duplicates, invalid, report
@@ -0,0 +1,274 @@
+"""
+Ingestion des rapports JUnit XML et historique des durées par test
+
+Les rapports (jest-junit pour backend/test-results.xml, reporter junit de
+Playwright pour e2e/) sont lus avec ElementTree.iterparse: chaque
+<testcase> est retiré de l'arbre dès qu'il est lu, la mémoire reste
+constante quelle que soit la taille du rapport. Les fichiers .xml.gz sont
+acceptés.
+
+Chaque test est identifié par (suite, classname, name) et produit un
+enregistrement {run, suite, classname, name, time, status}, status valant
+passed, failed, error ou skipped.
+
+TestHistory tient dans un répertoire:
+  - tests.jsonl.gz: journal en ajout seul de tous les enregistrements,
+    par run (execlog.py, blocs gzip indexés)
+  - tests_index.json: runs déjà ingérés et, par test, compteurs de statuts
+    et statistiques fusionnables des durées (RunningStats: moyenne,
+    écart-type, sketch de quantiles), mis à jour en O(1) par test
+Un run déjà ingéré (même identifiant) est ignoré: ré-ingérer un rapport ne
+change rien.
+"""
+
+import gzip
+import json
+import math
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+
+from . import execlog
+from .aggregates import RunningStats
+from .consolidation import write_json_atomic
+
+LOG_NAME = "tests.jsonl.gz"
+INDEX_NAME = "tests_index.json"
+INDEX_VERSION = 1
+
+STATUSES = ("passed", "failed", "error", "skipped")
+
+# Éléments enfants d'un <testcase> qui fixent son statut
+STATUS_ELEMENTS = {
+    "failure": "failed",
+    "error": "error",
+    "skipped": "skipped",
+}
+
+SORT_KEYS = ("total", "mean", "p95", "cv", "failures")
+
+TEST_FIELDS = (
+    "suite",
+    "classname",
+    "name",
+    "runs",
+    "failures",
+    "skipped",
+    "mean",
+    "p50",
+    "p95",
+    "max",
+    "std",
+    "cv",
+    "total",
+    "last_run",
+)
+
+
+def _open_report(path):
+    path = Path(path)
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _seconds(value):
+    """Attribut time → secondes (NaN si absent ou invalide)"""
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return math.nan
+
+
+def report_run_id(path):
+    """Identifiant de run par défaut: horodatage du premier <testsuite>, sinon le nom du fichier"""
+    with _open_report(path) as f:
+        for _, elem in ElementTree.iterparse(f, events=("start",)):
+            if elem.tag == "testsuite" and elem.get("timestamp"):
+                return elem.get("timestamp")
+    return Path(path).name
+
+
+def iter_testcases(path):
+    """Itère sur les tests d'un rapport JUnit en mémoire constante
+
+    Produit des dicts {suite, classname, name, time, status}.
+    """
+    stack = []
+    suites = []
+    with _open_report(path) as f:
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if elem.tag == "testsuite":
+                    suites.append(elem.get("name", ""))
+                continue
+            stack.pop()
+            if elem.tag == "testcase":
+                status = "passed"
+                for child in elem:
+                    if child.tag in STATUS_ELEMENTS:
+                        status = STATUS_ELEMENTS[child.tag]
+                        break
+                yield {
+                    "suite": suites[-1] if suites else "",
+                    "classname": elem.get("classname", ""),
+                    "name": elem.get("name", ""),
+                    "time": _seconds(elem.get("time")),
+                    "status": status,
+                }
+            elif elem.tag == "testsuite":
+                suites.pop()
+            else:
+                # failure, system-out...: retirés avec leur testcase
+                continue
+            # Élément traité: retiré de son parent pour ne pas garder l'arbre
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+
+
+class TestStats:
+    """Compteurs de statuts et durées d'un test"""
+
+    def __init__(self, suite, classname, name):
+        self.suite = suite
+        self.classname = classname
+        self.name = name
+        self.statuses = {status: 0 for status in STATUSES}
+        self.duration = RunningStats()
+        self.last_run = None
+
+    @property
+    def key(self):
+        return (self.suite, self.classname, self.name)
+
+    def add(self, record):
+        self.statuses[record["status"]] += 1
+        if record["status"] != "skipped":
+            self.duration.add(record["time"])
+        self.last_run = record["run"]
+
+    def to_dict(self):
+        return {
+            "suite": self.suite,
+            "classname": self.classname,
+            "name": self.name,
+            "statuses": self.statuses,
+            "last_run": self.last_run,
+            "duration": self.duration.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["suite"], data["classname"], data["name"])
+        stats.statuses.update(data["statuses"])
+        stats.last_run = data["last_run"]
+        stats.duration = RunningStats.from_dict(data["duration"])
+        return stats
+
+    def row(self):
+        """Ligne de rapport (TEST_FIELDS)"""
+        duration = self.duration
+        mean = duration.mean
+        return {
+            "suite": self.suite,
+            "classname": self.classname,
+            "name": self.name,
+            "runs": sum(self.statuses.values()),
+            "failures": self.statuses["failed"] + self.statuses["error"],
+            "skipped": self.statuses["skipped"],
+            "mean": mean,
+            "p50": duration.quantile(0.5) if duration.count else 0,
+            "p95": duration.quantile(0.95) if duration.count else 0,
+            "max": duration.max if duration.count else 0,
+            "std": duration.std,
+            "cv": duration.std / mean if mean else 0,
+            "total": duration.sum,
+            "last_run": self.last_run,
+        }
+
+
+class TestHistory:
+    """Historique des durées par test (journal des runs et index des statistiques)
+
+    Utilisation:
+        history = TestHistory.load("results/tests")
+        history.ingest("backend/test-results.xml")
+        history.save()
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.runs = []
+        self.tests = {}
+
+    @property
+    def log_path(self):
+        return self.directory / LOG_NAME
+
+    @property
+    def index_path(self):
+        return self.directory / INDEX_NAME
+
+    @classmethod
+    def load(cls, directory):
+        history = cls(directory)
+        if history.index_path.exists():
+            with open(history.index_path) as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError(f"Version d'index inconnue dans {history.index_path}: {data.get('version')}")
+            history.runs = data["runs"]
+            for entry in data["tests"]:
+                stats = TestStats.from_dict(entry)
+                history.tests[stats.key] = stats
+        return history
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.index_path, {
+            "version": INDEX_VERSION,
+            "runs": self.runs,
+            "tests": [stats.to_dict() for stats in self.tests.values()],
+        })
+
+    def ingest(self, path, run_id=None):
+        """Ajoute les tests d'un rapport; retourne le nombre de tests (0 si le run est déjà connu)"""
+        run_id = run_id or report_run_id(path)
+        if run_id in self.runs:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with execlog.ExecutionLogWriter(self.log_path) as log:
+            for record in iter_testcases(path):
+                record["run"] = run_id
+                log.append(record)
+                key = (record["suite"], record["classname"], record["name"])
+                if key not in self.tests:
+                    self.tests[key] = TestStats(*key)
+                self.tests[key].add(record)
+                count += 1
+        self.runs.append(run_id)
+        return count
+
+    def iter_records(self, run_id=None):
+        """Enregistrements du journal, éventuellement ceux d'un seul run"""
+        if not self.log_path.exists():
+            return
+        for record in execlog.iter_records(self.log_path):
+            if run_id is None or record["run"] == run_id:
+                yield record
+
+    def table(self, sort="total", top=None, suite=None, min_runs=1):
+        """Tests triés par sort (décroissant), filtrés sur suite/classname contenant suite"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Tri inconnu: {sort} (choix: {', '.join(SORT_KEYS)})")
+        rows = []
+        for stats in self.tests.values():
+            if suite and suite not in stats.suite and suite not in stats.classname:
+                continue
+            row = stats.row()
+            if row["runs"] >= min_runs:
+                rows.append(row)
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows[:top] if top else rows
@@ -0,0 +1,365 @@
+"""
+Chargeur columnaire partagé des exécutions de pipelines
+
+Chaque fichier JSON de results/performance/ est lu une seule fois et les
+exécutions sont converties en colonnes NumPy (une valeur par exécution).
+Les scripts d'analyse travaillent ensuite sur ces colonnes au lieu de
+reparcourir les dictionnaires imbriqués.
+
+Formats supportés (identiques à consolidate-data.py):
+  - exécution unique: {"platform": ..., "execution_id": ..., "duration": {...}}
+  - conteneur: {"platform": ..., "executions": [...]}
+  - liste d'exécutions: [{...}, {...}]
+  - ancien format de measure-performance.sh: "duration" numérique
+  - journaux JSON Lines (.jsonl, .jsonl.gz, .jsonl.zst): une exécution par
+    ligne, lus en flux bloc par bloc (voir execlog.py)
+
+Les fichiers produits par consolidate-data.py ({platform}_all.*,
+summary.json, manifeste) sont ignorés par load_executions pour ne pas
+compter deux fois les mêmes exécutions.
+"""
+
+import math
+
+import numpy as np
+
+from . import execlog
+from .parallel import map_chunks
+# Lecture des fichiers bruts, réexportée pour les scripts existants
+from .records import (
+    CONSOLIDATED_SUFFIXES,
+    MANIFEST_FILE,
+    PLATFORMS,
+    RESULT_PATTERNS,
+    STAGES,
+    SUMMARY_FILE,
+    is_consolidated_output,
+    iter_execution_records,
+    iter_file_documents,
+    list_result_files,
+    parse_timestamp,
+    platform_from_filename,
+    read_json_file,
+)
+
+PLATFORM_CODES = {platform: code for code, platform in enumerate(PLATFORMS)}
+STAGE_INDEX = {stage: index for index, stage in enumerate(STAGES)}
+
+# Valeur des colonnes booléennes (success, cache_hit) quand le champ est absent
+UNKNOWN = -1
+
+NUMERIC_COLUMNS = (
+    "platform",
+    "timestamp",
+    "total",
+    "stages",
+    "success",
+    "queue_time",
+    "cache_hit",
+    "cache_size_mb",
+    "artifact_size_mb",
+)
+STRING_COLUMNS = ("execution_id", "branch", "trigger", "runner_type")
+COLUMNS = NUMERIC_COLUMNS + STRING_COLUMNS
+
+
+def _number(value, default=math.nan):
+    """Retourne value en float si c'est un nombre, sinon default"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return default
+    return float(value)
+
+
+def _flag(value):
+    """Convertit un booléen JSON en 1/0, UNKNOWN si absent ou invalide"""
+    if isinstance(value, bool):
+        return int(value)
+    return UNKNOWN
+
+
+class ColumnBuilder:
+    """Accumule des exécutions puis les convertit en ExecutionColumns"""
+
+    def __init__(self):
+        self._values = {name: [] for name in COLUMNS}
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._values["platform"])
+
+    def append(self, platform, execution):
+        """Ajoute une exécution; retourne False si la plateforme est inconnue"""
+        code = PLATFORM_CODES.get(platform)
+        if code is None:
+            self.skipped += 1
+            return False
+
+        values = self._values
+        duration = execution.get("duration")
+        row = [math.nan] * len(STAGES)
+        if isinstance(duration, dict):
+            total = _number(duration.get("total"))
+            stages = duration.get("stages")
+            if isinstance(stages, dict):
+                for stage, stage_duration in stages.items():
+                    index = STAGE_INDEX.get(stage)
+                    if index is not None:
+                        row[index] = _number(stage_duration)
+        else:
+            total = _number(duration)
+
+        timestamp = execution.get("timestamp")
+        if timestamp is None:
+            timestamp = execution.get("start_time")
+        cache = execution.get("cache")
+        cache = cache if isinstance(cache, dict) else {}
+        artifacts = execution.get("artifacts")
+        artifacts = artifacts if isinstance(artifacts, dict) else {}
+
+        values["platform"].append(code)
+        values["timestamp"].append(parse_timestamp(timestamp))
+        values["total"].append(total)
+        values["stages"].append(row)
+        values["success"].append(_flag(execution.get("success")))
+        values["queue_time"].append(_number(execution.get("queue_time")))
+        values["cache_hit"].append(_flag(cache.get("hit")))
+        values["cache_size_mb"].append(_number(cache.get("size_mb")))
+        values["artifact_size_mb"].append(_number(artifacts.get("total_size_mb")))
+        for name in STRING_COLUMNS:
+            value = execution.get(name)
+            values[name].append(None if value is None else str(value))
+        return True
+
+    def extend_from_document(self, data, default_platform=None):
+        """Ajoute toutes les exécutions d'un document JSON déjà parsé"""
+        for platform, execution in iter_execution_records(data, default_platform):
+            self.append(platform, execution)
+
+    def build(self):
+        """Construit les colonnes NumPy"""
+        values = self._values
+        n = len(self)
+        stages = np.array(values["stages"], dtype=np.float64).reshape(n, len(STAGES))
+        return ExecutionColumns(
+            platform=np.array(values["platform"], dtype=np.int8),
+            timestamp=np.array(values["timestamp"], dtype=np.float64),
+            total=np.array(values["total"], dtype=np.float64),
+            stages=stages,
+            success=np.array(values["success"], dtype=np.int8),
+            queue_time=np.array(values["queue_time"], dtype=np.float64),
+            cache_hit=np.array(values["cache_hit"], dtype=np.int8),
+            cache_size_mb=np.array(values["cache_size_mb"], dtype=np.float64),
+            artifact_size_mb=np.array(values["artifact_size_mb"], dtype=np.float64),
+            **{name: _string_array(values[name]) for name in STRING_COLUMNS},
+        )
+
+
+def decode_strings(codes, table):
+    """Décode des codes de table de chaînes (-1 → None) en tableau d'objets"""
+    lookup = _string_array(list(table) + [None])
+    return lookup[np.asarray(codes)]
+
+
+def _string_array(values):
+    """Crée un tableau NumPy d'objets (str ou None) sans conversion implicite"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class ExecutionColumns:
+    """Exécutions stockées en colonnes NumPy
+
+    Colonnes:
+      platform          int8, index dans PLATFORMS
+      timestamp         float64, secondes epoch (NaN si absent)
+      total             float64, duration.total en secondes (NaN si absent)
+      stages            float64 (n, len(STAGES)), NaN si le stage est absent
+      success           int8, 1/0 ou UNKNOWN
+      queue_time        float64, secondes
+      cache_hit         int8, 1/0 ou UNKNOWN
+      cache_size_mb     float64
+      artifact_size_mb  float64
+      execution_id, branch, trigger, runner_type: tableaux d'objets (str/None)
+
+    Les colonnes de chaînes peuvent aussi être fournies encodées
+    (encoded={name: (codes, load_table)}, code -1 = None): elles ne sont
+    décodées qu'au premier accès (voir snapshot.py).
+    """
+
+    def __init__(self, encoded=None, **columns):
+        self._encoded = encoded or {}
+        for name in COLUMNS:
+            if name not in self._encoded:
+                setattr(self, name, columns[name])
+
+    def __getattr__(self, name):
+        encoded = self.__dict__.get("_encoded", {})
+        if name not in encoded:
+            raise AttributeError(name)
+        codes, load_table = encoded[name]
+        values = decode_strings(codes, load_table())
+        setattr(self, name, values)
+        return values
+
+    def __len__(self):
+        return len(self.platform)
+
+    @classmethod
+    def empty(cls):
+        return ColumnBuilder().build()
+
+    @classmethod
+    def concatenate(cls, chunks):
+        """Concatène plusieurs blocs de colonnes en conservant leur ordre"""
+        chunks = [chunk for chunk in chunks if len(chunk)]
+        if not chunks:
+            return cls.empty()
+        if len(chunks) == 1:
+            return chunks[0]
+        return cls(**{
+            name: np.concatenate([getattr(chunk, name) for chunk in chunks])
+            for name in COLUMNS
+        })
+
+    def select(self, mask):
+        """Retourne les exécutions sélectionnées par un masque ou des indices"""
+        columns = {}
+        encoded = {}
+        for name in COLUMNS:
+            if name in self.__dict__:
+                columns[name] = self.__dict__[name][mask]
+            else:
+                codes, load_table = self._encoded[name]
+                encoded[name] = (codes[mask], load_table)
+        return ExecutionColumns(encoded=encoded, **columns)
+
+    def platform_mask(self, platform):
+        return self.platform == PLATFORM_CODES[platform]
+
+    def for_platform(self, platform):
+        return self.select(self.platform_mask(platform))
+
+    def platforms(self):
+        """Plateformes présentes, dans l'ordre de PLATFORMS"""
+        present = np.unique(self.platform)
+        return [PLATFORMS[code] for code in present]
+
+    def stage(self, name):
+        """Colonne des durées d'un stage (NaN si absent)"""
+        return self.stages[:, STAGE_INDEX[name]]
+
+    def durations(self, platform=None):
+        """Durées totales valides (> 0), éventuellement filtrées par plateforme"""
+        total = self.total
+        mask = total > 0
+        if platform is not None:
+            mask &= self.platform_mask(platform)
+        return total[mask]
+
+    def stage_durations(self, stage, platform=None):
+        """Durées valides (> 0) d'un stage, éventuellement filtrées par plateforme"""
+        values = self.stage(stage)
+        mask = values > 0
+        if platform is not None:
+            mask &= self.platform_mask(platform)
+        return values[mask]
+
+    def success_counts(self, platform=None):
+        """Retourne (succès, échecs); les exécutions sans champ success sont ignorées"""
+        success = self.success
+        if platform is not None:
+            success = success[self.platform_mask(platform)]
+        return int(np.count_nonzero(success == 1)), int(np.count_nonzero(success == 0))
+
+
+def execution_keys(columns):
+    """Clés de déduplication des exécutions: platform:execution_id
+
+    Comme consolidation.execution_key, une exécution sans execution_id est
+    identifiée par son contenu (ici, ses valeurs en colonnes).
+    """
+    keys = []
+    numeric = np.column_stack([columns.timestamp, columns.total, columns.queue_time, columns.stages])
+    for row, (code, execution_id) in enumerate(zip(columns.platform, columns.execution_id)):
+        if execution_id is None:
+            keys.append((int(code), numeric[row].tobytes(), columns.branch[row], int(columns.success[row])))
+        else:
+            keys.append(f"{PLATFORMS[code]}:{execution_id}")
+    return keys
+
+
+def deduplicate(columns, seen=None):
+    """Garde la première exécution de chaque clé (voir execution_keys)
+
+    seen (ensemble de clés, mis à jour) permet de dédupliquer un flux de
+    blocs.
+    """
+    seen = set() if seen is None else seen
+    keep = np.zeros(len(columns), dtype=bool)
+    for row, key in enumerate(execution_keys(columns)):
+        if key not in seen:
+            seen.add(key)
+            keep[row] = True
+    return columns if keep.all() else columns.select(keep)
+
+
+def _load_chunk(paths):
+    """Charge un lot de fichiers en colonnes (exécuté dans un worker)"""
+    builder = ColumnBuilder()
+    for path in paths:
+        default_platform = platform_from_filename(path)
+        for data in iter_file_documents(path):
+            builder.extend_from_document(data, default_platform)
+    return builder.build()
+
+
+def load_files(paths, workers=1):
+    """Charge une liste de fichiers JSON en colonnes (ordre des fichiers conservé)
+
+    Avec workers > 1 (0 = tous les cœurs), les fichiers sont répartis en lots
+    sur un pool de processus; chaque worker renvoie un bloc de colonnes NumPy
+    et les blocs sont concaténés dans l'ordre des fichiers.
+    """
+    return ExecutionColumns.concatenate(map_chunks(_load_chunk, list(paths), workers))
+
+
+def load_executions(results_dir, patterns=RESULT_PATTERNS, workers=1, unique=False):
+    """Charge toutes les exécutions brutes d'un répertoire de résultats
+
+    Avec unique, les doublons (même platform:execution_id) ne sont comptés
+    qu'une fois, comme dans la consolidation.
+    """
+    columns = load_files(list_result_files(results_dir, patterns), workers)
+    return deduplicate(columns) if unique else columns
+
+
+def iter_column_blocks(path, start_block=0):
+    """Itère sur un journal d'exécutions bloc par bloc, en colonnes
+
+    La mémoire utilisée est bornée par la taille d'un bloc: les analyses sur
+    de longs historiques agrègent les blocs au fil de l'eau (ex:
+    aggregates.Summary.update_columns).
+    """
+    default_platform = platform_from_filename(path)
+    for block in execlog.iter_blocks(path, start_block):
+        builder = ColumnBuilder()
+        for data in block:
+            builder.extend_from_document(data, default_platform)
+        yield builder.build()
+
+
+def iter_file_columns(path):
+    """Itère sur un fichier de résultats bloc par bloc, en colonnes
+
+    Les journaux sont lus bloc par bloc (iter_column_blocks), les fichiers
+    JSON document par document.
+    """
+    if execlog.is_execution_log(path):
+        yield from iter_column_blocks(path)
+        return
+    default_platform = platform_from_filename(path)
+    for data in iter_file_documents(path):
+        builder = ColumnBuilder()
+        builder.extend_from_document(data, default_platform)
+        yield builder.build()
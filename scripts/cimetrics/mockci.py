@@ -0,0 +1,502 @@
+"""
+Serveur CI simulé (GitHub Actions, GitLab CI, Jenkins) pour les tests et les mesures de débit
+
+Un serveur HTTP/1.1 asyncio local sert, sous trois préfixes, les mêmes
+pipelines simulés avec les routes utilisées par collector.py:
+  - /github/repos/:owner/:repo/actions/...: runs, run, jobs, dispatches
+  - /gitlab/api/v4/projects/:id/...: pipelines, pipeline, jobs, POST pipeline
+  - /jenkins/job/:nom/...: api/json, :n/wfapi/describe, POST build, queue/item
+
+Chaque pipeline a des stages aux durées tirées (graine fixe) et un état
+calculé à chaque requête: un run déclenché est en cours jusqu'à la fin de
+ses stages, les derniers runs de l'historique peuvent l'être aussi
+(in_progress). Les durées rapportées sont connues (MockRun.stages), ce qui
+permet de vérifier qu'un collecteur les retrouve exactement.
+
+Comportements d'API reproduits: keep-alive, ETag et 304 (sans consommer
+le quota), limite de débit (429 + Retry-After; 403 + X-RateLimit-Reset pour
+GitHub), erreurs 502 aléatoires (fail_rate), latence par requête et
+réponses gzip.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Stage → (moyenne en secondes, vague): les stages d'une même vague sont parallèles
+STAGE_PROFILE = {
+    "lint_backend": (25.0, 0),
+    "lint_frontend": (18.0, 0),
+    "test_backend": (60.0, 0),
+    "test_frontend": (40.0, 0),
+    "build_frontend": (50.0, 1),
+    "e2e_tests": (240.0, 2),
+    "deploy": (20.0, 3),
+}
+
+# Noms des jobs/stages de chaque plateforme (.github/workflows/ci.yml, .gitlab-ci.yml, Jenkinsfile)
+JOB_NAMES = {
+    "github": {
+        "lint_backend": "Backend Lint",
+        "lint_frontend": "Frontend Lint",
+        "test_backend": "Backend Tests",
+        "test_frontend": "Frontend Tests",
+        "build_frontend": "Build Frontend",
+        "e2e_tests": "E2E Tests",
+        "deploy": "Deploy to Staging",
+    },
+    "gitlab": {
+        "lint_backend": ("backend-lint", "lint"),
+        "lint_frontend": ("frontend-lint", "lint"),
+        "test_backend": ("backend-test", "test"),
+        "test_frontend": ("frontend-test", "test"),
+        "build_frontend": ("build-frontend", "build"),
+        "e2e_tests": ("e2e-tests", "e2e"),
+        "deploy": ("deploy-staging", "deploy"),
+    },
+    "jenkins": {
+        "lint_backend": "Lint Backend",
+        "lint_frontend": "Lint Frontend",
+        "test_backend": "Backend Tests",
+        "test_frontend": "Frontend Tests",
+        "build_frontend": "Build",
+        "e2e_tests": "E2E Tests",
+        "deploy": "Deploy",
+    },
+}
+
+GITHUB_ID_OFFSET = 10000
+GITLAB_ID_OFFSET = 5000
+HISTORY_INTERVAL = 600
+GZIP_MIN_SIZE = 1024
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified", 403: "Forbidden",
+           404: "Not Found", 429: "Too Many Requests", 502: "Bad Gateway"}
+
+
+def _iso(seconds):
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class MockRun:
+    """Pipeline simulé: création, attente en file et stages (début relatif, durée)"""
+
+    def __init__(self, index, created, queue, stages, success, event="push", branch="main"):
+        self.index = index
+        self.created = created
+        self.queue = queue
+        # stage → (début relatif au démarrage, durée)
+        self.stages = stages
+        self.success = success
+        self.event = event
+        self.branch = branch
+
+    @property
+    def started(self):
+        return self.created + self.queue
+
+    @property
+    def finished(self):
+        return self.started + max(offset + duration for offset, duration in self.stages.values())
+
+    @property
+    def span(self):
+        return self.finished - self.started
+
+    def durations(self):
+        return {stage: duration for stage, (_, duration) in self.stages.items()}
+
+
+def make_run(index, created, rng, scale=1.0, event="push"):
+    """Pipeline aux durées tirées; scale ramène toutes les durées à l'échelle voulue"""
+    durations = {stage: round(max(rng.gauss(mean, mean * 0.1), 1.0) * scale, 3)
+                 for stage, (mean, _) in STAGE_PROFILE.items()}
+    success = rng.random() >= 0.1
+    if not success:
+        # e2e en échec: pas de déploiement
+        del durations["deploy"]
+    stages = {}
+    wave_start = 0.0
+    for wave in sorted({wave for _, wave in STAGE_PROFILE.values()}):
+        wave_stages = [stage for stage, (_, w) in STAGE_PROFILE.items() if w == wave and stage in durations]
+        for stage in wave_stages:
+            stages[stage] = (round(wave_start, 3), durations[stage])
+        if wave_stages:
+            wave_start += max(durations[stage] for stage in wave_stages)
+    return MockRun(index, created, round(rng.uniform(1, 10) * scale, 3), stages, success, event)
+
+
+class MockCI:
+    """Serveur CI simulé
+
+    Utilisation:
+        server = MockCI(runs=300, latency=0.01)
+        await server.start()
+        ... server.base_url("github") ...
+        await server.close()
+    """
+
+    def __init__(self, runs=100, latency=0.0, rate_limit=None, rate_window=1.0, fail_rate=0.0,
+                 run_seconds=1.0, queue_delay=0.05, in_progress=0, seed=0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.fail_rate = fail_rate
+        self.run_seconds = run_seconds
+        self.queue_delay = queue_delay
+        self.rng = random.Random(seed)
+        now = time.time()
+        self.runs = []
+        for index in range(runs):
+            created = round(now - (runs - index) * HISTORY_INTERVAL - 3600)
+            self.runs.append(make_run(index, created, self.rng))
+        # Derniers runs encore en cours: ils se terminent run_seconds plus tard
+        for run in self.runs[len(self.runs) - in_progress:] if in_progress else ():
+            self._reschedule(run, now)
+        self.queue_items = {}
+        self.server = None
+        self._writers = set()
+        self._tasks = set()
+        self.host = "127.0.0.1"
+        self.port = None
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        # Statistiques: connexions, requêtes et réponses par statut
+        self.connections = 0
+        self.requests = 0
+        self.statuses = {}
+
+    def _reschedule(self, run, created):
+        """Recale un run pour qu'il démarre à created et dure run_seconds"""
+        total = sum(STAGE_PROFILE[stage][0] for stage in ("test_backend", "build_frontend", "e2e_tests", "deploy"))
+        fresh = make_run(run.index, created, self.rng, self.run_seconds / total, run.event)
+        run.created, run.queue, run.stages, run.success = fresh.created, fresh.queue, fresh.stages, fresh.success
+
+    def trigger(self, event="workflow_dispatch"):
+        run = MockRun(len(self.runs), 0, 0, {}, True, event)
+        self._reschedule(run, time.time())
+        self.runs.append(run)
+        return run
+
+    def base_url(self, platform):
+        prefix = {"github": "/github", "gitlab": "/gitlab/api/v4", "jenkins": "/jenkins"}[platform]
+        return f"http://{self.host}:{self.port}{prefix}"
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._handle, host, port)
+        self.host = host
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Connexions keep-alive encore ouvertes: fermées avant l'arrêt
+            for writer in self._writers:
+                writer.close()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.server.wait_closed()
+
+    # HTTP
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        self._tasks.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, response_headers, body = self.respond(method, target, headers)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                if body and len(body) >= GZIP_MIN_SIZE and "gzip" in headers.get("accept-encoding", ""):
+                    body = gzip.compress(body, 1)
+                    response_headers["Content-Encoding"] = "gzip"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Length: {len(body)}"]
+                head += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self._writers.discard(writer)
+            self._tasks.discard(asyncio.current_task())
+
+    def _rate_limited(self, github):
+        """Réponse de limite de débit si le quota de la fenêtre est épuisé, sinon None"""
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        if now - self._window_start >= self.rate_window:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        if self._window_count <= self.rate_limit:
+            return None
+        wait = self._window_start + self.rate_window - now
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": f"{time.time() + wait:.3f}"}
+        if github:
+            return 403, headers, b'{"message": "API rate limit exceeded"}'
+        headers["Retry-After"] = f"{wait:.3f}"
+        return 429, headers, b'{"message": "Too Many Requests"}'
+
+    def respond(self, method, target, headers):
+        """(statut, en-têtes, corps) d'une requête"""
+        url = urlsplit(target)
+        path = unquote(url.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            return 502, {}, b"Bad Gateway"
+        result = self.route(method, path, query)
+        if result is None:
+            return 404, {}, b'{"message": "Not Found"}'
+        status, data, extra = result
+        body = json.dumps(data).encode() if data is not None else b""
+        response_headers = dict(extra)
+        response_headers["Content-Type"] = "application/json"
+        if method == "GET" and status == 200:
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            response_headers["ETag"] = etag
+            # Requête conditionnelle satisfaite: ne compte pas dans le quota
+            if headers.get("if-none-match") == etag:
+                return 304, {"ETag": etag}, b""
+        limited = self._rate_limited(path.startswith("/github/"))
+        if limited:
+            return limited
+        return status, response_headers, body
+
+    def route(self, method, path, query):
+        """(statut, données JSON, en-têtes) pour une route connue, None sinon"""
+        now = time.time()
+        for (route_method, pattern), handler in self._routes():
+            match = re.fullmatch(pattern, path)
+            if match and route_method == method:
+                return handler(now, query, *match.groups())
+        return None
+
+    def _routes(self):
+        github = r"/github/repos/[^/]+/[^/]+/actions"
+        gitlab = r"/gitlab/api/v4/projects/[^/]+"
+        jenkins = r"/jenkins/job/[^/]+"
+        return (
+            (("GET", github + r"(?:/workflows/[^/]+)?/runs"), self._github_runs),
+            (("GET", github + r"/runs/(\d+)"), self._github_run),
+            (("GET", github + r"/runs/(\d+)/jobs"), self._github_jobs),
+            (("POST", github + r"/workflows/[^/]+/dispatches"), self._github_dispatch),
+            (("GET", gitlab + r"/pipelines"), self._gitlab_pipelines),
+            (("GET", gitlab + r"/pipelines/(\d+)"), self._gitlab_pipeline),
+            (("GET", gitlab + r"/pipelines/(\d+)/jobs"), self._gitlab_jobs),
+            (("POST", gitlab + r"/pipeline"), self._gitlab_trigger),
+            (("GET", jenkins + r"/api/json"), self._jenkins_builds),
+            (("GET", jenkins + r"/(\d+)/wfapi/describe"), self._jenkins_describe),
+            (("POST", jenkins + r"/build"), self._jenkins_trigger),
+            (("GET", r"/jenkins/queue/item/(\d+)/api/json"), self._jenkins_queue_item),
+        )
+
+    def _run(self, run_id, offset=0):
+        index = int(run_id) - offset
+        return self.runs[index] if 0 <= index < len(self.runs) else None
+
+    def _page(self, items, query):
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        return items[(page - 1) * per_page:page * per_page]
+
+    def _stage_state(self, run, stage, now):
+        """(début, fin ou None si en cours) d'un stage à l'instant now, None s'il n'a pas démarré"""
+        offset, duration = run.stages[stage]
+        start = run.started + offset
+        if now < start:
+            return None
+        end = start + duration
+        return start, (end if now >= end else None)
+
+    # GitHub
+
+    def _github_run_data(self, run, now):
+        done = now >= run.finished
+        return {
+            "id": GITHUB_ID_OFFSET + run.index,
+            "name": "BMI App CI/CD",
+            "workflow_id": 1,
+            "run_attempt": 1,
+            "head_branch": run.branch,
+            "event": run.event,
+            "status": "completed" if done else "in_progress",
+            "conclusion": ("success" if run.success else "failure") if done else None,
+            "created_at": _iso(run.created),
+            "run_started_at": _iso(run.created),
+            "updated_at": _iso(run.finished if done else run.started),
+        }
+
+    def _github_runs(self, now, query):
+        runs = [run for run in reversed(self.runs) if query.get("event") in (None, run.event)]
+        page = self._page(runs, query)
+        return 200, {"total_count": len(runs), "workflow_runs": [self._github_run_data(run, now) for run in page]}, {}
+
+    def _github_run(self, now, query, run_id):
+        run = self._run(run_id, GITHUB_ID_OFFSET)
+        return (200, self._github_run_data(run, now), {}) if run else None
+
+    def _github_jobs(self, now, query, run_id):
+        run = self._run(run_id, GITHUB_ID_OFFSET)
+        if run is None:
+            return None
+        jobs = []
+        for number, stage in enumerate(run.stages, 1):
+            state = self._stage_state(run, stage, now)
+            start, end = state if state else (None, None)
+            failed = stage == "e2e_tests" and not run.success
+            jobs.append({
+                "id": (GITHUB_ID_OFFSET + run.index) * 100 + number,
+                "run_id": GITHUB_ID_OFFSET + run.index,
+                "run_attempt": 1,
+                "name": JOB_NAMES["github"][stage],
+                "status": "completed" if end else ("in_progress" if start else "queued"),
+                "conclusion": ("failure" if failed else "success") if end else None,
+                "created_at": _iso(run.started + run.stages[stage][0]),
+                "started_at": _iso(start),
+                "completed_at": _iso(end),
+                "labels": ["ubuntu-latest"],
+                "steps": [],
+            })
+        page = self._page(jobs, query)
+        return 200, {"total_count": len(jobs), "jobs": page}, {}
+
+    def _github_dispatch(self, now, query):
+        self.trigger("workflow_dispatch")
+        return 204, None, {}
+
+    # GitLab
+
+    def _gitlab_pipeline_data(self, run, now):
+        done = now >= run.finished
+        return {
+            "id": GITLAB_ID_OFFSET + run.index,
+            "status": ("success" if run.success else "failed") if done else "running",
+            "source": run.event,
+            "ref": run.branch,
+            "created_at": _iso(run.created),
+            "updated_at": _iso(run.finished if done else run.started),
+            "started_at": _iso(run.started),
+            "finished_at": _iso(run.finished) if done else None,
+            "duration": round(run.span) if done else None,
+            "queued_duration": run.queue,
+        }
+
+    def _gitlab_pipelines(self, now, query):
+        page = self._page(list(reversed(self.runs)), query)
+        return 200, [self._gitlab_pipeline_data(run, now) for run in page], {}
+
+    def _gitlab_pipeline(self, now, query, pipeline_id):
+        run = self._run(pipeline_id, GITLAB_ID_OFFSET)
+        return (200, self._gitlab_pipeline_data(run, now), {}) if run else None
+
+    def _gitlab_jobs(self, now, query, pipeline_id):
+        run = self._run(pipeline_id, GITLAB_ID_OFFSET)
+        if run is None:
+            return None
+        jobs = []
+        for number, stage in enumerate(run.stages, 1):
+            state = self._stage_state(run, stage, now)
+            start, end = state if state else (None, None)
+            failed = stage == "e2e_tests" and not run.success
+            name, gitlab_stage = JOB_NAMES["gitlab"][stage]
+            jobs.append({
+                "id": (GITLAB_ID_OFFSET + run.index) * 100 + number,
+                "name": name,
+                "stage": gitlab_stage,
+                "status": ("failed" if failed else "success") if end else ("running" if start else "pending"),
+                "allow_failure": False,
+                "created_at": _iso(run.created),
+                "started_at": _iso(start),
+                "finished_at": _iso(end),
+                "duration": round(end - start, 3) if end else None,
+                "pipeline": {"id": GITLAB_ID_OFFSET + run.index, "ref": run.branch},
+                "runner": {"description": "mock-runner"},
+            })
+        return 200, self._page(jobs, query), {}
+
+    def _gitlab_trigger(self, now, query):
+        run = self.trigger("api")
+        return 201, self._gitlab_pipeline_data(run, now), {}
+
+    # Jenkins
+
+    def _jenkins_describe_data(self, run, now):
+        done = now >= run.finished
+        stages = []
+        for number, stage in enumerate(run.stages, 1):
+            state = self._stage_state(run, stage, now)
+            if state is None:
+                continue
+            start, end = state
+            failed = stage == "e2e_tests" and not run.success
+            stages.append({
+                "id": str(number),
+                "name": JOB_NAMES["jenkins"][stage],
+                "status": ("FAILED" if failed else "SUCCESS") if end else "IN_PROGRESS",
+                "startTimeMillis": round(start * 1000),
+                "durationMillis": round(((end or now) - start) * 1000),
+                "pauseDurationMillis": 0,
+            })
+        return {
+            "id": str(run.index + 1),
+            "name": f"#{run.index + 1}",
+            "status": ("SUCCESS" if run.success else "FAILURE") if done else "IN_PROGRESS",
+            "startTimeMillis": round(run.started * 1000),
+            "endTimeMillis": round(run.finished * 1000) if done else 0,
+            "durationMillis": round((min(now, run.finished) - run.started) * 1000),
+            "queueDurationMillis": round(run.queue * 1000),
+            "pauseDurationMillis": 0,
+            "stages": stages,
+        }
+
+    def _jenkins_builds(self, now, query):
+        match = re.search(r"\{(\d+),(\d+)\}", query.get("tree", ""))
+        builds = [{"number": run.index + 1} for run in reversed(self.runs)]
+        if match:
+            builds = builds[int(match.group(1)):int(match.group(2))]
+        return 200, {"builds": builds}, {}
+
+    def _jenkins_describe(self, now, query, number):
+        run = self._run(number, 1)
+        return (200, self._jenkins_describe_data(run, now), {}) if run else None
+
+    def _jenkins_trigger(self, now, query):
+        item = len(self.queue_items) + 1
+        self.queue_items[item] = now
+        return 201, None, {"Location": f"http://{self.host}:{self.port}/jenkins/queue/item/{item}/"}
+
+    def _jenkins_queue_item(self, now, query, item):
+        queued = self.queue_items.get(int(item))
+        if queued is None:
+            return None
+        data = {"id": int(item), "cancelled": False, "executable": None}
+        # Élément en file (date d'entrée) jusqu'à queue_delay, puis build
+        if not isinstance(queued, MockRun) and now - queued >= self.queue_delay:
+            queued = self.queue_items[int(item)] = self.trigger("manual")
+        if isinstance(queued, MockRun):
+            data["executable"] = {"number": queued.index + 1}
+        return 200, data, {}
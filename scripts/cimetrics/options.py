@@ -0,0 +1,74 @@
+"""
+Lecture des options --nom VALEUR des scripts
+
+Les scripts gardent leurs arguments positionnels historiques (sys.argv); les
+options sont retirées de argv avant leur lecture. Les scripts lisent leurs
+options dans un bloc usage_on_error: une valeur manquante ou invalide
+affiche l'erreur et l'usage au lieu d'une trace d'exception.
+"""
+
+import sys
+from contextlib import contextmanager
+
+
+def pop_option(argv, name, default=None, convert=str):
+    """Extrait --name VALEUR (ou --name=VALEUR) de argv; retourne (valeur, argv restant)
+
+    ValueError si la valeur manque ou si convert la refuse.
+    """
+    flag = f"--{name}"
+    value = default
+    remaining = []
+    args = iter(argv)
+    for arg in args:
+        if arg == flag:
+            raw = next(args, None)
+            if raw is None:
+                raise ValueError(f"{flag} attend une valeur")
+            value = _convert(flag, raw, convert)
+        elif arg.startswith(flag + "="):
+            value = _convert(flag, arg.split("=", 1)[1], convert)
+        else:
+            remaining.append(arg)
+    return value, remaining
+
+
+def _convert(flag, raw, convert):
+    try:
+        return convert(raw)
+    except ValueError:
+        raise ValueError(f"{flag}: valeur invalide: {raw}") from None
+
+
+def exit_with_usage(message, print_usage):
+    """Affiche l'erreur puis l'usage du script et quitte (code 1)"""
+    print(f"❌ {message}")
+    print_usage()
+    sys.exit(1)
+
+
+@contextmanager
+def usage_on_error(print_usage):
+    """Bloc de lecture des options: une ValueError (valeur manquante ou invalide) quitte avec l'usage"""
+    try:
+        yield
+    except ValueError as e:
+        exit_with_usage(e, print_usage)
+
+
+def reject_unknown_options(argv, print_usage):
+    """Quitte avec l'usage si des options inconnues restent dans argv"""
+    unknown = unknown_options(argv)
+    if unknown:
+        exit_with_usage(f"Option inconnue: {' '.join(unknown)}", print_usage)
+
+
+def unknown_options(argv):
+    """Options (--...) restées dans argv après l'extraction des options connues"""
+    return [arg for arg in argv if arg.startswith("--")]
+
+
+def pop_flag(argv, name):
+    """Extrait --name de argv; retourne (présent, argv restant)"""
+    flag = f"--{name}"
+    return flag in argv, [arg for arg in argv if arg != flag]
@@ -0,0 +1,103 @@
+"""
+Exécution parallèle par lots sur un pool de processus
+
+Les listes de fichiers sont découpées en lots contigus traités par un
+ProcessPoolExecutor; les résultats sont renvoyés dans l'ordre des lots, de
+sorte que la sortie est identique à celle du mode séquentiel.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .options import pop_option
+
+# Nombre de lots par worker: assez pour équilibrer la charge, assez peu pour
+# limiter le coût de sérialisation des résultats
+CHUNKS_PER_WORKER = 4
+
+# Nombre de workers par défaut des scripts (sans --workers)
+WORKERS_VARIABLE = "CIMETRICS_WORKERS"
+
+# En dessous de ce nombre d'éléments, le démarrage du pool coûte plus cher
+# que le travail lui-même
+MIN_PARALLEL_ITEMS = 64
+
+
+def resolve_workers(workers):
+    """Nombre de workers effectif: None/1 → séquentiel, 0 ou négatif → tous les cœurs"""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def split_chunks(items, n_chunks):
+    """Découpe items en n_chunks lots contigus de tailles équilibrées"""
+    n_chunks = max(1, min(n_chunks, len(items)))
+    size, extra = divmod(len(items), n_chunks)
+    chunks = []
+    start = 0
+    for index in range(n_chunks):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def map_chunks(func, items, workers=1, min_items=MIN_PARALLEL_ITEMS):
+    """Applique func(lot) à des lots contigus de items; retourne la liste ordonnée des résultats
+
+    func doit être une fonction de niveau module (sérialisable par pickle).
+    min_items est le seuil en dessous duquel le travail reste séquentiel (à
+    abaisser quand chaque élément est coûteux).
+    """
+    return list(imap_chunks(func, items, workers, min_items))
+
+
+def imap_chunks(func, items, workers=1, min_items=MIN_PARALLEL_ITEMS, max_chunk_size=None):
+    """Comme map_chunks, mais produit les résultats des lots au fur et à mesure, dans l'ordre
+
+    Avec max_chunk_size, les lots sont plus petits (donc plus nombreux): les
+    premiers résultats arrivent plus tôt. Si l'appelant arrête l'itération,
+    les lots pas encore commencés sont annulés.
+    """
+    items = list(items)
+    if not items:
+        return
+    workers = resolve_workers(workers)
+    parallel = workers > 1 and len(items) >= min_items
+    n_chunks = workers * CHUNKS_PER_WORKER if parallel else 1
+    if max_chunk_size:
+        n_chunks = max(n_chunks, -(-len(items) // max_chunk_size))
+    chunks = split_chunks(items, n_chunks)
+    if not parallel:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(func, chunks)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def pop_workers_option(argv):
+    """Extrait --workers N (ou --workers=N) de argv; retourne (workers, argv restant)
+
+    Sans l'option, la valeur de la variable d'environnement CIMETRICS_WORKERS
+    est utilisée (1 par défaut).
+    """
+    return pop_option(argv, "workers", default_workers(), int)
+
+
+def default_workers():
+    """Workers de CIMETRICS_WORKERS; 1 (avec un avertissement) si la variable n'est pas un entier"""
+    value = os.environ.get(WORKERS_VARIABLE, "1")
+    try:
+        return int(value)
+    except ValueError:
+        # Sur stderr: certains scripts écrivent leur rapport sur stdout
+        print(f"⚠️  {WORKERS_VARIABLE}={value} invalide (entier attendu): 1 worker", file=sys.stderr)
+        return 1
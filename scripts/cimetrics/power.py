@@ -0,0 +1,134 @@
+"""
+Planification du nombre d'exécutions (puissance statistique et précision)
+
+Chaque exécution de benchmark coûte des minutes de CI: le nombre
+d'exécutions est déduit de la variabilité observée (coefficient de
+variation CV = écart-type / moyenne, voir stats.py) au lieu d'être fixé à
+10.
+  - runs_for_effect: exécutions par plateforme pour détecter une
+    différence relative des moyennes effect (test t bilatéral à deux
+    échantillons, risque alpha, puissance power):
+    n = 2 × (t(1 - alpha/2) + t(power))² × (CV / effect)²
+  - runs_for_precision: exécutions pour que la demi-largeur relative de
+    l'intervalle de confiance de la moyenne soit au plus precision:
+    n = (t(1 - (1 - confidence)/2) × CV / precision)²
+Les quantiles t dépendent de n: la formule est itérée jusqu'à un point
+fixe, pour toutes les cellules à la fois.
+
+Arrêt adaptatif (should_stop): les mesures continuent tant que la
+demi-largeur relative de l'IC de la moyenne dépasse la cible.
+
+scipy (quantiles t) n'est importé qu'à l'appel, comme dans stats.py.
+"""
+
+import numpy as np
+
+from .stats import statistics_table
+
+DEFAULT_ALPHA = 0.05
+DEFAULT_POWER = 0.8
+DEFAULT_EFFECT = 0.10
+DEFAULT_PRECISION = 0.05
+DEFAULT_CONFIDENCE = 0.95
+
+# En dessous, ni l'écart-type ni l'intervalle de confiance ne sont fiables
+MIN_RUNS = 3
+
+# Itérations du point fixe sur n (converge en quelques pas)
+MAX_ITERATIONS = 20
+
+PLAN_FIELDS = (
+    "platform",
+    "stage",
+    "count",
+    "mean",
+    "cv",
+    "precision",
+    "detectable_effect",
+    "runs_for_effect",
+    "runs_for_precision",
+)
+
+
+def runs_for_effect(cv, effect=DEFAULT_EFFECT, alpha=DEFAULT_ALPHA, power=DEFAULT_POWER):
+    """Exécutions par plateforme pour détecter un écart relatif effect (cv et effect en fractions)"""
+    from scipy import stats
+
+    ratio = (np.asarray(cv, dtype=np.float64) / effect) ** 2
+    n = np.full(ratio.shape, float(MIN_RUNS))
+    for _ in range(MAX_ITERATIONS):
+        df = np.maximum(2 * n - 2, 1)
+        n = 2 * (stats.t.ppf(1 - alpha / 2, df) + stats.t.ppf(power, df)) ** 2 * ratio
+        n = np.maximum(np.ceil(n), MIN_RUNS)
+    return n.astype(np.int64)
+
+
+def runs_for_precision(cv, precision=DEFAULT_PRECISION, confidence=DEFAULT_CONFIDENCE):
+    """Exécutions pour un IC de la moyenne de demi-largeur relative au plus precision"""
+    from scipy import stats
+
+    ratio = (np.asarray(cv, dtype=np.float64) / precision) ** 2
+    n = np.full(ratio.shape, float(MIN_RUNS))
+    for _ in range(MAX_ITERATIONS):
+        n = stats.t.ppf((1 + confidence) / 2, np.maximum(n - 1, 1)) ** 2 * ratio
+        n = np.maximum(np.ceil(n), MIN_RUNS)
+    return n.astype(np.int64)
+
+
+def detectable_effect(cv, n, alpha=DEFAULT_ALPHA, power=DEFAULT_POWER):
+    """Plus petit écart relatif détectable avec n exécutions par plateforme"""
+    from scipy import stats
+
+    n = np.asarray(n, dtype=np.float64)
+    df = np.maximum(2 * n - 2, 1)
+    return (stats.t.ppf(1 - alpha / 2, df) + stats.t.ppf(power, df)) * np.asarray(cv) * np.sqrt(2 / n)
+
+
+def relative_precision(values, confidence=DEFAULT_CONFIDENCE):
+    """Demi-largeur relative de l'IC de la moyenne (inf avec moins de 2 valeurs)"""
+    from scipy import stats
+
+    values = np.asarray(values, dtype=np.float64)
+    values = values[values > 0]
+    if len(values) < 2:
+        return np.inf
+    half_width = stats.t.ppf((1 + confidence) / 2, len(values) - 1) * values.std(ddof=1) / np.sqrt(len(values))
+    return float(half_width / values.mean())
+
+
+def should_stop(values, precision=DEFAULT_PRECISION, confidence=DEFAULT_CONFIDENCE, min_runs=MIN_RUNS):
+    """Arrêt adaptatif: retourne (arrêter ?, demi-largeur relative actuelle)"""
+    current = relative_precision(values, confidence)
+    return bool(np.count_nonzero(np.asarray(values) > 0) >= min_runs and current <= precision), current
+
+
+def plan_table(columns, effect=DEFAULT_EFFECT, alpha=DEFAULT_ALPHA, power=DEFAULT_POWER,
+               precision=DEFAULT_PRECISION, confidence=DEFAULT_CONFIDENCE):
+    """Nombre d'exécutions recommandé pour chaque cellule plateforme × stage
+
+    cv est en % (comme dans statistics_table); precision et
+    detectable_effect sont les valeurs atteintes avec les exécutions déjà
+    mesurées.
+    """
+    table = [row for row in statistics_table(columns, confidence) if row["cv"] is not None]
+    if not table:
+        return []
+    cv = np.array([row["cv"] for row in table]) / 100
+    counts = np.array([row["count"] for row in table])
+    by_effect = runs_for_effect(cv, effect, alpha, power)
+    by_precision = runs_for_precision(cv, precision, confidence)
+    detectable = detectable_effect(cv, counts, alpha, power)
+    rows = []
+    for k, row in enumerate(table):
+        rows.append({
+            "platform": row["platform"],
+            "stage": row["stage"],
+            "count": row["count"],
+            "mean": row["mean"],
+            "cv": row["cv"],
+            "precision": (row["ci_95_upper"] - row["mean"]) / row["mean"],
+            "detectable_effect": float(detectable[k]),
+            "runs_for_effect": int(by_effect[k]),
+            "runs_for_precision": int(by_precision[k]),
+        })
+    return rows
@@ -0,0 +1,130 @@
+"""
+Lecture des fichiers de résultats bruts (sans dépendance scientifique)
+
+Plateformes et stages connus, formats de documents acceptés et liste des
+fichiers de résultats. Ce module n'importe que la bibliothèque standard:
+les outils légers (validate-data.py) l'utilisent sans charger numpy;
+loader.py le complète avec le chargement en colonnes NumPy.
+"""
+
+import fnmatch
+import json
+import math
+import os
+from datetime import datetime
+from pathlib import Path
+
+from . import execlog
+
+PLATFORMS = ("github", "gitlab", "jenkins")
+
+STAGES = (
+    "lint_backend",
+    "lint_frontend",
+    "test_backend",
+    "test_frontend",
+    "build_frontend",
+    "e2e_tests",
+    "docker_build",
+    "deploy",
+)
+
+# Fichiers générés par consolidate-data.py dans le répertoire des résultats
+CONSOLIDATED_SUFFIXES = ("_all.json",) + tuple("_all" + suffix for suffix in execlog.LOG_SUFFIXES)
+SUMMARY_FILE = "summary.json"
+MANIFEST_FILE = ".consolidation-manifest.json"
+KEYS_FILE = ".consolidation-keys.tsv"
+
+# Fichiers de résultats bruts: documents JSON et journaux d'exécutions
+RESULT_PATTERNS = ("*.json",) + tuple("*" + suffix for suffix in execlog.LOG_SUFFIXES)
+
+
+def parse_timestamp(value):
+    """Convertit un timestamp (ISO 8601 ou epoch) en secondes epoch, NaN si invalide"""
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def iter_execution_records(data, default_platform=None):
+    """Itère sur les exécutions d'un document JSON, quel que soit son format
+
+    Produit des tuples (platform, execution). La plateforme vient de
+    l'exécution, puis du conteneur, puis de default_platform (nom du fichier).
+    """
+    if isinstance(data, list):
+        for execution in data:
+            if isinstance(execution, dict):
+                yield execution.get("platform", default_platform), execution
+    elif isinstance(data, dict):
+        if "executions" in data:
+            platform = data.get("platform", default_platform)
+            for execution in data["executions"]:
+                if isinstance(execution, dict):
+                    yield execution.get("platform", platform), execution
+        else:
+            yield data.get("platform", default_platform), data
+
+
+def read_json_file(path):
+    """Lit un fichier JSON, affiche un avertissement et retourne None en cas d'erreur"""
+    path = Path(path)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Erreur lors de la lecture de {path.name}: {e}")
+        return None
+
+
+def iter_file_documents(path):
+    """Itère sur les documents JSON d'un fichier de résultats
+
+    Un fichier .json produit un seul document; un journal JSON Lines produit
+    une exécution par ligne, lue en flux.
+    """
+    if execlog.is_execution_log(path):
+        yield from execlog.iter_records(path)
+        return
+    data = read_json_file(path)
+    if data is not None:
+        yield data
+
+
+def is_consolidated_output(path):
+    """Indique si le fichier a été généré par consolidate-data.py"""
+    name = os.path.basename(path)
+    return name in (SUMMARY_FILE, MANIFEST_FILE, KEYS_FILE) or name.endswith(CONSOLIDATED_SUFFIXES)
+
+
+def list_result_files(results_dir, patterns=RESULT_PATTERNS):
+    """Liste triée des fichiers de résultats bruts (sorties consolidées exclues)
+
+    Le répertoire est parcouru une seule fois quel que soit le nombre de
+    motifs (les archives comptent des centaines de milliers de fichiers).
+    """
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+    results_dir = Path(results_dir)
+    if not results_dir.is_dir():
+        return []
+    names = sorted(
+        entry.name
+        for entry in os.scandir(results_dir)
+        if any(fnmatch.fnmatchcase(entry.name, pattern) for pattern in patterns)
+        and not is_consolidated_output(entry.name)
+        and entry.is_file()
+    )
+    return [results_dir / name for name in names]
+
+
+def platform_from_filename(path):
+    """Devine la plateforme depuis le nom du fichier (github_run_001.json → github)"""
+    return os.path.basename(path).split(".")[0].split("_")[0]
@@ -0,0 +1,189 @@
+"""
+Comparaisons robustes entre plateformes par rééchantillonnage
+
+Les durées CI sont asymétriques et à queue lourde (e2e_tests,
+docker_build): au lieu d'un test t sur la moyenne, chaque paire de
+plateformes est comparée, pour la durée totale et pour chaque stage, sur la
+médiane et le p95:
+  - intervalle de confiance bootstrap (percentile) de la différence
+  - test de permutation bilatéral sur la différence
+Les p-values sont corrigées pour comparaisons multiples (Holm ou
+Benjamini-Hochberg).
+
+Les rééchantillonnages sont tirés par lots sous forme de matrices NumPy
+(lots × taille d'échantillon) et les comparaisons sont réparties sur un pool
+de processus. Chaque comparaison a son propre générateur dérivé de la graine
+(SeedSequence.spawn): le résultat ne dépend pas du nombre de workers.
+"""
+
+import numpy as np
+
+from .parallel import map_chunks
+from .stats import CELLS, TOTAL
+
+# Statistiques comparées: quantiles calculés ensemble sur chaque matrice de
+# rééchantillonnage (un seul np.quantile pour médiane et p95)
+STATISTICS = {
+    "median": 0.5,
+    "p95": 0.95,
+}
+
+CORRECTIONS = ("holm", "bh")
+
+# Nombre maximal d'éléments d'une matrice de rééchantillonnage (mémoire bornée)
+MAX_BATCH_ELEMENTS = 4_000_000
+
+COMPARISON_FIELDS = (
+    "platform_a",
+    "platform_b",
+    "stage",
+    "statistic",
+    "n_a",
+    "n_b",
+    "estimate_a",
+    "estimate_b",
+    "difference",
+    "ci_lower",
+    "ci_upper",
+    "p_value",
+    "p_adjusted",
+    "significant",
+)
+
+
+def _batches(total, row_size):
+    """Découpe total tirages en lots dont la matrice reste sous MAX_BATCH_ELEMENTS"""
+    batch = max(1, MAX_BATCH_ELEMENTS // max(row_size, 1))
+    for start in range(0, total, batch):
+        yield min(batch, total - start)
+
+
+def bootstrap_difference(a, b, levels, n_resamples, rng, confidence=0.95):
+    """IC bootstrap percentile de quantile(a) - quantile(b) pour chaque niveau
+
+    Retourne deux tableaux (bornes inférieures, bornes supérieures), un
+    élément par niveau de levels.
+    """
+    differences = []
+    for size in _batches(n_resamples, len(a) + len(b)):
+        samples_a = a[rng.integers(0, len(a), (size, len(a)))]
+        samples_b = b[rng.integers(0, len(b), (size, len(b)))]
+        differences.append(np.quantile(samples_a, levels, axis=1) - np.quantile(samples_b, levels, axis=1))
+    differences = np.concatenate(differences, axis=1)
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(differences, [alpha, 1 - alpha], axis=1)
+    return lower, upper
+
+
+def permutation_test(a, b, levels, n_permutations, rng):
+    """p-values bilatérales du test de permutation sur quantile(a) - quantile(b)"""
+    observed = np.abs(np.quantile(a, levels) - np.quantile(b, levels))
+    pooled = np.concatenate([a, b])
+    extreme = np.zeros(len(levels), dtype=np.int64)
+    for size in _batches(n_permutations, len(pooled)):
+        permuted = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+        differences = np.abs(
+            np.quantile(permuted[:, :len(a)], levels, axis=1)
+            - np.quantile(permuted[:, len(a):], levels, axis=1)
+        )
+        # Tolérance relative: les égalités exactes comptent comme extrêmes
+        extreme += np.count_nonzero(differences >= observed[:, None] * (1 - 1e-12), axis=1)
+    return (extreme + 1) / (n_permutations + 1)
+
+
+def compare_pair(task):
+    """Compare deux échantillons sur toutes les statistiques (exécuté dans un worker)"""
+    a, b = task["a"], task["b"]
+    rng = np.random.default_rng(task["seed"])
+    names = list(task["statistics"])
+    levels = [STATISTICS[name] for name in names]
+    estimates_a = np.quantile(a, levels)
+    estimates_b = np.quantile(b, levels)
+    ci_lower, ci_upper = bootstrap_difference(a, b, levels, task["n_resamples"], rng, task["confidence"])
+    p_values = permutation_test(a, b, levels, task["n_resamples"], rng)
+    rows = []
+    for k, name in enumerate(names):
+        rows.append({
+            "platform_a": task["platform_a"],
+            "platform_b": task["platform_b"],
+            "stage": task["stage"],
+            "statistic": name,
+            "n_a": len(a),
+            "n_b": len(b),
+            "estimate_a": float(estimates_a[k]),
+            "estimate_b": float(estimates_b[k]),
+            "difference": float(estimates_a[k] - estimates_b[k]),
+            "ci_lower": float(ci_lower[k]),
+            "ci_upper": float(ci_upper[k]),
+            "p_value": float(p_values[k]),
+        })
+    return rows
+
+
+def _compare_chunk(tasks):
+    return [row for task in tasks for row in compare_pair(task)]
+
+
+def adjust_p_values(p_values, method="holm"):
+    """Corrige des p-values pour comparaisons multiples (Holm ou Benjamini-Hochberg)"""
+    p = np.asarray(p_values, dtype=np.float64)
+    m = len(p)
+    if m == 0:
+        return p
+    order = np.argsort(p)
+    ranked = p[order]
+    if method == "holm":
+        adjusted = np.maximum.accumulate((m - np.arange(m)) * ranked)
+    elif method == "bh":
+        adjusted = np.minimum.accumulate((m / np.arange(m, 0, -1) * ranked[::-1]))[::-1]
+    else:
+        raise ValueError(f"Correction inconnue: {method} (choix: {', '.join(CORRECTIONS)})")
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def sample_for_cell(columns, platform, cell):
+    if cell == TOTAL:
+        return columns.durations(platform)
+    return columns.stage_durations(cell, platform)
+
+
+def compare_all(columns, n_resamples=2000, seed=None, correction="holm", alpha=0.05,
+                confidence=0.95, statistics=tuple(STATISTICS), min_count=2, workers=1):
+    """Compare toutes les paires de plateformes sur toutes les cellules
+
+    Retourne une ligne par (paire, cellule, statistique), p-values corrigées
+    sur l'ensemble des comparaisons. Chaque (paire, cellule) est une tâche
+    du pool avec son propre générateur aléatoire.
+    """
+    platforms = columns.platforms()
+    tasks = []
+    for i, platform_a in enumerate(platforms):
+        for platform_b in platforms[i + 1:]:
+            for cell in CELLS:
+                a = np.asarray(sample_for_cell(columns, platform_a, cell), dtype=np.float64)
+                b = np.asarray(sample_for_cell(columns, platform_b, cell), dtype=np.float64)
+                if len(a) < min_count or len(b) < min_count:
+                    continue
+                tasks.append({
+                    "platform_a": platform_a,
+                    "platform_b": platform_b,
+                    "stage": cell,
+                    "statistics": statistics,
+                    "a": a,
+                    "b": b,
+                    "n_resamples": n_resamples,
+                    "confidence": confidence,
+                })
+
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    for task, task_seed in zip(tasks, seeds):
+        task["seed"] = task_seed
+
+    rows = [row for chunk in map_chunks(_compare_chunk, tasks, workers, min_items=2) for row in chunk]
+    adjusted = adjust_p_values([row["p_value"] for row in rows], correction)
+    for row, p_adjusted in zip(rows, adjusted):
+        row["p_adjusted"] = float(p_adjusted)
+        row["significant"] = bool(p_adjusted < alpha)
+    return rows
@@ -0,0 +1,287 @@
+"""
+Schéma des exécutions et validation compilée
+
+EXECUTION_SCHEMA décrit une exécution de façon déclarative (type, champ
+obligatoire, bornes, sous-champs). compile_schema() le transforme une fois
+pour toutes en une liste de fonctions de vérification: valider une
+exécution revient ensuite à appeler ces fonctions, sans réinterpréter le
+schéma.
+
+Les formats acceptés sont ceux des autres scripts (voir records.py):
+exécution unique, conteneur {"executions": [...]}, liste d'exécutions et
+journaux JSON Lines. Chaque exécution d'un conteneur est validée, la
+plateforme pouvant venir du conteneur ou du nom du fichier.
+
+Sévérités: une erreur rend l'exécution inutilisable par les analyses
+(plateforme ou durée absente, type invalide); un avertissement signale une
+donnée incomplète ou suspecte (durée <= 0, success absent).
+execution_id et success absents ne sont que des avertissements (l'ancien
+validate-data.py les rejetait): le format de measure-performance.sh ne les
+contient pas, et les analyses les traitent (une exécution sans
+execution_id est dédupliquée par son contenu, un success absent vaut
+UNKNOWN dans les colonnes et n'est compté ni en succès ni en échec).
+"""
+
+import json
+import os
+from datetime import datetime
+
+from . import execlog
+from .records import PLATFORMS, STAGES, platform_from_filename
+
+ERROR = "error"
+WARNING = "warning"
+
+# Nombre maximal de messages conservés par fichier (les compteurs restent exacts)
+MAX_MESSAGES = 50
+
+STAGE_SCHEMA = {"type": "number", "minimum": 0, "severity": WARNING}
+
+EXECUTION_SCHEMA = {
+    "platform": {"required": ERROR, "type": "string", "choices": PLATFORMS},
+    "execution_id": {"required": WARNING, "type": ("string", "integer")},
+    "timestamp": {"type": "timestamp"},
+    "start_time": {"type": "timestamp"},
+    "duration": {
+        "required": ERROR,
+        # Ancien format de measure-performance.sh: durée totale numérique
+        "type": ("number", "object"),
+        "positive": True,
+        "fields": {
+            "total": {"required": ERROR, "type": "number", "positive": True},
+            "stages": {"type": "object", "values": STAGE_SCHEMA, "known": STAGES},
+        },
+    },
+    "success": {"required": WARNING, "type": "boolean"},
+    "queue_time": {"type": "number", "minimum": 0, "severity": WARNING},
+    "cache": {
+        "type": "object",
+        "fields": {
+            "hit": {"type": "boolean", "severity": WARNING},
+            "size_mb": {"type": "number", "minimum": 0, "severity": WARNING},
+        },
+    },
+    "artifacts": {
+        "type": "object",
+        "fields": {
+            "total_size_mb": {"type": "number", "minimum": 0, "severity": WARNING},
+        },
+    },
+}
+
+# Au moins un de ces champs date l'exécution (séries temporelles)
+TIME_FIELDS = ("timestamp", "start_time")
+
+TYPE_NAMES = {
+    "string": "une chaîne",
+    "integer": "un entier",
+    "number": "un nombre",
+    "boolean": "un booléen",
+    "object": "un objet",
+    "timestamp": "au format ISO 8601 ou un epoch",
+}
+
+
+def _is_timestamp(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "object": lambda value: isinstance(value, dict),
+    "timestamp": _is_timestamp,
+}
+
+
+def _compile_type(types):
+    types = (types,) if isinstance(types, str) else tuple(types)
+    checks = tuple(TYPE_CHECKS[name] for name in types)
+    if len(checks) == 1:
+        return checks[0], TYPE_NAMES[types[0]]
+    description = " ou ".join(TYPE_NAMES[name] for name in types)
+    return (lambda value: any(check(value) for check in checks)), description
+
+
+def compile_field(name, spec, prefix=""):
+    """Compile la spécification d'un champ en une fonction check(objet, report)
+
+    report(severity, message) reçoit chaque problème trouvé.
+    """
+    path = prefix + name
+    required = spec.get("required")
+    severity = spec.get("severity", ERROR)
+    is_valid_type, type_name = _compile_type(spec["type"])
+    choices = spec.get("choices")
+    positive = spec.get("positive", False)
+    minimum = spec.get("minimum")
+    sub_checks = [compile_field(sub, sub_spec, path + ".") for sub, sub_spec in spec.get("fields", {}).items()]
+    value_check = compile_value(spec["values"], path) if "values" in spec else None
+    known = frozenset(spec.get("known", ()))
+
+    def check(data, report):
+        if name not in data:
+            if required:
+                report(required, f"Champ manquant: {path}")
+            return
+        value = data[name]
+        if not is_valid_type(value):
+            report(severity, f"{path} doit être {type_name} (reçu: {json.dumps(value)[:40]})")
+            return
+        if choices is not None and value not in choices:
+            report(ERROR, f"{path} invalide: {value}")
+        if isinstance(value, dict):
+            for sub_check in sub_checks:
+                sub_check(value, report)
+            if value_check is not None:
+                for key, item in value.items():
+                    if known and key not in known:
+                        report(WARNING, f"{path}.{key}: stage inconnu")
+                    value_check(key, item, report)
+        elif positive and value <= 0:
+            report(WARNING, f"{path} est <= 0")
+        elif minimum is not None and isinstance(value, (int, float)) and value < minimum:
+            report(severity, f"{path} est négatif" if minimum == 0 else f"{path} est < {minimum}")
+
+    return check
+
+
+def compile_value(spec, prefix):
+    """Compile la spécification des valeurs d'un objet (ex: durées des stages)"""
+    is_valid_type, type_name = _compile_type(spec["type"])
+    severity = spec.get("severity", ERROR)
+    minimum = spec.get("minimum")
+
+    def check(key, value, report):
+        if not is_valid_type(value):
+            report(severity, f"{prefix}.{key} n'est pas {type_name}")
+        elif minimum is not None and value < minimum:
+            report(severity, f"{prefix}.{key} est négatif")
+
+    return check
+
+
+def compile_schema(schema=EXECUTION_SCHEMA):
+    """Compile un schéma d'exécution en une fonction validate(execution, report)"""
+    checks = [compile_field(name, spec) for name, spec in schema.items()]
+
+    def validate(execution, report):
+        for check in checks:
+            check(execution, report)
+        if not any(field in execution for field in TIME_FIELDS):
+            report(WARNING, "Aucun horodatage (timestamp ou start_time)")
+
+    return validate
+
+
+class FileReport:
+    """Résultat de la validation d'un fichier (sérialisable en JSON)"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.records = 0
+        self.error_count = 0
+        self.warning_count = 0
+        self.errors = []
+        self.warnings = []
+
+    def add(self, severity, message, location=""):
+        if location:
+            message = f"{location}: {message}"
+        if severity == ERROR:
+            self.error_count += 1
+            if len(self.errors) < MAX_MESSAGES:
+                self.errors.append(message)
+        else:
+            self.warning_count += 1
+            if len(self.warnings) < MAX_MESSAGES:
+                self.warnings.append(message)
+
+    @property
+    def valid(self):
+        return self.error_count == 0
+
+    def to_dict(self):
+        return {
+            "file": self.path,
+            "valid": self.valid,
+            "records": self.records,
+            "error_count": self.error_count,
+            "warning_count": self.warning_count,
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+
+class Validator:
+    """Valide des fichiers de résultats avec un schéma compilé une seule fois"""
+
+    def __init__(self, schema=EXECUTION_SCHEMA):
+        self._validate = compile_schema(schema)
+
+    def validate_execution(self, execution, report, location="", platform=None):
+        """Valide une exécution; platform est celle du conteneur ou du nom du fichier"""
+        if not isinstance(execution, dict):
+            report.add(ERROR, "l'exécution doit être un objet", location)
+            return
+        report.records += 1
+        if platform is not None and "platform" not in execution:
+            execution = dict(execution, platform=platform)
+        self._validate(execution, lambda severity, message: report.add(severity, message, location))
+
+    def validate_document(self, data, report, default_platform=None):
+        """Valide toutes les exécutions d'un document JSON, quel que soit son format"""
+        if isinstance(data, list):
+            if not data:
+                report.add(WARNING, "Aucune exécution")
+            for position, execution in enumerate(data):
+                self.validate_execution(execution, report, f"[{position}]", default_platform)
+        elif isinstance(data, dict) and "executions" in data:
+            executions = data["executions"]
+            if not isinstance(executions, list):
+                report.add(ERROR, "executions doit être une liste")
+                return
+            if not executions:
+                report.add(WARNING, "Aucune exécution")
+            platform = data.get("platform", default_platform)
+            for position, execution in enumerate(executions):
+                self.validate_execution(execution, report, f"executions[{position}]", platform)
+        elif isinstance(data, dict):
+            self.validate_execution(data, report, platform=default_platform)
+        else:
+            report.add(ERROR, "le document doit être un objet ou une liste d'exécutions")
+
+    def validate_file(self, path):
+        """Valide un fichier .json ou un journal .jsonl[.gz|.zst]; retourne un FileReport"""
+        report = FileReport(path)
+        default_platform = platform_from_filename(path)
+        if default_platform not in PLATFORMS:
+            default_platform = None
+        try:
+            if execlog.is_execution_log(path):
+                def on_error(line, error):
+                    report.add(ERROR, f"JSON invalide: {error}", f"ligne {line}")
+
+                for position, execution in enumerate(execlog.iter_records(path, on_error=on_error)):
+                    self.validate_execution(execution, report, f"exécution {position + 1}", default_platform)
+            else:
+                with open(path, "rb") as f:
+                    data = json.load(f)
+                self.validate_document(data, report, default_platform)
+        except ValueError as e:
+            report.add(ERROR, f"JSON invalide: {e}")
+        except (OSError, EOFError, ImportError) as e:
+            report.add(ERROR, f"Erreur de lecture: {e}")
+        return report
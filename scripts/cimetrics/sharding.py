@@ -0,0 +1,158 @@
+"""
+Répartition des fichiers de test en shards d'après l'historique des durées
+
+L'unité de répartition est le fichier de test: Jest et Playwright
+acceptent une liste de fichiers en argument, et les tests d'un même
+fichier partagent leur mise en place (beforeAll, serveur, navigateur).
+
+Durée d'un fichier: pour chaque run de l'historique JUnit (junit.py), somme
+des durées de ses tests (tous projets Playwright et relances compris),
+puis quantile quantile de ces sommes sur les runs (p50 ou p90). Le nom de
+suite JUnit (chemin du fichier, éventuellement avec des \\ ou relatif à
+un autre dossier) est rapproché des fichiers trouvés sur disque par
+suffixe de chemin. Les fichiers jamais vus prennent la durée par défaut
+(médiane des fichiers connus si elle n'est pas donnée).
+
+Répartition LPT (longest processing time first): fichiers triés par durée
+décroissante, chacun affecté au shard le moins chargé (tas). Le makespan
+(durée du shard le plus long) est au plus 4/3 de l'optimum.
+
+Comparaison avec le stage actuel (un seul shard): la part du stage qui
+n'est pas du temps de test (installation, navigateurs, serveurs) est
+overhead = max(p50 du stage - somme des fichiers, 0), payée par chaque
+shard en parallèle; la durée prédite du stage est overhead + makespan.
+"""
+
+import heapq
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_QUANTILE = 0.5
+DEFAULT_PATTERN = "e2e/*.spec.js"
+DEFAULT_STAGE = "e2e_tests"
+
+STAGE_FIELDS = (
+    "platform",
+    "runs",
+    "current",
+    "tests_total",
+    "overhead",
+    "predicted",
+    "speedup",
+)
+
+
+def normalize_path(path):
+    return str(path).replace("\\", "/").removeprefix("./")
+
+
+def match_file(suite, files):
+    """Fichier de files correspondant au nom de suite (suffixe de chemin le plus long), ou None"""
+    suite = normalize_path(suite)
+    best = None
+    for name in files:
+        if suite == name or suite.endswith("/" + name) or name.endswith("/" + suite):
+            if best is None or len(name) > len(best):
+                best = name
+    return best
+
+
+def discover_files(root, pattern=DEFAULT_PATTERN):
+    """Fichiers de test sous root correspondant au motif glob, chemins relatifs à root"""
+    root = Path(root)
+    return sorted(normalize_path(path.relative_to(root)) for path in root.glob(pattern) if path.is_file())
+
+
+def run_durations(records, files):
+    """Durée de chaque fichier à chaque run: {fichier: [somme par run]}
+
+    Les enregistrements dont la suite ne correspond à aucun fichier de
+    files sont ignorés (fichiers supprimés ou hors du motif).
+    """
+    totals = {}
+    matches = {}
+    for record in records:
+        suite = record["suite"]
+        if suite not in matches:
+            matches[suite] = match_file(suite, files)
+        name = matches[suite]
+        if name is None or record["status"] == "skipped" or not record["time"] > 0:
+            continue
+        per_run = totals.setdefault(name, {})
+        per_run[record["run"]] = per_run.get(record["run"], 0.0) + record["time"]
+    return {name: list(per_run.values()) for name, per_run in totals.items()}
+
+
+def file_estimates(files, durations, quantile=DEFAULT_QUANTILE, default=None):
+    """Durée prédite de chaque fichier; retourne (estimations, fichiers sans historique)"""
+    known = {name: float(np.quantile(durations[name], quantile)) for name in files if durations.get(name)}
+    if default is None:
+        default = float(np.median(list(known.values()))) if known else 0.0
+    unseen = [name for name in files if name not in known]
+    estimates = {name: known.get(name, default) for name in files}
+    return estimates, unseen
+
+
+def lpt_shards(estimates, shards):
+    """Répartition LPT: liste de shards {"files", "predicted"} (ordre des index)"""
+    result = [{"files": [], "predicted": 0.0} for _ in range(shards)]
+    heap = [(0.0, index) for index in range(shards)]
+    for name, seconds in sorted(estimates.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(heap)
+        result[index]["files"].append(name)
+        result[index]["predicted"] = load + seconds
+        heapq.heappush(heap, (load + seconds, index))
+    return result
+
+
+def plan_shards(files, records, shards, quantile=DEFAULT_QUANTILE, default=None):
+    """Plan complet: shards, makespan, borne inférieure et fichiers sans historique"""
+    estimates, unseen = file_estimates(files, run_durations(records, files), quantile, default)
+    result = lpt_shards(estimates, shards)
+    total = sum(estimates.values())
+    return {
+        "shards": result,
+        "quantile": quantile,
+        "total": total,
+        "makespan": max(shard["predicted"] for shard in result) if result else 0.0,
+        # Aucun plan ne fait mieux que la charge moyenne ni que le plus long fichier
+        "lower_bound": max(total / shards, max(estimates.values(), default=0.0)) if shards else 0.0,
+        "estimates": estimates,
+        "unseen": unseen,
+    }
+
+
+def manifest(plan):
+    """Manifeste JSON des shards (index à partir de 1, comme --shard=i/n)"""
+    return {
+        "quantile": plan["quantile"],
+        "makespan": plan["makespan"],
+        "shards": [
+            {"index": index, "files": shard["files"], "predicted_seconds": shard["predicted"]}
+            for index, shard in enumerate(plan["shards"], 1)
+        ],
+        "unseen": plan["unseen"],
+    }
+
+
+def stage_comparison(columns, plan, stage=DEFAULT_STAGE):
+    """Durée actuelle du stage (p50) et durée prédite avec les shards du plan, par plateforme"""
+    rows = []
+    for platform in columns.platforms():
+        values = columns.stage_durations(stage, platform)
+        if not len(values):
+            continue
+        current = float(np.median(values))
+        overhead = max(current - plan["total"], 0.0)
+        predicted = overhead + plan["makespan"]
+        rows.append({
+            "platform": platform,
+            "runs": len(values),
+            "current": current,
+            "tests_total": plan["total"],
+            "overhead": overhead,
+            "predicted": predicted,
+            "speedup": current / predicted if predicted else None,
+        })
+    return rows
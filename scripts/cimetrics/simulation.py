@@ -0,0 +1,325 @@
+"""
+Simulation Monte Carlo des pipelines (graphe de dépendances des stages)
+
+Un pipeline est décrit par son graphe de dépendances: {stage: [stages dont
+il dépend]}. PIPELINES reprend celui de chaque plateforme:
+  - jenkins: stages séquentiels du Jenkinsfile, Lint et Test en parallèle
+  - github: jobs et needs de .github/workflows/ci.yml (lint et tests sans
+    needs, docker-build et deploy après e2e-tests)
+  - gitlab: ordre des stages de .gitlab-ci.yml (un stage attend tous les
+    jobs du stage précédent)
+docker_build est désactivé dans les trois fichiers: il est déclaré tel
+qu'il serait réactivé et ne compte pas tant qu'aucune durée n'est mesurée.
+
+Chaque tirage prend les durées des stages d'une exécution réelle de la
+plateforme ayant au moins un stage mesuré (tirage avec remise d'une ligne
+de columns.stages, ce qui garde la corrélation entre stages d'un même
+run); les stages absents de la ligne sont complétés par un tirage
+indépendant dans leur distribution marginale.
+Tous les tirages sont ordonnancés ensemble, stage par stage, sur des
+matrices NumPy (tirages × stages).
+
+Avec un nombre de runners limité, les stages sont lancés dans l'ordre
+topologique sur le premier runner libre (ordonnancement de liste). Le
+chemin critique d'un tirage est remonté depuis le dernier stage terminé, en
+suivant à chaque étape la contrainte qui a fixé le début du stage:
+dépendance la plus tardive ou stage précédent sur le même runner.
+"""
+
+import json
+
+import numpy as np
+
+from .loader import STAGE_INDEX, STAGES
+
+PIPELINES = {
+    "jenkins": {
+        "lint_backend": [],
+        "lint_frontend": [],
+        "test_backend": ["lint_backend", "lint_frontend"],
+        "test_frontend": ["lint_backend", "lint_frontend"],
+        "build_frontend": ["test_backend", "test_frontend"],
+        "e2e_tests": ["build_frontend"],
+        "docker_build": ["e2e_tests"],
+        "deploy": ["docker_build"],
+    },
+    "github": {
+        "lint_backend": [],
+        "lint_frontend": [],
+        "test_backend": [],
+        "test_frontend": [],
+        "build_frontend": ["test_backend", "test_frontend"],
+        "e2e_tests": ["build_frontend"],
+        "docker_build": ["e2e_tests"],
+        "deploy": ["e2e_tests"],
+    },
+    "gitlab": {
+        "lint_backend": [],
+        "lint_frontend": [],
+        "test_backend": ["lint_backend", "lint_frontend"],
+        "test_frontend": ["lint_backend", "lint_frontend"],
+        "build_frontend": ["test_backend", "test_frontend"],
+        "e2e_tests": ["build_frontend"],
+        "docker_build": ["e2e_tests"],
+        "deploy": ["docker_build"],
+    },
+}
+
+# Nombre de tirages par défaut
+DEFAULT_SAMPLES = 20_000
+
+# Nombre de chemins critiques distincts rapportés par scénario
+MAX_PATHS = 5
+
+# Pas de dépendance ni de runner contraignant (début à t = 0)
+NO_BINDING = -1
+
+
+def topological_order(dag):
+    """Ordre topologique des stages d'un graphe; ValueError si cycle ou stage inconnu"""
+    for stage, dependencies in dag.items():
+        if stage not in STAGE_INDEX:
+            raise ValueError(f"Stage inconnu: {stage}")
+        for dependency in dependencies:
+            if dependency not in dag:
+                raise ValueError(f"{stage} dépend d'un stage non déclaré: {dependency}")
+    order = []
+    done = set()
+    while len(order) < len(dag):
+        ready = [stage for stage in dag if stage not in done and all(dep in done for dep in dag[stage])]
+        if not ready:
+            cycle = sorted(stage for stage in dag if stage not in done)
+            raise ValueError(f"Cycle dans le graphe des stages: {', '.join(cycle)}")
+        # Ordre stable: celui de STAGES à dépendances satisfaites égales
+        ready.sort(key=STAGE_INDEX.get)
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+def load_pipeline(source):
+    """Graphe d'un pipeline: nom de plateforme (PIPELINES) ou fichier JSON {stage: [dépendances]}"""
+    if source in PIPELINES:
+        dag = PIPELINES[source]
+    else:
+        with open(source) as f:
+            dag = json.load(f)
+        if not isinstance(dag, dict) or not all(isinstance(deps, list) for deps in dag.values()):
+            raise ValueError(f"{source}: le graphe doit être un objet {{stage: [dépendances]}}")
+    dag = {stage: list(dependencies) for stage, dependencies in dag.items()}
+    topological_order(dag)
+    return dag
+
+
+def parallelize(dag, stages):
+    """Retourne un graphe où les stages donnés ne dépendent plus les uns des autres
+
+    Une dépendance vers un autre stage du groupe est remplacée par les
+    dépendances de celui-ci (hors groupe): "e2e_tests,docker_build" lance
+    docker_build dès que e2e_tests pourrait démarrer. Comme après un bloc
+    parallel du Jenkinsfile, un stage qui dépendait d'un stage du groupe
+    attend tout le groupe.
+    """
+    group = set(stages)
+    unknown = group - set(dag)
+    if unknown:
+        raise ValueError(f"Stages absents du graphe: {', '.join(sorted(unknown))}")
+
+    def outside(stage, seen):
+        result = []
+        for dependency in dag[stage]:
+            if dependency not in group:
+                result.append(dependency)
+            elif dependency not in seen:
+                seen.add(dependency)
+                result.extend(outside(dependency, seen))
+        return result
+
+    parallel = {}
+    for stage, dependencies in dag.items():
+        if stage in group:
+            dependencies = list(dict.fromkeys(outside(stage, {stage})))
+        elif group.intersection(dependencies):
+            dependencies = list(dict.fromkeys(list(dependencies) + sorted(group, key=STAGE_INDEX.get)))
+        parallel[stage] = list(dependencies)
+    return parallel
+
+
+def sample_stage_durations(stages, n_samples, rng):
+    """Tire n_samples lignes de durées (n_samples × len(STAGES)) d'une plateforme
+
+    stages est la matrice columns.stages de la plateforme (NaN = stage non
+    mesuré). Seules les lignes ayant au moins un stage mesuré sont tirées,
+    avec remise; les NaN restants sont remplacés par un tirage dans les
+    valeurs mesurées du même stage, ou 0 si le stage n'a jamais été mesuré.
+    """
+    stages = measured_rows(stages)
+    if not len(stages):
+        return np.zeros((n_samples, len(STAGES)))
+    samples = stages[rng.integers(0, len(stages), n_samples)]
+    for index in range(samples.shape[1]):
+        missing = np.isnan(samples[:, index])
+        if not missing.any():
+            continue
+        observed = stages[:, index]
+        observed = observed[~np.isnan(observed)]
+        if len(observed):
+            samples[missing, index] = observed[rng.integers(0, len(observed), np.count_nonzero(missing))]
+        else:
+            samples[missing, index] = 0.0
+    # Durées négatives (horloges décalées) ramenées à 0
+    return np.maximum(samples, 0.0)
+
+
+def measured_rows(stages):
+    """Lignes de durées ayant au moins un stage mesuré (non NaN)"""
+    stages = np.asarray(stages, dtype=np.float64)
+    return stages[~np.isnan(stages).all(axis=1)] if stages.size else stages
+
+
+def schedule(dag, durations, runners=0):
+    """Ordonnance tous les tirages à la fois
+
+    durations: matrice (tirages × len(STAGES)). runners <= 0: autant de
+    runners que nécessaire. Retourne (fin de chaque stage, contrainte qui a
+    fixé son début), deux matrices (tirages × len(dag)) indexées dans
+    l'ordre topologique; la contrainte est l'indice du stage bloquant ou
+    NO_BINDING.
+    """
+    order = topological_order(dag)
+    position = {stage: k for k, stage in enumerate(order)}
+    n = len(durations)
+    rows = np.arange(n)
+    finish = np.zeros((n, len(order)))
+    binding = np.full((n, len(order)), NO_BINDING, dtype=np.int64)
+    if runners > 0:
+        runner_free = np.zeros((n, runners))
+        # Dernier stage exécuté sur chaque runner
+        runner_last = np.full((n, runners), NO_BINDING, dtype=np.int64)
+
+    for k, stage in enumerate(order):
+        duration = durations[:, STAGE_INDEX[stage]]
+        dependencies = [position[dependency] for dependency in dag[stage]]
+        if dependencies:
+            dependency_finish = finish[:, dependencies]
+            latest = dependency_finish.argmax(axis=1)
+            ready = dependency_finish[rows, latest]
+            binding[:, k] = np.asarray(dependencies)[latest]
+        else:
+            ready = np.zeros(n)
+        if runners > 0:
+            runner = runner_free.argmin(axis=1)
+            free = runner_free[rows, runner]
+            waits = free > ready
+            binding[waits, k] = runner_last[rows, runner][waits]
+            start = np.maximum(ready, free)
+            finish[:, k] = start + duration
+            runner_free[rows, runner] = finish[:, k]
+            runner_last[rows, runner] = k
+        else:
+            finish[:, k] = ready + duration
+    return finish, binding
+
+
+def critical_paths(finish, binding):
+    """Chemin critique de chaque tirage, en masque de bits (bit k = k-ième stage topologique)"""
+    n = len(finish)
+    rows = np.arange(n)
+    current = finish.argmax(axis=1)
+    masks = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+    for _ in range(finish.shape[1]):
+        masks[active] |= np.left_shift(1, current[active])
+        current = np.where(active, binding[rows, current], NO_BINDING)
+        active = current != NO_BINDING
+        if not active.any():
+            break
+    return masks
+
+
+def _path_stages(mask, order):
+    return [stage for k, stage in enumerate(order) if mask >> k & 1]
+
+
+def simulate(dag, stage_samples, runners=0, max_paths=MAX_PATHS):
+    """Simule un pipeline sur des durées tirées (voir sample_stage_durations)
+
+    Retourne un dict: percentiles de la durée prédite, fréquence des chemins
+    critiques et, par stage, la fraction des tirages où il est critique.
+    """
+    order = topological_order(dag)
+    finish, binding = schedule(dag, stage_samples, runners)
+    makespan = finish.max(axis=1) if order else np.zeros(len(stage_samples))
+    masks = critical_paths(finish, binding)
+    # Les stages jamais mesurés (durée nulle) ne figurent pas dans les chemins
+    for k, stage in enumerate(order):
+        if not stage_samples[:, STAGE_INDEX[stage]].any():
+            masks &= ~(1 << k)
+    paths, counts = np.unique(masks, return_counts=True)
+    ranked = np.argsort(-counts, kind="stable")[:max_paths]
+    n = len(stage_samples)
+    p50, p95 = np.quantile(makespan, [0.5, 0.95]) if n else (0.0, 0.0)
+    return {
+        "runners": runners if runners > 0 else None,
+        "samples": n,
+        "mean": float(makespan.mean()) if n else 0.0,
+        "p50": float(p50),
+        "p95": float(p95),
+        "critical_paths": [
+            {"stages": _path_stages(int(paths[i]), order), "frequency": float(counts[i] / n)}
+            for i in ranked
+        ],
+        "criticality": {
+            stage: float(np.count_nonzero(masks >> k & 1) / n) if n else 0.0
+            for k, stage in enumerate(order)
+        },
+    }
+
+
+def scenario_pipeline(platform, scenario):
+    """Graphe d'un scénario pour une plateforme"""
+    dag = scenario.get("pipeline") or PIPELINES[platform]
+    if scenario.get("parallel"):
+        dag = parallelize(dag, scenario["parallel"])
+    return dag
+
+
+def simulate_platforms(columns, scenarios, n_samples=DEFAULT_SAMPLES, seed=None):
+    """Simule chaque scénario sur chaque plateforme présente
+
+    scenarios: {nom: {"pipeline": graphe ou None pour celui de la
+    plateforme, "parallel": stages à paralléliser, "runners": n}}. Les mêmes
+    tirages de durées servent à tous les scénarios d'une plateforme: les
+    écarts entre scénarios ne viennent que du graphe et des runners.
+    Retourne {plateforme: {"observed": ..., "sampled": exécutions tirées
+    (au moins un stage mesuré), "scenarios": {...}}}.
+    """
+    platforms = columns.platforms()
+    seeds = np.random.SeedSequence(seed).spawn(len(platforms))
+    results = {}
+    for platform, platform_seed in zip(platforms, seeds):
+        rng = np.random.default_rng(platform_seed)
+        # Exécutions valides (durée totale > 0); un stage <= 0 n'a pas été mesuré
+        stages = columns.stages[columns.platform_mask(platform) & (columns.total > 0)]
+        stages = measured_rows(np.where(stages > 0, stages, np.nan))
+        measured = ~np.isnan(stages).all(axis=0)
+        observed = columns.durations(platform)
+        results[platform] = {
+            "observed": {
+                "count": len(observed),
+                "p50": float(np.quantile(observed, 0.5)) if len(observed) else None,
+                "p95": float(np.quantile(observed, 0.95)) if len(observed) else None,
+            },
+            "sampled": len(stages),
+            "unmeasured_stages": [stage for index, stage in enumerate(STAGES) if not measured[index]],
+            "scenarios": {},
+        }
+        if not len(stages):
+            # Aucune durée de stage: rien à simuler pour cette plateforme
+            continue
+        samples = sample_stage_durations(stages, n_samples, rng)
+        results[platform]["scenarios"] = {
+            name: simulate(scenario_pipeline(platform, scenario), samples, scenario.get("runners", 0))
+            for name, scenario in scenarios.items()
+        }
+    return results
@@ -0,0 +1,213 @@
+"""
+Sketch de quantiles fusionnable (DDSketch)
+
+Les valeurs positives sont rangées dans des intervalles logarithmiques de
+raison gamma = (1 + alpha) / (1 - alpha). Chaque quantile estimé est à
+moins de alpha (erreur relative) de la vraie valeur de l'échantillon, quelle
+que soit la taille de l'historique. Deux sketches de même alpha se
+fusionnent exactement en additionnant les compteurs des intervalles.
+
+Le quantile q correspond au rang q * (n - 1) arrondi à l'inférieur (comme
+np.quantile(..., method="lower")): l'estimation est à moins de alpha de
+cette valeur exacte. Pour des durées entre 1 s et 10 h, un sketch à 1 %
+compte au plus ~520 intervalles, quel que soit le nombre d'exécutions.
+
+Sérialisation compacte (summary.json): premier intervalle (offset) et
+compteurs denses des intervalles consécutifs, zéros compris.
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_ALPHA = 0.01
+
+# Percentiles de queue suivis pour les durées de pipeline
+REPORTED_PERCENTILES = (50, 90, 95, 99)
+
+# Nombre maximal de points aberrants renvoyés par box_stats (échantillonnés)
+MAX_FLIERS = 40
+
+
+def _clip_extremes(values, minimum=None, maximum=None):
+    """Remplace les valeurs des intervalles extrêmes par le min et le max exacts (si connus)"""
+    values = values.copy()
+    if minimum is not None:
+        values = np.maximum(values, minimum)
+        values[0] = minimum
+    if maximum is not None:
+        values = np.minimum(values, maximum)
+        values[-1] = maximum
+    return values
+
+
+class QuantileSketch:
+    """Sketch DDSketch pour des durées positives"""
+
+    def __init__(self, alpha=DEFAULT_ALPHA):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alpha doit être dans ]0, 1[: {alpha}")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value, count=1):
+        """Ajoute une valeur (> 0) en O(1)"""
+        if not value > 0:
+            return
+        key = self._key(value)
+        self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+
+    def update(self, values):
+        """Ajoute un tableau de valeurs; NaN et valeurs <= 0 sont ignorées"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[values > 0]
+        if not len(values):
+            return
+        keys, counts = np.unique(
+            np.ceil(np.log(values) / self._log_gamma).astype(np.int64), return_counts=True
+        )
+        bins = self.bins
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            bins[key] = bins.get(key, 0) + count
+        self.count += int(counts.sum())
+
+    def merge(self, other):
+        """Fusionne un autre sketch (même alpha) dans celui-ci"""
+        if other.alpha != self.alpha:
+            raise ValueError(f"alpha incompatibles: {self.alpha} != {other.alpha}")
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Estime le quantile q (0 <= q <= 1); None si le sketch est vide"""
+        if not 0 <= q <= 1:
+            raise ValueError(f"q doit être dans [0, 1]: {q}")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def quantiles(self, qs):
+        """Estime plusieurs quantiles en un seul parcours des intervalles"""
+        if self.count == 0:
+            return [None] * len(qs)
+        keys = sorted(self.bins)
+        cumulative = np.cumsum([self.bins[key] for key in keys])
+        ranks = np.asarray(qs, dtype=np.float64) * (self.count - 1)
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="right"), len(keys) - 1)
+        return [2 * self.gamma ** keys[i] / (self.gamma + 1) for i in positions.tolist()]
+
+    def rank_counts(self, values):
+        """Rang de chaque valeur dans le sketch: (nombre de valeurs des intervalles
+        inférieurs, nombre de valeurs du même intervalle), en tableaux
+
+        Deux valeurs du même intervalle sont à alpha près et comptent comme des
+        ex-aequo (test de Mann-Whitney contre un sketch, voir gate.py).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if self.count == 0:
+            return np.zeros(values.shape), np.zeros(values.shape)
+        keys = np.array(sorted(self.bins), dtype=np.int64)
+        cumulative = np.concatenate([[0], np.cumsum([self.bins[key] for key in keys.tolist()])]).astype(np.float64)
+        positive = values > 0
+        value_keys = np.ceil(np.log(np.where(positive, values, 1.0)) / self._log_gamma)
+        lower = np.searchsorted(keys, value_keys, side="left")
+        upper = np.searchsorted(keys, value_keys, side="right")
+        below = np.where(positive, cumulative[lower], 0.0)
+        equal = np.where(positive, cumulative[upper] - cumulative[lower], 0.0)
+        return below, equal
+
+    def _dense(self):
+        """Valeurs représentatives et compteurs de tous les intervalles entre le premier et le dernier"""
+        keys = np.arange(min(self.bins), max(self.bins) + 1)
+        counts = np.array([self.bins.get(key, 0) for key in keys.tolist()], dtype=np.float64)
+        return keys, 2 * self.gamma ** keys.astype(np.float64) / (self.gamma + 1), counts
+
+    def box_stats(self, whis=1.5, minimum=None, maximum=None, max_fliers=MAX_FLIERS):
+        """Statistiques de box plot (clés de Axes.bxp) estimées depuis le sketch
+
+        Quartiles et médiane à alpha près; les moustaches sont les valeurs
+        les plus extrêmes à moins de whis × IQR des quartiles, les points
+        aberrants un échantillon (au plus max_fliers) des intervalles au-delà.
+        minimum et maximum (valeurs exactes, si connues) bornent le résultat.
+        None si le sketch est vide.
+        """
+        if self.count == 0:
+            return None
+        q1, median, q3 = np.clip(
+            self.quantiles((0.25, 0.5, 0.75)),
+            -np.inf if minimum is None else minimum,
+            np.inf if maximum is None else maximum,
+        ).tolist()
+        _, values, counts = self._dense()
+        values = _clip_extremes(values[counts > 0], minimum, maximum)
+        iqr = q3 - q1
+        low, high = q1 - whis * iqr, q3 + whis * iqr
+        inside = values[(values >= low) & (values <= high)]
+        fliers = values[(values < low) | (values > high)]
+        if len(fliers) > max_fliers:
+            fliers = fliers[np.unique(np.linspace(0, len(fliers) - 1, max_fliers).round().astype(int))]
+        return {
+            "med": median,
+            "q1": q1,
+            "q3": q3,
+            "whislo": float(inside.min()) if len(inside) else q1,
+            "whishi": float(inside.max()) if len(inside) else q3,
+            "fliers": fliers.tolist(),
+        }
+
+    def density(self, minimum=None, maximum=None, smoothing=3):
+        """Densité estimée (clés coords/vals de Axes.violin) depuis les intervalles
+
+        Chaque intervalle ]gamma^(k-1), gamma^k] contribue count / largeur;
+        une moyenne glissante sur smoothing intervalles lisse le profil.
+        """
+        if self.count == 0:
+            return None
+        keys, values, counts = self._dense()
+        widths = self.gamma ** keys.astype(np.float64) * (1 - 1 / self.gamma)
+        density = counts / widths / self.count
+        if smoothing > 1 and len(density) > smoothing:
+            density = np.convolve(density, np.ones(smoothing) / smoothing, mode="same")
+        values = _clip_extremes(values, minimum, maximum)
+        return {"coords": values.tolist(), "vals": density.tolist()}
+
+    def percentiles(self, percentiles=REPORTED_PERCENTILES):
+        """Dict {"p50": ..., "p99": ...} des percentiles demandés"""
+        values = self.quantiles([p / 100 for p in percentiles])
+        return {f"p{p}": value for p, value in zip(percentiles, values)}
+
+    def to_dict(self):
+        if not self.bins:
+            return {"alpha": self.alpha, "count": 0, "offset": 0, "counts": []}
+        offset = min(self.bins)
+        bins = self.bins
+        return {
+            "alpha": self.alpha,
+            "count": self.count,
+            "offset": offset,
+            "counts": [bins.get(key, 0) for key in range(offset, max(bins) + 1)],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data.get("alpha", DEFAULT_ALPHA))
+        keys = range(data["offset"], data["offset"] + len(data["counts"]))
+        sketch.bins = {key: count for key, count in zip(keys, data.get("counts", [])) if count}
+        sketch.count = sum(sketch.bins.values())
+        return sketch
@@ -0,0 +1,239 @@
+"""
+Instantané binaire des exécutions consolidées (results/performance/snapshot/)
+
+Chaque colonne numérique est un fichier binaire brut (<colonne>.bin) relu
+avec np.memmap en lecture seule: recharger un million d'exécutions ne coûte
+que l'ouverture des fichiers, les pages n'étant lues qu'à l'accès. Les
+colonnes branch, trigger et runner_type sont stockées en codes int32 avec
+une table de chaînes (<colonne>.strings, une chaîne JSON par ligne);
+execution_id, unique par exécution, est stocké tel quel dans sa table.
+Les tables ne sont lues qu'au premier accès à la colonne.
+
+Les fichiers sont en ajout seul: consolidate-data.py n'ajoute que les
+nouvelles exécutions. meta.json (version, nombre d'exécutions, taille de
+chaque fichier, état des sources) est écrit en dernier; les lecteurs ne
+lisent que meta["count"] lignes, de sorte qu'un ajout interrompu reste
+invisible.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from .consolidation import existing_stores, write_json_atomic
+from .loader import (
+    NUMERIC_COLUMNS,
+    PLATFORMS,
+    STAGES,
+    STRING_COLUMNS,
+    ExecutionColumns,
+    list_result_files,
+    load_executions,
+)
+
+SNAPSHOT_DIR = "snapshot"
+SNAPSHOT_VERSION = 1
+META_FILE = "meta.json"
+
+DTYPES = {
+    "platform": np.int8,
+    "timestamp": np.float64,
+    "total": np.float64,
+    "stages": np.float64,
+    "success": np.int8,
+    "queue_time": np.float64,
+    "cache_hit": np.int8,
+    "cache_size_mb": np.float64,
+    "artifact_size_mb": np.float64,
+}
+
+# Colonnes de chaînes dont chaque valeur est unique: pas de déduplication
+UNIQUE_STRING_COLUMNS = ("execution_id",)
+
+CODE_DTYPE = np.int32
+
+
+def snapshot_dir(results_dir):
+    return Path(results_dir) / SNAPSHOT_DIR
+
+
+def snapshot_sources(results_dir):
+    """Fichiers dont l'instantané est dérivé: résultats bruts et magasins consolidés"""
+    return list_result_files(results_dir) + existing_stores(results_dir)
+
+
+def sources_state(paths):
+    """État des sources: nombre de fichiers et mtime le plus récent"""
+    mtimes = [path.stat().st_mtime_ns for path in paths]
+    return {"sources": len(mtimes), "sources_mtime_ns": max(mtimes, default=0)}
+
+
+def empty_meta():
+    return {
+        "version": SNAPSHOT_VERSION,
+        "count": 0,
+        "platforms": list(PLATFORMS),
+        "stages": list(STAGES),
+        "string_counts": {name: 0 for name in STRING_COLUMNS},
+        "file_sizes": {},
+        "sources": 0,
+        "sources_mtime_ns": 0,
+    }
+
+
+def read_meta(results_dir):
+    """meta.json de l'instantané, None s'il est absent ou d'un format incompatible"""
+    path = snapshot_dir(results_dir) / META_FILE
+    if not path.exists():
+        return None
+    with open(path) as f:
+        meta = json.load(f)
+    if (
+        meta.get("version") != SNAPSHOT_VERSION
+        or meta.get("platforms") != list(PLATFORMS)
+        or meta.get("stages") != list(STAGES)
+    ):
+        return None
+    return meta
+
+
+def write_meta(results_dir, meta):
+    directory = snapshot_dir(results_dir)
+    directory.mkdir(exist_ok=True)
+    write_json_atomic(directory / META_FILE, meta, indent=2)
+
+
+def rollback(results_dir, meta):
+    """Tronque les fichiers de l'instantané aux tailles enregistrées dans meta"""
+    directory = snapshot_dir(results_dir)
+    if not directory.exists():
+        return
+    for path in directory.iterdir():
+        if path.name == META_FILE:
+            continue
+        expected = meta["file_sizes"].get(path.name, 0)
+        if path.stat().st_size > expected:
+            with open(path, "r+b") as f:
+                f.truncate(expected)
+
+
+def is_intact(results_dir, meta):
+    """Vérifie que tous les fichiers de l'instantané ont au moins la taille attendue"""
+    directory = snapshot_dir(results_dir)
+    for name, size in meta["file_sizes"].items():
+        path = directory / name
+        if not path.exists() or path.stat().st_size < size:
+            return False
+    return True
+
+
+def reset(results_dir):
+    shutil.rmtree(snapshot_dir(results_dir), ignore_errors=True)
+
+
+def _read_table(path):
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def append(results_dir, columns, meta):
+    """Ajoute des colonnes aux fichiers de l'instantané; retourne le nouveau meta
+
+    meta.json n'est pas écrit ici: l'appelant le valide (write_meta) une fois
+    la consolidation enregistrée.
+    """
+    directory = snapshot_dir(results_dir)
+    directory.mkdir(exist_ok=True)
+    meta = json.loads(json.dumps(meta))
+
+    for name in NUMERIC_COLUMNS:
+        path = directory / f"{name}.bin"
+        values = np.ascontiguousarray(getattr(columns, name), dtype=DTYPES[name])
+        with open(path, "ab") as f:
+            f.write(values.tobytes())
+        meta["file_sizes"][path.name] = path.stat().st_size
+
+    for name in STRING_COLUMNS:
+        table_path = directory / f"{name}.strings"
+        codes_path = directory / f"{name}.bin"
+        values = getattr(columns, name)
+        start = meta["string_counts"][name]
+        new_strings = []
+        if name in UNIQUE_STRING_COLUMNS:
+            codes = np.full(len(values), -1, dtype=CODE_DTYPE)
+            for row, value in enumerate(values):
+                if value is not None:
+                    codes[row] = start + len(new_strings)
+                    new_strings.append(value)
+        else:
+            lookup = {value: code for code, value in enumerate(_read_table(table_path))}
+            codes = np.empty(len(values), dtype=CODE_DTYPE)
+            for row, value in enumerate(values):
+                if value is None:
+                    codes[row] = -1
+                    continue
+                if value not in lookup:
+                    lookup[value] = start + len(new_strings)
+                    new_strings.append(value)
+                codes[row] = lookup[value]
+        with open(table_path, "a") as f:
+            for value in new_strings:
+                f.write(json.dumps(value) + "\n")
+        with open(codes_path, "ab") as f:
+            f.write(codes.tobytes())
+        meta["string_counts"][name] = start + len(new_strings)
+        meta["file_sizes"][table_path.name] = table_path.stat().st_size
+        meta["file_sizes"][codes_path.name] = codes_path.stat().st_size
+
+    meta["count"] += len(columns)
+    return meta
+
+
+def load(results_dir, meta=None):
+    """Charge l'instantané en colonnes memory-mapped (lecture seule)"""
+    meta = meta or read_meta(results_dir)
+    if meta is None:
+        return None
+    count = meta["count"]
+    if count == 0:
+        return ExecutionColumns.empty()
+    directory = snapshot_dir(results_dir)
+
+    columns = {}
+    for name in NUMERIC_COLUMNS:
+        shape = (count, len(STAGES)) if name == "stages" else (count,)
+        columns[name] = np.memmap(directory / f"{name}.bin", dtype=DTYPES[name], mode="r", shape=shape)
+
+    encoded = {}
+    for name in STRING_COLUMNS:
+        codes = np.memmap(directory / f"{name}.bin", dtype=CODE_DTYPE, mode="r", shape=(count,))
+        table_path = directory / f"{name}.strings"
+        encoded[name] = (codes, lambda table_path=table_path: _read_table(table_path))
+    return ExecutionColumns(encoded=encoded, **columns)
+
+
+def load_if_fresh(results_dir):
+    """Charge l'instantané s'il est plus récent que toutes ses sources, sinon None"""
+    meta = read_meta(results_dir)
+    if meta is None:
+        return None
+    state = sources_state(snapshot_sources(results_dir))
+    if state["sources"] != meta["sources"] or state["sources_mtime_ns"] > meta["sources_mtime_ns"]:
+        return None
+    return load(results_dir, meta)
+
+
+def load_columns(results_dir, workers=1):
+    """Charge les exécutions depuis l'instantané s'il est à jour, sinon depuis les fichiers JSON
+
+    Dans les deux cas, chaque exécution (platform:execution_id) n'est
+    comptée qu'une fois.
+    """
+    columns = load_if_fresh(results_dir)
+    if columns is not None:
+        return columns
+    return load_executions(results_dir, workers=workers, unique=True)
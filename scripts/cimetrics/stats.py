@@ -0,0 +1,183 @@
+"""
+Moteur de statistiques vectorisé (plateforme × stage)
+
+Les durées sont rangées dans un cube (plateformes, exécutions, cellules) où
+la cellule 0 est la durée totale et les suivantes les stages de STAGES. Les
+valeurs absentes ou invalides (<= 0) valent NaN: toutes les statistiques de
+toutes les cellules sont calculées en une passe NumPy (nanmean, nanstd,
+nanpercentile sur l'axe des exécutions), sans boucle Python par cellule.
+"""
+
+import csv
+import json
+import warnings
+
+import numpy as np
+
+from .loader import PLATFORMS, STAGES
+from .sketch import REPORTED_PERCENTILES
+
+TOTAL = "total"
+CELLS = (TOTAL,) + STAGES
+
+# Colonnes de la table (format « tidy »: une ligne par plateforme × cellule)
+TABLE_FIELDS = (
+    "platform",
+    "stage",
+    "count",
+    "mean",
+    "median",
+    "std",
+    "min",
+    "max",
+    "q1",
+    "q3",
+    "iqr",
+    "cv",
+    "ci_95_lower",
+    "ci_95_upper",
+)
+
+# Colonnes de la table des percentiles de queue (lue depuis les sketches)
+TAIL_FIELDS = ("platform", "stage", "count", "mean", "std", "min", "max") + tuple(
+    f"p{p}" for p in REPORTED_PERCENTILES
+)
+
+
+def duration_matrix(columns):
+    """Matrice (n, len(CELLS)) des durées valides, NaN pour les valeurs absentes ou <= 0"""
+    values = np.column_stack([columns.total, columns.stages])
+    return np.where(values > 0, values, np.nan)
+
+
+def platform_cube(columns):
+    """Range les durées par plateforme: retourne (plateformes, cube (P, N, M))
+
+    N est le nombre d'exécutions de la plateforme la plus fournie; les
+    plateformes plus petites sont complétées par des NaN.
+    """
+    values = duration_matrix(columns)
+    codes = np.asarray(columns.platform)
+    present = np.unique(codes)
+    counts = np.bincount(codes, minlength=len(PLATFORMS))[present]
+    order = np.argsort(codes, kind="stable")
+    group = np.searchsorted(present, codes[order])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    position = np.arange(len(order)) - starts[group]
+
+    cube = np.full((len(present), counts.max() if len(counts) else 0, values.shape[1]), np.nan)
+    cube[group, position] = values[order]
+    return [PLATFORMS[code] for code in present], cube
+
+
+def describe_cube(cube, confidence=0.95):
+    """Statistiques de chaque cellule d'un cube (P, N, M) le long de l'axe N
+
+    Retourne un dict nom → tableau (P, M). Les cellules avec moins de deux
+    valeurs ont std, cv et intervalle de confiance à NaN.
+    """
+    # Import différé: scipy n'est chargé que si des intervalles sont calculés
+    from scipy import stats
+    with warnings.catch_warnings():
+        # Cellules vides (stage absent d'une plateforme): NaN attendus
+        warnings.simplefilter("ignore", RuntimeWarning)
+        count = np.sum(~np.isnan(cube), axis=1)
+        mean = np.nanmean(cube, axis=1)
+        std = np.nanstd(cube, axis=1, ddof=1)
+        std = np.where(count > 1, std, np.nan)
+        q1, median, q3 = np.nanpercentile(cube, [25, 50, 75], axis=1)
+        minimum = np.nanmin(cube, axis=1)
+        maximum = np.nanmax(cube, axis=1)
+        t_critical = stats.t.ppf((1 + confidence) / 2, np.maximum(count - 1, 1))
+        half_width = np.where(count > 1, t_critical * std / np.sqrt(count), np.nan)
+        cv = np.where(mean > 0, std / mean * 100, np.nan)
+
+    return {
+        "count": count,
+        "mean": mean,
+        "median": median,
+        "std": std,
+        "min": minimum,
+        "max": maximum,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "cv": cv,
+        "ci_95_lower": mean - half_width,
+        "ci_95_upper": mean + half_width,
+    }
+
+
+def describe(durations, confidence=0.95):
+    """Statistiques d'une seule série de durées (dict de floats)"""
+    values = np.asarray(durations, dtype=np.float64)
+    result = describe_cube(values[None, :, None], confidence)
+    return {name: _scalar(array[0, 0]) for name, array in result.items()}
+
+
+def statistics_table(columns, confidence=0.95, min_count=2):
+    """Table tidy des statistiques de toutes les cellules plateforme × stage
+
+    Les cellules avec moins de min_count valeurs sont omises.
+    """
+    platforms, cube = platform_cube(columns)
+    result = describe_cube(cube, confidence)
+    rows = []
+    for p, platform in enumerate(platforms):
+        for m, cell in enumerate(CELLS):
+            if result["count"][p, m] < min_count:
+                continue
+            row = {"platform": platform, "stage": cell}
+            for name in TABLE_FIELDS[2:]:
+                row[name] = _scalar(result[name][p, m])
+            rows.append(row)
+    return rows
+
+
+def tail_table(summary, min_count=1):
+    """Table tidy des percentiles de queue de toutes les cellules d'un résumé
+
+    Les valeurs viennent des agrégats fusionnables (aggregates.Summary):
+    aucune durée n'est chargée, les percentiles sont ceux des sketches.
+    """
+    rows = []
+    for platform in PLATFORMS:
+        if platform not in summary.platforms:
+            continue
+        platform_summary = summary.platforms[platform]
+        cells = [(TOTAL, platform_summary.duration)] + list(platform_summary.stages.items())
+        for cell, running in cells:
+            if running.count < min_count:
+                continue
+            row = {
+                "platform": platform,
+                "stage": cell,
+                "count": running.count,
+                "mean": running.mean,
+                "std": running.std,
+                "min": running.min,
+                "max": running.max,
+            }
+            row.update(running.percentiles())
+            rows.append(row)
+    return rows
+
+
+def _scalar(value):
+    value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def write_table(rows, output_file, fields=TABLE_FIELDS):
+    """Écrit une table (liste de dicts) en CSV ou JSON selon l'extension du fichier"""
+    output_file = str(output_file)
+    if output_file.endswith(".csv"):
+        with open(output_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(output_file, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,256 @@
+"""
+Tendances et ruptures dans l'historique des exécutions
+
+Les exécutions de chaque plateforme sont ordonnées par horodatage, pour la
+durée totale et chaque stage (les exécutions sans horodatage ou sans durée
+valide sont ignorées). Sur chaque série:
+  - médiane et p95 glissants sur les window dernières exécutions, lus dans
+    une fenêtre triée tenue à jour par recherche dichotomique (bisect):
+    chaque exécution retire la plus ancienne valeur et insère la nouvelle,
+    au lieu de retrier toute la fenêtre
+  - détection des ruptures par segmentation binaire sur le logarithme des
+    durées (une rupture = un changement relatif du niveau): le coût d'un
+    segment (somme des carrés des écarts à sa moyenne) s'obtient en O(1)
+    par sommes cumulées, et le meilleur point de coupure d'un segment est
+    évalué en une opération NumPy. Une coupure est retenue si elle réduit
+    le coût de plus que la pénalité penalty × sigma² × log(n), sigma étant
+    estimé de façon robuste (MAD des différences successives, insensible
+    aux ruptures elles-mêmes). Le coût total est en O(n × profondeur).
+    Les valeurs aberrantes isolées (relance, runner saturé) sont d'abord
+    ramenées à moins de 3 sigma de la médiane mobile.
+
+Chaque rupture est rapportée avec la fenêtre où elle s'est produite:
+dernière exécution de l'ancien régime et première du nouveau.
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .parallel import map_chunks
+from .stats import CELLS, TOTAL
+
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_SIZE = 10
+DEFAULT_PENALTY = 2.0
+
+# Écart maximal à la médiane mobile, en écarts-types du bruit
+OUTLIER_SIGMAS = 3.0
+
+# Changement relatif de la médiane en dessous duquel une rupture est ignorée
+MIN_RELATIVE_CHANGE = 0.05
+
+CHANGE_FIELDS = (
+    "platform",
+    "stage",
+    "index",
+    "direction",
+    "median_before",
+    "median_after",
+    "relative",
+    "p95_before",
+    "p95_after",
+    "last_before",
+    "first_after",
+    "last_before_id",
+    "first_after_id",
+)
+
+
+def format_timestamp(timestamp):
+    """Horodatage epoch → ISO 8601 UTC"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def ordered_series(columns, platform, cell):
+    """Série chronologique d'une cellule: (horodatages, durées, execution_id)"""
+    mask = columns.platform_mask(platform) & ~np.isnan(columns.timestamp)
+    values = columns.total if cell == TOTAL else columns.stage(cell)
+    mask &= values > 0
+    indices = np.flatnonzero(mask)
+    order = indices[np.argsort(columns.timestamp[indices], kind="stable")]
+    return columns.timestamp[order], values[order], columns.execution_id[order]
+
+
+def sorted_windows(values, window):
+    """Itère sur chaque fenêtre glissante complète de values, sous forme de liste triée
+
+    La même liste est mise à jour à chaque pas (retrait de la valeur sortante
+    et insertion de la nouvelle par bisect): ne pas la conserver.
+    """
+    values = np.asarray(values, dtype=np.float64).tolist()
+    if len(values) < window:
+        return
+    ordered = sorted(values[:window])
+    yield ordered
+    for old, new in zip(values, values[window:]):
+        del ordered[bisect_left(ordered, old)]
+        insort(ordered, new)
+        yield ordered
+
+
+def rolling_quantiles(values, window=DEFAULT_WINDOW, quantiles=(0.5, 0.95)):
+    """Quantiles glissants des window dernières valeurs, tableau (len(quantiles), n)
+
+    Interpolation linéaire, comme np.quantile. Les window - 1 premières
+    positions (fenêtre incomplète) valent NaN.
+    """
+    result = np.full((len(quantiles), len(values)), np.nan)
+    bounds = []
+    for q in quantiles:
+        position = q * (window - 1)
+        lower = int(position)
+        bounds.append((lower, min(lower + 1, window - 1), position - lower))
+    # Un seul parcours de la fenêtre triée pour tous les quantiles
+    lowers = [[] for _ in quantiles]
+    uppers = [[] for _ in quantiles]
+    for ordered in sorted_windows(values, window):
+        for (lower, upper, _), low_values, high_values in zip(bounds, lowers, uppers):
+            low_values.append(ordered[lower])
+            high_values.append(ordered[upper])
+    for k, (_, _, fraction) in enumerate(bounds):
+        if lowers[k]:
+            low = np.array(lowers[k])
+            result[k, window - 1:] = low + (np.array(uppers[k]) - low) * fraction
+    return result
+
+
+def robust_sigma(values):
+    """Écart-type du bruit estimé par la MAD des différences successives"""
+    differences = np.diff(values)
+    if not len(differences):
+        return 0.0
+    mad = np.median(np.abs(differences - np.median(differences)))
+    return float(1.4826 * mad / np.sqrt(2))
+
+
+def clip_outliers(values, sigma, width, limit=OUTLIER_SIGMAS):
+    """Ramène chaque valeur à moins de limit × sigma de la médiane mobile centrée
+
+    Une exécution isolée très lente (relance, runner saturé) ne crée pas de
+    rupture; un changement de niveau, suivi par la médiane mobile, est
+    conservé.
+    """
+    half = width // 2
+    padded = np.pad(values, half, mode="reflect")
+    medians = np.fromiter((ordered[half] for ordered in sorted_windows(padded, 2 * half + 1)),
+                          dtype=np.float64, count=len(values))
+    return np.clip(values, medians - limit * sigma, medians + limit * sigma)
+
+
+def binary_segmentation(values, penalty=DEFAULT_PENALTY, min_size=DEFAULT_MIN_SIZE):
+    """Indices des ruptures de niveau (début de chaque nouveau segment), triés"""
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    if n < 2 * min_size:
+        return []
+    sigma = robust_sigma(x)
+    if sigma == 0:
+        sigma = float(np.std(x))
+    if sigma == 0:
+        return []
+    x = clip_outliers(x, sigma, min_size)
+    threshold = penalty * sigma ** 2 * np.log(n)
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    def cost(a, b):
+        return s2[b] - s2[a] - (s1[b] - s1[a]) ** 2 / (b - a)
+
+    changes = []
+    segments = [(0, n)]
+    while segments:
+        a, b = segments.pop()
+        if b - a < 2 * min_size:
+            continue
+        splits = np.arange(a + min_size, b - min_size + 1)
+        gains = cost(a, b) - cost(a, splits) - cost(splits, b)
+        best = int(np.argmax(gains))
+        if gains[best] <= threshold:
+            continue
+        split = int(splits[best])
+        changes.append(split)
+        segments.extend([(a, split), (split, b)])
+    return sorted(changes)
+
+
+def detect_changes(timestamps, values, execution_ids, penalty=DEFAULT_PENALTY, min_size=DEFAULT_MIN_SIZE,
+                   min_relative_change=MIN_RELATIVE_CHANGE):
+    """Ruptures d'une série chronologique, avec médianes et p95 avant/après
+
+    Les ruptures dont la médiane change de moins de min_relative_change
+    (significatives mais négligeables) sont écartées.
+    """
+    changes = []
+    boundaries = binary_segmentation(np.log(values), penalty, min_size)
+    edges = [0] + boundaries + [len(values)]
+    for k, index in enumerate(boundaries):
+        before = values[edges[k]:index]
+        after = values[index:edges[k + 2]]
+        median_before, p95_before = np.quantile(before, [0.5, 0.95])
+        median_after, p95_after = np.quantile(after, [0.5, 0.95])
+        relative = (median_after - median_before) / median_before
+        if abs(relative) < min_relative_change:
+            continue
+        changes.append({
+            "index": index,
+            "direction": "slower" if relative > 0 else "faster",
+            "median_before": float(median_before),
+            "median_after": float(median_after),
+            "relative": float(relative),
+            "p95_before": float(p95_before),
+            "p95_after": float(p95_after),
+            "last_before": format_timestamp(timestamps[index - 1]),
+            "first_after": format_timestamp(timestamps[index]),
+            "last_before_id": execution_ids[index - 1],
+            "first_after_id": execution_ids[index],
+        })
+    return changes
+
+
+def analyze_series(task):
+    """Tendance et ruptures d'une série (exécuté dans un worker)"""
+    timestamps, values, execution_ids = task["series"]
+    rolling = rolling_quantiles(values, task["window"])
+    changes = detect_changes(timestamps, values, execution_ids, task["penalty"], task["min_size"])
+    for change in changes:
+        change["platform"] = task["platform"]
+        change["stage"] = task["stage"]
+    return {
+        "platform": task["platform"],
+        "stage": task["stage"],
+        "timestamps": timestamps,
+        "values": values,
+        "rolling_median": rolling[0],
+        "rolling_p95": rolling[1],
+        "changes": changes,
+    }
+
+
+def _analyze_chunk(tasks):
+    return [analyze_series(task) for task in tasks]
+
+
+def analyze_trends(columns, window=DEFAULT_WINDOW, penalty=DEFAULT_PENALTY, min_size=DEFAULT_MIN_SIZE,
+                   platforms=None, cells=CELLS, workers=1):
+    """Analyse toutes les séries plateforme × cellule ayant au moins 2 × min_size exécutions datées
+
+    Retourne la liste des résultats (un par série, dans l'ordre des
+    plateformes puis de CELLS); chaque série est une tâche du pool.
+    """
+    tasks = []
+    for platform in platforms or columns.platforms():
+        for cell in cells:
+            series = ordered_series(columns, platform, cell)
+            if len(series[1]) < 2 * min_size:
+                continue
+            tasks.append({
+                "platform": platform,
+                "stage": cell,
+                "series": series,
+                "window": window,
+                "penalty": penalty,
+                "min_size": min_size,
+            })
+    return [result for chunk in map_chunks(_analyze_chunk, tasks, workers, min_items=2) for result in chunk]
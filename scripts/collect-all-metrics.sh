@@ -136,6 +136,8 @@ echo ""
 echo "📝 Prochaines étapes:"
 echo "   1. Exécuter les pipelines sur chaque plateforme"
 echo "   2. Remplir les fichiers JSON avec les métriques réelles"
+echo "      ou importer les exports d'API: python scripts/import-ci.py github|gitlab|jenkins <exports...>"
+echo "      ou les collecter depuis les API: python scripts/collect-runs.py github|gitlab|jenkins --limit 100"
 echo "   3. Exécuter: python scripts/analyze-results.py $RESULTS_DIR"
 echo ""
 
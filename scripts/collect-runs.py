@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Script pour collecter les exécutions depuis les API GitHub, GitLab et Jenkins
+Usage: python scripts/collect-runs.py github|gitlab|jenkins [--repo OWNER/REPO|--project ID|--job JOB]
+       [--api-url URL] [--limit 100] [--trigger N [--parallel-runs 2] [--workflow ci.yml] [--ref main]]
+       [--wait] [--poll 15] [--timeout 7200] [--concurrency 16]
+       [--precision 0.05] [--min-runs 3] [--aliases alias.json]
+       [--output results/performance/github_api.jsonl]
+
+Remplace la mesure au chronomètre de measure-performance.sh: les runs sont
+lus par l'API de la plateforme (cimetrics/collector.py) avec un pool de
+connexions keep-alive, au plus --concurrency requêtes en vol, des requêtes
+conditionnelles (ETag) et le respect des limites de débit. Les durées
+viennent uniquement des horodatages rapportés par la plateforme; un run
+non terminé est ignoré, ou attendu avec --wait (--poll secondes entre deux
+interrogations, au plus --timeout secondes).
+
+Sans --trigger, les --limit derniers runs sont collectés. Avec --trigger N,
+N runs sont déclenchés (--parallel-runs à la fois, workflow_dispatch de
+--workflow sur --ref chez GitHub) et attendus (un run qui n'apparaît pas,
+ou reste en file Jenkins, au-delà de --timeout secondes est compté en
+erreur); --precision arrête les
+déclenchements dès que l'IC 95% de la durée totale moyenne a une
+demi-largeur relative d'au plus --precision (au moins --min-runs runs).
+
+Les exécutions sont validées avec le schéma de validate-data.py et ajoutées
+au journal --output (JSON Lines, .jsonl.gz ou .jsonl.zst) en un seul bloc;
+celles déjà présentes (même execution_id) ne sont pas ajoutées.
+
+Cible et authentification (variables d'environnement):
+    github   --repo ou GITHUB_REPOSITORY, --api-url ou GITHUB_API_URL, GITHUB_TOKEN
+    gitlab   --project ou GITLAB_PROJECT_ID, --api-url ou CI_API_V4_URL, GITLAB_TOKEN
+    jenkins  --job ou JENKINS_JOB, --api-url ou JENKINS_URL, JENKINS_USER et JENKINS_TOKEN
+
+Un serveur CI simulé (python scripts/mock-ci-server.py) sert de cible locale.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from cimetrics import execlog
+from cimetrics.collector import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_LIMIT,
+    DEFAULT_POLL,
+    DEFAULT_TIMEOUT,
+    APIClient,
+    APIError,
+    Collector,
+    auth_headers,
+    make_source,
+)
+from cimetrics.importers import load_aliases, write_executions
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.records import PLATFORMS
+
+# Plateforme → (option de la cible, variable de la cible, variable de l'URL de l'API)
+TARGETS = {
+    "github": ("repo", "GITHUB_REPOSITORY", "GITHUB_API_URL"),
+    "gitlab": ("project", "GITLAB_PROJECT_ID", "CI_API_V4_URL"),
+    "jenkins": ("job", "JENKINS_JOB", "JENKINS_URL"),
+}
+
+def precision_stop(precision, min_runs):
+    """Règle d'arrêt adaptatif sur la durée totale (numpy importé seulement si demandée)"""
+    from cimetrics.power import should_stop
+
+    def stop(executions):
+        reached, current = should_stop([e["duration"]["total"] for e in executions], precision, min_runs=min_runs)
+        print(f"   {len(executions)} run(s): ±{current:.1%}" + (" → précision atteinte" if reached else ""))
+        return reached
+
+    return stop
+
+async def collect(platform, target, api_url, options):
+    """Collecte (ou déclenche puis collecte); retourne (exécutions, collector, client, secondes)"""
+    client = APIClient(auth_headers(platform, os.environ), concurrency=options["concurrency"])
+    source = make_source(platform, client, target, api_url, options["workflow"], options["ref"])
+    collector = Collector(source, options["aliases"], options["wait"], options["poll"], options["timeout"])
+    start = time.monotonic()
+    try:
+        if options["trigger"]:
+            executions = await collector.collect_triggered(
+                options["trigger"], options["parallel_runs"], options["stop"])
+        else:
+            executions = await collector.collect_recent(options["limit"])
+    finally:
+        await client.close()
+    return executions, collector, client, time.monotonic() - start
+
+def print_report(platform, executions, collector, client, elapsed):
+    """Compteurs de requêtes et runs ignorés"""
+    for run_id, message in collector.failed[:10]:
+        print(f"❌ {run_id if run_id is not None else 'déclenchement'}: {message}")
+    print("\n" + "="*80)
+    print(f"COLLECTE {platform.upper()}")
+    print("="*80)
+    print(f"Durée: {elapsed:.2f} s ({len(executions) / elapsed if elapsed else 0:.0f} runs/s)")
+    print(f"Requêtes: {client.pool.requests} sur {client.pool.connections} connexion(s)")
+    print(f"Réponses 304 (ETag): {client.not_modified}")
+    print(f"Limites de débit: {client.rate_limited}, nouvelles tentatives: {client.retries}")
+    print(f"Runs collectés: {len(executions)}")
+    print(f"Non terminés: {collector.unfinished}")
+    print(f"En erreur: {len(collector.failed)}")
+
+def print_usage():
+    print("Usage: python scripts/collect-runs.py github|gitlab|jenkins [--repo OWNER/REPO|--project ID|--job JOB]")
+    print("       [--api-url URL] [--limit 100] [--trigger N [--parallel-runs 2] [--workflow ci.yml] [--ref main]]")
+    print("       [--wait] [--poll 15] [--timeout 7200] [--concurrency 16]")
+    print("       [--precision 0.05] [--min-runs 3] [--aliases alias.json] [--output journal.jsonl]")
+
+def main():
+    args = sys.argv[1:]
+    targets = {}
+    with usage_on_error(print_usage):
+        for option, _, _ in TARGETS.values():
+            targets[option], args = pop_option(args, option)
+        api_url, args = pop_option(args, "api-url")
+        limit, args = pop_option(args, "limit", DEFAULT_LIMIT, int)
+        trigger, args = pop_option(args, "trigger", 0, int)
+        parallel_runs, args = pop_option(args, "parallel-runs", 1, int)
+        workflow, args = pop_option(args, "workflow", "ci.yml")
+        ref, args = pop_option(args, "ref", "main")
+        wait, args = pop_flag(args, "wait")
+        poll, args = pop_option(args, "poll", DEFAULT_POLL, float)
+        timeout, args = pop_option(args, "timeout", DEFAULT_TIMEOUT, float)
+        concurrency, args = pop_option(args, "concurrency", DEFAULT_CONCURRENCY, int)
+        precision, args = pop_option(args, "precision", None, float)
+        min_runs, args = pop_option(args, "min-runs", 3, int)
+        aliases_file, args = pop_option(args, "aliases")
+        output_file, args = pop_option(args, "output")
+    if len(args) != 1 or args[0] not in PLATFORMS or min(limit, parallel_runs, concurrency) < 1 or trigger < 0:
+        print_usage()
+        sys.exit(1)
+
+    platform = args[0]
+    option, target_variable, url_variable = TARGETS[platform]
+    target = targets[option] or os.environ.get(target_variable)
+    api_url = api_url or os.environ.get(url_variable)
+    if not target:
+        print(f"❌ Cible manquante: --{option} ou {target_variable}")
+        sys.exit(1)
+    output_file = output_file or f"results/performance/{platform}_api.jsonl"
+    if not execlog.is_execution_log(output_file):
+        print(f"❌ --output doit être un journal {'|'.join(execlog.LOG_SUFFIXES)}: {output_file}")
+        sys.exit(1)
+
+    try:
+        aliases = load_aliases(aliases_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ Alias invalides: {e}")
+        sys.exit(1)
+
+    options = {
+        "limit": limit,
+        "trigger": trigger,
+        "parallel_runs": parallel_runs,
+        "workflow": workflow,
+        "ref": ref,
+        # Un run déclenché est toujours attendu
+        "wait": wait or bool(trigger),
+        "poll": poll,
+        "timeout": timeout,
+        "concurrency": concurrency,
+        "aliases": aliases,
+        "stop": precision_stop(precision, min_runs) if precision and trigger else None,
+    }
+    if trigger:
+        print(f"🚀 {platform}: déclenchement de {trigger} run(s) ({parallel_runs} à la fois)")
+    else:
+        print(f"📡 {platform}: collecte des {limit} derniers runs ({concurrency} requêtes en vol)")
+    try:
+        executions, collector, client, elapsed = asyncio.run(collect(platform, target, api_url, options))
+    except (APIError, ValueError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    added, duplicates, invalid, report = write_executions(output_file, executions)
+    for message in report.errors:
+        print(f"❌ {message}")
+    print_report(platform, executions, collector, client, elapsed)
+    print(f"Déjà présents: {duplicates}")
+    print(f"Invalides: {invalid}")
+    print(f"\n✅ {added} exécutions ajoutées à {output_file}")
+
+if __name__ == "__main__":
+    main()
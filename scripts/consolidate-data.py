@@ -1,7 +1,24 @@
 #!/usr/bin/env python3
 """
 Script pour consolider les données collectées
-Usage: python scripts/consolidate-data.py results/performance/
+Usage: python scripts/consolidate-data.py results/performance/ [--rebuild] [--format jsonl|jsonl.gz|jsonl.zst]
+
+La consolidation est incrémentale: seuls les fichiers nouveaux ou modifiés
+depuis la dernière exécution sont relus (voir .consolidation-manifest.json),
+les exécutions déjà consolidées (même platform + execution_id) sont ignorées
+(celles dont le contenu a changé sont signalées: --rebuild les relit) et
+les nouvelles sont ajoutées au journal {platform}_all.jsonl (une
+exécution par ligne, compressé par blocs avec --format jsonl.gz/jsonl.zst).
+Relancer le script sans nouveau fichier ne change rien. --rebuild repart de
+zéro. Un instantané binaire (snapshot/, voir cimetrics/snapshot.py) est
+tenu à jour pour que les scripts d'analyse rechargent les exécutions sans
+reparser le JSON. En entrée, les fichiers .json et les journaux .jsonl[.gz|.zst] sont
+acceptés.
+
+summary.json contient des agrégats fusionnables (count, sum, m2, min, max,
+sketch de quantiles) par plateforme et par stage, mis à jour avec les
+seules nouvelles exécutions. Pour combiner les résumés de plusieurs machines:
+  python scripts/consolidate-data.py --merge-summaries <sortie.json> <summary.json>...
 """
 
 import json
@@ -9,122 +26,177 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
-def load_all_executions(directory):
-    """Charge toutes les exécutions depuis les fichiers JSON"""
-    directory = Path(directory)
+from cimetrics import consolidation, execlog, snapshot
+from cimetrics.aggregates import Summary
+from cimetrics.consolidation import Manifest
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.loader import (
+    PLATFORMS,
+    SUMMARY_FILE,
+    ColumnBuilder,
+    iter_execution_records,
+    iter_file_documents,
+    list_result_files,
+    load_files,
+    platform_from_filename,
+)
+
+def load_new_executions(changed_files, manifest):
+    """Charge les exécutions des fichiers nouveaux ou modifiés
+
+    Les exécutions dont la clé (platform, execution_id) est déjà dans le
+    manifeste sont ignorées. Le manifeste est mis à jour en mémoire.
+    Retourne les exécutions brutes par plateforme, leurs colonnes et les clés
+    des exécutions déjà consolidées dont le contenu a changé.
+    """
     executions_by_platform = defaultdict(list)
-    
-    for json_file in directory.glob("*.json"):
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
-            # Support pour différents formats
-            if isinstance(data, list):
-                # Format: liste d'exécutions
-                for execution in data:
-                    if "platform" in execution:
-                        executions_by_platform[execution["platform"]].append(execution)
-            elif isinstance(data, dict):
-                if "executions" in data:
-                    # Format: {platform: "...", executions: [...]}
-                    platform = data.get("platform", json_file.stem.split("_")[0])
-                    for execution in data["executions"]:
-                        execution["platform"] = platform
-                        executions_by_platform[platform].append(execution)
-                elif "platform" in data:
-                    # Format: exécution unique
-                    executions_by_platform[data["platform"]].append(data)
-                else:
-                    # Essayer de deviner la plateforme depuis le nom du fichier
-                    platform = json_file.stem.split("_")[0]
-                    if platform in ["github", "gitlab", "jenkins"]:
-                        data["platform"] = platform
-                        executions_by_platform[platform].append(data)
-        except Exception as e:
-            print(f"⚠️  Erreur lors de la lecture de {json_file.name}: {e}")
-    
-    return executions_by_platform
-
-def consolidate_platform(platform, executions, output_dir):
-    """Consolide les exécutions d'une plateforme"""
-    output_file = output_dir / f"{platform}_all.json"
-    
-    consolidated = {
-        "platform": platform,
-        "total_executions": len(executions),
-        "executions": executions
-    }
-    
-    with open(output_file, 'w') as f:
-        json.dump(consolidated, f, indent=2)
-    
-    return output_file
-
-def generate_summary(executions_by_platform, output_dir):
-    """Génère un résumé de toutes les données"""
-    summary = {
-        "total_platforms": len(executions_by_platform),
-        "platforms": {}
-    }
-    
-    for platform, executions in executions_by_platform.items():
-        durations = [e.get("duration", {}).get("total", 0) for e in executions]
-        durations = [d for d in durations if d > 0]
-        
-        summary["platforms"][platform] = {
-            "total_executions": len(executions),
-            "successful_executions": sum(1 for e in executions if e.get("success", False)),
-            "failed_executions": sum(1 for e in executions if not e.get("success", True)),
-            "avg_duration": sum(durations) / len(durations) if durations else 0,
-            "min_duration": min(durations) if durations else 0,
-            "max_duration": max(durations) if durations else 0
-        }
-    
-    summary_file = output_dir / "summary.json"
-    with open(summary_file, 'w') as f:
-        json.dump(summary, f, indent=2)
-    
+    builder = ColumnBuilder()
+    modified = []
+
+    for result_file, entry in changed_files:
+        default_platform = platform_from_filename(result_file)
+
+        # Support pour différents formats (liste, conteneur, exécution unique, journal)
+        for data in iter_file_documents(result_file):
+            for platform, execution in iter_execution_records(data, default_platform):
+                key = consolidation.execution_key(platform, execution)
+                digest = consolidation.execution_digest({**execution, "platform": platform})
+                if key in manifest.keys:
+                    if manifest.keys[key] != digest:
+                        modified.append(key)
+                    continue
+                if not builder.append(platform, execution):
+                    continue
+                manifest.add_key(key, digest)
+                execution["platform"] = platform
+                executions_by_platform[platform].append(execution)
+        manifest.files[result_file.name] = entry
+
+    return executions_by_platform, builder.build(), modified
+
+def prepare_snapshot(results_dir, manifest):
+    """Remet l'instantané dans l'état validé par le manifeste; retourne son meta
+
+    Si l'instantané manque ou est incomplet, il est reconstruit depuis les
+    magasins consolidés.
+    """
+    meta = manifest.snapshot
+    if meta is not None and snapshot.is_intact(results_dir, meta):
+        snapshot.rollback(results_dir, meta)
+        return meta
+    snapshot.reset(results_dir)
+    meta = snapshot.empty_meta()
+    stored = load_files(consolidation.existing_stores(results_dir))
+    if len(stored):
+        print("🔄 Reconstruction de l'instantané binaire depuis les magasins consolidés")
+        meta = snapshot.append(results_dir, stored, meta)
+    return meta
+
+def generate_summary(summary, output_dir):
+    """Écrit le résumé fusionnable de toutes les données"""
+    summary_file = output_dir / SUMMARY_FILE
+    consolidation.write_json_atomic(summary_file, summary.to_dict(), indent=2)
+
     return summary_file
 
+def merge_summaries(output_file, summary_files):
+    """Combine les summary.json de plusieurs shards ou machines"""
+    merged = Summary()
+    for summary_file in summary_files:
+        with open(summary_file) as f:
+            merged.merge(Summary.from_dict(json.load(f)))
+    consolidation.write_json_atomic(output_file, merged.to_dict(), indent=2)
+    print(f"✅ {len(summary_files)} résumés fusionnés → {output_file}")
+
+def print_usage():
+    print("Usage: python scripts/consolidate-data.py <results_dir> [--rebuild] [--format jsonl|jsonl.gz|jsonl.zst]")
+    print("       python scripts/consolidate-data.py --merge-summaries <output> <summary.json>...")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/consolidate-data.py <results_dir>")
+    with usage_on_error(print_usage):
+        store_format, argv = pop_option(sys.argv[1:], "format")
+    if store_format is not None and store_format not in execlog.FORMATS:
+        print(f"❌ Format inconnu: {store_format} (choix: {', '.join(execlog.FORMATS)})")
+        sys.exit(1)
+    args = [arg for arg in argv if not arg.startswith("--")]
+    if "--merge-summaries" in sys.argv:
+        if len(args) < 2:
+            print_usage()
+            sys.exit(1)
+        merge_summaries(Path(args[0]), args[1:])
+        return
+
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
-    
-    results_dir = Path(sys.argv[1])
-    
+
+    results_dir = Path(args[0])
+
     if not results_dir.exists():
         print(f"❌ Répertoire introuvable: {results_dir}")
         sys.exit(1)
-    
+
     print(f"🔍 Consolidation des données depuis {results_dir}...")
     print()
-    
-    # Charger toutes les exécutions
-    executions_by_platform = load_all_executions(results_dir)
-    
-    if not executions_by_platform:
-        print("❌ Aucune exécution trouvée")
+
+    if "--rebuild" in sys.argv:
+        consolidation.reset(results_dir)
+        snapshot.reset(results_dir)
+
+    manifest = Manifest.load(results_dir)
+    if not manifest.files:
+        manifest.store_format = store_format or manifest.store_format
+    elif store_format and store_format != manifest.store_format:
+        print(f"❌ Le magasin existant est au format {manifest.store_format} (utiliser --rebuild pour changer)")
         sys.exit(1)
-    
-    # Afficher le résumé
-    print("📊 Exécutions trouvées:")
-    for platform, executions in executions_by_platform.items():
-        print(f"  {platform}: {len(executions)} exécutions")
+    manifest.rollback_stores(results_dir)
+    snapshot_meta = prepare_snapshot(results_dir, manifest)
+
+    # Ne relire que les fichiers nouveaux ou modifiés
+    result_files = list_result_files(results_dir)
+    changed_files = manifest.changed_files(result_files)
+    executions_by_platform, new_columns, modified = load_new_executions(changed_files, manifest)
+
+    print(f"📄 Fichiers: {len(result_files)} ({len(changed_files)} nouveaux ou modifiés)")
+    print("📊 Nouvelles exécutions:")
+    for platform in PLATFORMS:
+        print(f"  {platform}: {len(executions_by_platform.get(platform, []))} exécutions")
+    if modified:
+        shown = ", ".join(modified[:5]) + (", ..." if len(modified) > 5 else "")
+        print(f"⚠️  {len(modified)} exécution(s) déjà consolidée(s) modifiée(s), non remplacée(s): {shown}")
+        print("   (relancer avec --rebuild pour consolider leur nouveau contenu)")
     print()
-    
-    # Consolider par plateforme
+
+    # Ajouter aux magasins, à l'instantané et aux agrégats, puis valider le manifeste
+    store_sizes = consolidation.append_executions(
+        results_dir, executions_by_platform, manifest.compression
+    )
+    manifest.store_sizes.update(store_sizes)
+    manifest.summary.update_columns(new_columns)
+    snapshot_meta = snapshot.append(results_dir, new_columns, snapshot_meta)
+    snapshot_meta.update(snapshot.sources_state(snapshot.snapshot_sources(results_dir)))
+    manifest.snapshot = snapshot_meta
+    manifest.save(results_dir)
+    snapshot.write_meta(results_dir, snapshot_meta)
+
+    summary = manifest.summary
+    if not summary.platforms:
+        print("❌ Aucune exécution trouvée")
+        sys.exit(1)
+
     consolidated_files = []
-    for platform, executions in executions_by_platform.items():
-        output_file = consolidate_platform(platform, executions, results_dir)
+    for platform in PLATFORMS:
+        if platform not in summary.platforms:
+            continue
+        output_file = consolidation.store_path(results_dir, platform, manifest.compression)
         consolidated_files.append(output_file)
-        print(f"✅ {platform}: {len(executions)} exécutions consolidées → {output_file.name}")
-    
+        total = summary.platforms[platform].executions
+        print(f"✅ {platform}: {total} exécutions consolidées → {output_file.name}")
+
     # Générer le résumé
-    summary_file = generate_summary(executions_by_platform, results_dir)
+    summary_file = generate_summary(summary, results_dir)
     print(f"✅ Résumé généré → {summary_file.name}")
-    
+
     print()
     print("="*60)
     print("✅ Consolidation terminée!")
@@ -137,4 +209,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -1,7 +1,20 @@
 #!/usr/bin/env python3
 """
 Script pour générer des visualisations améliorées
-Usage: python scripts/generate-visualizations.py results/performance/
+Usage: python scripts/generate-visualizations.py results/performance/ [--preview] [--workers N] [--summary summary.json]
+
+Les figures sont tirées des agrégats fusionnables de la consolidation
+(cimetrics/aggregates.py) et non des durées brutes: moyennes, écarts-types
+et taux de succès viennent des statistiques suffisantes, les box plots
+(Axes.bxp) et les violons (Axes.violin) des sketches de quantiles. Le coût
+ne dépend donc pas de la longueur de l'historique. --summary dessine un
+summary.json donné (ex: fusion de plusieurs machines avec
+consolidate-data.py --merge-summaries).
+
+Toutes les figures sont dessinées à partir d'une même table
+(aggregate_table), les figures indépendantes en parallèle sur un pool de
+processus. --preview génère des PNG basse résolution (PREVIEW_DPI) pour la
+CI.
 """
 
 import json
@@ -9,96 +22,161 @@ import sys
 from pathlib import Path
 import matplotlib.pyplot as plt
 import numpy as np
-from statistics import mean, median, stdev
 import seaborn as sns
 
+from cimetrics.aggregates import Summary
+from cimetrics.consolidation import load_summary
+from cimetrics.loader import PLATFORMS, STAGES
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.parallel import map_chunks, pop_workers_option
+
 # Configuration
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 6)
 plt.rcParams['font.size'] = 10
 
-def load_consolidated_data(results_dir):
-    """Charge les données consolidées"""
-    results_dir = Path(results_dir)
-    platforms_data = {}
-    
-    for platform in ["github", "gitlab", "jenkins"]:
-        file = results_dir / f"{platform}_all.json"
-        if file.exists():
-            with open(file) as f:
-                data = json.load(f)
-                platforms_data[platform] = data.get("executions", [])
-    
-    return platforms_data
-
-def extract_durations(executions):
-    """Extrait les durées totales"""
-    durations = []
-    for e in executions:
-        duration = e.get("duration", {}).get("total", 0) if isinstance(e.get("duration"), dict) else e.get("duration", 0)
-        if duration > 0:
-            durations.append(duration)
-    return durations
-
-def plot_comparison_boxplot(platforms_data, output_file):
-    """Génère un box plot de comparaison"""
+DPI = 300
+PREVIEW_DPI = 72
+
+COLORS = ['#28a745', '#fc6d26', '#d33833']
+
+def load_consolidated_summary(results_dir, summary_file=None, workers=1):
+    """Charge le résumé fusionnable: summary_file s'il est donné, sinon celui de la consolidation"""
+    if summary_file:
+        with open(summary_file) as f:
+            return Summary.from_dict(json.load(f))
+    return load_summary(results_dir, workers)
+
+def aggregate_table(summary):
+    """Calcule les agrégats de toutes les figures depuis le résumé fusionnable
+
+    Retourne un dict de listes (sérialisable, envoyé tel quel aux workers):
+    une valeur par plateforme, et par plateforme × stage pour stage_means et
+    stage_boxes. Aucune durée brute n'est lue.
+    """
+    platforms = [
+        platform for platform in PLATFORMS
+        if platform in summary.platforms and summary.platforms[platform].executions
+    ]
+    table = {
+        "platforms": platforms,
+        "counts": [],
+        "means": [],
+        "medians": [],
+        "stds": [],
+        "success_rates": [],
+        "stage_means": [],
+        "boxes": [],
+        "violins": [],
+        "stage_boxes": [],
+    }
+    for platform in platforms:
+        platform_summary = summary.platforms[platform]
+        duration = platform_summary.duration
+        table["counts"].append(duration.count)
+        table["means"].append(duration.mean)
+        table["medians"].append(duration.quantile(0.5) or 0)
+        table["stds"].append(duration.std)
+        table["success_rates"].append(platform_summary.successful / platform_summary.executions * 100)
+        table["stage_means"].append([platform_summary.stages[stage].mean for stage in STAGES])
+        table["boxes"].append(duration.box_stats(platform.upper()))
+        table["violins"].append(duration.violin_stats())
+        table["stage_boxes"].append([platform_summary.stages[stage].box_stats() for stage in STAGES])
+    return table
+
+def plot_comparison_boxplot(table, output_file, dpi=DPI):
+    """Génère un box plot de comparaison (quantiles précalculés, Axes.bxp)"""
+    boxes = [box for box in table["boxes"] if box is not None]
+    if not boxes:
+        return
+    colors = [COLORS[i] for i, box in enumerate(table["boxes"]) if box is not None]
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bp = ax.bxp(boxes, patch_artist=True, showmeans=True)
+    
+    # Colorier les box plots
+    for patch, color in zip(bp['boxes'], colors):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+    
+    ax.set_ylabel('Temps d\'exécution (secondes)')
+    ax.set_title('Distribution des temps d\'exécution par plateforme')
+    ax.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Box plot généré: {output_file}")
+
+def plot_distribution_violin(table, output_file, dpi=DPI):
+    """Génère des violons des durées totales (densités des sketches, Axes.violin)"""
+    violins = [(i, violin) for i, violin in enumerate(table["violins"]) if violin is not None]
+    if not violins:
+        return
+    
     fig, ax = plt.subplots(figsize=(10, 6))
+    positions = np.arange(1, len(violins) + 1)
+    parts = ax.violin([violin for _, violin in violins], positions=positions, showmedians=True)
+    for body, (i, _) in zip(parts['bodies'], violins):
+        body.set_facecolor(COLORS[i])
+        body.set_alpha(0.6)
     
-    data_to_plot = []
-    labels = []
-    
-    for platform in ["github", "gitlab", "jenkins"]:
-        if platform in platforms_data:
-            durations = extract_durations(platforms_data[platform])
-            if durations:
-                data_to_plot.append(durations)
-                labels.append(platform.upper())
-    
-    if data_to_plot:
-        bp = ax.boxplot(data_to_plot, labels=labels, patch_artist=True)
-        
-        # Colorier les box plots
-        colors = ['#28a745', '#fc6d26', '#d33833']
-        for patch, color in zip(bp['boxes'], colors[:len(bp['boxes'])]):
-            patch.set_facecolor(color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([table["platforms"][i].upper() for i, _ in violins])
+    ax.set_ylabel('Temps d\'exécution (secondes)')
+    ax.set_title('Densité des temps d\'exécution par plateforme')
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Violons générés: {output_file}")
+
+def plot_stage_boxplot(table, output_file, dpi=DPI):
+    """Génère les box plots par stage et par plateforme (Axes.bxp)"""
+    fig, ax = plt.subplots(figsize=(14, 8))
+    
+    platforms = table["platforms"]
+    width = 0.8 / max(len(platforms), 1)
+    x = np.arange(len(STAGES))
+    
+    for i, (platform, stage_boxes) in enumerate(zip(platforms, table["stage_boxes"])):
+        positions = [x[s] + i * width for s, box in enumerate(stage_boxes) if box is not None]
+        boxes = [box for box in stage_boxes if box is not None]
+        if not boxes:
+            continue
+        bp = ax.bxp(boxes, positions=positions, widths=width * 0.9, patch_artist=True,
+                    showfliers=False, manage_ticks=False)
+        for patch in bp['boxes']:
+            patch.set_facecolor(COLORS[i])
             patch.set_alpha(0.7)
-        
-        ax.set_ylabel('Temps d\'exécution (secondes)')
-        ax.set_title('Distribution des temps d\'exécution par plateforme')
-        ax.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"✅ Box plot généré: {output_file}")
-
-def plot_stage_comparison(platforms_data, output_file):
+        bp['boxes'][0].set_label(platform.upper())
+    
+    ax.set_xlabel('Stages')
+    ax.set_ylabel('Temps (secondes)')
+    ax.set_title('Distribution des temps par stage')
+    ax.set_xticks(x + width * (len(platforms) - 1) / 2)
+    ax.set_xticklabels([s.replace('_', ' ').title() for s in STAGES], rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Box plots des stages générés: {output_file}")
+
+def plot_stage_comparison(table, output_file, dpi=DPI):
     """Génère une comparaison des temps par stage"""
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    stages = ["lint_backend", "lint_frontend", "test_backend", "test_frontend", 
-              "build_frontend", "e2e_tests", "docker_build", "deploy"]
+    stages = STAGES
     
     x = np.arange(len(stages))
     width = 0.25
     
-    platforms = []
-    for platform in ["github", "gitlab", "jenkins"]:
-        if platform in platforms_data:
-            platforms.append(platform)
-    
-    for i, platform in enumerate(platforms):
-        stage_means = []
-        for stage in stages:
-            durations = []
-            for e in platforms_data[platform]:
-                stages_data = e.get("duration", {}).get("stages", {})
-                if isinstance(stages_data, dict) and stage in stages_data:
-                    duration = stages_data[stage]
-                    if duration > 0:
-                        durations.append(duration)
-            stage_means.append(mean(durations) if durations else 0)
-        
+    platforms = table["platforms"]
+    
+    for i, (platform, stage_means) in enumerate(zip(platforms, table["stage_means"])):
         ax.bar(x + i * width, stage_means, width, label=platform.upper(), alpha=0.8)
     
     ax.set_xlabel('Stages')
@@ -110,97 +188,94 @@ def plot_stage_comparison(platforms_data, output_file):
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     plt.close()
     print(f"✅ Comparaison des stages générée: {output_file}")
 
-def plot_statistics_comparison(platforms_data, output_file):
+def plot_statistics_comparison(table, output_file, dpi=DPI):
     """Génère une comparaison des statistiques"""
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     
-    platforms = []
-    for platform in ["github", "gitlab", "jenkins"]:
-        if platform in platforms_data:
-            platforms.append(platform)
+    platforms = table["platforms"]
+    colors = COLORS[:len(platforms)]
     
     # Moyenne
-    means = []
-    for platform in platforms:
-        durations = extract_durations(platforms_data[platform])
-        means.append(mean(durations) if durations else 0)
-    
-    axes[0, 0].bar(platforms, means, color=['#28a745', '#fc6d26', '#d33833'], alpha=0.7)
+    axes[0, 0].bar(platforms, table["means"], color=colors, alpha=0.7)
     axes[0, 0].set_ylabel('Temps moyen (secondes)')
     axes[0, 0].set_title('Temps moyen d\'exécution')
     axes[0, 0].grid(True, alpha=0.3, axis='y')
     
     # Médiane
-    medians = []
-    for platform in platforms:
-        durations = extract_durations(platforms_data[platform])
-        medians.append(median(durations) if durations else 0)
-    
-    axes[0, 1].bar(platforms, medians, color=['#28a745', '#fc6d26', '#d33833'], alpha=0.7)
+    axes[0, 1].bar(platforms, table["medians"], color=colors, alpha=0.7)
     axes[0, 1].set_ylabel('Temps médian (secondes)')
     axes[0, 1].set_title('Temps médian d\'exécution')
     axes[0, 1].grid(True, alpha=0.3, axis='y')
     
     # Écart-type
-    stds = []
-    for platform in platforms:
-        durations = extract_durations(platforms_data[platform])
-        if len(durations) > 1:
-            stds.append(stdev(durations))
-        else:
-            stds.append(0)
-    
-    axes[1, 0].bar(platforms, stds, color=['#28a745', '#fc6d26', '#d33833'], alpha=0.7)
+    axes[1, 0].bar(platforms, table["stds"], color=colors, alpha=0.7)
     axes[1, 0].set_ylabel('Écart-type (secondes)')
     axes[1, 0].set_title('Variabilité des temps d\'exécution')
     axes[1, 0].grid(True, alpha=0.3, axis='y')
     
     # Taux de succès
-    success_rates = []
-    for platform in platforms:
-        executions = platforms_data[platform]
-        successful = sum(1 for e in executions if e.get("success", False))
-        success_rates.append((successful / len(executions) * 100) if executions else 0)
-    
-    axes[1, 1].bar(platforms, success_rates, color=['#28a745', '#fc6d26', '#d33833'], alpha=0.7)
+    axes[1, 1].bar(platforms, table["success_rates"], color=colors, alpha=0.7)
     axes[1, 1].set_ylabel('Taux de succès (%)')
     axes[1, 1].set_title('Taux de succès des pipelines')
     axes[1, 1].set_ylim(0, 100)
     axes[1, 1].grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     plt.close()
     print(f"✅ Comparaison des statistiques générée: {output_file}")
 
+# Figure → fonction de dessin (toutes indépendantes les unes des autres)
+FIGURES = {
+    "comparison_boxplot.png": plot_comparison_boxplot,
+    "distribution_violin.png": plot_distribution_violin,
+    "stage_comparison.png": plot_stage_comparison,
+    "stage_boxplot.png": plot_stage_boxplot,
+    "statistics_comparison.png": plot_statistics_comparison,
+}
+
+def render_figures(tasks):
+    """Dessine un lot de figures [(nom, table, fichier, dpi)] (exécuté dans un worker)"""
+    for name, table, output_file, dpi in tasks:
+        FIGURES[name](table, output_file, dpi)
+    return len(tasks)
+
+def print_usage():
+    print("Usage: python scripts/generate-visualizations.py <results_dir> [--preview] [--workers N] [--summary summary.json]")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/generate-visualizations.py <results_dir>")
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        preview, args = pop_flag(args, "preview")
+        summary_file, args = pop_option(args, "summary")
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
     
-    results_dir = Path(sys.argv[1])
+    results_dir = Path(args[0])
     output_dir = results_dir / "visualizations"
     output_dir.mkdir(exist_ok=True)
     
     print(f"📊 Génération des visualisations...")
     print()
     
-    # Charger les données
-    platforms_data = load_consolidated_data(results_dir)
+    # Charger les agrégats (aucune durée brute)
+    summary = load_consolidated_summary(results_dir, summary_file, workers)
     
-    if not platforms_data:
+    if not any(platform_summary.executions for platform_summary in summary.platforms.values()):
         print("❌ Aucune donnée consolidée trouvée")
         print("   Exécutez d'abord: python scripts/consolidate-data.py results/performance/")
         sys.exit(1)
     
-    # Générer les visualisations
-    plot_comparison_boxplot(platforms_data, output_dir / "comparison_boxplot.png")
-    plot_stage_comparison(platforms_data, output_dir / "stage_comparison.png")
-    plot_statistics_comparison(platforms_data, output_dir / "statistics_comparison.png")
+    # Une table pour toutes les figures, puis les figures en parallèle
+    table = aggregate_table(summary)
+    dpi = PREVIEW_DPI if preview else DPI
+    tasks = [(name, table, output_dir / name, dpi) for name in FIGURES]
+    map_chunks(render_figures, tasks, workers, min_items=2)
     
     print()
     print("="*60)
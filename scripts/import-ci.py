@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script pour importer les exports d'API GitHub Actions, GitLab CI et Jenkins
+Usage: python scripts/import-ci.py github|gitlab|jenkins <export.json|dossier ...>
+       [--output results/performance/github_api.jsonl] [--aliases alias.json]
+
+Remplace le remplissage manuel des modèles de collect-all-metrics.sh: les
+exports sauvegardés (cimetrics/importers.py) sont convertis en exécutions
+au format des résultats, validées avec le schéma de validate-data.py et
+ajoutées au journal --output (JSON Lines, .jsonl.gz ou .jsonl.zst).
+
+Exports, un ou plusieurs fichiers par plateforme (un dossier = tous ses
+.json, .json.gz et .jsonl):
+    gh api --paginate "repos/OWNER/REPO/actions/runs?status=completed" > runs.json
+    gh api --paginate repos/OWNER/REPO/actions/runs/ID/jobs >> jobs.json
+    curl -H "PRIVATE-TOKEN: $T" "$GITLAB/api/v4/projects/ID/pipelines/PID" > pipeline.json
+    curl -H "PRIVATE-TOKEN: $T" "$GITLAB/api/v4/projects/ID/pipelines/PID/jobs" > jobs.json
+    curl -u user:token "$JENKINS/job/JOB/wfapi/runs" > runs.json
+
+Les noms de jobs et de stages sont ramenés aux stages canoniques; ceux qui
+restent sans correspondance sont listés et peuvent être ajoutés avec
+--aliases {"nom du job": "stage"}. Les exécutions déjà présentes dans le
+journal (même execution_id) ne sont pas ajoutées une seconde fois.
+"""
+
+import sys
+from pathlib import Path
+
+from cimetrics import execlog
+from cimetrics.importers import CIImporter, load_aliases, write_executions
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.records import PLATFORMS
+
+EXPORT_SUFFIXES = (".json", ".json.gz", ".jsonl", ".jsonl.gz")
+
+def export_files(paths):
+    """Exports à importer: fichiers donnés et exports des dossiers"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(p for p in path.iterdir() if p.name.endswith(EXPORT_SUFFIXES))
+        else:
+            yield path
+
+def print_unmapped(unmapped):
+    """Affiche les noms de jobs/stages sans stage canonique"""
+    print(f"\n⚠️  {len(unmapped)} nom(s) de job/stage sans stage canonique (--aliases pour les ajouter):")
+    for name, count in sorted(unmapped.items(), key=lambda item: -item[1])[:20]:
+        print(f"   {count:>6}× {name}")
+
+def print_usage():
+    print("Usage: python scripts/import-ci.py github|gitlab|jenkins <export.json|dossier ...>")
+    print("       [--output results/performance/github_api.jsonl] [--aliases alias.json]")
+
+def main():
+    with usage_on_error(print_usage):
+        aliases_file, args = pop_option(sys.argv[1:], "aliases")
+        output_file, args = pop_option(args, "output")
+    if len(args) < 2 or args[0] not in PLATFORMS:
+        print_usage()
+        sys.exit(1)
+
+    platform = args[0]
+    output_file = output_file or f"results/performance/{platform}_api.jsonl"
+    if not execlog.is_execution_log(output_file):
+        print(f"❌ --output doit être un journal {'|'.join(execlog.LOG_SUFFIXES)}: {output_file}")
+        sys.exit(1)
+
+    try:
+        importer = CIImporter(platform, load_aliases(aliases_file))
+    except (OSError, ValueError) as e:
+        print(f"❌ Alias invalides: {e}")
+        sys.exit(1)
+
+    for path in export_files(args[1:]):
+        runs, jobs = len(importer.pipelines), importer.jobs
+        try:
+            importer.add_file(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"❌ {path}: export illisible ({e})")
+            sys.exit(1)
+        print(f"📥 {path}: {len(importer.pipelines) - runs} runs, {importer.jobs - jobs} jobs/stages")
+
+    executions = importer.executions()
+    added, duplicates, invalid, report = write_executions(output_file, executions)
+
+    if importer.unmapped:
+        print_unmapped(importer.unmapped)
+    for message in report.errors:
+        print(f"❌ {message}")
+
+    print("\n" + "="*80)
+    print(f"IMPORT {platform.upper()}")
+    print("="*80)
+    print(f"Runs lus: {len(importer.pipelines)}")
+    print(f"Non terminés ou sans dates: {len(importer.pipelines) - len(executions)}")
+    print(f"Déjà présents: {duplicates}")
+    print(f"Invalides: {invalid}")
+    print(f"\n✅ {added} exécutions ajoutées à {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Script pour dimensionner les executors Jenkins à partir des durées mesurées
+Usage: python scripts/jenkins-capacity.py results/performance/ [--rate 20] [--days 30] [--flat]
+       [--max-executors 8] [--target-wait 60] [--platform jenkins] [--seed S] [--pricing tarifs.json]
+       [--output capacite.json|capacite.csv] [--workers N]
+       python scripts/jenkins-capacity.py results/performance/ --replay [--scale 2] [options]
+
+Simulation à événements discrets d'une file de builds servie par N
+executors (cimetrics/capacity.py), pour N de 1 à --max-executors. Les
+durées des builds sont tirées des exécutions mesurées de --platform. Les
+arrivées sont synthétiques (--rate builds/heure en moyenne sur --days
+jours, réparties selon le profil horaire observé, ou uniformément avec
+--flat; par défaut le rythme observé, --rate étant requis avec moins de
+MIN_PROFILE_RUNS exécutions horodatées) ou rejouées depuis les horodatages
+mesurés (--replay, compressés d'un facteur --scale; trop peu d'arrivées
+rejouées ne donnent ni attente ni coût par build significatifs).
+
+Pour chaque N: percentiles du temps d'attente en file, part des builds qui
+attendent, utilisation des executors et coût (PRICING["jenkins"] de
+cimetrics/costs.py: un agent par executors_per_agent executors, plus la
+maintenance). La recommandation est le plus petit N dont le p95 d'attente
+ne dépasse pas --target-wait secondes.
+"""
+
+import math
+import random
+import sys
+
+import numpy as np
+
+from cimetrics.capacity import (
+    CAPACITY_FIELDS,
+    DEFAULT_DAYS,
+    DEFAULT_MAX_EXECUTORS,
+    DEFAULT_TARGET_WAIT,
+    MIN_PROFILE_RUNS,
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    TARGET_PERCENTILE,
+    capacity_table,
+    hourly_profile,
+    recommend,
+    replay_arrivals,
+    sample_services,
+    synthesize_arrivals,
+)
+from cimetrics.costs import load_pricing
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
+from cimetrics.stats import write_table
+
+def format_wait(seconds):
+    if math.isnan(seconds):
+        return "-"
+    return f"{seconds / 60:.1f}min" if seconds >= 600 else f"{seconds:.0f}s"
+
+def print_capacity(rows, target_wait):
+    """Affiche les attentes, l'utilisation et le coût de chaque configuration"""
+    print("\n" + "="*80)
+    print("CAPACITÉ JENKINS (attente en file selon le nombre d'executors)")
+    print("="*80)
+    print(f"{'Exec.':>5} {'Agents':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'Attente':>8} "
+          f"{'Util.':>6} {'$/mois':>8} {'$/build':>8}")
+    print("-"*80)
+    for row in rows:
+        print(f"{row['executors']:>5} {row['agents']:>6} {format_wait(row['wait_p50']):>8} "
+              f"{format_wait(row['wait_p90']):>8} {format_wait(row['wait_p95']):>8} "
+              f"{format_wait(row['wait_p99']):>8} {row['waiting_share'] * 100:>7.1f}% "
+              f"{row['utilization'] * 100:>5.1f}% {row['cost_per_month']:>8.2f} {row['cost_per_build']:>8.4f}")
+
+    best = recommend(rows, target_wait)
+    if best is None:
+        print(f"\n⚠️  Aucune configuration testée ne tient p{TARGET_PERCENTILE} ≤ {target_wait:.0f}s: "
+              f"augmenter --max-executors")
+    else:
+        print(f"\n🎯 Recommandation: {best['executors']} executors ({best['agents']} agents), "
+              f"p{TARGET_PERCENTILE} d'attente {format_wait(best['wait_p95'])}, "
+              f"utilisation {best['utilization'] * 100:.0f}%, ${best['cost_per_build']:.4f}/build")
+
+def print_usage():
+    print("Usage: python scripts/jenkins-capacity.py <results_dir> [--rate 20] [--days 30] [--flat]")
+    print("       [--max-executors 8] [--target-wait 60] [--platform jenkins] [--seed S] [--pricing tarifs.json]")
+    print("       [--output capacite.json|capacite.csv] [--workers N]")
+    print("       python scripts/jenkins-capacity.py <results_dir> --replay [--scale 2] [options]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        platform, args = pop_option(args, "platform", "jenkins")
+        rate, args = pop_option(args, "rate", None, float)
+        days, args = pop_option(args, "days", DEFAULT_DAYS, float)
+        flat, args = pop_flag(args, "flat")
+        replay, args = pop_flag(args, "replay")
+        scale, args = pop_option(args, "scale", 1.0, float)
+        max_executors, args = pop_option(args, "max-executors", DEFAULT_MAX_EXECUTORS, int)
+        target_wait, args = pop_option(args, "target-wait", DEFAULT_TARGET_WAIT, float)
+        seed, args = pop_option(args, "seed", None, int)
+        pricing_file, args = pop_option(args, "pricing")
+        output_file, args = pop_option(args, "output")
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+
+    results_dir = args[0]
+    columns = load_columns(results_dir, workers)
+    mask = columns.platform_mask(platform) & (columns.total > 0)
+    durations = columns.total[mask].tolist()
+    if not durations:
+        print(f"❌ Aucune exécution {platform} dans {results_dir}")
+        sys.exit(1)
+    timestamps = columns.timestamp[mask]
+    timestamps = timestamps[~np.isnan(timestamps)].tolist()
+    queue_times = columns.queue_time[mask]
+    queue_times = queue_times[queue_times >= 0]
+
+    rng = random.Random(seed)
+    if replay:
+        arrivals = replay_arrivals(timestamps, scale)
+        period = arrivals[-1] if arrivals else 0
+        if period <= 0:
+            print("❌ --replay demande des exécutions horodatées à des instants différents")
+            sys.exit(1)
+        print(f"🔁 {len(arrivals)} arrivées rejouées sur {period / SECONDS_PER_DAY:.1f} jours (×{scale:g})")
+        if len(arrivals) < MIN_PROFILE_RUNS:
+            print(f"⚠️  Moins de {MIN_PROFILE_RUNS} arrivées rejouées: attente, utilisation et coût par build "
+                  f"peu significatifs (préférer --rate)")
+    else:
+        if rate is None:
+            span = max(timestamps) - min(timestamps) if len(timestamps) >= 2 else 0
+            if len(timestamps) < MIN_PROFILE_RUNS or span <= 0:
+                print(f"❌ Rythme des builds inconnu ({len(timestamps)} exécutions horodatées, "
+                      f"au moins {MIN_PROFILE_RUNS} nécessaires): utiliser --rate")
+                sys.exit(1)
+            rate = (len(timestamps) - 1) / span * SECONDS_PER_HOUR
+        profile = [1.0] * 24 if flat else hourly_profile(timestamps)
+        arrivals = synthesize_arrivals(rate, days, profile, rng)
+        period = days * SECONDS_PER_DAY
+        print(f"🎲 {len(arrivals)} arrivées simulées sur {days:g} jours ({rate:.2f} builds/heure en moyenne, "
+              f"profil {'uniforme' if profile == [1.0] * 24 else 'horaire observé'})")
+    if not arrivals:
+        print("❌ Aucune arrivée à simuler")
+        sys.exit(1)
+
+    print(f"⏱️  Durées tirées de {len(durations)} exécutions {platform} (médiane {np.median(durations):.0f}s)")
+    if len(queue_times):
+        print(f"📥 Attente observée: p50 {format_wait(float(np.quantile(queue_times, 0.5)))}, "
+              f"p95 {format_wait(float(np.quantile(queue_times, 0.95)))}")
+
+    services = sample_services(durations, len(arrivals), rng)
+    pricing = load_pricing(pricing_file)["jenkins"]
+    rows = capacity_table(arrivals, services, range(1, max_executors + 1), pricing, period)
+    print_capacity(rows, target_wait)
+
+    if output_file:
+        write_table(rows, output_file, CAPACITY_FIELDS)
+        print(f"\n✅ Table de capacité écrite: {output_file}")
+
+if __name__ == "__main__":
+    main()
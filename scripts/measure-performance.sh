@@ -1,70 +1,33 @@
 #!/bin/bash
 
 # Script pour mesurer les performances des pipelines CI/CD
-# Usage: ./scripts/measure-performance.sh [platform] [runs]
-# Exemple: ./scripts/measure-performance.sh github 10
+# Usage: ./scripts/measure-performance.sh [platform] [runs] [options de collect-runs.py]
+# Exemple: ./scripts/measure-performance.sh github 10 --repo OWNER/REPO --workflow ci.yml
+#
+# Déclenche runs exécutions par l'API de la plateforme et attend leur fin
+# (scripts/collect-runs.py): les durées enregistrées sont celles rapportées
+# par la plateforme, ajoutées au journal results/performance/<platform>_api.jsonl.
+# Cible et jetons: voir python3 scripts/collect-runs.py --help (GITHUB_TOKEN,
+# GITLAB_TOKEN, JENKINS_URL...). Pour collecter les derniers runs sans en
+# déclencher: python3 scripts/collect-runs.py github --limit 100
+#
+# Arrêt adaptatif: avec TARGET_PRECISION (ex: 0.05), runs devient un maximum
+# et les déclenchements s'arrêtent dès que l'IC 95% de la durée moyenne a une
+# demi-largeur relative d'au plus TARGET_PRECISION (au moins MIN_RUNS=3 exécutions).
+# Exemple: TARGET_PRECISION=0.05 ./scripts/measure-performance.sh github 30
 
 PLATFORM=${1:-github}
 RUNS=${2:-10}
-RESULTS_DIR="results/performance"
-TIMESTAMP=$(date +%Y%m%d_%H%M%S)
-OUTPUT_FILE="${RESULTS_DIR}/${PLATFORM}_${TIMESTAMP}.json"
-
-# Créer le dossier de résultats
-mkdir -p "$RESULTS_DIR"
-
-echo "📊 Mesure des performances pour $PLATFORM ($RUNS exécutions)"
-echo "Résultats: $OUTPUT_FILE"
-
-# Initialiser le fichier JSON
-echo "{" > "$OUTPUT_FILE"
-echo "  \"platform\": \"$PLATFORM\"," >> "$OUTPUT_FILE"
-echo "  \"runs\": $RUNS," >> "$OUTPUT_FILE"
-echo "  \"timestamp\": \"$TIMESTAMP\"," >> "$OUTPUT_FILE"
-echo "  \"executions\": [" >> "$OUTPUT_FILE"
-
-for i in $(seq 1 $RUNS); do
-    echo "Run $i/$RUNS..."
-    
-    START_TIME=$(date +%s.%N)
-    
-    case $PLATFORM in
-        github)
-            # Déclencher GitHub Actions via API
-            gh workflow run "BMI App CI/CD" 2>/dev/null || echo "Note: Utiliser gh CLI ou interface web"
-            ;;
-        gitlab)
-            # Déclencher GitLab CI via API
-            echo "Note: Déclencher manuellement via GitLab UI ou API"
-            ;;
-        jenkins)
-            # Déclencher Jenkins via API
-            echo "Note: Déclencher manuellement via Jenkins UI ou API"
-            ;;
-    esac
-    
-    # Attendre la fin (à adapter selon la plateforme)
-    # Pour l'instant, on simule
-    sleep 5
-    
-    END_TIME=$(date +%s.%N)
-    DURATION=$(echo "$END_TIME - $START_TIME" | bc)
-    
-    # Ajouter au JSON
-    if [ $i -gt 1 ]; then
-        echo "," >> "$OUTPUT_FILE"
-    fi
-    echo "    {" >> "$OUTPUT_FILE"
-    echo "      \"run\": $i," >> "$OUTPUT_FILE"
-    echo "      \"duration\": $DURATION," >> "$OUTPUT_FILE"
-    echo "      \"start_time\": $START_TIME," >> "$OUTPUT_FILE"
-    echo "      \"end_time\": $END_TIME" >> "$OUTPUT_FILE"
-    echo -n "    }" >> "$OUTPUT_FILE"
-done
-
-echo "" >> "$OUTPUT_FILE"
-echo "  ]" >> "$OUTPUT_FILE"
-echo "}" >> "$OUTPUT_FILE"
-
-echo "✅ Mesures terminées: $OUTPUT_FILE"
-
+TARGET_PRECISION=${TARGET_PRECISION:-}
+MIN_RUNS=${MIN_RUNS:-3}
+SCRIPT_DIR=$(dirname "$0")
+
+ARGS=("$PLATFORM" --trigger "$RUNS" --wait)
+if [ -n "$TARGET_PRECISION" ]; then
+    echo "📊 Mesure des performances pour $PLATFORM (au plus $RUNS exécutions, précision ±$TARGET_PRECISION)"
+    ARGS+=(--precision "$TARGET_PRECISION" --min-runs "$MIN_RUNS")
+else
+    echo "📊 Mesure des performances pour $PLATFORM ($RUNS exécutions)"
+fi
+
+exec python3 "$SCRIPT_DIR/collect-runs.py" "${ARGS[@]}" "${@:3}"
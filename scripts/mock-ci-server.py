@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Script pour lancer le serveur CI simulé ou mesurer le débit du collecteur
+Usage: python scripts/mock-ci-server.py [--port 8080] [--runs 300] [--latency 0.02]
+       [--rate-limit 500] [--fail-rate 0.01] [--run-seconds 5] [--in-progress 0] [--seed 0]
+       python scripts/mock-ci-server.py --benchmark [--runs 500] [--latency 0.02] [--concurrency 16] ...
+
+Le serveur (cimetrics/mockci.py) sert --runs pipelines simulés sous les API
+GitHub Actions, GitLab CI et Jenkins, avec --latency secondes par requête,
+au plus --rate-limit requêtes par seconde et --fail-rate réponses 502. Les
+runs déclenchés durent --run-seconds secondes; les --in-progress derniers
+runs de l'historique sont en cours au démarrage. Exemple:
+    python scripts/mock-ci-server.py --port 8080 &
+    python scripts/collect-runs.py gitlab --project 1 --api-url http://127.0.0.1:8080/gitlab/api/v4
+
+--benchmark démarre le serveur dans le processus, collecte les --runs runs
+de chaque plateforme avec --concurrency requêtes en vol et affiche la
+durée, le débit et le nombre de connexions; les durées collectées sont
+comparées aux durées simulées.
+"""
+
+import asyncio
+import sys
+import time
+
+from cimetrics.collector import DEFAULT_CONCURRENCY, APIClient, Collector, make_source
+from cimetrics.mockci import MockCI
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.records import PLATFORMS, parse_timestamp
+
+# Plateforme → cible (dépôt, projet, job) acceptée par le serveur simulé
+TARGETS = {"github": "acme/bmi-app", "gitlab": "1", "jenkins": "bmi-app"}
+
+async def benchmark_platform(platform, settings, concurrency):
+    """(exécutions, secondes, requêtes, connexions, durées différentes) pour une plateforme"""
+    server = await MockCI(**settings).start()
+    client = APIClient(concurrency=concurrency)
+    try:
+        source = make_source(platform, client, TARGETS[platform], server.base_url(platform))
+        collector = Collector(source)
+        start = time.monotonic()
+        executions = await collector.collect_recent(settings["runs"])
+        elapsed = time.monotonic() - start
+    finally:
+        await client.close()
+        await server.close()
+    # Les runs simulés sont créés à des instants distincts
+    expected = {run.created: run.durations() for run in server.runs}
+    different = sum(1 for execution in executions
+                    if execution["duration"]["stages"] != expected.get(parse_timestamp(execution["timestamp"])))
+    return executions, elapsed, client.pool.requests, client.pool.connections, different
+
+def run_benchmark(settings, concurrency):
+    """Débit du collecteur sur chaque plateforme simulée"""
+    print(f"⏱️  Collecte de {settings['runs']} runs par plateforme "
+          f"({settings['latency'] * 1000:.0f} ms par requête, {concurrency} requêtes en vol)")
+    print("\n" + "="*80)
+    print("DÉBIT DU COLLECTEUR")
+    print("="*80)
+    print(f"{'Plateforme':<12}{'Runs':>8}{'Durée (s)':>12}{'Runs/s':>10}{'Requêtes':>11}{'Connexions':>12}{'Écarts':>9}")
+    for platform in PLATFORMS:
+        executions, elapsed, requests, connections, different = asyncio.run(
+            benchmark_platform(platform, settings, concurrency))
+        print(f"{platform:<12}{len(executions):>8}{elapsed:>12.2f}{len(executions) / elapsed:>10.0f}"
+              f"{requests:>11}{connections:>12}{different:>9}")
+
+async def serve(settings, port):
+    """Sert les trois API simulées jusqu'à l'interruption"""
+    server = await MockCI(**settings).start("127.0.0.1", port)
+    print(f"🧪 Serveur CI simulé: {settings['runs']} runs")
+    for platform in PLATFORMS:
+        print(f"   {platform:<8} {server.base_url(platform)}  (cible: {TARGETS[platform]})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def print_usage():
+    print("Usage: python scripts/mock-ci-server.py [--port 8080] [--runs 300] [--latency 0.02]")
+    print("       [--rate-limit 500] [--fail-rate 0.01] [--run-seconds 5] [--in-progress 0] [--seed 0]")
+    print("       python scripts/mock-ci-server.py --benchmark [--runs 500] [--concurrency 16] ...")
+
+def main():
+    with usage_on_error(print_usage):
+        benchmark, args = pop_flag(sys.argv[1:], "benchmark")
+        port, args = pop_option(args, "port", 8080, int)
+        concurrency, args = pop_option(args, "concurrency", DEFAULT_CONCURRENCY, int)
+        settings = {}
+        settings["runs"], args = pop_option(args, "runs", 300, int)
+        settings["latency"], args = pop_option(args, "latency", 0.02, float)
+        settings["rate_limit"], args = pop_option(args, "rate-limit", None, int)
+        settings["fail_rate"], args = pop_option(args, "fail-rate", 0.0, float)
+        settings["run_seconds"], args = pop_option(args, "run-seconds", 5.0, float)
+        settings["in_progress"], args = pop_option(args, "in-progress", 0, int)
+        settings["seed"], args = pop_option(args, "seed", 0, int)
+    if args or settings["runs"] < 1 or concurrency < 1:
+        print_usage()
+        sys.exit(1)
+
+    if benchmark:
+        run_benchmark(settings, concurrency)
+        return
+    try:
+        asyncio.run(serve(settings, port))
+    except KeyboardInterrupt:
+        print("\n✅ Serveur arrêté")
+
+if __name__ == "__main__":
+    main()
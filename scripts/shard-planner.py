@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Script pour répartir les fichiers de test en shards de durées équilibrées
+Usage: python scripts/shard-planner.py results/tests/ [--shards 3] [--root .] [--pattern "e2e/*.spec.js"]
+       [--quantile 0.5|0.9] [--default SECONDES] [--output-dir shards/]
+       [--results results/performance/] [--stage e2e_tests] [--workers N]
+
+Les fichiers de test (--pattern sous --root) reçoivent une durée prédite
+tirée de l'historique JUnit de test-timings.py (quantile --quantile des
+durées par run, p50 par défaut, 0.9 pour un plan prudent) et sont répartis
+en --shards shards par LPT (cimetrics/sharding.py). Les fichiers sans
+historique prennent --default secondes (médiane des fichiers connus sinon).
+
+--output-dir écrit manifest.json (shards, fichiers, durées prédites) et
+shard-<i>.txt, un chemin par ligne relatif à --root, à passer au lanceur:
+    npx playwright test $(cat shards/shard-1.txt)
+    cd backend && npx jest $(cat ../shards/shard-1.txt)    (--root backend --pattern "tests/*.test.js")
+
+--results compare le makespan prédit à la durée actuelle (p50, un seul
+shard) du stage --stage de chaque plateforme.
+"""
+
+import sys
+from pathlib import Path
+
+from cimetrics.consolidation import write_json_atomic
+from cimetrics.junit import TestHistory
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.sharding import (
+    DEFAULT_PATTERN,
+    DEFAULT_QUANTILE,
+    DEFAULT_STAGE,
+    discover_files,
+    manifest,
+    plan_shards,
+    stage_comparison,
+)
+from cimetrics.snapshot import load_columns
+
+def print_plan(plan):
+    """Affiche les shards et leur durée prédite"""
+    print("\n" + "="*80)
+    print(f"RÉPARTITION EN {len(plan['shards'])} SHARDS (p{plan['quantile'] * 100:.0f} des durées par fichier)")
+    print("="*80)
+    for index, shard in enumerate(plan["shards"], 1):
+        print(f"\n📦 Shard {index}: {shard['predicted']:.1f}s ({len(shard['files'])} fichiers)")
+        for name in shard["files"]:
+            marker = " (sans historique)" if name in plan["unseen"] else ""
+            print(f"  {plan['estimates'][name]:>7.1f}s  {name}{marker}")
+
+    print("\n" + "-"*80)
+    print(f"Temps de test total: {plan['total']:.1f}s")
+    print(f"Makespan prédit: {plan['makespan']:.1f}s (borne inférieure {plan['lower_bound']:.1f}s)")
+    if plan["unseen"]:
+        print(f"⚠️  {len(plan['unseen'])} fichier(s) sans historique, durée par défaut appliquée")
+
+def print_comparison(rows, stage):
+    """Affiche la durée actuelle du stage et la durée prédite avec les shards"""
+    print("\n" + "="*80)
+    print(f"STAGE {stage}: ACTUEL (1 SHARD) VS SHARDS")
+    print("="*80)
+    print(f"{'Plateforme':<12} {'Runs':>5} {'Actuel':>9} {'Surcoût':>9} {'Prédit':>9} {'Gain':>7}")
+    print("-"*80)
+    for row in rows:
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "-"
+        print(f"{row['platform']:<12} {row['runs']:>5} {row['current']:>8.1f}s {row['overhead']:>8.1f}s "
+              f"{row['predicted']:>8.1f}s {speedup:>7}")
+
+def write_shards(plan, output_dir):
+    """Écrit manifest.json et un shard-<i>.txt par shard"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(output_dir / "manifest.json", manifest(plan))
+    for index, shard in enumerate(plan["shards"], 1):
+        (output_dir / f"shard-{index}.txt").write_text("".join(f"{name}\n" for name in shard["files"]))
+
+def print_usage():
+    print("Usage: python scripts/shard-planner.py <history_dir> [--shards 3] [--root .] [--pattern \"e2e/*.spec.js\"]")
+    print("       [--quantile 0.5|0.9] [--default SECONDES] [--output-dir shards/]")
+    print("       [--results results/performance/] [--stage e2e_tests] [--workers N]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        shards, args = pop_option(args, "shards", 2, int)
+        root, args = pop_option(args, "root", ".")
+        pattern, args = pop_option(args, "pattern", DEFAULT_PATTERN)
+        quantile, args = pop_option(args, "quantile", DEFAULT_QUANTILE, float)
+        default, args = pop_option(args, "default", None, float)
+        output_dir, args = pop_option(args, "output-dir")
+        results_dir, args = pop_option(args, "results")
+        stage, args = pop_option(args, "stage", DEFAULT_STAGE)
+    if len(args) < 1 or shards < 1 or not 0 <= quantile <= 1:
+        print_usage()
+        sys.exit(1)
+
+    files = discover_files(root, pattern)
+    if not files:
+        print(f"❌ Aucun fichier {pattern} sous {root}")
+        sys.exit(1)
+
+    history = TestHistory.load(args[0])
+    if not history.runs:
+        print(f"⚠️  Historique {args[0]} vide: tous les fichiers prennent la durée par défaut")
+    plan = plan_shards(files, history.iter_records(), shards, quantile, default)
+    print_plan(plan)
+
+    if results_dir:
+        rows = stage_comparison(load_columns(results_dir, workers), plan, stage)
+        if rows:
+            print_comparison(rows, stage)
+        else:
+            print(f"\n⚠️  Aucune durée du stage {stage} dans {results_dir}")
+
+    if output_dir:
+        write_shards(plan, output_dir)
+        print(f"\n✅ Manifeste et listes de fichiers écrits dans {output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Script pour prédire la durée des pipelines selon leur parallélisation
+Usage: python scripts/simulate-pipeline.py results/performance/ [--pipeline jenkins|github|gitlab|graphe.json]
+       [--parallel e2e_tests,docker_build] [--runners N] [--samples 20000] [--seed S] [--output simulation.json] [--workers N]
+
+Simulation Monte Carlo (cimetrics/simulation.py): les durées des stages
+sont tirées des exécutions mesurées de chaque plateforme et ordonnancées
+selon le graphe de dépendances du pipeline. Le pipeline actuel de chaque
+plateforme (Jenkinsfile, .github/workflows/ci.yml, .gitlab-ci.yml, runners
+illimités) sert de référence; --pipeline, --parallel et --runners décrivent
+un scénario simulé sur les mêmes tirages:
+  --pipeline   graphe du scénario: celui d'une plateforme ou un fichier JSON
+               {stage: [dépendances]}
+  --parallel   stages lancés en parallèle (dépendances entre eux retirées)
+  --runners    nombre de runners disponibles (0 = illimité)
+
+Pour chaque scénario: durée prédite (moyenne, p50, p95), chemins critiques
+les plus fréquents et fraction des tirages où chaque stage est critique.
+"""
+
+import json
+import sys
+
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.simulation import DEFAULT_SAMPLES, load_pipeline, simulate_platforms
+from cimetrics.snapshot import load_columns
+
+BASELINE = "actuel"
+SCENARIO = "scenario"
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+def print_platform_simulation(platform, result):
+    """Affiche les scénarios simulés d'une plateforme"""
+    observed = result["observed"]
+    print(f"\n📊 {platform.upper()} ({observed['count']} exécutions, {result['sampled']} avec durées de stages, "
+          f"observé: p50 {format_seconds(observed['p50'])}, p95 {format_seconds(observed['p95'])})")
+    if result["unmeasured_stages"]:
+        print(f"   ⚠️  Stages jamais mesurés (durée nulle): {', '.join(result['unmeasured_stages'])}")
+    if not result["scenarios"]:
+        print("   ⚠️  Aucune durée de stage mesurée: simulation impossible")
+        return
+    baseline = result["scenarios"].get(BASELINE)
+    for name, scenario in result["scenarios"].items():
+        runners = scenario["runners"] or "illimités"
+        print(f"\n   {name} (runners: {runners})")
+        line = (f"     Durée prédite: moyenne {scenario['mean']:.1f}s, "
+                f"p50 {scenario['p50']:.1f}s, p95 {scenario['p95']:.1f}s")
+        if baseline is not None and scenario is not baseline and baseline["p50"] > 0:
+            change = (scenario["p50"] - baseline["p50"]) / baseline["p50"] * 100
+            line += f" ({change:+.1f}% sur p50)"
+        print(line)
+        print("     Chemins critiques:")
+        for path in scenario["critical_paths"]:
+            print(f"       {path['frequency'] * 100:5.1f}%  {' → '.join(path['stages'])}")
+        critical = sorted(scenario["criticality"].items(), key=lambda item: -item[1])
+        print("     Stages critiques: " + ", ".join(
+            f"{stage} {share * 100:.0f}%" for stage, share in critical if share > 0))
+
+def print_usage():
+    print("Usage: python scripts/simulate-pipeline.py <results_dir> [--pipeline jenkins|github|gitlab|graphe.json]")
+    print("       [--parallel stage,stage] [--runners N] [--samples N] [--seed S] [--output simulation.json] [--workers N]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        pipeline, args = pop_option(args, "pipeline")
+        parallel, args = pop_option(args, "parallel")
+        runners, args = pop_option(args, "runners", None, int)
+        n_samples, args = pop_option(args, "samples", DEFAULT_SAMPLES, int)
+        seed, args = pop_option(args, "seed", None, int)
+        output_file, args = pop_option(args, "output")
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+
+    results_dir = args[0]
+    scenarios = {BASELINE: {}}
+    if pipeline is not None or parallel is not None or runners is not None:
+        try:
+            scenarios[SCENARIO] = {
+                "pipeline": load_pipeline(pipeline) if pipeline else None,
+                "parallel": parallel.split(",") if parallel else [],
+                "runners": runners or 0,
+            }
+        except (OSError, ValueError) as e:
+            print(f"❌ Pipeline invalide: {e}")
+            sys.exit(1)
+
+    columns = load_columns(results_dir, workers)
+    if not len(columns):
+        print(f"❌ Aucun résultat trouvé dans {results_dir}")
+        sys.exit(1)
+
+    print(f"🎲 Simulation de {n_samples} pipelines par plateforme et par scénario...")
+    try:
+        results = simulate_platforms(columns, scenarios, n_samples, seed)
+    except ValueError as e:
+        print(f"❌ Scénario invalide: {e}")
+        sys.exit(1)
+
+    for platform, result in results.items():
+        print_platform_simulation(platform, result)
+
+    if output_file:
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Résultats de la simulation écrits: {output_file}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ImportError:
+        print("❌ Erreur: numpy est requis")
+        print("   Installer avec: pip install numpy")
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Script pour suivre la durée de chaque test à partir des rapports JUnit XML
+Usage: python scripts/test-timings.py results/tests/ [rapport.xml|dossier ...] [--run-id ID]
+       [--sort total|mean|p95|cv|failures] [--top 20] [--suite "Performance Tests"] [--min-runs 1]
+       [--output tests.json|tests.csv]
+
+Les rapports donnés (backend/test-results.xml, rapports junit de
+Playwright, .xml.gz; un dossier = tous ses .xml) sont lus en flux
+(cimetrics/junit.py) et ajoutés à l'historique du répertoire: journal
+tests.jsonl.gz (un enregistrement par test et par run) et index
+tests_index.json (statistiques par test). Le run est identifié par
+--run-id, sinon par l'horodatage du rapport; un run déjà ingéré est ignoré.
+
+Le rapport liste ensuite les tests triés par --sort: temps cumulé sur tous
+les runs (total), durée moyenne, p95, variabilité (cv = écart-type /
+moyenne) ou nombre d'échecs. --suite filtre sur le fichier ou le describe
+(ex: "Performance Tests" de performance.test.js).
+"""
+
+import sys
+from pathlib import Path
+
+from cimetrics.junit import SORT_KEYS, TEST_FIELDS, TestHistory
+from cimetrics.options import pop_option, usage_on_error
+from cimetrics.stats import write_table
+
+SORT_LABELS = {
+    "total": "TEMPS CUMULÉ",
+    "mean": "DURÉE MOYENNE",
+    "p95": "P95",
+    "cv": "VARIABILITÉ",
+    "failures": "ÉCHECS",
+}
+
+def report_files(paths):
+    """Rapports à ingérer: fichiers donnés et .xml/.xml.gz des dossiers"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(p for p in path.iterdir() if p.name.endswith((".xml", ".xml.gz")))
+        else:
+            yield path
+
+def print_tests(rows, sort, total_runs):
+    """Affiche les tests classés"""
+    print("\n" + "="*100)
+    print(f"TESTS PAR {SORT_LABELS[sort]} ({total_runs} runs)")
+    print("="*100)
+    print(f"{'Test':<58} {'Runs':>5} {'Moy.':>7} {'p95':>7} {'CV':>6} {'Total':>8} {'Échecs':>6}")
+    print("-"*100)
+    for row in rows:
+        label = f"{row['classname']} › {row['name']}"
+        if len(label) > 58:
+            label = label[:57] + "…"
+        print(f"{label:<58} {row['runs']:>5} {row['mean']:>6.2f}s {row['p95']:>6.2f}s {row['cv'] * 100:>5.0f}% "
+              f"{row['total']:>7.1f}s {row['failures']:>6}")
+
+def print_usage():
+    print("Usage: python scripts/test-timings.py <history_dir> [rapport.xml|dossier ...] [--run-id ID]")
+    print(f"       [--sort {'|'.join(SORT_KEYS)}] [--top 20] [--suite S] [--min-runs 1] [--output tests.json|tests.csv]")
+
+def main():
+    with usage_on_error(print_usage):
+        run_id, args = pop_option(sys.argv[1:], "run-id")
+        sort, args = pop_option(args, "sort", "total")
+        top, args = pop_option(args, "top", 20, int)
+        suite, args = pop_option(args, "suite")
+        min_runs, args = pop_option(args, "min-runs", 1, int)
+        output_file, args = pop_option(args, "output")
+    if len(args) < 1 or sort not in SORT_KEYS:
+        print_usage()
+        sys.exit(1)
+
+    history = TestHistory.load(args[0])
+    reports = list(report_files(args[1:]))
+    if run_id and len(reports) > 1:
+        print("❌ --run-id ne peut s'appliquer qu'à un seul rapport")
+        sys.exit(1)
+    for report in reports:
+        count = history.ingest(report, run_id)
+        if count:
+            print(f"📥 {report}: {count} tests ajoutés (run {history.runs[-1]})")
+        else:
+            print(f"⏭️  {report}: run déjà ingéré")
+    if reports:
+        history.save()
+
+    if not history.tests:
+        print(f"❌ Aucun test dans l'historique {args[0]}")
+        sys.exit(1)
+
+    rows = history.table(sort, None, suite, min_runs)
+    print_tests(rows[:top] if top else rows, sort, len(history.runs))
+
+    if output_file:
+        write_table(rows, output_file, TEST_FIELDS)
+        print(f"\n✅ Table des tests écrite: {output_file}")
+
+if __name__ == "__main__":
+    main()
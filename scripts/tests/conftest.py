@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les scripts importent le paquet cimetrics depuis scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_columns(n, platform="github", seed=0, e2e=120.0, spread=0.2, e2e_spread=0.15, stages=None, fields=None,
+                 overhead=0.0, prefix="run", start=0, interval=1, branch="main", shuffle=False):
+    """n exécutions synthétiques d'une plateforme
+
+    Par défaut, chaque stage dure lognormal(médiane 20 s, spread) et
+    e2e_tests lognormal(médiane e2e, e2e_spread). stages(rng, i) remplace
+    ces durées; fields(rng, i, stages) retourne des champs à ajouter à
+    l'exécution (et peut modifier ses stages). La i-ème exécution a
+    l'identifiant <prefix>-<start + i> et l'horodatage
+    1_700_000_000 + (start + i) × interval; shuffle les écrit dans le
+    désordre.
+    """
+    import numpy as np
+
+    from cimetrics.loader import STAGES, ColumnBuilder
+
+    rng = np.random.default_rng(seed)
+    builder = ColumnBuilder()
+    for i in (rng.permutation(n) if shuffle else range(n)):
+        if stages is None:
+            durations = {stage: float(rng.lognormal(np.log(20), spread)) for stage in STAGES}
+            durations["e2e_tests"] = float(rng.lognormal(np.log(e2e), e2e_spread))
+        else:
+            durations = stages(rng, int(i))
+        extra = fields(rng, int(i), durations) if fields else {}
+        builder.append(platform, {
+            "execution_id": f"{prefix}-{start + i}",
+            "branch": branch,
+            "timestamp": 1_700_000_000 + (start + int(i)) * interval,
+            "duration": {"total": sum(durations.values()) + overhead, "stages": durations},
+            **extra,
+        })
+    return builder.build()
+
+
+@pytest.fixture
+def build_columns():
+    """Fabrique d'exécutions synthétiques (voir make_columns)"""
+    return make_columns
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from cimetrics.aggregates import RunningStats, Summary
+from cimetrics.loader import STAGES, ExecutionColumns
+
+
+def test_merge_equals_aggregate_of_union(build_columns):
+    a = build_columns(300, platform="github", seed=1)
+    b = ExecutionColumns.concatenate([build_columns(200, platform="github", seed=2, prefix="b"),
+                                      build_columns(50, platform="gitlab", seed=3, prefix="b")])
+    merged = Summary().update_columns(a).merge(Summary().update_columns(b))
+    union = Summary().update_columns(ExecutionColumns.concatenate([a, b]))
+
+    assert set(merged.platforms) == set(union.platforms) == {"github", "gitlab"}
+    for platform, expected in union.platforms.items():
+        actual = merged.platforms[platform]
+        assert actual.executions == expected.executions
+        for stats, reference in [(actual.duration, expected.duration)] + [
+            (actual.stages[stage], expected.stages[stage]) for stage in STAGES
+        ]:
+            assert stats.count == reference.count
+            assert stats.min == reference.min and stats.max == reference.max
+            assert stats.sum == pytest.approx(reference.sum, rel=1e-12)
+            assert stats.m2 == pytest.approx(reference.m2, rel=1e-9)
+
+
+def test_add_update_and_merge_agree_with_numpy():
+    values = np.random.default_rng(0).lognormal(4, 0.5, 1000)
+    one_by_one = RunningStats()
+    for value in values:
+        one_by_one.add(value)
+    merged = RunningStats()
+    for chunk in np.array_split(values, 7):
+        part = RunningStats()
+        part.update(chunk)
+        merged.merge(part)
+
+    for stats in (one_by_one, merged):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+        assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_variance_survives_a_large_offset():
+    # sum_sq - sum²/n perd tous les chiffres significatifs ici
+    values = 1e9 + np.arange(100, dtype=np.float64)
+    stats = RunningStats()
+    stats.update(values[:40])
+    other = RunningStats()
+    for value in values[40:]:
+        other.add(value)
+    stats.merge(other)
+    assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-6)
+
+
+def test_summary_round_trip_keeps_m2():
+    stats = RunningStats()
+    stats.update([10.0, 12.0, 15.0])
+    restored = RunningStats.from_dict(stats.to_dict())
+    assert (restored.count, restored.sum, restored.m2) == (stats.count, stats.sum, stats.m2)
+    assert restored.std == pytest.approx(np.std([10.0, 12.0, 15.0], ddof=1))
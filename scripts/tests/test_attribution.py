@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from cimetrics.attribution import COMPONENTS, OVERHEAD, attribution_table, component_cube
+from cimetrics.loader import STAGES, ColumnBuilder, ExecutionColumns
+
+
+def attribution_columns(build_columns, n=400):
+    """e2e_tests domine la moyenne, docker_build porte toute la variabilité
+
+    lint_frontend et test_frontend, plus courts que leurs stages parallèles,
+    sont hors du chemin critique; le total est le chemin critique + 5 s.
+    """
+    def stages(rng, i):
+        durations = {stage: 10.0 for stage in STAGES}
+        durations.update(lint_frontend=8.0, test_frontend=8.0, e2e_tests=200.0)
+        durations["docker_build"] = float(rng.exponential(30.0))
+        return durations
+
+    def fields(rng, i, durations):
+        path = sum(durations.values()) - durations["lint_frontend"] - durations["test_frontend"]
+        return {"duration": {"total": path + 5.0, "stages": durations}}
+
+    columns = build_columns(n, platform="gitlab", stages=stages, fields=fields)
+    # Exécution sans stages: ignorée
+    builder = ColumnBuilder()
+    builder.append("gitlab", {"duration": 300.0})
+    return ExecutionColumns.concatenate([columns, builder.build()])
+
+
+def test_shares_sum_to_one_and_rank_targets(build_columns):
+    table = attribution_table(attribution_columns(build_columns))
+    assert [row["rank"] for row in table] == list(range(1, len(COMPONENTS) - 2)) + [None]
+    assert {row["stage"] for row in table} == set(COMPONENTS) - {"lint_frontend", "test_frontend"}
+    assert all(row["runs"] == 400 and not row["low_n"] for row in table)
+    for share in ("mean_share", "variance_share", "tail_share"):
+        assert sum(row[share] or 0 for row in table) == pytest.approx(1.0)
+
+    rows = {row["stage"]: row for row in table}
+    assert rows["e2e_tests"]["mean_share"] > 0.5
+    assert rows["docker_build"]["variance_share"] == pytest.approx(1.0)
+    assert rows["docker_build"]["tail_share"] == pytest.approx(1.0)
+    assert rows[OVERHEAD]["mean"] == pytest.approx(5.0)
+    assert table[0]["stage"] == "docker_build"
+
+
+def test_parallel_stages_do_not_make_overhead_negative(build_columns):
+    """Somme des stages > total: seul le chemin critique est attribué, overhead ≥ 0 et sans rang"""
+    def stages(rng, i):
+        durations = dict(lint_backend=50.0, lint_frontend=50.0, test_backend=30.0, test_frontend=20.0,
+                         build_frontend=20.0, e2e_tests=100.0, deploy=5.0)
+        durations["docker_build"] = 10.0 + float(rng.exponential(30.0))
+        return durations
+
+    def fields(rng, i, durations):
+        # Chemin critique: test_backend → build_frontend → e2e_tests → docker_build, 10 s de décalage d'horloge
+        path = 150.0 + durations["docker_build"]
+        return {"duration": {"total": path - 10.0, "stages": durations}}
+
+    columns = build_columns(200, platform="github", stages=stages, fields=fields)
+    assert (np.nansum(columns.stages, axis=1) > columns.total).all()
+
+    platforms, total, components = component_cube(columns)
+    overhead = components[0, :, COMPONENTS.index(OVERHEAD)]
+    assert platforms == ["github"] and (overhead == 0.0).all()
+    assert total[0] == pytest.approx(columns.total + 10.0)
+
+    table = attribution_table(columns)
+    rows = {row["stage"]: row for row in table}
+    # Overhead toujours nul: omis comme un stage jamais sur le chemin critique
+    assert set(rows) == {"test_backend", "build_frontend", "e2e_tests", "docker_build"}
+    assert [row["rank"] for row in table] == [1, 2, 3, 4]
+    assert all(row["mean_share"] >= 0 for row in table)
+    assert sum(row["mean_share"] for row in table) == pytest.approx(1.0)
+    assert table[0]["stage"] == "docker_build"
+    assert rows["e2e_tests"]["mean"] == pytest.approx(100.0)
+
+
+def test_platform_without_stages_is_omitted():
+    builder = ColumnBuilder()
+    for total in (100.0, 120.0, 140.0):
+        builder.append("jenkins", {"duration": {"total": total}})
+    assert attribution_table(builder.build()) == []
+
+
+def test_platform_with_few_runs_is_marked_low_n(build_columns):
+    table = attribution_table(attribution_columns(build_columns, n=5))
+    assert table and all(row["runs"] == 5 and row["low_n"] for row in table)
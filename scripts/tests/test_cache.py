@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from cimetrics.cache import cache_model, cache_summary, cache_table
+from cimetrics.loader import ColumnBuilder, ExecutionColumns
+
+
+def cache_columns(build_columns, hit_rate=0.75, penalty=60.0, size_mb=500.0):
+    def stages(rng, i):
+        return {"lint_backend": float(rng.normal(30, 3)), "test_backend": float(rng.normal(60, 5))}
+
+    def fields(rng, i, stages):
+        hit = bool(rng.random() < hit_rate)
+        if not hit:
+            stages["test_backend"] += penalty
+        return {"cache": {"hit": hit, "size_mb": size_mb}}
+
+    columns = build_columns(400, stages=stages, fields=fields, prefix="c")
+    # Exécution sans champ cache: ignorée
+    builder = ColumnBuilder()
+    builder.append("github", {"execution_id": "no-cache", "duration": {"total": 999.0}})
+    return ExecutionColumns.concatenate([columns, builder.build()])
+
+
+def test_cache_table_isolates_the_stage_that_uses_the_cache(build_columns):
+    rows, draws = cache_table(cache_columns(build_columns), n_resamples=500, seed=1)
+    by_stage = {row["stage"]: row for row in rows}
+    assert by_stage["total"]["hits"] + by_stage["total"]["misses"] == 400
+    assert by_stage["test_backend"]["saving"] == pytest.approx(60, abs=3)
+    assert by_stage["test_backend"]["saving_lower"] < 60 < by_stage["test_backend"]["saving_upper"]
+    assert by_stage["lint_backend"]["saving_lower"] < 0 < by_stage["lint_backend"]["saving_upper"]
+    assert set(draws) == {"github"}
+
+
+def test_cache_model_break_even():
+    transfer, net, break_even = cache_model(0.5, 40.0, 500.0, throughput=50.0)
+    assert transfer == 10.0
+    assert net == 10.0
+    assert break_even == 1000.0
+    assert cache_model(0.5, 40.0, 1000.0, 50.0)[1] == 0
+
+
+def test_cache_summary_projects_monthly_savings(build_columns):
+    columns = cache_columns(build_columns, size_mb=5000.0)
+    rows, draws = cache_table(columns, n_resamples=500, seed=2)
+    summary, = cache_summary(columns, rows, draws, throughput=50.0, builds_per_month=1000)
+    expected_net = summary["hit_rate"] * summary["saving_per_hit"] - 100.0
+    assert summary["net_saving"] == pytest.approx(expected_net)
+    assert summary["net_saving"] < 0 and summary["break_even_mb"] < 5000
+    assert summary["net_lower"] <= summary["net_saving"] <= summary["net_upper"]
+    assert summary["minutes_per_month"] == pytest.approx(expected_net * 1000 / 60)
+    assert summary["cost_saved"] <= 0
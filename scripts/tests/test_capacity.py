@@ -0,0 +1,80 @@
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cimetrics.capacity import (
+    MIN_PROFILE_RUNS,
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    capacity_table,
+    hourly_profile,
+    recommend,
+    simulate_queue,
+    synthesize_arrivals,
+)
+from cimetrics.costs import PRICING
+
+
+def test_simulate_queue_serves_in_arrival_order():
+    waits, busy, end = simulate_queue([0, 1, 2, 10], [5, 5, 5, 1], executors=2)
+    assert waits == [0, 0, 3, 0]
+    assert busy == 16
+    assert end == 11
+
+
+def test_single_executor_matches_mm1_waiting_time():
+    # M/M/1 de charge 0.5: attente moyenne en file = ρ / (1 - ρ) × durée moyenne
+    rng = random.Random(0)
+    arrivals = synthesize_arrivals(1800, days=2, rng=rng)
+    services = [rng.expovariate(1.0) for _ in arrivals]
+    waits, busy, end = simulate_queue(arrivals, services, 1)
+    assert sum(waits) / len(waits) == pytest.approx(1.0, rel=0.1)
+    assert busy / end == pytest.approx(0.5, rel=0.05)
+
+
+def test_hourly_profile_shapes_synthetic_arrivals():
+    day = [SECONDS_PER_DAY * d + SECONDS_PER_HOUR * h for d in range(5) for h in (9, 10, 14) for _ in range(4)]
+    profile = hourly_profile(day)
+    assert sum(profile) == pytest.approx(24)
+    arrivals = synthesize_arrivals(10, days=10, profile=profile, rng=random.Random(1))
+    hours = {int(t // SECONDS_PER_HOUR) % 24 for t in arrivals}
+    assert hours == {9, 10, 14}
+    assert len(arrivals) == pytest.approx(2400, rel=0.1)
+    assert hourly_profile(day[:10]) == [1.0] * 24
+
+
+def test_capacity_table_recommends_smallest_sufficient_pool():
+    rng = random.Random(2)
+    arrivals = synthesize_arrivals(20, days=7, rng=rng)
+    services = [rng.uniform(300, 600) for _ in arrivals]
+    rows = capacity_table(arrivals, services, range(1, 7), PRICING["jenkins"], 7 * SECONDS_PER_DAY)
+    waits = [row["wait_p95"] for row in rows]
+    assert waits == sorted(waits, reverse=True)
+    best = recommend(rows, target_wait=60)
+    assert best["executors"] >= 3
+    assert best["wait_p95"] <= 60 < rows[best["executors"] - 2]["wait_p95"]
+    assert rows[0]["cost_per_month"] == 220
+    assert rows[2]["agents"] == 2
+
+
+def run_capacity(tmp_path, runs, *flags):
+    executions = [{"platform": "jenkins", "execution_id": f"build_{i}", "timestamp": 1700000000 + i * SECONDS_PER_HOUR,
+                   "duration": {"total": 250.0, "stages": {}}} for i in range(runs)]
+    (tmp_path / "jenkins_builds.json").write_text(json.dumps({"platform": "jenkins", "executions": executions}))
+    script = Path(__file__).resolve().parent.parent / "jenkins-capacity.py"
+    return subprocess.run([sys.executable, str(script), str(tmp_path), "--seed", "0", *flags],
+                          capture_output=True, text=True)
+
+
+def test_rate_is_required_when_too_few_runs_are_timestamped(tmp_path):
+    result = run_capacity(tmp_path, 6)
+    assert result.returncode == 1
+    assert "--rate" in result.stdout
+    assert run_capacity(tmp_path, 6, "--rate", "2", "--days", "2").returncode == 0
+    # Arrivées rejouées trop rares: averti
+    assert "Moins de" in run_capacity(tmp_path, 6, "--replay").stdout
+    assert "Moins de" not in run_capacity(tmp_path, MIN_PROFILE_RUNS, "--replay").stdout
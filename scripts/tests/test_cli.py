@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+EXAMPLE = SCRIPTS_DIR.parent / "results" / "performance" / "github_example.json"
+
+# Exécute la CLI puis écrit les modules racines importés et le backend matplotlib
+PROBE = """
+import atexit, json, sys
+output = sys.argv[1]
+def dump():
+    modules = sorted({name.split(".")[0] for name in sys.modules})
+    backend = sys.modules["matplotlib"].get_backend() if "matplotlib" in sys.modules else None
+    with open(output, "w") as f:
+        json.dump({"modules": modules, "backend": backend}, f)
+atexit.register(dump)
+from cimetrics.cli import main
+main(sys.argv[2:])
+"""
+
+HEAVY = {"numpy", "scipy", "matplotlib", "seaborn"}
+
+
+def run_cli(tmp_path, *args):
+    output = tmp_path / "probe.json"
+    subprocess.run(
+        [sys.executable, "-c", PROBE, str(output), *args],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+        env={name: value for name, value in os.environ.items() if name != "MPLBACKEND"},
+    )
+    with open(output) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    directory = tmp_path / "performance"
+    directory.mkdir()
+    shutil.copy(EXAMPLE, directory / EXAMPLE.name)
+    return directory
+
+
+def test_help_imports_no_scientific_library(tmp_path):
+    for args in (["--help"], ["stats", "--help"], ["viz", "--help"]):
+        assert not HEAVY & set(run_cli(tmp_path, *args)["modules"])
+
+
+def test_validate_imports_no_scientific_library(tmp_path, results_dir):
+    assert not HEAVY & set(run_cli(tmp_path, "validate", str(results_dir))["modules"])
+
+
+def test_import_imports_no_scientific_library(tmp_path):
+    output = tmp_path / "jenkins_api.jsonl"
+    fixture = Path(__file__).parent / "fixtures" / "jenkins_wfapi_runs.json"
+    assert not HEAVY & set(run_cli(tmp_path, "import", "jenkins", str(fixture), "--output", str(output))["modules"])
+    assert output.exists()
+
+
+def test_costs_and_consolidate_import_numpy_only(tmp_path, results_dir):
+    for command in ("consolidate", "costs"):
+        modules = set(run_cli(tmp_path, command, str(results_dir))["modules"])
+        assert "numpy" in modules
+        assert not {"scipy", "matplotlib", "seaborn"} & modules
+
+
+def test_stats_sketch_skips_scipy_and_plotting(tmp_path, results_dir):
+    modules = set(run_cli(tmp_path, "stats", str(results_dir), "--sketch")["modules"])
+    assert not {"scipy", "matplotlib", "seaborn"} & modules
+
+
+def test_stats_imports_scipy_without_plotting(tmp_path, results_dir):
+    modules = set(run_cli(tmp_path, "stats", str(results_dir))["modules"])
+    assert "scipy" in modules
+    assert not {"matplotlib", "seaborn"} & modules
+
+
+def test_viz_uses_agg_backend(tmp_path):
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    probe = run_cli(tmp_path, "viz", str(empty))
+    assert {"matplotlib", "seaborn"} <= set(probe["modules"])
+    assert probe["backend"].lower() == "agg"
+
+
+def test_unknown_command_exits_with_usage():
+    result = subprocess.run(
+        [sys.executable, "-m", "cimetrics", "unknown"], cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    assert result.returncode == 1
+    assert "Commandes:" in result.stdout
+
+
+@pytest.mark.parametrize("args", [
+    ["--correction", "bonferroni"],
+    ["--resamples", "many"],
+    ["--last"],
+    ["--unknown-flag"],
+])
+def test_invalid_statistics_options_exit_with_usage(results_dir, args):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "advanced-statistics.py"), str(results_dir), *args],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "Usage:" in result.stdout
+    assert "Traceback" not in result.stderr
+
+
+@pytest.mark.parametrize("script, args", [
+    ("calculate-costs.py", ["abc"]),
+    ("calculate-costs.py", ["0"]),
+    ("calculate-costs.py", ["--sweep", "--min-builds", "0", "--no-plots"]),
+    ("calculate-costs.py", ["--sweep", "--min-builds", "50", "--max-builds", "10", "--no-plots"]),
+    ("calculate-costs.py", ["--samples", "0"]),
+    ("calculate-costs.py", ["--points", "x"]),
+    ("bottleneck-report.py", ["--top", "x"]),
+    ("shard-planner.py", ["--shards", "x"]),
+    ("validate-data.py", ["--workers", "x"]),
+    ("jenkins-capacity.py", ["--rate", "x"]),
+    ("jenkins-capacity.py", ["--max-executors", "2.5"]),
+    ("trend-analysis.py", ["--window"]),
+    ("consolidate-data.py", ["--format"]),
+])
+def test_invalid_script_arguments_exit_with_usage(results_dir, script, args):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / script), str(results_dir), *args],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "Usage:" in result.stdout
+    assert "Traceback" not in result.stderr
+
+
+def test_negative_trigger_exits_with_usage(tmp_path):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "collect-runs.py"), "github", "--repo", "owner/repo", "--trigger", "-1",
+         "--output", str(tmp_path / "github_api.jsonl")],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "Usage:" in result.stdout
+    assert not (tmp_path / "github_api.jsonl").exists()
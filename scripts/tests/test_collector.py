@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from cimetrics.asynchttp import Response
+from cimetrics.collector import APIClient, Collector, make_source, rate_limit_delay
+from cimetrics.mockci import GITHUB_ID_OFFSET, GITLAB_ID_OFFSET, MockCI
+from cimetrics.records import PLATFORMS
+
+TARGETS = {"github": "acme/bmi-app", "gitlab": "1", "jenkins": "bmi-app"}
+ID_OFFSETS = {"github": GITHUB_ID_OFFSET, "gitlab": GITLAB_ID_OFFSET, "jenkins": 1}
+
+
+def collect(server_options, platform, run, **client_options):
+    """Démarre le serveur simulé, exécute run(collector, client, server) et arrête tout"""
+
+    async def main():
+        server = await MockCI(**server_options).start()
+        client = APIClient(**{"backoff": 0.01, "seed": 0, **client_options})
+        try:
+            source = make_source(platform, client, TARGETS[platform], server.base_url(platform), "ci.yml")
+            return server, client, await run(source, client, server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def simulated_run(server, execution):
+    """Run simulé d'une exécution (run_<id>, pipeline_<id> ou build_<numéro>)"""
+    offset = ID_OFFSETS[execution["platform"]]
+    return server.runs[int(execution["execution_id"].split("_")[1]) - offset]
+
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_collects_reported_durations_through_a_bounded_pool(platform):
+    server, client, executions = collect(
+        {"runs": 300, "latency": 0.002}, platform,
+        lambda source, client, server: Collector(source).collect_recent(300), concurrency=8)
+    assert len(executions) == 300
+    for execution in executions:
+        run = simulated_run(server, execution)
+        assert execution["duration"]["stages"] == run.durations()
+        # GitHub: la durée du run court depuis sa création (run_started_at)
+        start = run.created if platform == "github" else run.started
+        assert execution["duration"]["total"] == pytest.approx(run.finished - start, abs=0.002)
+        assert execution["queue_time"] == pytest.approx(run.queue, abs=0.002)
+    assert client.pool.connections <= 8
+    assert server.connections == client.pool.connections
+    assert client.pool.requests == server.requests
+
+
+def test_second_collection_is_answered_with_304():
+    async def twice(source, client, server):
+        await Collector(source).collect_recent(50)
+        requests = server.requests
+        executions = await Collector(source).collect_recent(50)
+        return executions, server.requests - requests
+
+    server, client, (executions, requests) = collect({"runs": 50}, "gitlab", twice)
+    assert len(executions) == 50
+    assert client.not_modified == requests == server.statuses[304]
+
+
+def test_recovers_from_rate_limits_and_server_errors():
+    server, client, executions = collect(
+        {"runs": 80, "rate_limit": 40, "rate_window": 0.1, "fail_rate": 0.05}, "github",
+        lambda source, client, server: Collector(source).collect_recent(80))
+    assert len(executions) == 80
+    assert server.statuses[403] == client.rate_limited > 0
+    assert server.statuses[502] > 0
+    assert client.retries == server.statuses[403] + server.statuses[502]
+
+
+def test_unfinished_runs_are_skipped_or_awaited():
+    options = {"runs": 20, "in_progress": 2, "run_seconds": 0.3}
+
+    async def skip(source, client, server):
+        collector = Collector(source)
+        return collector, await collector.collect_recent(20)
+
+    server, client, (collector, executions) = collect(options, "gitlab", skip)
+    assert (len(executions), collector.unfinished) == (18, 2)
+
+    async def wait(source, client, server):
+        return await Collector(source, wait=True, poll=0.05).collect_recent(20)
+
+    server, client, executions = collect(options, "gitlab", wait)
+    assert len(executions) == 20
+    # Pipeline inchangé pendant son exécution: les interrogations reçoivent 304
+    assert client.not_modified > 0
+    assert all(e["duration"]["stages"] == simulated_run(server, e).durations() for e in executions)
+
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_triggered_runs_are_awaited_until_stop(platform):
+    async def trigger(source, client, server):
+        collector = Collector(source, wait=True, poll=0.05)
+        return await collector.collect_triggered(5, parallel_runs=2, stop=lambda executions: len(executions) >= 2)
+
+    server, client, executions = collect({"runs": 3, "run_seconds": 0.2, "queue_delay": 0.05}, platform, trigger)
+    triggered = server.runs[3:]
+    # Deux runs en cours quand la règle d'arrêt est satisfaite: aucun autre déclenché
+    assert 2 <= len(executions) == len(triggered) <= 3
+    for execution in executions:
+        run = simulated_run(server, execution)
+        assert run in triggered
+        assert execution["duration"]["stages"] == run.durations()
+        assert execution["duration"]["total"] == pytest.approx(0.2, rel=0.1)
+
+
+@pytest.mark.parametrize("platform", ["github", "jenkins"])
+def test_trigger_gives_up_after_timeout(platform):
+    async def trigger(source, client, server):
+        if platform == "github":
+            # Runs déjà réclamés par un autre déclenchement: aucun candidat
+            source._claimed.update(range(GITHUB_ID_OFFSET, GITHUB_ID_OFFSET + 10))
+        collector = Collector(source, wait=True, poll=0.05, timeout=0.3)
+        start = asyncio.get_running_loop().time()
+        executions = await collector.collect_triggered(1)
+        return collector, executions, asyncio.get_running_loop().time() - start
+
+    # Jenkins: build en file bien au-delà du timeout
+    server, client, (collector, executions, elapsed) = collect(
+        {"runs": 3, "queue_delay": 60}, platform, trigger)
+    assert executions == []
+    assert len(collector.failed) == 1 and "après 0.3 s" in collector.failed[0][1]
+    assert elapsed < 2
+
+
+def test_rate_limit_delay_reads_retry_after_or_reset():
+    def response(status, **headers):
+        return Response(status, {name.replace("_", "-"): value for name, value in headers.items()}, b"", "")
+
+    assert rate_limit_delay(response(429, retry_after="2")) == 2.0
+    assert rate_limit_delay(response(429, retry_after="Thu, 01 Jan 1970 00:01:40 GMT"), now=90) == 10.0
+    assert rate_limit_delay(response(403, x_ratelimit_remaining="0", x_ratelimit_reset="130"), now=100) == 30.0
+    assert rate_limit_delay(response(403, x_ratelimit_remaining="12")) is None
+    assert rate_limit_delay(response(502)) is None
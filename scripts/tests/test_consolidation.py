@@ -0,0 +1,78 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from cimetrics.consolidation import Manifest, existing_stores
+from cimetrics.execlog import count_records
+from cimetrics.records import KEYS_FILE, MANIFEST_FILE
+
+SCRIPT = Path(__file__).resolve().parent.parent / "consolidate-data.py"
+
+
+def execution(execution_id, total):
+    return {"execution_id": execution_id, "timestamp": 1700000000 + total,
+            "duration": {"total": float(total), "stages": {"build": float(total)}}}
+
+
+def write_runs(path, runs):
+    path.write_text(json.dumps({"platform": "gitlab", "executions": runs}))
+
+
+def consolidate(results, *flags):
+    return subprocess.run([sys.executable, str(SCRIPT), str(results), *flags],
+                          check=True, capture_output=True, text=True).stdout
+
+
+def stored(results):
+    return sum(count_records(path) for path in existing_stores(results))
+
+
+def test_rerun_is_idempotent_and_duplicates_are_stored_once(tmp_path):
+    write_runs(tmp_path / "gitlab_a.json", [execution(f"pipeline_{i}", 100 + i) for i in range(3)])
+    write_runs(tmp_path / "gitlab_b.json", [execution(f"pipeline_{i}", 100 + i) for i in range(2, 5)])
+    consolidate(tmp_path)
+    manifest = (tmp_path / MANIFEST_FILE).read_bytes()
+    keys = (tmp_path / KEYS_FILE).read_bytes()
+    summary = (tmp_path / "summary.json").read_bytes()
+    assert stored(tmp_path) == 5
+
+    consolidate(tmp_path)
+    assert stored(tmp_path) == 5
+    assert (tmp_path / MANIFEST_FILE).read_bytes() == manifest
+    assert (tmp_path / KEYS_FILE).read_bytes() == keys
+    assert (tmp_path / "summary.json").read_bytes() == summary
+
+
+def test_key_log_only_grows_with_new_executions(tmp_path):
+    write_runs(tmp_path / "gitlab_a.json", [execution(f"pipeline_{i}", 100 + i) for i in range(3)])
+    consolidate(tmp_path)
+    keys = (tmp_path / KEYS_FILE).read_bytes()
+
+    write_runs(tmp_path / "gitlab_b.json", [execution("pipeline_2", 102), execution("pipeline_3", 103)])
+    consolidate(tmp_path)
+    appended = (tmp_path / KEYS_FILE).read_bytes()
+    assert appended.startswith(keys)
+    assert appended[len(keys):].decode().split("\t")[0] == "gitlab:pipeline_3"
+
+    # Clés écrites par une consolidation interrompue avant le manifeste: ignorées
+    with open(tmp_path / KEYS_FILE, "ab") as f:
+        f.write(b"gitlab:pipeline_9\tdead\n")
+    assert "gitlab:pipeline_9" not in Manifest.load(tmp_path).keys
+    write_runs(tmp_path / "gitlab_c.json", [execution("pipeline_9", 109)])
+    consolidate(tmp_path)
+    assert stored(tmp_path) == 5
+    assert len(Manifest.load(tmp_path).keys) == 5
+
+
+def test_modified_execution_is_reported_then_replaced_on_rebuild(tmp_path):
+    write_runs(tmp_path / "gitlab_a.json", [execution("pipeline_1", 100), execution("pipeline_2", 200)])
+    consolidate(tmp_path)
+    write_runs(tmp_path / "gitlab_a.json", [execution("pipeline_1", 100), execution("pipeline_2", 250)])
+    output = consolidate(tmp_path)
+    assert "1 exécution(s) déjà consolidée(s) modifiée(s), non remplacée(s): gitlab:pipeline_2" in output
+    assert stored(tmp_path) == 2
+
+    consolidate(tmp_path, "--rebuild")
+    summary = json.loads((tmp_path / "summary.json").read_text())["platforms"]["gitlab"]
+    assert (summary["total_executions"], summary["max_duration"]) == (2, 250.0)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from cimetrics.costs import (
+    EXACT_BUILDS,
+    PRICING,
+    billed_minutes,
+    break_even,
+    builds_grid,
+    cost_sweep,
+    load_pricing,
+    monthly_minutes,
+)
+from cimetrics.loader import ColumnBuilder
+
+
+def build_columns(platform, stages_list):
+    builder = ColumnBuilder()
+    for i, stages in enumerate(stages_list):
+        total = sum(stages.values()) if stages else 100.0
+        builder.append(platform, {"execution_id": f"c-{i}", "duration": {"total": total, "stages": stages}})
+    return builder.build()
+
+
+def test_billed_minutes_rounds_each_job():
+    columns = build_columns("github", [{"lint_backend": 10.0, "e2e_tests": 61.0}, {}])
+    assert billed_minutes(columns, "github", "job").tolist() == [3.0, 2.0]
+    assert billed_minutes(columns, "github", "build").tolist() == [2.0, 2.0]
+    assert billed_minutes(columns, "github", "none")[0] == pytest.approx(71 / 60)
+
+
+def test_monthly_minutes_small_grid_is_exact_sum():
+    minutes = np.array([1.0, 3.0])
+    totals = monthly_minutes(minutes, [1, 2, EXACT_BUILDS], n_samples=500, rng=np.random.default_rng(0))
+    assert set(np.unique(totals[0])) == {1.0, 3.0}
+    assert set(np.unique(totals[1])) <= {2.0, 4.0, 6.0}
+    assert totals[2].mean() == pytest.approx(2 * EXACT_BUILDS, rel=0.05)
+
+
+def test_sweep_break_even_matches_closed_form():
+    rng = np.random.default_rng(1)
+    stages_list = [{"test_backend": float(rng.uniform(100, 400)), "e2e_tests": float(rng.uniform(200, 500))}
+                   for _ in range(300)]
+    columns = build_columns("gitlab", stages_list)
+    sweep = cost_sweep(columns, builds_grid(1, 100_000, 241), n_samples=1000, seed=2)
+    result = sweep["platforms"]["gitlab"]
+    jenkins = sweep["fixed"]["jenkins"]
+    pricing = PRICING["gitlab"]
+    expected = (jenkins / pricing["price_per_minute"] + pricing["free_minutes"]) / result["billed_minutes"]
+    threshold = result["break_even"]
+    assert threshold["median"] == pytest.approx(expected, rel=0.02)
+    assert threshold["earliest"] <= threshold["median"] <= threshold["latest"]
+    assert np.all(result["low"] <= result["median"]) and np.all(result["median"] <= result["high"])
+    assert result["median"][0] == 0
+
+
+def test_break_even_interpolates_and_handles_never():
+    builds = np.array([10, 20, 30])
+    assert break_even(builds, np.array([0.0, 10.0, 30.0]), 20.0) == pytest.approx(25.0)
+    assert break_even(builds, np.array([0.0, 1.0, 2.0]), 20.0) is None
+
+
+def test_load_pricing_overrides_per_platform(tmp_path):
+    path = tmp_path / "pricing.json"
+    path.write_text('{"github": {"free_minutes": 3000}}')
+    pricing = load_pricing(path)
+    assert pricing["github"]["free_minutes"] == 3000
+    assert pricing["github"]["price_per_minute"] == PRICING["github"]["price_per_minute"]
+    assert PRICING["github"]["free_minutes"] == 2000
+    path.write_text('{"gitlab": {"rounding": "second"}}')
+    with pytest.raises(ValueError):
+        load_pricing(path)
+
+
+def test_point_estimate_does_not_depend_on_the_draws():
+    columns = build_columns("github", [{"lint_backend": 30.0 + i, "e2e_tests": 100.0 + 7 * i} for i in range(20)])
+    builds = [10, 1000]
+    first, second = (cost_sweep(columns, builds, 500, seed, PRICING)["platforms"]["github"] for seed in (1, 2))
+    assert first["mean"].tolist() != second["mean"].tolist()
+    assert first["estimate"].tolist() == second["estimate"].tolist()
+    minutes = billed_minutes(columns, "github").mean()
+    expected = max(1000 * minutes - PRICING["github"]["free_minutes"], 0) * PRICING["github"]["price_per_minute"]
+    assert first["estimate"][1] == pytest.approx(expected)
+    assert first["low"][1] <= first["estimate"][1] <= first["high"][1]
@@ -0,0 +1,88 @@
+import gzip
+import json
+
+import pytest
+
+from cimetrics import execlog
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(execlog, "DEFAULT_BLOCK_SIZE", 4)
+
+
+def executions(start, n):
+    return [{"platform": "github", "execution_id": f"run-{i}", "duration": {"total": 100.0 + i}}
+            for i in range(start, start + n)]
+
+
+def write(path, records, block_size=4):
+    with execlog.ExecutionLogWriter(path, block_size) as log:
+        for record in records:
+            log.append(record)
+
+
+def ids(records):
+    return [record["execution_id"] for record in records]
+
+
+@pytest.mark.parametrize("name", ["runs.jsonl", "runs.jsonl.gz"])
+def test_write_read_and_seek_by_block(tmp_path, name):
+    path = tmp_path / name
+    write(path, executions(0, 6))
+    write(path, executions(6, 5))
+    index = execlog.read_index(path)
+    assert [entry["records"] for entry in index] == [4, 2, 4, 1]
+    assert ids(execlog.iter_records(path)) == [f"run-{i}" for i in range(11)]
+    assert execlog.count_records(path) == 11
+    assert ids(execlog.iter_records(path, start_block=2)) == [f"run-{i}" for i in range(6, 11)]
+    if name.endswith(".gz"):
+        # Blocs compressés séparément: le journal reste un flux gzip valide
+        with gzip.open(path, "rt") as f:
+            assert len(f.readlines()) == 11
+
+
+def test_zstd_log_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "runs.jsonl.zst"
+    write(path, executions(0, 6))
+    assert ids(execlog.iter_records(path, start_block=1)) == ["run-4", "run-5"]
+
+
+@pytest.mark.parametrize("name", ["runs.jsonl", "runs.jsonl.gz"])
+def test_lines_appended_after_the_index_are_read_then_indexed(tmp_path, name, capsys):
+    path = tmp_path / name
+    write(path, executions(0, 3))
+    extra = "".join(json.dumps(record) + "\n" for record in executions(3, 6)).encode()
+    with open(path, "ab") as f:
+        f.write(gzip.compress(extra) if name.endswith(".gz") else extra.rstrip(b"\n"))
+    assert ids(execlog.iter_records(path)) == [f"run-{i}" for i in range(9)]
+    assert execlog.count_records(path) == 9
+    assert "non indexé" in capsys.readouterr().out
+
+    write(path, executions(9, 1))
+    assert [entry["records"] for entry in execlog.read_index(path)] == [3, 4, 2, 1]
+    assert ids(execlog.iter_records(path)) == [f"run-{i}" for i in range(10)]
+    assert "non indexé" not in capsys.readouterr().out
+
+
+def test_existing_log_without_index_is_indexed_in_blocks(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in executions(0, 10)))
+    assert [len(block) for block in execlog.iter_blocks(path)] == [4, 4, 2]
+    write(path, executions(10, 1))
+    assert [entry["records"] for entry in execlog.read_index(path)] == [4, 4, 2, 1]
+    assert ids(execlog.iter_records(path, start_block=3)) == ["run-10"]
+
+
+def test_index_longer_than_truncated_log_is_ignored(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    write(path, executions(0, 8))
+    first = execlog.read_index(path)[0]
+    with open(path, "r+b") as f:
+        f.truncate(first["size"] + 5)
+    records = list(execlog.iter_records(path, on_error=lambda *_: None))
+    assert ids(records) == ["run-0", "run-1", "run-2", "run-3"]
+    execlog.truncate_log(path, first["size"])
+    assert execlog.read_index(path) == [first]
+    assert execlog.count_records(path) == 4
@@ -0,0 +1,129 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cimetrics.aggregates import Summary
+from cimetrics.gate import Baseline, execution_keys, gate_table, mann_whitney_greater, select_newest
+from cimetrics.loader import STAGES, ExecutionColumns
+from cimetrics.sketch import QuantileSketch
+
+
+def test_mann_whitney_against_sketch_matches_exact_test():
+    scipy_stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(1)
+    baseline = rng.lognormal(np.log(100), 0.3, 2000)
+    new = rng.lognormal(np.log(115), 0.3, 12)
+    sketch = QuantileSketch()
+    sketch.update(baseline)
+    expected = scipy_stats.mannwhitneyu(new, baseline, alternative="greater", method="asymptotic").pvalue
+    assert mann_whitney_greater(new, sketch) == pytest.approx(expected, rel=0.1)
+
+
+def test_rank_counts_treats_same_bin_as_ties():
+    sketch = QuantileSketch()
+    sketch.update([10.0, 10.01, 20.0, 30.0])
+    below, equal = sketch.rank_counts([10.0, 25.0, 100.0, 0.0])
+    assert below.tolist() == [0, 3, 4, 0]
+    assert equal.tolist() == [2, 0, 0, 0]
+
+
+def test_gate_flags_slower_stage_only(build_columns):
+    baseline = Summary().update_columns(build_columns(300))
+    rows = gate_table(build_columns(8, e2e=170.0, seed=2), baseline)
+    regressions = {row["stage"] for row in rows if row["regression"]}
+    assert "e2e_tests" in regressions
+    assert regressions <= {"e2e_tests", "total"}
+
+    rows = gate_table(build_columns(8, seed=3), baseline)
+    assert not any(row["regression"] for row in rows)
+
+
+def test_min_effect_ignores_small_significant_shift(build_columns):
+    baseline = Summary().update_columns(build_columns(2000))
+    rows = gate_table(build_columns(200, e2e=126.0, seed=4), baseline, min_effect=0.10)
+    e2e = next(row for row in rows if row["stage"] == "e2e_tests")
+    assert e2e["p_adjusted"] < 0.05
+    assert not e2e["regression"]
+
+
+def test_select_newest_filters_branch_and_keeps_latest(build_columns):
+    merged = ExecutionColumns.concatenate([
+        build_columns(10, branch="main"),
+        build_columns(5, branch="dev", start=100),
+        build_columns(10, branch="main", start=50),
+    ])
+    selected = select_newest(merged, "github", "main", last=4)
+    assert selected.execution_id.tolist() == [f"run-{i}" for i in range(56, 60)]
+
+
+def test_baseline_window_keeps_latest_batches(build_columns):
+    summary = Summary().update_columns(build_columns(20))
+    baseline = Baseline.from_dict(summary.to_dict(), window=2)
+    assert len(baseline.batches) == 1
+    for _ in range(3):
+        baseline.push(Summary().update_columns(build_columns(5)))
+    assert len(baseline.batches) == 2
+    restored = Baseline.from_dict(baseline.to_dict())
+    assert restored.window == 2
+    assert restored.summary().platforms["github"].executions == 10
+
+
+def test_baseline_keys_skip_executions_already_pushed(build_columns):
+    columns = build_columns(5)
+    baseline = Baseline(window=2)
+    assert baseline.unseen(columns).all()
+    baseline.push(Summary().update_columns(columns), execution_keys(columns))
+    restored = Baseline.from_dict(baseline.to_dict())
+    merged = ExecutionColumns.concatenate([columns, build_columns(3, start=5)])
+    assert restored.unseen(merged).tolist() == [False] * 5 + [True] * 3
+
+
+def write_results(directory, columns):
+    directory.mkdir()
+    executions = [
+        {"platform": "github", "execution_id": execution_id, "timestamp": int(timestamp),
+         "duration": {"total": float(total), "stages": dict(zip(STAGES, map(float, stages)))}}
+        for execution_id, timestamp, total, stages
+        in zip(columns.execution_id, columns.timestamp, columns.total, columns.stages)
+    ]
+    (directory / "github_new.json").write_text(json.dumps({"platform": "github", "executions": executions}))
+    return directory
+
+
+def run_gate(results, baseline, *flags):
+    script = Path(__file__).resolve().parent.parent / "advanced-statistics.py"
+    return subprocess.run([sys.executable, str(script), str(results), "--gate", "--baseline", str(baseline), *flags],
+                          capture_output=True, text=True).returncode
+
+
+def test_gate_exits_2_when_nothing_is_checked_and_seeds_only_on_request(tmp_path, build_columns):
+    results = write_results(tmp_path / "new", build_columns(6))
+    baseline_file = tmp_path / "baseline.json"
+    baseline_file.write_text(json.dumps(Summary().update_columns(build_columns(3)).to_dict()))
+    assert run_gate(results, baseline_file, "--update-baseline") == 2
+    assert len(Baseline.load(baseline_file).batches) == 1
+
+    assert run_gate(results, baseline_file, "--seed-baseline") == 0
+    assert run_gate(results, baseline_file, "--seed-baseline") == 0
+    baseline = Baseline.load(baseline_file)
+    assert len(baseline.batches) == 2
+    assert baseline.summary().platforms["github"].executions == 9
+
+    seeded = tmp_path / "seeded.json"
+    assert run_gate(results, seeded, "--seed-baseline") == 0
+    assert Baseline.load(seeded).summary().platforms["github"].executions == 6
+
+
+def test_update_baseline_does_not_push_the_same_runs_twice(tmp_path, build_columns):
+    results = write_results(tmp_path / "new", build_columns(6, seed=3, start=1000))
+    baseline_file = tmp_path / "baseline.json"
+    baseline_file.write_text(json.dumps(Summary().update_columns(build_columns(300)).to_dict()))
+    for _ in range(2):
+        assert run_gate(results, baseline_file, "--update-baseline") == 0
+        baseline = Baseline.load(baseline_file)
+        assert len(baseline.batches) == 2
+        assert baseline.summary().platforms["github"].executions == 306
@@ -0,0 +1,148 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from cimetrics import execlog, importers
+from cimetrics.importers import CIImporter
+from cimetrics.schema import FileReport, Validator
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def import_fixtures(platform, *names):
+    importer = CIImporter(platform)
+    for name in names:
+        importer.add_file(FIXTURES / name)
+    return importer, {execution["execution_id"]: execution for execution in importer.executions()}
+
+
+def assert_valid(executions):
+    validator = Validator()
+    report = FileReport("import")
+    for execution in executions.values():
+        validator.validate_execution(execution, report)
+    assert report.error_count == 0, report.errors
+    assert report.warning_count == 0, report.warnings
+
+
+def test_alias_key_strips_matrix_and_parallel_suffixes():
+    assert importers.alias_key("Backend Tests (18.x)") == "backend_tests"
+    assert importers.alias_key("e2e-tests 2/3") == "e2e_tests"
+    assert importers.alias_key("Deploy to Staging") == "deploy_to_staging"
+
+
+def test_iter_json_documents_streams_arrays_and_concatenated_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(importers, "READ_SIZE", 7)
+    path = tmp_path / "export.json.gz"
+    with gzip.open(path, "wt") as f:
+        f.write('[{"id": 1, "name": "é"}, {"id": 2}]\n{"id": 3, "value": 12345678901}\n[]\n{"id": 4}')
+    assert [doc["id"] for doc in importers.iter_json_documents(path)] == [1, 2, 3, 4]
+    assert list(importers.iter_json_documents(path))[2]["value"] == 12345678901
+
+    (tmp_path / "bad.json").write_text('[{"id": 1} {"id": 2}]')
+    with pytest.raises(ValueError):
+        list(importers.iter_json_documents(tmp_path / "bad.json"))
+
+
+def test_github_runs_and_jobs_from_separate_exports():
+    importer, executions = import_fixtures("github", "github_jobs.json", "github_runs.json")
+    assert sorted(executions) == ["run_1001", "run_1002_2"]
+    run = executions["run_1001"]
+    assert run["timestamp"] == "2026-03-02T10:00:00Z"
+    assert run["duration"]["total"] == 410
+    assert run["duration"]["stages"] == {
+        "lint_backend": 30, "lint_frontend": 20, "test_backend": 110, "test_frontend": 45,
+        "build_frontend": 40, "e2e_tests": 240, "deploy": 30,
+    }
+    assert run["queue_time"] == 10
+    assert run["success"] is True
+    assert (run["branch"], run["trigger"], run["runner_type"]) == ("main", "push", "ubuntu-latest")
+
+    # Relance: un seul job monolithique, stages lus dans les steps
+    rerun = executions["run_1002_2"]
+    assert rerun["duration"]["stages"] == {"lint_backend": 20, "test_backend": 60}
+    assert rerun["duration"]["total"] == 305
+    assert rerun["queue_time"] == 5
+    assert rerun["success"] is False
+    assert importer.unmapped == {"Notify": 1}
+    assert_valid(executions)
+
+
+def test_gitlab_pipelines_with_jobs_and_jobs_only_export():
+    importer, executions = import_fixtures("gitlab", "gitlab_pipelines.json", "gitlab_jobs.json")
+    assert sorted(executions) == ["pipeline_501", "pipeline_503"]
+    pipeline = executions["pipeline_501"]
+    assert pipeline["duration"]["total"] == 480
+    assert pipeline["duration"]["stages"] == {
+        "lint_backend": 25.5, "lint_frontend": 18, "test_backend": 70, "test_frontend": 40,
+        "build_frontend": 55, "e2e_tests": 300, "deploy": 20,
+    }
+    assert pipeline["queue_time"] == 30
+    # security-scan échoue avec allow_failure: le pipeline reste un succès
+    assert pipeline["success"] is True
+    assert importer.unmapped == {"security-scan": 1}
+
+    jobs_only = executions["pipeline_503"]
+    assert jobs_only["timestamp"] == "2026-03-04T07:59:00Z"
+    assert jobs_only["branch"] == "develop"
+    assert jobs_only["duration"]["stages"] == {"build_frontend": 40, "e2e_tests": 220}
+    assert jobs_only["duration"]["total"] == 190
+    assert jobs_only["queue_time"] == 10
+    assert_valid(executions)
+
+
+def test_jenkins_wfapi_runs():
+    importer, executions = import_fixtures("jenkins", "jenkins_wfapi_runs.json")
+    assert sorted(executions) == ["build_41", "build_42"]
+    build = executions["build_42"]
+    assert build["duration"]["total"] == 340
+    assert build["duration"]["stages"] == {
+        "lint_backend": 25, "lint_frontend": 15, "test_backend": 50, "test_frontend": 30,
+        "build_frontend": 45, "e2e_tests": 200, "deploy": 10,
+    }
+    assert build["queue_time"] == 15
+    assert build["timestamp"] == "2026-03-04T04:53:20Z"
+    assert executions["build_41"]["success"] is False
+    assert importer.unmapped == {"Lint": 1, "Test": 1}
+    assert_valid(executions)
+
+
+def test_bulk_export_of_thousands_of_runs(tmp_path):
+    path = tmp_path / "runs.json"
+    with open(path, "w") as f:
+        json.dump([
+            {"id": str(i), "status": "SUCCESS", "startTimeMillis": 1772600000000 + i * 600000,
+             "durationMillis": 120000 + i, "queueDurationMillis": 0,
+             "stages": [{"name": "E2E Tests", "status": "SUCCESS", "durationMillis": 60000}]}
+            for i in range(5000)
+        ], f)
+    importer = CIImporter("jenkins")
+    importer.add_file(path)
+    executions = importer.executions()
+    assert len(executions) == 5000
+    assert executions[-1]["duration"]["total"] == 120 + 4999 / 1000
+
+
+def test_load_aliases_rejects_unknown_stage(tmp_path):
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps({"Security Scan": "test_backend"}))
+    importer = CIImporter("gitlab", importers.load_aliases(path))
+    importer.add_file(FIXTURES / "gitlab_pipelines.json")
+    assert importer.executions()[0]["duration"]["stages"]["test_backend"] == 82
+    path.write_text(json.dumps({"Security Scan": "security"}))
+    with pytest.raises(ValueError):
+        importers.load_aliases(path)
+
+
+def test_write_executions_appends_valid_new_executions_in_one_block(tmp_path):
+    importer, executions = import_fixtures("jenkins", "jenkins_wfapi_runs.json")
+    log = tmp_path / "jenkins_api.jsonl"
+    assert importers.write_executions(log, list(executions.values()))[:3] == (len(executions), 0, 0)
+    invalid = dict(next(iter(executions.values())), execution_id="build_invalid", success="yes")
+    added, duplicates, invalid_count, report = importers.write_executions(log, [*executions.values(), invalid])
+    assert (added, duplicates, invalid_count) == (0, len(executions), 1)
+    assert report.error_count == 1
+    assert len(execlog.read_index(log)) == 1
+    assert [record["execution_id"] for record in execlog.iter_records(log)] == list(executions)
@@ -0,0 +1,75 @@
+import gzip
+
+import pytest
+
+from cimetrics import junit
+
+REPORT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuites name="Backend Tests" tests="4">
+  <testsuite name="tests/performance.test.js" timestamp="{timestamp}" tests="3">
+    <testcase classname="Performance Tests" name="POST /api/bmi" time="{bmi}"></testcase>
+    <testcase classname="Performance Tests" name="GET /api/history" time="0.5">
+      <failure message="trop lent">Error: expected 0.5 &lt; 0.2</failure>
+    </testcase>
+    <testcase classname="Performance Tests" name="skip me" time="0"><skipped/></testcase>
+  </testsuite>
+  <testsuite name="tests/auth.test.js" timestamp="{timestamp}" tests="1">
+    <testcase classname="Auth" name="login" time="1,250.5"><system-out>log</system-out></testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+def write_report(path, timestamp="2025-12-04T16:37:23", bmi="0.02"):
+    content = REPORT.format(timestamp=timestamp, bmi=bmi)
+    if path.name.endswith(".gz"):
+        with gzip.open(path, "wt") as f:
+            f.write(content)
+    else:
+        path.write_text(content)
+    return path
+
+
+def test_iter_testcases_reads_suite_status_and_time(tmp_path):
+    cases = list(junit.iter_testcases(write_report(tmp_path / "report.xml.gz")))
+    assert [(case["suite"], case["status"]) for case in cases] == [
+        ("tests/performance.test.js", "passed"),
+        ("tests/performance.test.js", "failed"),
+        ("tests/performance.test.js", "skipped"),
+        ("tests/auth.test.js", "passed"),
+    ]
+    assert cases[0]["time"] == 0.02
+    assert cases[3]["time"] == 1250.5
+    assert junit.report_run_id(tmp_path / "report.xml.gz") == "2025-12-04T16:37:23"
+
+
+def test_history_ingests_each_run_once_and_reloads(tmp_path):
+    history = junit.TestHistory.load(tmp_path / "history")
+    for k, bmi in enumerate(["0.02", "0.04", "0.06"]):
+        report = write_report(tmp_path / f"r{k}.xml", timestamp=f"2025-12-0{k + 1}T10:00:00", bmi=bmi)
+        assert history.ingest(report) == 4
+    assert history.ingest(report) == 0
+    history.save()
+
+    history = junit.TestHistory.load(tmp_path / "history")
+    assert len(history.runs) == 3
+    bmi = history.tests[("tests/performance.test.js", "Performance Tests", "POST /api/bmi")].row()
+    assert bmi["runs"] == 3
+    assert bmi["mean"] == pytest.approx(0.04)
+    skipped = history.tests[("tests/performance.test.js", "Performance Tests", "skip me")].row()
+    assert skipped["skipped"] == 3 and skipped["mean"] == 0
+    assert [record["name"] for record in history.iter_records("2025-12-02T10:00:00")] == [
+        "POST /api/bmi", "GET /api/history", "skip me", "login"
+    ]
+
+
+def test_history_table_sorts_and_filters(tmp_path):
+    history = junit.TestHistory(tmp_path)
+    for k, bmi in enumerate(["0.01", "0.09"]):
+        history.ingest(write_report(tmp_path / f"r{k}.xml", bmi=bmi), run_id=f"run-{k}")
+    assert history.table("total")[0]["name"] == "login"
+    assert history.table("cv", top=1)[0]["name"] == "POST /api/bmi"
+    assert history.table("failures", top=1)[0]["failures"] == 2
+    assert {row["classname"] for row in history.table(suite="Performance Tests")} == {"Performance Tests"}
+    with pytest.raises(ValueError):
+        history.table("name")
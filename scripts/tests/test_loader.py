@@ -0,0 +1,90 @@
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from cimetrics import snapshot
+from cimetrics.loader import (
+    NUMERIC_COLUMNS,
+    STAGE_INDEX,
+    STAGES,
+    STRING_COLUMNS,
+    UNKNOWN,
+    ColumnBuilder,
+    load_executions,
+)
+from cimetrics.records import PLATFORMS
+
+SCRIPT = Path(__file__).resolve().parent.parent / "consolidate-data.py"
+
+EXECUTIONS = [
+    {"execution_id": "a", "branch": "main", "timestamp": "2025-01-01T12:00:00Z", "success": True,
+     "duration": {"total": 100.0, "stages": {"lint_backend": 10.0, "e2e_tests": 60.0, "inconnu": 5.0}},
+     "cache": {"hit": False, "size_mb": 12.5}, "queue_time": 4},
+    {"execution_id": 42, "start_time": 1_700_000_000, "success": False, "duration": 80,
+     "cache": {"hit": True}, "artifacts": {"total_size_mb": 3.0}, "trigger": "push"},
+    {"success": "yes", "duration": {"total": True, "stages": {"build_frontend": "12"}}, "cache": "hit"},
+]
+
+
+def build(executions=EXECUTIONS, platform="gitlab"):
+    builder = ColumnBuilder()
+    for execution in executions:
+        assert builder.append(platform, execution)
+    return builder.build()
+
+
+def test_builder_keeps_missing_stages_as_nan():
+    columns = build()
+    stages = columns.stages
+    assert stages.shape == (3, len(STAGES))
+    assert stages[0, STAGE_INDEX["lint_backend"]] == 10.0
+    assert stages[0, STAGE_INDEX["e2e_tests"]] == 60.0
+    assert np.count_nonzero(~np.isnan(stages[0])) == 2
+    # Durée scalaire, durée booléenne et stage non numérique: NaN
+    assert np.isnan(stages[1:]).all()
+    assert columns.total[:2].tolist() == [100.0, 80.0] and math.isnan(columns.total[2])
+
+
+def test_builder_maps_booleans_and_missing_fields():
+    columns = build()
+    assert columns.success.tolist() == [1, 0, UNKNOWN]
+    assert columns.cache_hit.tolist() == [0, 1, UNKNOWN]
+    assert columns.timestamp[0] == 1_735_732_800.0 and columns.timestamp[1] == 1_700_000_000.0
+    assert math.isnan(columns.timestamp[2])
+    assert columns.queue_time[0] == 4.0 and np.isnan(columns.queue_time[1:]).all()
+    assert columns.cache_size_mb[0] == 12.5 and columns.artifact_size_mb[1] == 3.0
+    assert list(columns.execution_id) == ["a", "42", None]
+    assert list(columns.trigger) == [None, "push", None]
+    assert columns.success_counts() == (1, 1)
+
+
+def test_builder_skips_unknown_platforms():
+    builder = ColumnBuilder()
+    assert not builder.append("travis", EXECUTIONS[0])
+    assert builder.skipped == 1 and len(builder.build()) == 0
+
+
+def assert_same_columns(actual, expected):
+    for name in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+    for name in STRING_COLUMNS:
+        assert list(getattr(actual, name)) == list(getattr(expected, name))
+
+
+def test_snapshot_columns_match_raw_files(tmp_path):
+    results = tmp_path / "results"
+    results.mkdir()
+    for platform in PLATFORMS:
+        executions = [dict(execution, execution_id=f"{platform}-{i}") for i, execution in enumerate(EXECUTIONS)]
+        (results / f"{platform}_run.json").write_text(json.dumps({"platform": platform, "executions": executions}))
+    raw = load_executions(results)
+    subprocess.run([sys.executable, str(SCRIPT), str(results)], check=True, capture_output=True)
+
+    columns = snapshot.load_if_fresh(results)
+    assert columns is not None
+    order = np.argsort(columns.execution_id.astype(str))
+    assert_same_columns(columns.select(order), raw.select(np.argsort(raw.execution_id.astype(str))))
@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pytest
+
+from cimetrics.loader import STAGES, execution_keys, load_executions
+from cimetrics.parallel import MIN_PARALLEL_ITEMS, WORKERS_VARIABLE, pop_workers_option
+
+
+def write_results(directory, n_files):
+    """n_files fichiers de résultats, avec stages partiels et exécutions sans execution_id"""
+    rng = np.random.default_rng(0)
+    for index in range(n_files):
+        platform = ("github", "gitlab", "jenkins")[index % 3]
+        executions = []
+        for run in range(4):
+            stages = {stage: float(rng.uniform(5, 60)) for stage in STAGES[:index % len(STAGES) + 1]}
+            execution = {
+                "run": run,
+                "duration": {"total": sum(stages.values()) + 3.0, "stages": stages},
+                "start_time": 1_700_000_000 + index * 100 + run,
+                "success": bool(run % 2),
+            }
+            if run != 3:
+                execution["execution_id"] = f"{index}-{run}"
+            executions.append(execution)
+        with open(directory / f"{platform}_{index:03d}.json", "w") as f:
+            json.dump({"platform": platform, "executions": executions}, f)
+
+
+def test_parallel_ingestion_matches_serial(tmp_path):
+    write_results(tmp_path, MIN_PARALLEL_ITEMS + 10)
+    serial = load_executions(tmp_path)
+    parallel = load_executions(tmp_path, workers=3)
+
+    assert len(serial) == 4 * (MIN_PARALLEL_ITEMS + 10)
+    assert execution_keys(parallel) == execution_keys(serial)
+    for name in ("platform", "timestamp", "total", "stages", "success", "queue_time", "cache_hit"):
+        np.testing.assert_array_equal(getattr(parallel, name), getattr(serial, name))
+    for name in ("execution_id", "branch", "trigger", "runner_type"):
+        assert list(getattr(parallel, name)) == list(getattr(serial, name))
+
+
+@pytest.mark.parametrize("value, expected", [("4", 4), ("0", 0), ("auto", 1)])
+def test_workers_default_comes_from_environment(monkeypatch, capsys, value, expected):
+    monkeypatch.setenv(WORKERS_VARIABLE, value)
+    assert pop_workers_option(["results"]) == (expected, ["results"])
+    assert ("invalide" in capsys.readouterr().err) == (value == "auto")
+    assert pop_workers_option(["--workers", "2", "results"]) == (2, ["results"])
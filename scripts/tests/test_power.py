@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from cimetrics.power import detectable_effect, plan_table, runs_for_effect, runs_for_precision, should_stop
+
+pytest.importorskip("scipy")
+
+
+def test_runs_for_effect_matches_normal_approximation():
+    # 2 × (1.96 + 0.84)² × (0.25 / 0.10)² ≈ 98, un peu plus avec les quantiles t
+    n = runs_for_effect([0.25, 0.05], effect=0.10)
+    assert 98 <= n[0] <= 101
+    assert n[1] >= 3
+    assert runs_for_effect(0.25, effect=0.05) > 3.9 * n[0]
+
+
+def test_detectable_effect_inverts_runs_for_effect():
+    n = runs_for_effect(0.3, effect=0.10)
+    assert detectable_effect(0.3, n) <= 0.10
+    assert detectable_effect(0.3, n - 2) > 0.10
+
+
+def test_runs_for_precision_reaches_target_on_simulated_runs():
+    rng = np.random.default_rng(0)
+    n = int(runs_for_precision(0.2, precision=0.05))
+    widths = []
+    for _ in range(200):
+        values = rng.normal(100, 20, n)
+        widths.append(should_stop(values, precision=0.05)[1])
+    assert np.median(widths) == pytest.approx(0.05, rel=0.1)
+
+
+def test_should_stop_needs_min_runs_and_precision():
+    assert should_stop([100.0, 100.5], precision=0.05) == (False, pytest.approx(0.032, rel=0.1))
+    assert should_stop([100.0, 100.5, 99.8], precision=0.05)[0]
+    assert not should_stop([100.0, 160.0, 70.0, 120.0], precision=0.05)[0]
+
+
+def test_plan_table_uses_observed_cv(build_columns):
+    columns = build_columns(200, platform="gitlab", seed=1, spread=0.05, e2e_spread=0.4, prefix="p")
+    rows = {row["stage"]: row for row in plan_table(columns, effect=0.10)}
+    assert rows["e2e_tests"]["runs_for_effect"] > 10 * rows["lint_backend"]["runs_for_effect"]
+    assert rows["e2e_tests"]["precision"] == pytest.approx(1.96 * rows["e2e_tests"]["cv"] / 100 / np.sqrt(200), rel=0.05)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from cimetrics.resampling import adjust_p_values, bootstrap_difference, permutation_test
+
+LEVELS = [0.5, 0.95]
+
+
+def test_permutation_test_detects_a_shift_only():
+    rng = np.random.default_rng(0)
+    a = rng.normal(100.0, 10.0, 60)
+    shifted = rng.normal(130.0, 10.0, 60)
+    same = rng.normal(100.0, 10.0, 60)
+
+    p_shifted = permutation_test(a, shifted, LEVELS, 999, np.random.default_rng(1))
+    p_same = permutation_test(a, same, LEVELS, 999, np.random.default_rng(1))
+    # Aucune permutation n'atteint l'écart observé: p minimal 1 / (n + 1)
+    assert p_shifted[0] == pytest.approx(1 / 1000)
+    assert p_same[0] > 0.05
+    assert ((p_same > 0) & (p_same <= 1)).all()
+
+
+def test_permutation_test_is_reproducible_with_a_seed():
+    rng = np.random.default_rng(0)
+    a, b = rng.exponential(10.0, 30), rng.exponential(12.0, 40)
+    first = permutation_test(a, b, LEVELS, 500, np.random.default_rng(7))
+    second = permutation_test(a, b, LEVELS, 500, np.random.default_rng(7))
+    assert (first == second).all()
+
+
+def test_bootstrap_interval_covers_the_known_difference():
+    # Médianes connues: 50 et 40 (lois normales), différence 10
+    rng = np.random.default_rng(0)
+    covered = 0
+    trials = 200
+    for _ in range(trials):
+        a = rng.normal(50.0, 5.0, 80)
+        b = rng.normal(40.0, 5.0, 80)
+        lower, upper = bootstrap_difference(a, b, [0.5], 400, rng)
+        covered += lower[0] <= 10.0 <= upper[0]
+    assert 0.88 <= covered / trials <= 0.99
+
+
+def test_holm_and_bh_match_hand_computed_values():
+    p = [0.01, 0.04, 0.03, 0.005]
+    # Holm: triées 0.005, 0.01, 0.03, 0.04 × (4, 3, 2, 1) = 0.02, 0.03, 0.06, 0.04, maximum cumulé
+    assert adjust_p_values(p, "holm") == pytest.approx([0.03, 0.06, 0.06, 0.02])
+    # BH: p × 4 / rang = 0.02, 0.02, 0.04, 0.04, minimum cumulé depuis la plus grande
+    assert adjust_p_values(p, "bh") == pytest.approx([0.02, 0.04, 0.04, 0.02])
+    assert adjust_p_values([0.5, 0.6], "holm") == pytest.approx([1.0, 1.0])
+    assert len(adjust_p_values([], "bh")) == 0
+    with pytest.raises(ValueError):
+        adjust_p_values(p, "bonferroni")
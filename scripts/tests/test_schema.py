@@ -0,0 +1,103 @@
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from cimetrics.schema import ERROR, WARNING, Validator, compile_schema
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+VALID = {
+    "platform": "github",
+    "execution_id": "run-1",
+    "timestamp": "2025-01-01T12:00:00Z",
+    "duration": {"total": 245.3, "stages": {"lint_backend": 12.0, "test_backend": 40.5}},
+    "success": True,
+}
+
+
+def problems(execution):
+    found = []
+    compile_schema()(execution, lambda severity, message: found.append((severity, message)))
+    return found
+
+
+def test_valid_execution_has_no_problem():
+    assert problems(VALID) == []
+
+
+def test_invalid_timestamp_is_an_error():
+    found = problems(dict(VALID, timestamp="01/01/2025"))
+    assert [severity for severity, _ in found] == [ERROR]
+    assert "timestamp" in found[0][1]
+
+
+def test_type_and_value_checks():
+    execution = dict(VALID, success="yes", platform="travis", duration={"stages": {"deploy": -1}})
+    messages = {message.split(" ")[0]: severity for severity, message in problems(execution)}
+    assert messages["success"] == ERROR
+    assert messages["platform"] == ERROR
+    assert messages["Champ"] == ERROR  # duration.total manquant
+    assert messages["duration.stages.deploy"] == WARNING
+
+
+def test_legacy_numeric_duration_is_accepted():
+    found = problems({"platform": "jenkins", "duration": 250.1, "start_time": 1704110400.0})
+    assert all(severity == WARNING for severity, _ in found)
+
+
+def test_missing_execution_id_and_success_are_warnings():
+    execution = {name: value for name, value in VALID.items() if name not in ("execution_id", "success")}
+    found = problems(execution)
+    assert [severity for severity, _ in found] == [WARNING, WARNING]
+    assert {message.split(" ")[-1] for _, message in found} == {"execution_id", "success"}
+
+
+def test_every_record_of_containers_is_validated(tmp_path):
+    container = tmp_path / "gitlab_runs.json"
+    container.write_text(json.dumps({"platform": "gitlab", "executions": [VALID, {"duration": "x"}, 3]}))
+    report = Validator().validate_file(container)
+    assert report.records == 2
+    assert report.error_count == 2
+    assert any(error.startswith("executions[1]: duration") for error in report.errors)
+    assert any(error.startswith("executions[2]:") for error in report.errors)
+
+    listing = tmp_path / "runs.json"
+    listing.write_text(json.dumps([VALID, dict(VALID, platform=None)]))
+    report = Validator().validate_file(listing)
+    assert report.records == 2
+    assert report.errors and report.errors[0].startswith("[1]: platform")
+
+
+def test_execution_logs_report_invalid_lines(tmp_path):
+    log = tmp_path / "github_all_shard.jsonl.gz"
+    with gzip.open(log, "wt") as f:
+        f.write(json.dumps(VALID) + "\n{not json\n" + json.dumps(dict(VALID, execution_id="run-2")) + "\n")
+    report = Validator().validate_file(log)
+    assert report.records == 2
+    assert report.error_count == 1
+    assert report.errors[0].startswith("ligne 2:")
+
+
+def run_script(*args):
+    return subprocess.run(
+        [sys.executable, "validate-data.py", *map(str, args)], cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+
+
+def test_jsonl_output_and_fail_fast(tmp_path):
+    for index in range(5):
+        execution = dict(VALID, execution_id=f"run-{index}")
+        if index in (1, 3):
+            execution["duration"] = "broken"
+        (tmp_path / f"github_run_{index}.json").write_text(json.dumps(execution))
+
+    result = run_script(tmp_path, "--jsonl", "-")
+    assert result.returncode == 1
+    reports = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [report["valid"] for report in reports] == [True, False, True, False, True]
+
+    result = run_script(tmp_path, "--jsonl", "-", "--fail-fast")
+    assert result.returncode == 1
+    assert len(result.stdout.splitlines()) == 2
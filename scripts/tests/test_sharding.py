@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+
+from cimetrics import sharding
+from cimetrics.loader import ColumnBuilder
+
+FILES = ["e2e/auth.spec.js", "e2e/bmi-flow.spec.js", "e2e/navigation.spec.js", "e2e/profile.spec.js"]
+
+
+def record(run, suite, time, status="passed"):
+    return {"run": run, "suite": suite, "classname": "", "name": "t", "time": time, "status": status}
+
+
+def test_match_file_uses_path_suffix():
+    assert sharding.match_file("auth.spec.js", FILES) == "e2e/auth.spec.js"
+    assert sharding.match_file("C:\\repo\\e2e\\bmi-flow.spec.js", FILES) == "e2e/bmi-flow.spec.js"
+    assert sharding.match_file("./e2e/navigation.spec.js", FILES) == "e2e/navigation.spec.js"
+    assert sharding.match_file("other/auth.spec.js.bak", FILES) is None
+    assert sharding.match_file("xauth.spec.js", FILES) is None
+
+
+def test_run_durations_sum_projects_and_skip_skipped_tests():
+    records = [
+        # Même fichier exécuté par deux projets Playwright dans le run 1
+        record("1", "auth.spec.js", 10.0),
+        record("1", "auth.spec.js", 12.0),
+        record("1", "auth.spec.js", 50.0, "skipped"),
+        record("2", "auth.spec.js", 30.0),
+        record("1", "deleted.spec.js", 99.0),
+    ]
+    assert sharding.run_durations(records, FILES) == {"e2e/auth.spec.js": [22.0, 30.0]}
+
+
+def test_file_estimates_quantile_and_default_for_unseen():
+    durations = {"e2e/auth.spec.js": [10.0, 20.0, 30.0], "e2e/bmi-flow.spec.js": [50.0]}
+    estimates, unseen = sharding.file_estimates(FILES, durations, quantile=0.5)
+    assert estimates["e2e/auth.spec.js"] == 20.0
+    assert estimates["e2e/navigation.spec.js"] == 35.0
+    assert unseen == ["e2e/navigation.spec.js", "e2e/profile.spec.js"]
+    estimates, _ = sharding.file_estimates(FILES, durations, quantile=1.0, default=5.0)
+    assert estimates["e2e/auth.spec.js"] == 30.0
+    assert estimates["e2e/profile.spec.js"] == 5.0
+
+
+def test_lpt_balances_shards_within_four_thirds_of_lower_bound():
+    rng = np.random.default_rng(0)
+    files = [f"e2e/f{i}.spec.js" for i in range(40)]
+    records = [record(str(run), name, float(rng.lognormal(3, 1)))
+               for run in range(5) for name in files]
+    plan = sharding.plan_shards(files, records, shards=4)
+    assigned = sorted(name for shard in plan["shards"] for name in shard["files"])
+    assert assigned == sorted(files)
+    assert plan["total"] == pytest.approx(sum(shard["predicted"] for shard in plan["shards"]))
+    assert plan["lower_bound"] <= plan["makespan"] <= plan["lower_bound"] * 4 / 3
+
+
+def test_lpt_known_instance():
+    shards = sharding.lpt_shards({"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}, 2)
+    assert [shard["files"] for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+    assert [shard["predicted"] for shard in shards] == [10.0, 10.0]
+
+
+def test_manifest_and_stage_comparison():
+    records = [record("1", name, 60.0) for name in FILES]
+    plan = sharding.plan_shards(FILES, records, shards=2)
+    data = json.loads(json.dumps(sharding.manifest(plan)))
+    assert [shard["index"] for shard in data["shards"]] == [1, 2]
+    assert [shard["predicted_seconds"] for shard in data["shards"]] == [120.0, 120.0]
+
+    builder = ColumnBuilder()
+    for i, stage_time in enumerate((330.0, 300.0, 360.0)):
+        builder.append("gitlab", {
+            "execution_id": f"g-{i}",
+            "duration": {"total": stage_time + 100, "stages": {"e2e_tests": stage_time}},
+        })
+    row, = sharding.stage_comparison(builder.build(), plan)
+    assert row["current"] == 330.0
+    assert row["overhead"] == 90.0
+    assert row["predicted"] == 210.0
+    assert row["speedup"] == pytest.approx(330 / 210)
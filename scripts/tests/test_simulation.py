@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from cimetrics.loader import STAGE_INDEX, STAGES, ColumnBuilder
+from cimetrics.simulation import (
+    PIPELINES,
+    parallelize,
+    sample_stage_durations,
+    simulate,
+    simulate_platforms,
+    topological_order,
+)
+
+# Durées fixes d'un pipeline: e2e_tests et docker_build dominent
+FIXED = {
+    "lint_backend": 10.0,
+    "lint_frontend": 8.0,
+    "test_backend": 30.0,
+    "test_frontend": 20.0,
+    "build_frontend": 15.0,
+    "e2e_tests": 120.0,
+    "docker_build": 90.0,
+    "deploy": 5.0,
+}
+
+
+def fixed_samples(n=4, **overrides):
+    row = [dict(FIXED, **overrides)[stage] for stage in STAGES]
+    return np.tile(row, (n, 1))
+
+
+def test_jenkins_is_sum_of_sequential_blocks():
+    result = simulate(PIPELINES["jenkins"], fixed_samples())
+    # max(lint) + max(test) + build + e2e + docker + deploy
+    assert result["p50"] == pytest.approx(10 + 30 + 15 + 120 + 90 + 5)
+    assert result["critical_paths"] == [{
+        "stages": ["lint_backend", "test_backend", "build_frontend", "e2e_tests", "docker_build", "deploy"],
+        "frequency": 1.0,
+    }]
+    assert result["criticality"]["test_frontend"] == 0.0
+
+
+def test_parallelize_runs_group_side_by_side_and_joins_successors():
+    dag = parallelize(PIPELINES["jenkins"], ["e2e_tests", "docker_build"])
+    assert dag["docker_build"] == ["build_frontend"]
+    assert set(dag["deploy"]) == {"e2e_tests", "docker_build"}
+    result = simulate(dag, fixed_samples())
+    assert result["p50"] == pytest.approx(10 + 30 + 15 + 120 + 5)
+
+
+def test_runner_limit_serializes_stages():
+    dag = {"e2e_tests": [], "docker_build": []}
+    assert simulate(dag, fixed_samples())["p50"] == pytest.approx(120)
+    one_runner = simulate(dag, fixed_samples(), runners=1)
+    assert one_runner["p50"] == pytest.approx(210)
+    # Le runner occupé par e2e_tests rend les deux stages critiques
+    assert one_runner["critical_paths"][0]["stages"] == ["e2e_tests", "docker_build"]
+
+
+def test_cycle_and_unknown_stage_are_rejected():
+    with pytest.raises(ValueError, match="Cycle"):
+        topological_order({"build_frontend": ["e2e_tests"], "e2e_tests": ["build_frontend"]})
+    with pytest.raises(ValueError, match="inconnu"):
+        topological_order({"integration": []})
+
+
+def test_sampling_keeps_rows_and_fills_missing_stages():
+    stages = np.full((2, len(STAGES)), np.nan)
+    stages[0, :] = 1.0
+    stages[1, :] = 2.0
+    stages[1, STAGE_INDEX["deploy"]] = np.nan
+    stages[:, STAGE_INDEX["docker_build"]] = np.nan
+    samples = sample_stage_durations(stages, 1000, np.random.default_rng(0))
+    assert np.all(samples[:, STAGE_INDEX["docker_build"]] == 0)
+    # Une ligne tirée garde les durées d'une même exécution
+    assert np.all(samples[:, STAGE_INDEX["lint_backend"]] == samples[:, STAGE_INDEX["e2e_tests"]])
+    assert set(np.unique(samples[:, STAGE_INDEX["deploy"]])) == {1.0}
+
+
+def test_simulate_platforms_is_reproducible():
+    builder = ColumnBuilder()
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        stages = {stage: float(duration * rng.uniform(0.8, 1.2)) for stage, duration in FIXED.items()}
+        builder.append("github", {"duration": {"total": sum(stages.values()), "stages": stages}})
+    builder.append("github", {"duration": {"total": 0, "stages": {stage: 0 for stage in STAGES}}})
+    columns = builder.build()
+    scenarios = {"actuel": {}, "runners": {"runners": 1}}
+    first = simulate_platforms(columns, scenarios, 2000, seed=3)
+    assert first == simulate_platforms(columns, scenarios, 2000, seed=3)
+    github = first["github"]["scenarios"]
+    assert github["runners"]["p50"] > github["actuel"]["p50"]
+    # Un seul runner: le pipeline dure la somme des stages
+    assert github["runners"]["p50"] == pytest.approx(sum(FIXED.values()), rel=0.1)
+
+
+def test_sampling_skips_runs_without_measured_stages():
+    stages = np.full((3, len(STAGES)), np.nan)
+    stages[0, :] = 5.0
+    stages[1, :] = 1.0
+    samples = sample_stage_durations(stages, 200, np.random.default_rng(0))
+    # Un run sans stage mesuré complété stage par stage mélangerait les runs
+    assert np.all(samples == samples[:, :1])
+
+    builder = ColumnBuilder()
+    builder.append("jenkins", {"duration": {"total": 250, "stages": {stage: 25.0 for stage in STAGES}}})
+    for _ in range(5):
+        builder.append("jenkins", {"duration": {"total": 250, "stages": {}}})
+    result = simulate_platforms(builder.build(), {"actuel": {}}, 500, seed=0)["jenkins"]
+    assert (result["observed"]["count"], result["sampled"]) == (6, 1)
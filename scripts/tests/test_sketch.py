@@ -0,0 +1,199 @@
+import json
+
+import numpy as np
+import pytest
+
+from cimetrics import execlog
+from cimetrics.aggregates import Summary, summarize_files
+from cimetrics.loader import STAGES, load_files
+from cimetrics.sketch import QuantileSketch
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def samples(name, n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    if name == "lognormal":
+        return rng.lognormal(5, 0.8, n)
+    if name == "pareto":
+        return (rng.pareto(1.5, n) + 1) * 30
+    if name == "bimodal":
+        return np.concatenate([rng.normal(60, 5, n // 2), rng.normal(900, 50, n // 2)]).clip(1)
+    return rng.uniform(0.5, 36000, n)
+
+
+def assert_relative_error(sketch, values, alpha):
+    exact = np.quantile(values, QUANTILES, method="lower")
+    estimated = np.asarray(sketch.quantiles(QUANTILES))
+    assert np.all(np.abs(estimated - exact) <= alpha * exact * (1 + 1e-9))
+    for q, value in zip(QUANTILES, estimated):
+        assert sketch.quantile(q) == pytest.approx(value)
+
+
+@pytest.mark.parametrize("distribution", ["lognormal", "pareto", "bimodal", "uniform"])
+@pytest.mark.parametrize("alpha", [0.01, 0.05])
+def test_relative_error_is_bounded(distribution, alpha):
+    values = samples(distribution)
+    sketch = QuantileSketch(alpha)
+    sketch.update(values)
+    assert sketch.count == len(values)
+    assert_relative_error(sketch, values, alpha)
+
+
+def test_add_and_update_agree():
+    values = samples("lognormal", 2000)
+    one_by_one = QuantileSketch()
+    for value in values:
+        one_by_one.add(value)
+    vectorized = QuantileSketch()
+    vectorized.update(values)
+    assert one_by_one.bins == vectorized.bins
+
+
+def test_merged_shards_equal_single_sketch():
+    values = samples("pareto", 30000, seed=3)
+    full = QuantileSketch()
+    full.update(values)
+    merged = QuantileSketch()
+    for shard in np.array_split(values, 7):
+        part = QuantileSketch()
+        part.update(shard)
+        merged.merge(QuantileSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+    assert merged.bins == full.bins
+    assert_relative_error(merged, values, merged.alpha)
+
+
+def test_merge_rejects_different_alpha():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_serialization_is_compact():
+    sketch = QuantileSketch()
+    sketch.update(samples("lognormal", 100000))
+    data = sketch.to_dict()
+    assert len(data["counts"]) < 600
+    assert QuantileSketch.from_dict(data).bins == sketch.bins
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+    sketch.update([np.nan, 0, -1])
+    assert sketch.quantile(0.5) is None
+    assert sketch.percentiles() == {"p50": None, "p90": None, "p95": None, "p99": None}
+    assert QuantileSketch.from_dict(sketch.to_dict()).count == 0
+
+
+def write_log(path, executions, block_size=100):
+    with execlog.ExecutionLogWriter(path, block_size) as log:
+        for execution in executions:
+            log.append(execution)
+
+
+def executions(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "execution_id": f"run-{seed}-{i}",
+            "success": bool(rng.random() < 0.9),
+            "duration": {
+                "total": float(rng.lognormal(5, 0.5)),
+                "stages": {stage: float(rng.lognormal(3, 1)) for stage in STAGES},
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def test_streaming_summary_matches_loaded_columns(tmp_path):
+    paths = []
+    for shard in range(3):
+        path = tmp_path / f"github_shard{shard}.jsonl.gz"
+        write_log(path, executions(500, shard))
+        paths.append(path)
+    json_path = tmp_path / "gitlab_run.json"
+    json_path.write_text(json.dumps({"executions": executions(300, 9)}))
+    paths.append(json_path)
+
+    streamed = summarize_files(paths)
+    columns = load_files(paths)
+    assert streamed.platforms.keys() == set(columns.platforms())
+    for platform in columns.platforms():
+        exact = columns.durations(platform)
+        running = streamed.platforms[platform].duration
+        assert running.count == len(exact)
+        assert running.mean == pytest.approx(exact.mean())
+        assert_relative_error(running.sketch, exact, running.sketch.alpha)
+        for stage in STAGES:
+            assert_relative_error(
+                streamed.platforms[platform].stages[stage].sketch,
+                columns.stage_durations(stage, platform),
+                0.01,
+            )
+
+
+def test_parallel_streaming_equals_serial(tmp_path):
+    paths = []
+    for shard in range(70):
+        path = tmp_path / f"jenkins_shard{shard}.jsonl"
+        write_log(path, executions(10, shard))
+        paths.append(path)
+    serial = summarize_files(paths)
+    parallel = summarize_files(paths, workers=2)
+    assert parallel.platforms["jenkins"].duration.sketch.bins == serial.platforms["jenkins"].duration.sketch.bins
+    assert parallel.platforms["jenkins"].executions == 700
+
+
+def test_summary_round_trip_keeps_percentiles(tmp_path):
+    path = tmp_path / "github_run.jsonl"
+    write_log(path, executions(300, 1))
+    summary = summarize_files([path])
+    data = json.loads(json.dumps(summary.to_dict()))
+    duration = data["platforms"]["github"]["duration"]
+    assert set(duration) >= {"p50", "p90", "p95", "p99", "sketch"}
+    assert Summary.from_dict(data).to_dict() == summary.to_dict()
+
+
+@pytest.mark.parametrize("distribution", ["lognormal", "pareto", "bimodal"])
+def test_box_stats_match_exact_quartiles(distribution):
+    from cimetrics.aggregates import RunningStats
+    from cimetrics.sketch import MAX_FLIERS
+
+    values = samples(distribution)
+    running = RunningStats()
+    running.update(values)
+    box = running.box_stats("label")
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75], method="lower")
+    for estimated, exact in ((box["q1"], q1), (box["med"], median), (box["q3"], q3)):
+        assert abs(estimated - exact) <= 0.01 * exact * (1 + 1e-9)
+    assert box["mean"] == pytest.approx(values.mean())
+    assert values.min() <= box["whislo"] <= box["q1"] <= box["q3"] <= box["whishi"] <= values.max()
+    assert len(box["fliers"]) <= MAX_FLIERS
+    if box["fliers"]:
+        assert max(box["fliers"]) == values.max()
+
+    violin = running.violin_stats()
+    assert violin["min"] == values.min() and violin["max"] == values.max()
+    assert len(violin["coords"]) == len(violin["vals"])
+
+
+def test_box_stats_of_a_single_value():
+    from cimetrics.aggregates import RunningStats
+
+    running = RunningStats()
+    running.update([42.0])
+    box = running.box_stats()
+    assert box["q1"] == box["med"] == box["q3"] == box["whislo"] == box["whishi"] == 42.0
+    assert box["fliers"] == []
+
+
+def test_running_quantiles_stay_within_exact_min_and_max():
+    from cimetrics.aggregates import RunningStats
+
+    running = RunningStats()
+    running.update([1.5, 1.5, 1.5])
+    # Le sketch seul estime 1.5 à 1 % près, au-dessus du maximum
+    assert running.sketch.quantile(0.5) > 1.5
+    assert running.quantile(0.5) == 1.5
+    assert set(running.percentiles().values()) == {1.5}
+    assert RunningStats.from_dict(running.to_dict()).to_dict()["p99"] == 1.5
@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from cimetrics import snapshot
+from cimetrics.consolidation import load_summary
+
+SCRIPT = Path(__file__).resolve().parent.parent / "consolidate-data.py"
+
+
+def execution(execution_id, total):
+    return {"platform": "github", "execution_id": execution_id, "timestamp": 1700000000 + total,
+            "duration": {"total": float(total), "stages": {"build": float(total)}}}
+
+
+def write_results(results):
+    results.mkdir()
+    runs = [execution(f"run_{i}", 100 + i) for i in range(5)]
+    (results / "github_a.json").write_text(json.dumps({"platform": "github", "executions": runs[:3]}))
+    # run_2 collecté deux fois
+    (results / "github_b.json").write_text(json.dumps({"platform": "github", "executions": runs[2:]}))
+    return results
+
+
+def consolidate(results):
+    subprocess.run([sys.executable, str(SCRIPT), str(results)], check=True, capture_output=True)
+
+
+def test_snapshot_round_trip_counts_each_execution_once(tmp_path):
+    results = write_results(tmp_path / "results")
+    consolidate(results)
+    columns = snapshot.load_if_fresh(results)
+    assert columns is not None
+    assert sorted(columns.execution_id) == [f"run_{i}" for i in range(5)]
+    assert snapshot.load_columns(results).total.tolist() == columns.total.tolist()
+    assert load_summary(results).platforms["github"].executions == 5
+
+
+def test_stale_snapshot_falls_back_to_deduplicated_raw_files(tmp_path):
+    results = write_results(tmp_path / "results")
+    consolidate(results)
+    fresh = snapshot.load_columns(results)
+    stat = (results / "github_b.json").stat()
+    os.utime(results / "github_b.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (results / "github_a.json").write_text((results / "github_a.json").read_text() + "\n")
+
+    assert snapshot.load_if_fresh(results) is None
+    columns = snapshot.load_columns(results)
+    assert len(columns) == len(fresh) == 5
+    assert sorted(columns.execution_id) == sorted(fresh.execution_id)
+    assert load_summary(results).platforms["github"].executions == 5
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from scipy import stats as scipy_stats
+
+from cimetrics.loader import ColumnBuilder, ExecutionColumns
+from cimetrics.records import PLATFORMS
+from cimetrics.stats import CELLS, TOTAL, describe, statistics_table
+
+
+def mixed_columns(build_columns):
+    """Plateformes de tailles différentes, stages absents, durées nulles et négatives"""
+    def fields(rng, i, stages):
+        if i % 5 == 0:
+            stages["deploy"] = 0.0
+        if i % 7 == 0:
+            stages["lint_backend"] = -1.0
+        del stages["docker_build"]
+        return {}
+
+    builder = ColumnBuilder()
+    # Un seul docker_build pour gitlab: cellule omise (min_count=2)
+    builder.append("gitlab", {"duration": {"total": 500.0, "stages": {"docker_build": 42.0}}})
+    return ExecutionColumns.concatenate([
+        build_columns(60, platform="jenkins", seed=1, fields=fields, prefix="j"),
+        build_columns(25, platform="github", seed=2, fields=fields, prefix="g"),
+        builder.build(),
+        build_columns(40, platform="gitlab", seed=3, fields=fields, prefix="l"),
+    ])
+
+
+def reference(values, confidence=0.95):
+    values = values[values > 0]
+    mean, std = values.mean(), values.std(ddof=1)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    lower, upper = scipy_stats.t.interval(confidence, len(values) - 1, loc=mean, scale=std / np.sqrt(len(values)))
+    return {"count": len(values), "mean": mean, "median": median, "std": std, "min": values.min(),
+            "max": values.max(), "q1": q1, "q3": q3, "iqr": q3 - q1, "cv": std / mean * 100,
+            "ci_95_lower": lower, "ci_95_upper": upper}
+
+
+def test_statistics_table_matches_per_cell_computation(build_columns):
+    columns = mixed_columns(build_columns)
+    table = statistics_table(columns)
+
+    expected_cells = []
+    for platform in PLATFORMS:
+        subset = columns.for_platform(platform)
+        for cell in CELLS:
+            values = subset.total if cell == TOTAL else subset.stage(cell)
+            if np.count_nonzero(values > 0) >= 2:
+                expected_cells.append((platform, cell, reference(values)))
+
+    assert [(row["platform"], row["stage"]) for row in table] == [(p, c) for p, c, _ in expected_cells]
+    for row, (_, _, expected) in zip(table, expected_cells):
+        assert row["count"] == expected.pop("count")
+        for name, value in expected.items():
+            assert row[name] == pytest.approx(value, rel=1e-9), (row["platform"], row["stage"], name)
+
+
+def test_single_value_has_no_spread():
+    result = describe([12.0])
+    assert result["count"] == 1 and result["mean"] == 12.0 and result["median"] == 12.0
+    assert result["std"] is None and result["cv"] is None and result["ci_95_lower"] is None
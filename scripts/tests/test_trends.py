@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from cimetrics.loader import STAGES
+from cimetrics.trends import analyze_trends, binary_segmentation, rolling_quantiles
+
+
+def test_binary_segmentation_finds_level_shifts():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 0.1, 3000)
+    values[1000:] += 0.5
+    values[2200:] -= 0.8
+    changes = binary_segmentation(values)
+    assert len(changes) == 2
+    assert abs(changes[0] - 1000) <= 5
+    assert abs(changes[1] - 2200) <= 5
+
+
+def test_binary_segmentation_ignores_noise_and_outliers():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 0.1, 2000)
+    values[::97] += 2.0
+    assert binary_segmentation(values) == []
+    assert binary_segmentation(np.ones(100)) == []
+
+
+def test_rolling_quantiles_match_window_quantiles():
+    values = np.random.default_rng(2).exponential(10, 500)
+    median, p95 = rolling_quantiles(values, window=20)
+    assert np.isnan(median[:19]).all()
+    assert median[19] == pytest.approx(np.median(values[:20]))
+    assert p95[-1] == pytest.approx(np.quantile(values[-20:], 0.95))
+    # Valeurs répétées: la fenêtre triée retire bien la valeur sortante
+    values = np.random.default_rng(3).integers(0, 5, 300).astype(float)
+    expected = np.quantile(np.lib.stride_tricks.sliding_window_view(values, 7), [0.5, 0.95], axis=1)
+    assert np.allclose(rolling_quantiles(values, window=7)[:, 6:], expected)
+
+
+def test_analyze_trends_reports_change_window(build_columns):
+    def stages(rng, i):
+        durations = {stage: float(rng.lognormal(np.log(20), 0.1)) for stage in STAGES}
+        if i >= 250:
+            durations["e2e_tests"] *= 1.5
+        return durations
+
+    # Exécutions écrites dans le désordre: la série est triée par horodatage
+    columns = build_columns(400, platform="jenkins", seed=3, stages=stages, prefix="build", interval=600, shuffle=True)
+    results = analyze_trends(columns)
+    changes = {result["stage"]: result["changes"] for result in results}
+    assert [change["first_after_id"] for change in changes["e2e_tests"]] == ["build-250"]
+    assert changes["e2e_tests"][0]["last_before_id"] == "build-249"
+    assert changes["e2e_tests"][0]["direction"] == "slower"
+    assert changes["lint_backend"] == []
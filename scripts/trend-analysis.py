@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Script pour suivre l'évolution des durées et détecter les ruptures
+Usage: python scripts/trend-analysis.py results/performance/ [--platform P] [--stage S] [--window 20]
+       [--min-size 10] [--penalty 2] [--output ruptures.json|ruptures.csv] [--no-plots] [--preview] [--workers N]
+
+Les exécutions sont ordonnées par horodatage, par plateforme, pour la durée
+totale et chaque stage (cimetrics/trends.py): médiane et p95 glissants sur
+--window exécutions et détection des ruptures de niveau par segmentation
+binaire (segments d'au moins --min-size exécutions, --penalty plus grand =
+moins de ruptures). Chaque rupture est rapportée avec la fenêtre où elle
+s'est produite (dernière exécution avant, première après), pour retrouver
+le commit responsable.
+
+Un graphique par plateforme (results_dir/visualizations/trends_<plateforme>.png)
+montre les durées, les courbes glissantes et les ruptures annotées.
+--output écrit la table des ruptures en JSON ou CSV.
+"""
+
+import sys
+from pathlib import Path
+
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.parallel import pop_workers_option
+from cimetrics.snapshot import load_columns
+from cimetrics.stats import CELLS, write_table
+from cimetrics.trends import CHANGE_FIELDS, DEFAULT_MIN_SIZE, DEFAULT_PENALTY, DEFAULT_WINDOW, analyze_trends
+
+DPI = 150
+PREVIEW_DPI = 72
+
+# Nombre maximal de points dessinés par série (les courbes glissantes restent complètes)
+MAX_PLOTTED_POINTS = 5000
+
+def print_changes(results):
+    """Affiche les ruptures détectées, série par série"""
+    print("\n" + "="*80)
+    print("RUPTURES DÉTECTÉES")
+    print("="*80)
+    found = False
+    for result in results:
+        for change in result["changes"]:
+            found = True
+            marker = "🐢" if change["direction"] == "slower" else "🚀"
+            print(f"{marker} {result['platform']}/{result['stage']}: {change['median_before']:.1f}s → "
+                  f"{change['median_after']:.1f}s ({change['relative'] * 100:+.1f}%, "
+                  f"p95 {change['p95_before']:.1f}s → {change['p95_after']:.1f}s)")
+            print(f"   entre {change['last_before_id']} ({change['last_before']}) "
+                  f"et {change['first_after_id']} ({change['first_after']})")
+    if not found:
+        print("✅ Aucune rupture détectée")
+
+def plot_platform_trends(platform, results, output_file, dpi=DPI):
+    """Graphique des séries d'une plateforme: durées, médiane et p95 glissants, ruptures"""
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(len(results), 1, figsize=(14, 2.6 * len(results)), sharex=True, squeeze=False)
+    for ax, result in zip(axes[:, 0], results):
+        dates = (result["timestamps"] * 1000).astype("datetime64[ms]")
+        step = max(1, len(dates) // MAX_PLOTTED_POINTS)
+        ax.scatter(dates[::step], result["values"][::step], s=4, alpha=0.3, color="gray", label="Exécutions")
+        ax.plot(dates, result["rolling_median"], color="#1f77b4", label="Médiane glissante")
+        ax.plot(dates, result["rolling_p95"], color="#d62728", alpha=0.8, label="p95 glissant")
+        for change in result["changes"]:
+            color = "#d33833" if change["direction"] == "slower" else "#28a745"
+            ax.axvline(dates[change["index"]], color=color, linestyle="--", linewidth=1.2)
+            ax.annotate(f"{change['relative'] * 100:+.0f}%", (dates[change["index"]], 1), xycoords=("data", "axes fraction"),
+                        xytext=(3, -12), textcoords="offset points", color=color, fontsize=9, fontweight="bold")
+        ax.set_ylabel(f"{result['stage'].replace('_', ' ')}\n(s)")
+        ax.grid(True, alpha=0.3)
+    axes[0, 0].set_title(f"Évolution des durées - {platform.upper()}")
+    axes[0, 0].legend(loc="upper left", fontsize=8)
+    fig.autofmt_xdate()
+
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Tendances générées: {output_file}")
+
+def print_usage():
+    print("Usage: python scripts/trend-analysis.py <results_dir> [--platform P] [--stage S] [--window 20]")
+    print("       [--min-size 10] [--penalty 2] [--output ruptures.json|ruptures.csv] [--no-plots] [--preview] [--workers N]")
+
+def main():
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        platform, args = pop_option(args, "platform")
+        stage, args = pop_option(args, "stage")
+        window, args = pop_option(args, "window", DEFAULT_WINDOW, int)
+        min_size, args = pop_option(args, "min-size", DEFAULT_MIN_SIZE, int)
+        penalty, args = pop_option(args, "penalty", DEFAULT_PENALTY, float)
+        output_file, args = pop_option(args, "output")
+        no_plots, args = pop_flag(args, "no-plots")
+        preview, args = pop_flag(args, "preview")
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+    if stage is not None and stage not in CELLS:
+        print(f"❌ Stage inconnu: {stage} (choix: {', '.join(CELLS)})")
+        sys.exit(1)
+
+    results_dir = Path(args[0])
+    columns = load_columns(results_dir, workers)
+    results = analyze_trends(
+        columns, window, penalty, min_size,
+        platforms=[platform] if platform else None,
+        cells=[stage] if stage else CELLS,
+        workers=workers,
+    )
+
+    if not results:
+        print(f"❌ Pas assez d'exécutions datées dans {results_dir} (au moins {2 * min_size} par série)")
+        sys.exit(1)
+
+    print(f"📈 {len(results)} séries analysées ({sum(len(result['values']) for result in results)} valeurs)")
+    print_changes(results)
+
+    if output_file:
+        changes = [change for result in results for change in result["changes"]]
+        write_table(changes, output_file, CHANGE_FIELDS)
+        print(f"\n✅ Table des ruptures écrite: {output_file}")
+
+    if not no_plots:
+        output_dir = results_dir / "visualizations"
+        output_dir.mkdir(exist_ok=True)
+        print()
+        for name in dict.fromkeys(result["platform"] for result in results):
+            platform_results = [result for result in results if result["platform"] == name]
+            plot_platform_trends(name, platform_results, output_dir / f"trends_{name}.png",
+                                 PREVIEW_DPI if preview else DPI)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ImportError:
+        print("❌ Erreur: matplotlib et numpy sont requis")
+        print("   Installer avec: pip install matplotlib numpy")
+        sys.exit(1)
@@ -1,151 +1,164 @@
 #!/usr/bin/env python3
 """
 Script pour valider les données collectées
-Usage: python scripts/validate-data.py results/performance/
+Usage: python scripts/validate-data.py results/performance/ [--workers N] [--jsonl rapport.jsonl|-] [--fail-fast] [--quiet]
+
+Chaque exécution de chaque fichier est validée, y compris dans les
+conteneurs {"executions": [...]}, les listes et les journaux JSON Lines,
+avec le schéma compilé de cimetrics/schema.py. Les fichiers sont répartis
+par lots sur un pool de processus et les résultats affichés au fil de l'eau,
+dans l'ordre des fichiers.
+
+execution_id et success absents sont des avertissements, pas des erreurs:
+les fichiers de l'ancien format de measure-performance.sh, qui ne les
+contiennent pas, restent valides (voir cimetrics/schema.py).
+
+--jsonl écrit un résultat JSON par fichier (- pour la sortie standard, le
+résumé passant alors sur la sortie d'erreur). --fail-fast s'arrête au
+premier fichier en erreur (hooks pre-commit). --quiet n'affiche que les
+fichiers en erreur ou avec avertissements.
 """
 
 import json
 import sys
 from pathlib import Path
-from datetime import datetime
 
-REQUIRED_FIELDS = [
-    "platform",
-    "execution_id",
-    "timestamp",
-    "duration",
-    "success"
-]
+from cimetrics.options import pop_flag, pop_option, usage_on_error
+from cimetrics.parallel import imap_chunks, pop_workers_option
+from cimetrics.records import list_result_files
+from cimetrics.schema import Validator
+
+# Taille maximale d'un lot: les résultats arrivent tôt et --fail-fast
+# n'attend pas la fin d'un gros lot
+MAX_CHUNK_SIZE = 256
 
-REQUIRED_DURATION_FIELDS = [
-    "total"
-]
+_validator = None
 
 def validate_json_file(file_path):
-    """Valide un fichier JSON"""
-    errors = []
-    warnings = []
-    
-    try:
-        with open(file_path) as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        return [f"❌ JSON invalide: {e}"], []
-    except Exception as e:
-        return [f"❌ Erreur de lecture: {e}"], []
-    
-    # Vérifier les champs obligatoires
-    for field in REQUIRED_FIELDS:
-        if field not in data:
-            errors.append(f"Champ manquant: {field}")
-    
-    # Vérifier la structure duration
-    if "duration" in data:
-        if not isinstance(data["duration"], dict):
-            errors.append("duration doit être un objet")
-        elif "total" not in data["duration"]:
-            errors.append("duration.total est manquant")
-        elif not isinstance(data["duration"]["total"], (int, float)):
-            errors.append("duration.total doit être un nombre")
-        elif data["duration"]["total"] <= 0:
-            warnings.append("duration.total est <= 0")
-    
-    # Vérifier le timestamp
-    if "timestamp" in data:
-        try:
-            datetime.fromisoformat(data["timestamp"].replace('Z', '+00:00'))
-        except:
-            errors.append("timestamp doit être au format ISO 8601")
-    
-    # Vérifier la plateforme
-    if "platform" in data:
-        if data["platform"] not in ["github", "gitlab", "jenkins"]:
-            errors.append(f"platform invalide: {data['platform']}")
-    
-    # Vérifier success
-    if "success" in data:
-        if not isinstance(data["success"], bool):
-            errors.append("success doit être un booléen")
-    
-    # Vérifier les durées des stages
-    if "duration" in data and "stages" in data["duration"]:
-        stages = data["duration"]["stages"]
-        if not isinstance(stages, dict):
-            errors.append("duration.stages doit être un objet")
-        else:
-            for stage_name, stage_duration in stages.items():
-                if not isinstance(stage_duration, (int, float)):
-                    warnings.append(f"duration.stages.{stage_name} n'est pas un nombre")
-                elif stage_duration < 0:
-                    warnings.append(f"duration.stages.{stage_name} est négatif")
-    
-    return errors, warnings
-
-def validate_directory(directory):
-    """Valide tous les fichiers JSON dans un répertoire"""
+    """Valide un fichier de résultats; retourne (errors, warnings)"""
+    report = validate_file(file_path)
+    return report["errors"], report["warnings"]
+
+def validate_file(file_path):
+    """Valide un fichier de résultats; retourne le rapport (dict sérialisable)"""
+    global _validator
+    if _validator is None:
+        # Schéma compilé une fois par processus
+        _validator = Validator()
+    return _validator.validate_file(file_path).to_dict()
+
+def validate_files(result_files):
+    """Valide un lot de fichiers; retourne la liste des rapports (exécuté dans un worker)"""
+    return [validate_file(result_file) for result_file in result_files]
+
+def iter_reports(result_files, workers=1):
+    """Rapports de validation dans l'ordre des fichiers, produits au fil de l'eau"""
+    for chunk in imap_chunks(validate_files, result_files, workers, max_chunk_size=MAX_CHUNK_SIZE):
+        yield from chunk
+
+def print_report(report, quiet=False, out=sys.stdout):
+    name = Path(report["file"]).name
+    if report["errors"]:
+        print(f"❌ {name}:", file=out)
+        for error in report["errors"]:
+            print(f"   - {error}", file=out)
+        hidden = report["error_count"] - len(report["errors"])
+        if hidden:
+            print(f"   ... et {hidden} autres erreurs", file=out)
+    if report["warnings"]:
+        print(f"⚠️  {name}:", file=out)
+        for warning in report["warnings"]:
+            print(f"   - {warning}", file=out)
+        hidden = report["warning_count"] - len(report["warnings"])
+        if hidden:
+            print(f"   ... et {hidden} autres avertissements", file=out)
+    if not report["errors"] and not report["warnings"] and not quiet:
+        print(f"✅ {name}: Valide ({report['records']} exécutions)", file=out)
+
+def validate_directory(directory, workers=1, jsonl_output=None, fail_fast=False, quiet=False):
+    """Valide tous les fichiers de résultats d'un répertoire"""
     directory = Path(directory)
-    
+    # Avec --jsonl -, la sortie standard est réservée aux lignes JSON
+    out = sys.stderr if jsonl_output == "-" else sys.stdout
+
     if not directory.exists():
-        print(f"❌ Répertoire introuvable: {directory}")
+        print(f"❌ Répertoire introuvable: {directory}", file=out)
         return False
-    
-    json_files = list(directory.glob("*.json"))
-    
-    if not json_files:
-        print(f"⚠️  Aucun fichier JSON trouvé dans {directory}")
+
+    result_files = list_result_files(directory)
+
+    if not result_files:
+        print(f"⚠️  Aucun fichier de résultats trouvé dans {directory}", file=out)
         return False
-    
-    print(f"🔍 Validation de {len(json_files)} fichiers...")
-    print()
-    
+
+    print(f"🔍 Validation de {len(result_files)} fichiers...", file=out)
+    print(file=out)
+
     total_errors = 0
     total_warnings = 0
+    total_records = 0
     valid_files = 0
-    
-    for json_file in sorted(json_files):
-        errors, warnings = validate_json_file(json_file)
-        
-        if errors:
-            print(f"❌ {json_file.name}:")
-            for error in errors:
-                print(f"   - {error}")
-            total_errors += len(errors)
-        else:
-            valid_files += 1
-        
-        if warnings:
-            print(f"⚠️  {json_file.name}:")
-            for warning in warnings:
-                print(f"   - {warning}")
-            total_warnings += len(warnings)
-        
-        if not errors and not warnings:
-            print(f"✅ {json_file.name}: Valide")
-    
-    print()
-    print("="*60)
-    print(f"Résumé:")
-    print(f"  ✅ Fichiers valides: {valid_files}/{len(json_files)}")
-    print(f"  ❌ Erreurs: {total_errors}")
-    print(f"  ⚠️  Avertissements: {total_warnings}")
-    print("="*60)
-    
+    checked_files = 0
+
+    if jsonl_output == "-":
+        stream = sys.stdout
+    elif jsonl_output:
+        stream = open(jsonl_output, "w")
+    else:
+        stream = None
+
+    try:
+        for report in iter_reports(result_files, workers):
+            checked_files += 1
+            total_errors += report["error_count"]
+            total_warnings += report["warning_count"]
+            total_records += report["records"]
+            valid_files += report["valid"]
+            if stream is not None:
+                stream.write(json.dumps(report, ensure_ascii=False) + "\n")
+            if jsonl_output != "-":
+                print_report(report, quiet)
+            if fail_fast and not report["valid"]:
+                print("\n⛔ Arrêt au premier fichier invalide (--fail-fast)", file=out)
+                break
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    print(file=out)
+    print("="*60, file=out)
+    print("Résumé:", file=out)
+    print(f"  ✅ Fichiers valides: {valid_files}/{checked_files}"
+          + (f" ({len(result_files)} fichiers au total)" if checked_files < len(result_files) else ""), file=out)
+    print(f"  📊 Exécutions vérifiées: {total_records}", file=out)
+    print(f"  ❌ Erreurs: {total_errors}", file=out)
+    print(f"  ⚠️  Avertissements: {total_warnings}", file=out)
+    print("="*60, file=out)
+
     return total_errors == 0
 
+def print_usage():
+    print("Usage: python scripts/validate-data.py <results_dir> [--workers N] [--jsonl rapport.jsonl|-] [--fail-fast] [--quiet]")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/validate-data.py <results_dir>")
+    with usage_on_error(print_usage):
+        workers, args = pop_workers_option(sys.argv[1:])
+        jsonl_output, args = pop_option(args, "jsonl")
+        fail_fast, args = pop_flag(args, "fail-fast")
+        quiet, args = pop_flag(args, "quiet")
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
-    
-    results_dir = sys.argv[1]
-    
-    if validate_directory(results_dir):
-        print("\n✅ Tous les fichiers sont valides!")
+
+    results_dir = args[0]
+    out = sys.stderr if jsonl_output == "-" else sys.stdout
+
+    if validate_directory(results_dir, workers, jsonl_output, fail_fast, quiet):
+        print("\n✅ Tous les fichiers sont valides!", file=out)
         sys.exit(0)
     else:
-        print("\n❌ Des erreurs ont été trouvées. Veuillez les corriger.")
+        print("\n❌ Des erreurs ont été trouvées. Veuillez les corriger.", file=out)
         sys.exit(1)
 
 if __name__ == "__main__":
     main()
-